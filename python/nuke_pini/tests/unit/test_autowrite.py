@@ -0,0 +1,236 @@
+import collections
+import importlib.util
+import sys
+import types
+import unittest
+from unittest import mock
+
+from pini.utils import assert_eq, basic_repr
+
+# Allow autowrite to be tested outside nuke using a stub nuke module,
+# which is only applied to sys.modules while autowrite is imported and
+# while tests are running
+_NUKE_MODS = {}
+if not importlib.util.find_spec('nuke'):
+    _NUKE_MODS['nuke'] = types.ModuleType('nuke')
+    _NUKE_MODS['nuke'].__file__ = None  # Rejected as dcc by pini.dcc
+    _NUKE_MODS['nuke'].READ_ONLY = 0x10000000
+
+with mock.patch.dict(sys.modules, _NUKE_MODS):
+    from nuke_pini.tools.autowrite import AWResolver, CAutowrite, aw_utils
+
+_CALLS = collections.Counter()
+
+
+class _FakeElem:
+
+    def __init__(self, name, **kwargs):
+        self.name = name
+        for _key, _val in kwargs.items():
+            setattr(self, _key, _val)
+
+    def __repr__(self):
+        return basic_repr(self, self.name)
+
+
+class _FakeJob(_FakeElem):
+
+    asset_types = ['char', 'prop']
+
+    def find_sequences(self):
+        _CALLS['find_sequences'] += 1
+        return [_FakeElem(_name) for _name in ('seq010', 'seq020')]
+
+    def find_entities(self, entity_type):
+        _CALLS['find_entities'] += 1
+        return [_ety for _ety in self.entities
+                if _ety.entity_type == entity_type]
+
+    def find_templates(self, type_, has_key):
+        _CALLS['find_templates'] += 1
+        return []
+
+
+class _FakeEntity(_FakeElem):
+
+    def find_work_dirs(self, dcc_):
+        _CALLS['find_work_dirs'] += 1
+        return [self.to_work_dir(dcc_=dcc_, task='comp')]
+
+    def to_work_dir(self, dcc_, task):
+        _CALLS['to_work_dir'] += 1
+        return _FakeWorkDir(f'{self.name}/{task}', entity=self, task=task)
+
+
+class _FakeWorkDir(_FakeElem):
+
+    def to_work(self, ver_n, tag):
+        _CALLS['to_work'] += 1
+        return _FakeWork(
+            f'{self.name}/v{ver_n:03d}', work_dir=self, entity=self.entity,
+            entity_type=self.entity.entity_type, profile='shot',
+            task=self.task, tag=tag, ver=ver_n)
+
+    def __eq__(self, other):
+        return isinstance(other, _FakeWorkDir) and self.name == other.name
+
+    def __hash__(self):
+        return hash(self.name)
+
+
+class _FakeWork(_FakeElem):
+
+    @property
+    def path(self):
+        return f'/jobs/{self.name}.nk'
+
+    def find_vers(self):
+        _CALLS['find_vers'] += 1
+        return [self.work_dir.to_work(ver_n=_ver_n, tag=self.tag)
+                for _ver_n in (1, 2)]
+
+    def find_template(self, name):
+        _CALLS['find_template'] += 1
+        if name not in ('render', 'plate'):
+            raise ValueError(f'Missing template {name}')
+        return name
+
+    def to_output(self, template, output_name, extn):
+        _CALLS['to_output'] += 1
+        return _FakeElem(
+            output_name, path=f'/jobs/{self.name}/{template}/'
+            f'{output_name}.%04d.{extn}')
+
+
+class _FakeKnob:
+
+    def __init__(self, value=None, label=None):
+        self.val = value
+        self.label_ = aw_utils.COL_FMT.format(col='Red', text=label)
+
+    def label(self):
+        return self.label_
+
+    def setLabel(self, label):  # pylint: disable=invalid-name
+        self.label_ = label
+
+    def setValue(self, value):  # pylint: disable=invalid-name
+        _CALLS['setValue'] += 1
+        self.val = value
+
+    def value(self):
+        return self.val
+
+    def __getattr__(self, name):
+        if name.startswith('set'):
+            return lambda *args: None
+        raise AttributeError(name)
+
+
+class _FakeNode:
+
+    def __init__(self, name):
+        self.name_ = name
+        self.knobs_ = {}
+        for _name in [
+                'work', 'desc_text', 'res_text', 'output_name', 'file',
+                'aw_file', 'error', 'grade', 'aw_layer', 'denoise',
+                'timewarp', 'tile_color']:
+            self.knobs_[_name] = _FakeKnob()
+        for _name in ['ety_type', 'ety', 'task', 'tag', 'ver']:
+            self.knobs_[_name] = _FakeKnob()
+            self.knobs_[_name + '_mode'] = _FakeKnob('Linked', label=_name)
+        for _name, _val in [
+                ('is_pini_autowrite_2', True),
+                ('tmpl', 'render'),
+                ('desc_mode', 'From node'),
+                ('res_mode', 'Disable'),
+                ('file_type', 'exr'),
+                ('show_internals', False)]:
+            self.knobs_[_name] = _FakeKnob(_val)
+
+    def knobs(self):
+        return self.knobs_
+
+    def name(self):
+        return self.name_
+
+    def width(self):
+        return 1920
+
+    def height(self):
+        return 1080
+
+    def __getitem__(self, name):
+        return self.knobs_[name]
+
+
+def _build_fake_job():
+    _job = _FakeJob('TestJob')
+    _job.entities = [
+        _FakeEntity(_name, entity_type=_seq)
+        for _seq, _name in [('seq010', 'shot010'), ('seq010', 'shot020'),
+                            ('seq020', 'shot030')]]
+    _work_dir = _job.entities[0].to_work_dir(dcc_='nuke', task='comp')
+    _work = _work_dir.to_work(ver_n=2, tag=None)
+    return AWResolver(
+        job=_job, work=_work, work_dir=_work_dir, entity=_work.entity)
+
+
+class TestAutowrite(unittest.TestCase):
+
+    def setUp(self):
+        self._sys_mods = mock.patch.dict(sys.modules, _NUKE_MODS)
+        self._sys_mods.start()
+
+    def tearDown(self):
+        self._sys_mods.stop()
+
+    def test_resolver(self):
+
+        _resolver = _build_fake_job()
+        _CALLS.clear()
+        for _ in range(100):
+            assert_eq(_resolver.find_ety_types(), ['seq010', 'seq020'])
+            assert_eq(
+                _resolver.find_ety_names('seq010'), ['shot010', 'shot020'])
+            _ety = _resolver.find_ety('seq010', 'shot020')
+            assert_eq(_resolver.find_tasks(_ety), ['comp', 'precomp'])
+            _work_dir = _resolver.to_work_dir(_ety, task='comp')
+            _work = _resolver.to_work(_work_dir, ver_n=1, tag=None)
+            assert_eq(_resolver.to_file(
+                _work, tmpl_name='render', output_name='beauty', extn='exr'),
+                ('/jobs/shot020/comp/v001/render/beauty.%04d.exr', ''))
+            assert_eq(_resolver.to_file(
+                _work, tmpl_name='mov', output_name='beauty', extn='mov'),
+                ('', 'Missing template mov'))
+        assert_eq(_CALLS['find_sequences'], 1)
+        assert_eq(_CALLS['find_entities'], 1)
+        assert_eq(_CALLS['find_work_dirs'], 2)
+        assert_eq(_CALLS['find_template'], 2)
+        assert_eq(_CALLS['to_output'], 1)
+        self.assertRaises(ValueError, _resolver.find_ety, 'seq010', 'blah')
+
+    def test_update_nodes(self):
+
+        _resolver = _build_fake_job()
+        _nodes = [CAutowrite(_FakeNode(f'Write{_idx:d}'))
+                  for _idx in range(100)]
+        _CALLS.clear()
+        for _node in _nodes:
+            _node.update(resolver=_resolver, apply_=False)
+        assert not _CALLS['setValue']
+        assert_eq(_CALLS['to_output'], 100)
+        assert_eq(_CALLS['find_entities'], 1)
+        assert_eq(_CALLS['find_vers'], 1)
+        for _node in _nodes:
+            _node.apply_edits()
+        assert_eq(_nodes[0]['ety'].value(), 'shot010')
+        assert_eq(_nodes[0]['ver'].value(), 2)
+        assert_eq(_nodes[0]['file'].value(),
+                  '/jobs/shot010/comp/v002/render/Write0.%04d.exr')
+
+        # Check unchanged values aren't set (apart from tile colour)
+        _CALLS.clear()
+        _nodes[0].update(resolver=_resolver)
+        assert_eq(_CALLS['setValue'], 1)
@@ -7,5 +7,6 @@ from .aw_callbacks import (
     update_all)
 from .aw_build import build
 from .aw_node import CAutowrite, get_selected
+from .aw_resolver import AWResolver, build_resolver
 
 ICON = icons.find('Robot')
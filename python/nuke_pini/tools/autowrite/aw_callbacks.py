@@ -11,7 +11,7 @@ from nuke_pini.utils import (
     flush_script_save_callback, add_script_save_callback,
     flush_script_load_callback, add_script_load_callback)
 
-from . import aw_node
+from . import aw_node, aw_resolver
 
 _LOGGER = logging.getLogger(__name__)
 _DISABLE_KNOB_CHANGED = False
@@ -42,7 +42,11 @@ def _safe_update_all():
 
 
 def update_all():
-    """Update all autowrite nodes."""
+    """Update all autowrite nodes.
+
+    Pipeline lookups are shared between nodes, and knob edits are only
+    applied once all the nodes have been resolved.
+    """
 
     # Find autowrite nodes
     _aw2s = []
@@ -81,8 +85,14 @@ def update_all():
     _LOGGER.debug(' - WORK (c) %s', pipe.CACHE.cur_work)
     _LOGGER.debug(' - WORK (l) %s', pipe.cur_work())
 
+    # Resolve all nodes using shared resolver, then apply knob edits
+    _resolver = aw_resolver.build_resolver()
     for _aw2 in _aw2s:
-        _aw2.update()
+        _aw2.update(resolver=_resolver, apply_=False)
+    _edits = sum(_aw2.apply_edits() for _aw2 in _aw2s)
+    _LOGGER.debug(
+        ' - UPDATED %d AUTOWRITE2S lookups=%d edits=%d', len(_aw2s),
+        _resolver.n_lookups, _edits)
 
     _DISABLE_KNOB_CHANGED = False
 
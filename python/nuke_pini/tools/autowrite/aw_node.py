@@ -7,11 +7,11 @@ import nuke
 
 from pini import pipe, qt
 from pini.dcc import export
-from pini.pipe import cache
-from pini.utils import basic_repr, single, cache_result
+from pini.utils import basic_repr
 
 from nuke_pini.utils import set_node_col
 
+from . import aw_resolver
 from .aw_utils import (
     COL_FMT, DEFAULT_COL, NON_DEFAULT_COL, UpdateLevel, RENDER_COL,
     PLATE_COL, FILE_COL, ERROR_COL)
@@ -42,6 +42,10 @@ class CAutowrite:
             _node = nuke.toNode(_node)
         self.node = _node
 
+        self.resolver = None
+        self._edits = None
+        self._values = {}
+
         _knob = self['is_pini_autowrite_2']
         if not _knob:
             raise ValueError(
@@ -104,6 +108,73 @@ class CAutowrite:
 
         _work.update_outputs()
 
+    def _edit_knob(self, name, method, *args):
+        """Edit a knob on this node.
+
+        During an update, edits are recorded and then applied together
+        by apply_edits - otherwise they're applied immediately.
+
+        Args:
+            name (str): knob name
+            method (str): name of knob method to call (eg. setValue)
+        """
+        if self._edits is None:
+            getattr(self[name], method)(*args)
+            return
+        self._edits.append((name, method, args))
+        if method == 'setValue':
+            self._values[name] = args[0]
+
+    def _edit_node(self, func, *args):
+        """Apply an edit to this node.
+
+        During an update, the edit is recorded and then applied with the
+        knob edits - otherwise it's applied immediately.
+
+        Args:
+            func (fn): function to apply (passed the node as first arg)
+        """
+        if self._edits is None:
+            func(self.node, *args)
+        else:
+            self._edits.append((None, func, args))
+
+    def _read_knob(self, name):
+        """Read a knob value, including any edits not yet applied.
+
+        Args:
+            name (str): knob name
+
+        Returns:
+            (any): knob value
+        """
+        if name in self._values:
+            return self._values[name]
+        return self[name].value()
+
+    def apply_edits(self):
+        """Apply knob edits recorded during an update.
+
+        Values which match the current knob value are not set, to avoid
+        triggering unnecessary knob changed callbacks.
+
+        Returns:
+            (int): number of edits applied
+        """
+        _edits = self._edits or []
+        self._edits, self._values = None, {}
+        _count = 0
+        for _name, _method, _args in _edits:
+            if _name is None:  # Node level edit
+                _method(self.node, *_args)
+            else:
+                _knob = self[_name]
+                if _method == 'setValue' and _knob.value() == _args[0]:
+                    continue
+                getattr(_knob, _method)(*_args)
+            _count += 1
+        return _count
+
     def _update_ety_type(self, level):
         """Update entity type.
 
@@ -113,28 +184,23 @@ class CAutowrite:
         Returns:
             (str): selected entity type
         """
-        if not pipe.CACHE.cur_work:
+        _work = self.resolver.work
+        if not _work:
             return None
-        if pipe.CACHE.cur_work.profile == 'asset':
-            _ety_types = pipe.CACHE.cur_job.asset_types
-        elif pipe.CACHE.cur_work.profile == 'shot':
-            _ety_types = [
-                _seq.name for _seq in pipe.CACHE.cur_job.find_sequences()]
-        else:
-            raise ValueError(pipe.CACHE.cur_work)
+        _ety_types = self.resolver.find_ety_types()
 
         if level <= UpdateLevel.ENTITY_TYPE:
             _LOGGER.debug(' - UPDATE ENITITY TYPE')
             _mode = self['ety_type_mode'].value()
-            _cur = self['ety_type'].value()
+            _cur = self._read_knob('ety_type')
             if _mode == 'Select' and _cur in _ety_types:
                 _val = _cur
             else:
-                _val = pipe.CACHE.cur_work.entity_type
-            self['ety_type'].setValues(_ety_types)
-            self['ety_type'].setValue(_val)
+                _val = _work.entity_type
+            self._edit_knob('ety_type', 'setValues', _ety_types)
+            self._edit_knob('ety_type', 'setValue', _val)
 
-        return self['ety_type'].value()
+        return self._read_knob('ety_type')
 
     def _update_ety(self, level, ety_type):
         """Update entity.
@@ -146,37 +212,36 @@ class CAutowrite:
         Returns:
             (CPEntity): selected entity
         """
-        _LOGGER.debug('UPDATE ETY cur=%s level=%s', self['ety'].value(), level)
-        if not pipe.CACHE.cur_work:
+        _LOGGER.debug(
+            'UPDATE ETY cur=%s level=%s', self._read_knob('ety'), level)
+        _work = self.resolver.work
+        if not _work:
             return None
 
-        if ety_type == pipe.CACHE.cur_work.entity_type:
-            self['ety_mode'].setEnabled(True)
+        if ety_type == _work.entity_type:
+            self._edit_knob('ety_mode', 'setEnabled', True)
         else:
             _LOGGER.debug(' - FORCE ETY TO SELECT %s %s', ety_type,
-                          pipe.CACHE.cur_work.entity_type)
-            self['ety_mode'].setEnabled(False)
-            self['ety_mode'].setValue('Select')
+                          _work.entity_type)
+            self._edit_knob('ety_mode', 'setEnabled', False)
+            self._edit_knob('ety_mode', 'setValue', 'Select')
 
         # Repopulate list
         if level <= UpdateLevel.ENTITY:
-            _mode = self['ety_mode'].value()
-            _cur = self['ety'].value()
+            _mode = self._read_knob('ety_mode')
+            _cur = self._read_knob('ety')
             _LOGGER.debug(' - UPDATING VALUES mode=%s cur=%s', _mode, _cur)
-            _etys = pipe.CACHE.cur_job.find_entities(entity_type=ety_type)
-            _vals = [_ety.name for _ety in _etys]
+            _vals = self.resolver.find_ety_names(ety_type)
             if _mode == 'Select' and _cur and _cur in _vals:
                 _val = _cur
             else:
-                _val = pipe.CACHE.cur_work.entity.name
-            self['ety'].setValues(_vals)
-            self['ety'].setValue(_val)
+                _val = _work.entity.name
+            self._edit_knob('ety', 'setValues', _vals)
+            self._edit_knob('ety', 'setValue', _val)
 
         # Map selection back to entity for result
-        _ety = single([
-            _ety for _ety in pipe.CACHE.cur_job.entities
-            if _ety.name == self['ety'].value() and
-            _ety.entity_type == self['ety_type'].value()])
+        _ety = self.resolver.find_ety(
+            ety_type=self._read_knob('ety_type'), name=self._read_knob('ety'))
         _LOGGER.debug(' - UPDATE ETY COMPLETE %s', _ety)
 
         return _ety
@@ -185,7 +250,7 @@ class CAutowrite:
         """Update pipeline knob ui settings (not opts/values)."""
 
         # Update entity type label
-        _work = pipe.CACHE.cur_work
+        _work = self.resolver.work
         if not _work:
             _ety_type_label = 'sequence'
             _ety_label = 'shot'
@@ -202,8 +267,7 @@ class CAutowrite:
         for _name in ['ety_type', 'ety', 'task', 'tag', 'ver']:
 
             _mode_knob = self[_name + '_mode']
-            _list_knob = self[_name]
-            _mode = _mode_knob.value()
+            _mode = self._read_knob(_name + '_mode')
 
             # Update mode label colour
             _col = {'Linked': DEFAULT_COL,
@@ -214,11 +278,11 @@ class CAutowrite:
                 'ety': _ety_label}.get(_name, _cur_label)
             _LOGGER.debug(' - UPDATE MODE mode=%s label=%s', _mode, _label)
             _label = COL_FMT.format(col=_col, text=_label)
-            _mode_knob.setLabel(_label)
+            self._edit_knob(_name + '_mode', 'setLabel', _label)
 
             # Update list enabled
             _list_en = _mode == 'Select'
-            _list_knob.setEnabled(_list_en)
+            self._edit_knob(_name, 'setEnabled', _list_en)
 
     def _update_task(self, level, ety):
         """Update task.
@@ -231,35 +295,27 @@ class CAutowrite:
             (CPWorkDir): selected work dir
         """
         _LOGGER.debug('UPDATE TASK')
-
-        # Get tasks list
-        _tasks = set(['precomp'])
-        _etys = sorted({_ety for _ety in (ety, pipe.CACHE.cur_entity) if _ety})
-        for _ety in _etys:
-            _work_dirs = _ety.find_work_dirs(dcc_='nuke')
-            _ety_tasks = {_work_dir.task for _work_dir in _work_dirs}
-            _tasks |= _ety_tasks
-        _tasks = sorted(_tasks)
+        _tasks = self.resolver.find_tasks(ety)
 
         # Update list
         if level <= UpdateLevel.TASK:
             _mode = self['task_mode'].value()
-            _cur = self['task'].value()
+            _cur = self._read_knob('task')
             _LOGGER.debug(' - REPOPULATE TASKS mode=%s cur=%s', _mode, _cur)
             if _mode == 'Select' and _cur and _cur in _tasks:
                 _task = _cur
             else:
-                _task = (pipe.CACHE.cur_work.task if pipe.CACHE.cur_work
-                         else None)
-            self['task'].setValues(_tasks)
-            self['task'].setValue(_task)
+                _work = self.resolver.work
+                _task = _work.task if _work else None
+            self._edit_knob('task', 'setValues', _tasks)
+            self._edit_knob('task', 'setValue', _task)
 
         # Build work dir
-        _task = self['task'].value()
+        _task = self._read_knob('task')
         if not ety or not _task:
             _work_dir = None
         else:
-            _work_dir = ety.to_work_dir(dcc_='nuke', task=_task)
+            _work_dir = self.resolver.to_work_dir(ety=ety, task=_task)
         _LOGGER.debug(' - WORK DIR %s', _work_dir)
 
         return _work_dir
@@ -274,30 +330,22 @@ class CAutowrite:
         Returns:
             (str): selected tag
         """
-
-        # Read tags
-        _work_dirs = {work_dir, pipe.CACHE.cur_work_dir}
-        _tags = {'<default>'}
-        for _o_work_dir in _work_dirs:
-            if not isinstance(_o_work_dir, cache.CCPWorkDir):
-                continue
-            _tags |= {_work.tag or '<default>'
-                      for _work in _o_work_dir.find_works()}
-        _tags = sorted(_tags)
+        _tags = self.resolver.find_tags(work_dir)
 
         # Update list
         if level <= UpdateLevel.TAG:
             _mode = self['tag_mode'].value()
-            _cur = self['tag'].value()
+            _cur = self._read_knob('tag')
             if _mode == 'Select' and _cur in _tags:
                 _val = _cur
             else:
-                _val = pipe.CACHE.cur_work.tag if pipe.CACHE.cur_work else None
+                _work = self.resolver.work
+                _val = _work.tag if _work else None
                 _val = _val or '<default>'
-            self['tag'].setValues(_tags)
-            self['tag'].setValue(_val)
+            self._edit_knob('tag', 'setValues', _tags)
+            self._edit_knob('tag', 'setValue', _val)
 
-        _tag = self['tag'].value()
+        _tag = self._read_knob('tag')
         if _tag == '<default>':
             _tag = None
 
@@ -312,24 +360,20 @@ class CAutowrite:
         Returns:
             (int): selected version number
         """
-
-        # Get list of vers
-        if not pipe.CACHE.cur_work:
-            _vers = []
-        else:
-            _vers = [_work.ver for _work in pipe.CACHE.cur_work.find_vers()]
+        _vers = self.resolver.find_vers()
 
         # Update list
         if level <= UpdateLevel.VERSION:
             _mode = self['ver_mode'].value()
-            _cur = self['ver'].value()
+            _cur = self._read_knob('ver')
             if _mode == 'Select' and _cur in _vers:
                 _val = _cur
             else:
-                _val = pipe.CACHE.cur_work.ver if pipe.CACHE.cur_work else None
-            self['ver'].setValues(_vers)
-            self['ver'].setValue(_val)
-        _ver_n = int(self['ver'].value())
+                _work = self.resolver.work
+                _val = _work.ver if _work else None
+            self._edit_knob('ver', 'setValues', _vers)
+            self._edit_knob('ver', 'setValue', _val)
+        _ver_n = int(self._read_knob('ver'))
 
         return _ver_n
 
@@ -342,9 +386,8 @@ class CAutowrite:
         Returns:
             (CPWork): current work file defined by pipeline knobs
         """
-        _job = pipe.CACHE.cur_job
-        _cur_work = pipe.CACHE.cur_work
-        _LOGGER.debug('UPDATE PIPELINE level=%s %s', level, _cur_work)
+        _LOGGER.debug(
+            'UPDATE PIPELINE level=%s %s', level, self.resolver.work)
 
         _ety_type = self._update_ety_type(level=level)
         _ety = self._update_ety(level=level, ety_type=_ety_type)
@@ -354,8 +397,9 @@ class CAutowrite:
         _ver_n = self._update_ver(level=level)
 
         # Update work knob (internal)
-        _work = _work_dir.to_work(ver_n=_ver_n, tag=_tag) if _work_dir else None
-        self['work'].setValue(_work.path if _work else '')
+        _work = (self.resolver.to_work(_work_dir, ver_n=_ver_n, tag=_tag)
+                 if _work_dir else None)
+        self._edit_knob('work', 'setValue', _work.path if _work else '')
         _LOGGER.debug(' - WORK %s', _work)
 
         return _work
@@ -367,18 +411,18 @@ class CAutowrite:
             (str): description
         """
         _desc_mode = self['desc_mode'].value()
-        self['desc_text'].setEnabled(_desc_mode == 'Manual')
+        self._edit_knob('desc_text', 'setEnabled', _desc_mode == 'Manual')
         if _desc_mode == 'From node':
             _desc = self.node.name()
-            self['desc_text'].setValue(_desc)
+            self._edit_knob('desc_text', 'setValue', _desc)
             _col = DEFAULT_COL
         elif _desc_mode == 'Manual':
-            _desc = self['desc_text'].value()
+            _desc = self._read_knob('desc_text')
             _col = NON_DEFAULT_COL
         else:
             raise ValueError(_desc)
         _label = COL_FMT.format(col=_col, text='desc')
-        self['desc_mode'].setLabel(_label)
+        self._edit_knob('desc_mode', 'setLabel', _label)
 
         return _desc
 
@@ -396,14 +440,13 @@ class CAutowrite:
                  _tmpl == 'plate'),
         ]:
             for _name in _names:
-                _knob = self[_name]
-                if not _knob:
+                if not self[_name]:
                     continue
-                _knob.setVisible(_tgl)
+                self._edit_knob(_name, 'setVisible', _tgl)
                 _LOGGER.debug('SET VISIBLE %s %d', _name, _tgl)
         _col = {'render': RENDER_COL,
                 'plate': PLATE_COL}[_tmpl]
-        set_node_col(self.node, _col)
+        self._edit_node(set_node_col, _col)
 
         return _tmpl
 
@@ -418,28 +461,28 @@ class CAutowrite:
         _tmpl = self['tmpl'].value()
         _res_mode = self['res_mode'].value()
 
-        self['res_text'].setEnabled(_res_mode == 'Manual')
+        self._edit_knob('res_text', 'setEnabled', _res_mode == 'Manual')
         _res = self.node.width(), self.node.height()
         _res_name = _RES_MAP.get(_res, f'{_res[0]:d}x{_res[1]:d}')
         if _res_mode == 'Auto':
-            self['res_text'].setValue(_res_name)
+            self._edit_knob('res_text', 'setValue', _res_name)
             _col = DEFAULT_COL if _tmpl == 'plate' else NON_DEFAULT_COL
         elif _res_mode == 'Manual':
-            _cur_res = self['res_text'].value()
+            _cur_res = self._read_knob('res_text')
             if _cur_res in ['unset', '']:
-                self['res_text'].setValue(_res_name)
-            _res_name = self['res_text'].value()
+                self._edit_knob('res_text', 'setValue', _res_name)
+            _res_name = self._read_knob('res_text')
             _col = NON_DEFAULT_COL
         elif _res_mode == 'Disable':
             _res_name = None
-            self['res_text'].setValue('')
+            self._edit_knob('res_text', 'setValue', '')
             _col = NON_DEFAULT_COL if _tmpl == 'plate' else DEFAULT_COL
         else:
             raise ValueError(_res_mode)
         _LOGGER.debug(' - RES NAME %s', _res_name)
 
         _label = COL_FMT.format(col=_col, text='res')
-        self['res_mode'].setLabel(_label)
+        self._edit_knob('res_mode', 'setLabel', _label)
 
         return _res_name
 
@@ -468,8 +511,8 @@ class CAutowrite:
         if _res_name:
             _output_tokens.append(_res_name)
         _output_name = '_'.join(_output_tokens)
-        self['output_name'].setValue(_output_name)
-        self['output_name'].setFlag(nuke.READ_ONLY)
+        self._edit_knob('output_name', 'setValue', _output_name)
+        self._edit_knob('output_name', 'setFlag', nuke.READ_ONLY)
 
         self._update_tag_elems_vis()
 
@@ -482,18 +525,18 @@ class CAutowrite:
         knobs are hidden in plate mode.
         """
         _tmpl = self['tmpl'].value()
-        if _tmpl == 'plate' and not _job_plate_uses_tag(pipe.cur_job()):
+        if _tmpl == 'plate' and not self.resolver.plate_uses_tag():
             _vis = False
         else:
             _vis = True
         for _elem in ['tag', 'tag_mode']:
-            self[_elem].setVisible(_vis)
+            self._edit_knob(_elem, 'setVisible', _vis)
 
     def _update_internals_vis(self):
         """Update internals elements visibility."""
         _vis = self['show_internals'].value()
         for _knob in ['work', 'output_name', 'is_pini_autowrite_2']:
-            self[_knob].setVisible(_vis)
+            self._edit_knob(_knob, 'setVisible', _vis)
 
     def _update_file(self, work, output_name):
         """Update output file.
@@ -513,46 +556,44 @@ class CAutowrite:
             ('plate', False): 'plate',
             ('plate', True): 'plate_mov'}[(_base_tmpl, _mov)]
 
-        # Find matching template
-        if not work:
-            _err = 'cannot build file path - no current work'
-            _file = ''
-        else:
-            try:
-                _tmpl = work.find_template(_tmpl_name)
-            except ValueError as _exc:
-                _tmpl = None
-                _err = str(_exc)
-                _file = ''
-            else:
-                _err = ''
-                _out = work.to_output(
-                    _tmpl, output_name=output_name, extn=_extn)
-                _file = _out.path
+        # Build path
+        _file, _err = self.resolver.to_file(
+            work, tmpl_name=_tmpl_name, output_name=output_name, extn=_extn)
         _LOGGER.debug(' - FILE %s', _file)
 
         # Update knobs
         for _knob in ['file', 'aw_file']:
-            self[_knob].setValue(_file)
-            self[_knob].setFlag(nuke.READ_ONLY)
+            self._edit_knob(_knob, 'setValue', _file)
+            self._edit_knob(_knob, 'setFlag', nuke.READ_ONLY)
             _label = COL_FMT.format(
                 col=ERROR_COL if _err else FILE_COL, text='file')
-            self[_knob].setLabel(_label)
+            self._edit_knob(_knob, 'setLabel', _label)
         _text = COL_FMT.format(col=ERROR_COL, text=_err)
-        self['error'].setValue(_text)
-        self['error'].setVisible(bool(_err))
+        self._edit_knob('error', 'setValue', _text)
+        self._edit_knob('error', 'setVisible', bool(_err))
 
-    def update(self, level=UpdateLevel.JOB):
+    def update(self, level=UpdateLevel.JOB, resolver=None, apply_=True):
         """Apply update triggered by knob change.
 
+        Knob edits are recorded while the pipeline is resolved, and then
+        applied together.
+
         Args:
             level (UpdateLevel): level of update
+            resolver (AWResolver): resolver for pipeline lookups (allows
+                lookups to be shared between nodes in an update pass)
+            apply_ (bool): apply knob edits - if this is disabled, the
+                edits are held until apply_edits is called
         """
         _LOGGER.debug('UPDATE FILE node=%s level=%s', self.node.name(), level)
+        self.resolver = resolver or aw_resolver.build_resolver()
+        self._edits, self._values = [], {}
         _work = self._update_pipeline(level=level)
         _output_name = self._update_output_name()
         self._update_file(work=_work, output_name=_output_name)
         self._update_internals_vis()
+        if apply_:
+            self.apply_edits()
 
     def knob_changed_callback(self, knob):
         """Callback triggered by knob change.
@@ -674,16 +715,3 @@ def _find_node_widget(node):
         if _title == _name:
             return _widget
     return None
-
-
-@cache_result
-def _job_plate_uses_tag(job):
-    """Test whether the given job uses tags in the plate path.
-
-    Args:
-        job (CPJob): job to test
-
-    Returns:
-        (bool): whether tags used in plates
-    """
-    return bool(job.find_templates('plate', has_key={'tag': True}))
@@ -0,0 +1,250 @@
+"""Tools for resolving pipeline data for autowrite 2.0 nodes.
+
+This is independent of nuke, and memoises pipeline lookups so that when
+all autowrites in a script are updated (eg. on save), each lookup is
+only applied once per update pass rather than once per node.
+"""
+
+import logging
+
+from pini import pipe
+from pini.pipe import cache
+from pini.utils import basic_repr
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AWResolver:
+    """Resolves pipeline data for a single autowrite update pass.
+
+    Results are memoised, so a resolver should not be reused after the
+    pipeline has changed (eg. after a save).
+    """
+
+    def __init__(self, job, work=None, work_dir=None, entity=None):
+        """Constructor.
+
+        Args:
+            job (CPJob): current job
+            work (CPWork): current work file
+            work_dir (CPWorkDir): current work dir
+            entity (CPEntity): current entity
+        """
+        self.job = job
+        self.work = work
+        self.work_dir = work_dir
+        self.entity = entity
+
+        self.n_lookups = 0
+        self._memo = {}
+        self._etys = None
+
+    def _obt(self, key, func, *args, **kwargs):
+        """Obtain a memoised lookup result.
+
+        Args:
+            key (tuple): lookup key
+            func (fn): lookup function
+
+        Returns:
+            (any): lookup result
+        """
+        if key not in self._memo:
+            self.n_lookups += 1
+            self._memo[key] = func(*args, **kwargs)
+        return self._memo[key]
+
+    def find_ety_types(self):
+        """Find entity types available for the current work profile.
+
+        Returns:
+            (str list): entity types (asset types or sequence names)
+        """
+        if not self.work:
+            return []
+        if self.work.profile == 'asset':
+            return self.job.asset_types
+        if self.work.profile == 'shot':
+            return self._obt(
+                ('sequences', ), lambda: [
+                    _seq.name for _seq in self.job.find_sequences()])
+        raise ValueError(self.work)
+
+    def find_ety_names(self, ety_type):
+        """Find names of entities of the given type.
+
+        Args:
+            ety_type (str): entity type (asset type or sequence)
+
+        Returns:
+            (str list): entity names
+        """
+        return self._obt(
+            ('etys', ety_type), lambda: [
+                _ety.name
+                for _ety in self.job.find_entities(entity_type=ety_type)])
+
+    def find_ety(self, ety_type, name):
+        """Find an entity in the current job.
+
+        Args:
+            ety_type (str): entity type (asset type or sequence)
+            name (str): entity name
+
+        Returns:
+            (CPEntity): entity
+        """
+        if self._etys is None:
+            self.n_lookups += 1
+            self._etys = {}
+            for _ety in self.job.entities:
+                _key = _ety.entity_type, _ety.name
+                self._etys[_key] = None if _key in self._etys else _ety
+        _ety = self._etys.get((ety_type, name))
+        if not _ety:
+            raise ValueError(f'Failed to find entity {ety_type}/{name}')
+        return _ety
+
+    def find_tasks(self, ety):
+        """Find tasks available to the given entity.
+
+        This is the tasks of the nuke work dirs in the given entity and
+        the current entity.
+
+        Args:
+            ety (CPEntity): selected entity
+
+        Returns:
+            (str list): tasks
+        """
+        _tasks = {'precomp'}
+        for _ety in {_ety for _ety in (ety, self.entity) if _ety}:
+            _tasks |= self._obt(
+                ('tasks', _ety), lambda _ety=_ety: {
+                    _work_dir.task
+                    for _work_dir in _ety.find_work_dirs(dcc_='nuke')})
+        return sorted(_tasks)
+
+    def to_work_dir(self, ety, task):
+        """Build a nuke work dir.
+
+        Args:
+            ety (CPEntity): entity
+            task (str): task
+
+        Returns:
+            (CPWorkDir): work dir
+        """
+        return self._obt(
+            ('work_dir', ety, task), ety.to_work_dir, dcc_='nuke', task=task)
+
+    def find_tags(self, work_dir):
+        """Find tags available to the given work dir.
+
+        This is the tags of the works in the given work dir and the
+        current work dir.
+
+        Args:
+            work_dir (CPWorkDir): selected work dir
+
+        Returns:
+            (str list): tags (with <default> for no tag)
+        """
+        _tags = {'<default>'}
+        for _work_dir in {work_dir, self.work_dir}:
+            if not isinstance(_work_dir, cache.CCPWorkDir):
+                continue
+            _tags |= self._obt(
+                ('tags', _work_dir), lambda _work_dir=_work_dir: {
+                    _work.tag or '<default>'
+                    for _work in _work_dir.find_works()})
+        return sorted(_tags)
+
+    def find_vers(self):
+        """Find versions of the current work.
+
+        Returns:
+            (int list): version numbers
+        """
+        if not self.work:
+            return []
+        return self._obt(
+            ('vers', ), lambda: [_work.ver for _work in self.work.find_vers()])
+
+    def to_work(self, work_dir, ver_n, tag):
+        """Build a work file.
+
+        Args:
+            work_dir (CPWorkDir): work dir
+            ver_n (int): version number
+            tag (str): tag
+
+        Returns:
+            (CPWork): work file
+        """
+        return self._obt(
+            ('work', work_dir, ver_n, tag), work_dir.to_work,
+            ver_n=ver_n, tag=tag)
+
+    def to_file(self, work, tmpl_name, output_name, extn):
+        """Build an output file path.
+
+        Args:
+            work (CPWork): work file
+            tmpl_name (str): output template name (eg. render)
+            output_name (str): output name
+            extn (str): output extension
+
+        Returns:
+            (tuple): path and error (if path could not be built)
+        """
+        if not work:
+            return '', 'cannot build file path - no current work'
+        _tmpl, _err = self._obt(
+            ('tmpl', work, tmpl_name), _find_template, work, tmpl_name)
+        if _err:
+            return '', _err
+        _out = self._obt(
+            ('output', work, tmpl_name, output_name, extn), work.to_output,
+            _tmpl, output_name=output_name, extn=extn)
+        return _out.path, ''
+
+    def plate_uses_tag(self):
+        """Test whether the current job uses tags in the plate path.
+
+        Returns:
+            (bool): whether tags used in plates
+        """
+        return self._obt(
+            ('plate_uses_tag', ), lambda: bool(self.job.find_templates(
+                'plate', has_key={'tag': True})))
+
+    def __repr__(self):
+        return basic_repr(self, self.job.name if self.job else None)
+
+
+def build_resolver():
+    """Build a resolver for the current pipeline state.
+
+    Returns:
+        (AWResolver): resolver
+    """
+    return AWResolver(
+        job=pipe.CACHE.cur_job, work=pipe.CACHE.cur_work,
+        work_dir=pipe.CACHE.cur_work_dir, entity=pipe.CACHE.cur_entity)
+
+
+def _find_template(work, name):
+    """Find output template for the given work file.
+
+    Args:
+        work (CPWork): work file
+        name (str): template name
+
+    Returns:
+        (tuple): template and error (if template not found)
+    """
+    try:
+        return work.find_template(name), ''
+    except ValueError as _exc:
+        return None, str(_exc)
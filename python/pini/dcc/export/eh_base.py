@@ -13,7 +13,7 @@ from pini import qt, icons, pipe, dcc
 from pini.qt import QtWidgets
 from pini.pipe import cache
 from pini.tools import error, usage
-from pini.utils import cache_result, str_to_seed, is_pascal
+from pini.utils import cache_result, str_to_seed, is_pascal, record_trace
 
 from . import eh_utils, eh_ui
 
@@ -266,13 +266,14 @@ class CExportHandler:
             force (bool): replace existing outputs without confirmation
         """
         _LOGGER.debug('EXEC %s args=%s kwargs=%s', self, args, kwargs)
-        self.set_settings(*args, **kwargs)
-        self.init_export()
+        with record_trace(f'export.{type(self).__name__.strip("_")}'):
+            self.set_settings(*args, **kwargs)
+            self.init_export()
 
-        self.outputs = self.export(*args, **kwargs)
-        assert isinstance(self.outputs, list)
+            self.outputs = self.export(*args, **kwargs)
+            assert isinstance(self.outputs, list)
 
-        self.post_export()
+            self.post_export()
 
         return self.outputs
 
@@ -93,7 +93,7 @@ class CMayaFarmRender(rhm_base.CMayaRenderHandler):
     def export(  # pylint: disable=unused-argument
             self, passes, notes=None, version_up=True, camera=None, frames=None,
             render_=True, limit_grps=None, hide_img_planes=False, priority=50,
-            machine_limit=15, chunk_size=1, strict_error_checking=True,
+            machine_limit=15, chunk_size=0, strict_error_checking=True,
             submit_suspended=False, res_pc=None, force=False):
         """Execute render.
 
@@ -109,6 +109,7 @@ class CMayaFarmRender(rhm_base.CMayaRenderHandler):
             priority (int): job priority (eg. 50)
             machine_limit (int): job machine limit (eg. 20 machines)
             chunk_size (int): job chunk size (frames to execute in one task)
+                - zero calculates chunk size from render history
             strict_error_checking (bool): apply deadline strict error checking
             submit_suspended (bool): submit job as suspended
             res_pc (float): override render resolution (in %)
@@ -130,7 +131,7 @@ class CMayaFarmRender(rhm_base.CMayaRenderHandler):
         self.submit_msg, _outs = farm.submit_maya_render(
             submit_=render_, force=True, result='msg/outs', layers=_lyrs,
             metadata=self.metadata, frames=frames, camera=_cam,
-            chunk_size=chunk_size, comment=notes, priority=priority,
+            chunk_size=chunk_size or None, comment=notes, priority=priority,
             machine_limit=machine_limit, limit_groups=_limit_grps,
             strict_error_checking=strict_error_checking,
             initial_status=_initial_status, res_pc=res_pc)
@@ -1,3 +1,7 @@
 """Tools for managing the base render farm module."""
 
 from .f_farm import CFarm
+from .f_schedule import (
+    CFrameSchedule, schedule_frames, order_frames, calc_chunk_size,
+    record_render_history, read_frame_dur, TARGET_TASK_DUR,
+    chunks_to_frame_durs)
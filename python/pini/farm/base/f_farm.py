@@ -6,6 +6,8 @@ import pprint
 from pini import pipe
 from pini.utils import last, plural
 
+from . import f_schedule
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -113,13 +115,15 @@ class CFarm:
         """
         raise NotImplementedError
 
-    def update_cache(self, work, outputs, metadata):
+    def update_cache(self, work, outputs, metadata, schedules=None):
         """Update outputs cache.
 
         Args:
             work (str): path to work file
             outputs (str list): outputs to register
             metadata (dict): metadata to apply to outputs
+            schedules (dict): output path/chunks of frames rendered by
+                each task (to record render history)
         """
         _LOGGER.info('UPDATE CACHE')
         _work = pipe.to_work(work)
@@ -138,6 +142,9 @@ class CFarm:
 
             if metadata is not None:
                 _out.set_metadata(metadata)
+            if schedules and _out.path in schedules:
+                f_schedule.record_render_history(
+                    _out, chunks=schedules[_out.path])
             if pipe.MASTER == 'shotgrid':
                 from pini.pipe import shotgrid
                 shotgrid.create_pub_file_from_output(
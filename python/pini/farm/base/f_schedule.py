@@ -0,0 +1,228 @@
+"""Tools for scheduling frames on the farm.
+
+Past frame durations are stored for each output stream, and are used
+to choose a chunk size which keeps each farm task close to a target
+duration (set using $PINI_FARM_TARGET_TASK_DUR). Frames are also
+ordered so that the first, middle and last frames are rendered first,
+which means that any issues with a render show up early.
+
+Frame durations are measured once a render completes, using the mtimes
+of consecutive frames rendered by the same task.
+"""
+
+import hashlib
+import logging
+import os
+import statistics
+import time
+
+from pini.utils import basic_repr, ints_to_str, clamp
+
+_LOGGER = logging.getLogger(__name__)
+
+TARGET_TASK_DUR = float(os.environ.get('PINI_FARM_TARGET_TASK_DUR', 600))
+
+_MAX_CHUNK_SIZE = 50
+_MAX_HISTORY = 20
+_NO_HISTORY_CHUNK_SIZE = 2
+
+
+class CFrameSchedule:
+    """Represents an ordered list of frames split into chunks."""
+
+    def __init__(self, frames, chunk_size=1, frame_dur=None):
+        """Constructor.
+
+        Args:
+            frames (int list): frames in render order
+            chunk_size (int): number of frames in each task
+            frame_dur (float): estimated duration of each frame
+                (in seconds)
+        """
+        self.frames = list(frames)
+        self.chunk_size = chunk_size
+        self.frame_dur = frame_dur
+
+    @property
+    def frames_str(self):
+        """Obtain frame list string (in render order).
+
+        Returns:
+            (str): frame list (eg. 1,50,100,2-49,51-99)
+        """
+        return ints_to_str(self.frames)
+
+    def to_chunks(self):
+        """Split frames into the chunks rendered by each task.
+
+        Returns:
+            (int list list): frames in each task
+        """
+        return [
+            self.frames[_idx: _idx + self.chunk_size]
+            for _idx in range(0, len(self.frames), self.chunk_size)]
+
+    def __repr__(self):
+        return basic_repr(
+            self, f'{self.frames_str} chunk={self.chunk_size:d}')
+
+
+def order_frames(frames, validate=True):
+    """Order frames for rendering.
+
+    Args:
+        frames (int list): frames to render
+        validate (bool): render first, middle and last frames first
+
+    Returns:
+        (int list): frames in render order
+    """
+    _frames = sorted(set(frames))
+    if not validate or len(_frames) < 3:
+        return _frames
+    _first = [_frames[0], _frames[len(_frames) // 2], _frames[-1]]
+    return _first + [_frame for _frame in _frames if _frame not in _first]
+
+
+def calc_chunk_size(frame_dur, target_dur=None, max_chunk_size=None):
+    """Calculate chunk size for the given frame duration.
+
+    Args:
+        frame_dur (float|None): estimated frame duration (in seconds)
+        target_dur (float): target task duration (in seconds)
+        max_chunk_size (int): maximum chunk size
+
+    Returns:
+        (int): chunk size
+    """
+    if not frame_dur:
+        return _NO_HISTORY_CHUNK_SIZE
+    _target = target_dur or TARGET_TASK_DUR
+    _max = max_chunk_size or _MAX_CHUNK_SIZE
+    return int(clamp(round(_target / frame_dur), 1, _max))
+
+
+def schedule_frames(
+        frames, output=None, chunk_size=None, frame_dur=None,
+        target_dur=None, validate=True):
+    """Build a render schedule for the given frames.
+
+    If no chunk size is given, one is calculated from the frame duration.
+    If there is no frame duration, this is read from the given output's
+    render history. If there is no history, a small chunk size is used
+    so that frame durations can be measured.
+
+    Args:
+        frames (int list): frames to render
+        output (CPOutput): output being rendered (to read history)
+        chunk_size (int): force chunk size
+        frame_dur (float): force estimated frame duration (in seconds)
+        target_dur (float): target task duration (in seconds)
+        validate (bool): render first, middle and last frames first
+
+    Returns:
+        (CFrameSchedule): schedule
+    """
+    _frame_dur = frame_dur
+    if not _frame_dur and output and not chunk_size:
+        _frame_dur = read_frame_dur(output)
+    _chunk_size = chunk_size or calc_chunk_size(
+        _frame_dur, target_dur=target_dur)
+    _chunk_size = min(_chunk_size, len(set(frames)))
+    _frames = order_frames(frames, validate=validate)
+    _sched = CFrameSchedule(
+        frames=_frames, chunk_size=_chunk_size, frame_dur=_frame_dur)
+    _LOGGER.debug(' - SCHEDULE %s frame_dur=%s', _sched, _frame_dur)
+    return _sched
+
+
+def to_history_file(output):
+    """Obtain render history file for the given output's stream.
+
+    Args:
+        output (CPOutput): output to read
+
+    Returns:
+        (File): history yml
+    """
+    _stream = output.to_stream()
+    _hash = hashlib.md5(_stream.encode()).hexdigest()[:12]
+    return output.job.to_file(f'.pini/FarmHistory/{_hash}.yml')
+
+
+def read_frame_dur(output):
+    """Read estimated frame duration from the given output's history.
+
+    Args:
+        output (CPOutput): output being rendered
+
+    Returns:
+        (float|None): median frame duration of recent renders (in seconds)
+    """
+    _file = to_history_file(output)
+    if not _file.exists():
+        return None
+    _durs = [_item['frame_dur'] for _item in _file.read_yml()['history']]
+    if not _durs:
+        return None
+    return statistics.median(_durs)
+
+
+def chunks_to_frame_durs(mtimes, chunks):
+    """Calculate frame durations from frame mtimes.
+
+    Frames in each chunk are rendered one after another, so the time
+    between consecutive frames in a chunk is the duration of each frame.
+    The first frame of each chunk is ignored as it includes task startup.
+
+    Args:
+        mtimes (dict): frame/mtime
+        chunks (int list list): frames rendered by each task
+
+    Returns:
+        (float list): frame durations
+    """
+    _durs = []
+    for _chunk in chunks:
+        for _prev, _frame in zip(_chunk, _chunk[1:]):
+            if _prev not in mtimes or _frame not in mtimes:
+                continue
+            _dur = mtimes[_frame] - mtimes[_prev]
+            if _dur > 0:
+                _durs.append(_dur)
+    return _durs
+
+
+def record_render_history(output, chunks):
+    """Record frame durations of a completed render.
+
+    Args:
+        output (CPOutputSeq): rendered output
+        chunks (int list list): frames rendered by each task
+
+    Returns:
+        (float|None): median frame duration (if any)
+    """
+    _mtimes = {}
+    for _chunk in chunks:
+        for _frame in _chunk:
+            _path = output[_frame]
+            if os.path.exists(_path):
+                _mtimes[_frame] = os.path.getmtime(_path)
+    _durs = chunks_to_frame_durs(_mtimes, chunks=chunks)
+    _LOGGER.info(' - FOUND %d FRAME DURS %s', len(_durs), output)
+    if not _durs:
+        return None
+    _frame_dur = statistics.median(_durs)
+
+    _file = to_history_file(output)
+    _data = _file.read_yml() if _file.exists() else {}
+    _history = _data.get('history', [])
+    _history.append({'frame_dur': _frame_dur, 'time': time.time(),
+                     'path': output.path})
+    _data['stream'] = output.to_stream()
+    _data['history'] = _history[-_MAX_HISTORY:]
+    _file.write_yml(_data, force=True)
+    _LOGGER.info(' - RECORDED FRAME DUR %.01fs %s', _frame_dur, _file.path)
+
+    return _frame_dur
@@ -3,7 +3,11 @@
 from pini import dcc
 
 from .d_farm import CDFarm
-from .d_farm_job import CDFarmJob
+from .d_farm_job import CDFarmJob, read_job_logs
+from .d_job_log import (
+    CDJobLog, find_job_logs, read_job_errors, summarise_job_failures,
+    read_error_lines)
+from .d_job_poller import CDJobPoller
 from .submit import (
     CDPyJob, CDCmdlineJob, CDJob, setup_deadline_submit, flush_old_submissions,
     write_deadline_data)
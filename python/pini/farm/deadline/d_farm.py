@@ -1,16 +1,15 @@
 """Tools for managing the deadline farm object."""
 
-import getpass
 import logging
 import time
 
 from pini import pipe, qt
 from pini.utils import (
-    system, single, to_str, safe_zip, cache_result, find_exe, check_heart,
-    to_snake, to_time_f, get_result_cacher, File, abs_path)
+    system, single, to_str, safe_zip, cache_result, find_exe,
+    get_result_cacher)
 
 from .. import base
-from . import submit, d_farm_job
+from . import submit, d_job_poller
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -91,11 +90,26 @@ class CDFarm(base.CFarm):
 
         return _jobs
 
+    @cache_result
+    def obt_job_poller(self, user=None):
+        """Obtain job poller for the given user.
+
+        Args:
+            user (str): override user (otherwise current user)
+
+        Returns:
+            (CDJobPoller): job poller
+        """
+        return d_job_poller.CDJobPoller(user=user)
+
     @get_result_cacher(use_args=('user',))
     def _read_jobs(
             self, user=None, write_file=False, jobs=None, force=False):
         """Read existing deadline jobs for the current user.
 
+        On reread, only new or incomplete jobs are read from deadline
+        (see CDJobPoller).
+
         Args:
             user (str): override user (otherwise current user)
             write_file (File): write job details to file (for debugging)
@@ -105,38 +119,11 @@ class CDFarm(base.CFarm):
         Returns:
             (CDFarmJob list): farm jobs
         """
-        from pini import farm
-
         _jobs = jobs
         if not _jobs:
-
-            # Read results
-            _user = user or getpass.getuser()
-            _deadline = find_exe('deadlinecommand')
-            _cmds = [_deadline, 'GetJobsFilter', f'UserName={_user}']
-            _start = time.time()
-            _result = system(_cmds, verbose=1)
-            farm.JOBS_READ_TIME = time.time()
-            farm.JOBS_READ_DUR = farm.JOBS_READ_TIME - _start
-            _result = _result.replace('\r', '')
-            if write_file:
-                write_file.write(_result, force=True)
-                _LOGGER.info(
-                    ' - WROTE FILE %s %s', write_file.nice_size(), write_file)
-
-            # Process results
-            _jobs = []
-            for _details_s in qt.progress_bar(_result.split('\n\n\n')):
-                _details_s = _details_s.strip()
-                if not _details_s:
-                    continue
-                _job = _details_to_job(_details_s, rtime=farm.JOBS_READ_TIME)
-                _jobs.append(_job)
-
-            _LOGGER.info(
-                ' - FOUND %d DEADLINE JOBS IN %.01fs', len(_jobs),
-                farm.JOBS_READ_DUR)
-
+            _poller = self.obt_job_poller(user=user)
+            _poller.poll(write_file=write_file)
+            _jobs = _poller.find_jobs()
         return _jobs
 
     def submit_job(self, job):
@@ -326,7 +313,8 @@ class CDFarm(base.CFarm):
 
     def submit_update_job(
             self, work, dependencies, comment, batch_name, stime,
-            priority=50, metadata=None, outputs=None, submit_=True):
+            priority=50, metadata=None, outputs=None, schedules=None,
+            submit_=True):
         """Submit job which updates work file output cache.
 
         Args:
@@ -338,6 +326,8 @@ class CDFarm(base.CFarm):
             priority (int): job priority (0 [low] - 100 [high])
             metadata (dict): metadata to apply to outputs
             outputs (CPOutput list): outputs to apply metadata to
+            schedules (dict): output path/frame chunks for each render
+                (to record render history)
             submit_ (bool): execute submission
 
         Returns:
@@ -346,7 +336,8 @@ class CDFarm(base.CFarm):
 
         # Submit job
         _py = _build_update_job_py(
-            outputs=outputs, metadata=metadata, work=work)
+            outputs=outputs, metadata=metadata, work=work,
+            schedules=schedules)
         _update_job = submit.CDPyJob(
             name=f'{work.base} [update cache]', comment=comment,
             py=_py, batch_name=batch_name, dependencies=dependencies,
@@ -359,13 +350,14 @@ class CDFarm(base.CFarm):
         return _update_job
 
 
-def _build_update_job_py(outputs, metadata, work):
+def _build_update_job_py(outputs, metadata, work, schedules=None):
     """Build update for update job.
 
     Args:
         outputs (CPOutput list): new outputs
         metadata (dict): output metadata
         work (CPWork): parent work file
+        schedules (dict): output path/frame chunks for each render
 
     Returns:
         (str): python to update outputs
@@ -380,129 +372,8 @@ def _build_update_job_py(outputs, metadata, work):
     _lines += [
         ']',
         f'_metadata = {metadata}',
-        'farm.update_cache(work=_work, outputs=_outs, metadata=_metadata)']
+        f'_schedules = {schedules}',
+        'farm.update_cache(',
+        '    work=_work, outputs=_outs, metadata=_metadata,',
+        '    schedules=_schedules)']
     return '\n'.join(_lines)
-
-
-def _details_to_job(details, rtime):
-    """Convert job details string to a farm job object.
-
-    Args:
-        details (str): job details string (output by deadline command)
-        rtime (float): details read time
-
-    Returns:
-        (CDFarmJob): farm job
-    """
-    _details_s = details.strip()
-    assert _details_s
-
-    _data = {'rtime': rtime}
-    for _line in _details_s.split('\n'):
-        if not _line.strip():
-            continue
-        check_heart()
-        _key, _val = _line.strip().split('=', 1)
-
-        if _key not in [
-                'BatchName',
-                'Comment',
-                'ID',
-                'JobName',
-                'JobOutputDirectories',
-                'JobOutputFileNames',
-                'PluginInfoDictionary',
-                'Status',
-                'SubmitDateTimeString',
-                'UserName',
-        ]:
-            continue
-        _LOGGER.debug(' - LINE %s', _line)
-        _LOGGER.debug('   - KVP %s %s', _key, _val)
-        assert _key not in _data
-
-        # Clean data
-        if _key == 'SubmitDateTimeString':
-            _fmt = '%m/%d/%Y %H:%M:%S'
-            # _val = _val.strip()
-            _LOGGER.debug('   - CONVERT TIME "%s"', _val)
-            _val = to_time_f(time.strptime(_val, _fmt))
-        _key = {
-            'ID': 'uid',
-            'JobName': 'name',
-            'JobOutputDirectories': 'out_dirs',
-            'JobOutputFileNames': 'out_fname',
-            'PluginInfoDictionary': 'info_dict',
-            'SubmitDateTimeString': 'ctime',
-            'UserName': 'user',
-        }.get(_key, to_snake(_key))
-
-        _data[_key] = _val
-
-    # Build output path
-    _path = None
-    _out_dirs = _data.pop('out_dirs', None)
-    _out_fname = _data.pop('out_fname', None)
-    _info_dict = _data.pop('info_dict', None)
-    if _out_fname and _info_dict:
-        _extn = File(_out_fname).extn
-        _path = _info_dict_to_path(_info_dict, extn=_extn)
-    if not _path and _out_dirs and _out_fname:
-        _LOGGER.debug(' - OUT DIRS %s', _out_dirs)
-        _LOGGER.debug(' - OUT FNAME %s', _out_fname)
-        _path = abs_path(f'{_out_dirs}/{_out_fname}')
-        _path = _path.replace('.####.', '.%04d.')
-    _data['path'] = _path
-    _LOGGER.debug('   - PATH %s', _path)
-
-    _LOGGER.debug('   - ADD JOB %s', _data)
-    return d_farm_job.CDFarmJob(**_data)
-
-
-def _info_dict_to_path(dict_s, extn, log=10):
-    """Read output path from info dict.
-
-    Args:
-        dict_s (str): plugin info dict string
-        extn (str): output extension
-        log (int): log level
-
-    Returns:
-        (str): output path
-    """
-    _LOGGER.log(log, ' - INFO DICT %s', dict_s)
-    if not dict_s:
-        return None
-
-    # Process string into dict
-    _data = {}
-    for _kvp_s in dict_s.split(','):
-        _LOGGER.debug('   - KVP %s', _kvp_s)
-        _key, _val = _kvp_s.split('=', 1)
-        _LOGGER.debug('     - KEY / VAL %s %s', _key, _val)
-        _data[_key] = _val
-
-    for _key in [
-            'SceneFile', 'RenderLayer', 'OutputFilePrefix', 'OutputFilePath']:
-        if _key not in _data:
-            return None
-
-    # Determine prefix
-    _scn = _data['SceneFile']
-    _lyr = _data['RenderLayer']
-    if _lyr.startswith('rs_'):
-        _lyr = _lyr[3:]
-    _prefix = _data['OutputFilePrefix']
-    for _tokens, _val in [
-            (['<layer>', '<Layer>'], _lyr),
-            (['<Scene>'], File(_scn).base),
-    ]:
-        for _token in _tokens:
-            _prefix = _prefix.replace(_token, _val)
-    _LOGGER.log(log, ' - PREFIX %s', _prefix)
-
-    # Build path
-    _path = f'{_data["OutputFilePath"]}/{_prefix}.%04d.{extn}'
-    _LOGGER.log(log, ' - PATH %s', _path)
-
-    return _path
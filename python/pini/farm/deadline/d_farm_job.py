@@ -1,11 +1,11 @@
 """Tools for managing jobs on the farm."""
 
-import bz2
 import logging
 
 from pini.utils import (
-    build_cache_fmt, system, basic_repr, find_exe, File, strftime,
-    cache_result, abs_path)
+    build_cache_fmt, system, basic_repr, find_exe, strftime, cache_on_obj)
+
+from . import d_job_log
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -54,33 +54,59 @@ class CDFarmJob:
         """
         return strftime(fmt, self.ctime)
 
-    @cache_result
-    def to_log(self, force=False):
+    @cache_on_obj
+    def to_log(self, force=False, value=None):
         """Read log for this job.
 
         Args:
             force (bool): force reread from disk
+            value (str): apply log text (eg. if it has been read as part
+                of a batch) rather than reading from deadline
 
         Returns:
             (str): log text
         """
-        _cmd = (
-            "GetJobErrorReportFilenames" if self.status == 'Failed'
-            else "GetJobLogReportFilenames")
-        _cmds = [find_exe('deadlinecommand'), _cmd, self.uid]
-        _results = system(_cmds, verbose=1).split()
-
-        if not _results:
+        if value is not None:
+            return value
+        _logs = self.find_logs()
+        if not _logs:
             _LOGGER.info(' - NO LOGS FOUND')
             return None
-        _log = File(abs_path(_results[-1]))
-        assert _log.exists()
+        return _logs[-1].read_text()
+
+    def find_logs(self):
+        """Find report logs for this job.
 
-        _text = ''
-        with bz2.open(_log.path, "rt") as bz_file:
-            for _line in bz_file:
-                _text += _line
-        return _text
+        Returns:
+            (CDJobLog list): logs
+        """
+        _result = system(self._to_log_cmds(), verbose=1)
+        return d_job_log.result_to_job_logs(_result, job_uid=self.uid)
+
+    def find_errors(self, max_errors=None):
+        """Find error lines in this job's last report log.
+
+        Args:
+            max_errors (int): stop after this many errors
+
+        Returns:
+            (tuple list): line index/text of error lines
+        """
+        _logs = self.find_logs()
+        if not _logs:
+            return []
+        return _logs[-1].find_errors(max_errors=max_errors)
+
+    def _to_log_cmds(self):
+        """Build deadlinecommand commands to find this job's log files.
+
+        Returns:
+            (list): commands
+        """
+        _cmd = (
+            "GetJobErrorReportFilenames" if self.status == 'Failed'
+            else "GetJobLogReportFilenames")
+        return [find_exe('deadlinecommand'), _cmd, self.uid]
 
     def __eq__(self, other):
         if isinstance(other, CDFarmJob):
@@ -95,3 +121,30 @@ class CDFarmJob:
 
     def __repr__(self):
         return basic_repr(self, self.name)
+
+
+def read_job_logs(jobs, max_workers=None):
+    """Read logs for a list of farm jobs.
+
+    The deadlinecommand queries are run concurrently, and the results are
+    applied to each job's log cache. Each report is only decompressed
+    the first time it is read (see CDJobLog).
+
+    Args:
+        jobs (CDFarmJob list): jobs to read
+        max_workers (int): maximum number of concurrent deadlinecommand
+            processes
+
+    Returns:
+        (str list): log text for each job
+    """
+    _jobs = list(jobs)
+    _job_logs = d_job_log.find_job_logs(_jobs, max_workers=max_workers)
+    _texts = []
+    for _job in _jobs:
+        _text = None
+        if _job_logs[_job]:
+            _text = _job_logs[_job][-1].read_text()
+            _job.to_log(force=True, value=_text)
+        _texts.append(_text)
+    return _texts
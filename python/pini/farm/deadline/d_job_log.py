@@ -0,0 +1,234 @@
+"""Tools for reading and indexing deadline job logs.
+
+Deadline stores each job report as a bz2 file. The first time a report
+is read it is decompressed, and the text is cached along with an index
+of its error lines, keyed by job uid and report name - reports don't
+change once written so these caches never need updating.
+
+Error lines can also be read straight from a report without caching,
+using streaming decompression which stops once enough errors have been
+found. This allows a failure summary to be built quickly for a large
+batch of jobs.
+"""
+
+import bz2
+import concurrent.futures
+import logging
+import re
+
+from pini.utils import (
+    File, abs_path, basic_repr, build_cache_fmt, system_many, check_heart)
+
+_LOGGER = logging.getLogger(__name__)
+
+_ERROR_RE = re.compile(
+    r'\b(error|exception|traceback|fatal)\b', flags=re.IGNORECASE)
+
+
+class CDJobLog(File):
+    """Represents a report log file for a deadline job."""
+
+    def __init__(self, file_, job_uid):
+        """Constructor.
+
+        Args:
+            file_ (str): path to report file (bz2)
+            job_uid (str): uid of job
+        """
+        super().__init__(file_)
+        self.job_uid = job_uid
+        _fmt = build_cache_fmt(
+            path=f'{job_uid}/{self.base}', namespace='Farm',
+            tool='DeadlineLogs', mode='home', extn='yml')
+        self.index_file = File(_fmt.format(func='index'))
+        self.text_file = File(_fmt.format(func='text')).to_file(extn='log')
+
+    def read_text(self, force=False):
+        """Read text of this log.
+
+        Args:
+            force (bool): force decompress report
+
+        Returns:
+            (str): log text
+        """
+        if force or not self.text_file.exists():
+            self.build_index()
+        return self.text_file.read()
+
+    def read_index(self, force=False):
+        """Read index of this log.
+
+        Args:
+            force (bool): force decompress report
+
+        Returns:
+            (dict): index data (line count + error lines)
+        """
+        if force or not self.index_file.exists():
+            return self.build_index()
+        return self.index_file.read_yml()
+
+    def find_errors(self, max_errors=None, force=False):
+        """Find error lines in this log.
+
+        If this log has been indexed then the index is used, otherwise
+        the report is streamed and reading stops once enough errors
+        have been found.
+
+        Args:
+            max_errors (int): stop after this many errors
+            force (bool): ignore index
+
+        Returns:
+            (tuple list): line index/text of error lines
+        """
+        if not force and self.index_file.exists():
+            _errors = [tuple(_item) for _item in self.read_index()['errors']]
+            return _errors[:max_errors] if max_errors else _errors
+        return read_error_lines(self, max_errors=max_errors)
+
+    def build_index(self):
+        """Decompress this log and cache its text and error lines.
+
+        Returns:
+            (dict): index data
+        """
+        _LOGGER.debug(' - INDEXING LOG %s', self.path)
+        _lines = []
+        _errors = []
+        with bz2.open(self.path, 'rt', encoding='utf-8',
+                      errors='replace') as _hook:
+            for _idx, _line in enumerate(_hook):
+                _lines.append(_line)
+                if _ERROR_RE.search(_line):
+                    _errors.append([_idx, _line.rstrip()])
+        self.text_file.write(''.join(_lines), force=True)
+        _index = {'n_lines': len(_lines), 'errors': _errors}
+        self.index_file.write_yml(_index, force=True)
+        return _index
+
+    def __repr__(self):
+        return basic_repr(self, f'{self.job_uid}:{self.base}')
+
+
+def read_error_lines(file_, max_errors=None):
+    """Read error lines from a bz2 log using streaming decompression.
+
+    Args:
+        file_ (str): path to log
+        max_errors (int): stop reading after this many errors
+
+    Returns:
+        (tuple list): line index/text of error lines
+    """
+    _file = File(file_)
+    _errors = []
+    with bz2.open(_file.path, 'rt', encoding='utf-8',
+                  errors='replace') as _hook:
+        for _idx, _line in enumerate(_hook):
+            if not _ERROR_RE.search(_line):
+                continue
+            _errors.append((_idx, _line.rstrip()))
+            if max_errors and len(_errors) >= max_errors:
+                break
+    return _errors
+
+
+def result_to_job_logs(result, job_uid):
+    """Read job logs from a deadlinecommand report filenames result.
+
+    Args:
+        result (str): deadlinecommand output
+        job_uid (str): uid of job
+
+    Returns:
+        (CDJobLog list): job logs (in deadline order)
+    """
+    _logs = []
+    for _path in result.split():
+        _log = CDJobLog(abs_path(_path), job_uid=job_uid)
+        if not _log.exists():
+            _LOGGER.warning(' - MISSING LOG %s', _log.path)
+            continue
+        _logs.append(_log)
+    return _logs
+
+
+def find_job_logs(jobs, max_workers=None):
+    """Find report logs for a list of farm jobs.
+
+    The deadlinecommand queries are run concurrently.
+
+    Args:
+        jobs (CDFarmJob list): jobs to read
+        max_workers (int): maximum number of concurrent deadlinecommand
+            processes
+
+    Returns:
+        (dict): job/logs
+    """
+    _jobs = list(jobs)
+    _cmds = [
+        _job._to_log_cmds()  # pylint: disable=protected-access
+        for _job in _jobs]
+    _results = system_many(_cmds, max_workers=max_workers, verbose=1)
+    return {
+        _job: result_to_job_logs(_result, job_uid=_job.uid)
+        for _job, _result in zip(_jobs, _results)}
+
+
+def read_job_errors(jobs, max_errors=5, max_workers=None):
+    """Read error lines for a list of farm jobs.
+
+    Only each job's last report is read. Reports which have been indexed
+    use the index, otherwise the report is streamed and reading stops
+    once enough errors are found. Reports are read in threads as bz2
+    decompression runs outside the GIL.
+
+    Args:
+        jobs (CDFarmJob list): jobs to read
+        max_errors (int): maximum errors to read for each job
+        max_workers (int): maximum number of concurrent processes/threads
+
+    Returns:
+        (dict): job/error lines
+    """
+    _logs = find_job_logs(jobs, max_workers=max_workers)
+    _errors = {_job: [] for _job in _logs}
+    _to_read = {
+        _job: _job_logs[-1] for _job, _job_logs in _logs.items()
+        if _job_logs}
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers) as _pool:
+        _futures = {
+            _pool.submit(_log.find_errors, max_errors=max_errors): _job
+            for _job, _log in _to_read.items()}
+        for _future in concurrent.futures.as_completed(_futures):
+            check_heart()
+            _errors[_futures[_future]] = _future.result()
+    return _errors
+
+
+def summarise_job_failures(jobs, max_errors=3, max_workers=None):
+    """Build a summary of errors for a list of farm jobs.
+
+    Args:
+        jobs (CDFarmJob list): jobs to summarise
+        max_errors (int): maximum errors to show for each job
+        max_workers (int): maximum number of concurrent processes/threads
+
+    Returns:
+        (str): failures summary
+    """
+    _errors = read_job_errors(
+        jobs, max_errors=max_errors, max_workers=max_workers)
+    _lines = []
+    for _job in sorted(_errors, key=lambda _job: _job.name):
+        _job_errors = _errors[_job]
+        _lines.append(f'{_job.name} ({_job.uid}) - {_job.status}')
+        if not _job_errors:
+            _lines.append('   - no errors found')
+        for _idx, _line in _job_errors:
+            _lines.append(f'   - line {_idx + 1:d}: {_line.strip()}')
+    return '\n'.join(_lines)
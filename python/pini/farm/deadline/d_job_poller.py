@@ -0,0 +1,356 @@
+"""Tools for incrementally polling deadline for jobs.
+
+Reading every job with GetJobsFilter returns the full details of every
+job, which is slow for users with a lot of jobs. The poller keeps a
+table of jobs, and on each poll it reads the current list of job ids
+and then only reads details for new jobs and jobs which haven't
+completed. Details are then applied to the existing job objects.
+
+The output of deadlinecommand is parsed line by line as it is received.
+If deadlinecommand fails then an error is raised and the job table is
+left unchanged.
+"""
+
+import getpass
+import logging
+import subprocess
+import tempfile
+import time
+
+from pini.utils import (
+    find_exe, check_heart, to_time_f, to_str, File, abs_path,
+    trace_span, trace_count)
+
+from . import d_farm_job
+
+_LOGGER = logging.getLogger(__name__)
+
+_READ_KEYS = {
+    'BatchName': 'batch_name',
+    'Comment': 'comment',
+    'ID': 'uid',
+    'JobName': 'name',
+    'JobOutputDirectories': 'out_dirs',
+    'JobOutputFileNames': 'out_fname',
+    'PluginInfoDictionary': 'info_dict',
+    'Status': 'status',
+    'SubmitDateTimeString': 'ctime',
+    'UserName': 'user',
+}
+_UPDATE_ATTRS = ['batch_name', 'comment', 'name', 'path', 'status']
+_FINAL_STATUSES = {'Completed'}
+_MAX_IDS_PER_CMD = 500
+
+
+class CDJobPoller:
+    """Maintains a table of a user's deadline jobs."""
+
+    def __init__(self, user=None, full_interval=600):
+        """Constructor.
+
+        Args:
+            user (str): user to read jobs for (default is current user)
+            full_interval (float): apply full read of all jobs if the
+                last full read is older than this (in seconds) - this
+                catches completed jobs which have been requeued
+        """
+        self.user = user or getpass.getuser()
+        self.full_interval = full_interval
+
+        self.jobs = {}
+        self.poll_time = None
+        self.full_time = None
+
+    def find_jobs(self):
+        """Find jobs in the current table.
+
+        Returns:
+            (CDFarmJob list): jobs
+        """
+        return sorted(self.jobs.values())
+
+    def poll(self, full=None, write_file=None):
+        """Update the job table.
+
+        Args:
+            full (bool): read details of all jobs (by default this is
+                applied on first poll or if the last full read is older
+                than the full interval)
+            write_file (File): write job details to file (for debugging)
+
+        Returns:
+            (tuple): added/updated/removed jobs
+        """
+        from pini import farm
+
+        _start = time.time()
+        _full = full
+        if _full is None:
+            _full = bool(
+                not self.full_time or
+                _start - self.full_time > self.full_interval)
+        _full = bool(_full or write_file)
+        _deadline = find_exe('deadlinecommand')
+
+        with trace_span('farm.read_jobs', full=_full):
+
+            # Determine jobs to read
+            if _full:
+                _uids = None
+                _cmds_list = [
+                    [_deadline, 'GetJobsFilter', f'UserName={self.user}']]
+            else:
+                _cmds = [
+                    _deadline, 'GetJobIdsFilter', f'UserName={self.user}']
+                _uids = [
+                    _line.strip() for _line in _stream_cmds(_cmds)
+                    if _line.strip()]
+                _to_read = [
+                    _uid for _uid in _uids
+                    if _uid not in self.jobs or
+                    self.jobs[_uid].status not in _FINAL_STATUSES]
+                _LOGGER.debug(
+                    ' - FOUND %d JOB IDS, %d TO READ', len(_uids),
+                    len(_to_read))
+                _cmds_list = [
+                    [_deadline, 'GetJob',
+                     ','.join(_to_read[_idx: _idx + _MAX_IDS_PER_CMD])]
+                    for _idx in range(0, len(_to_read), _MAX_IDS_PER_CMD)]
+
+            # Read job details
+            _lines = _stream_cmds_list(_cmds_list)
+            if write_file:
+                _lines = list(_lines)
+                write_file.write('\n'.join(_lines), force=True)
+                _LOGGER.info(
+                    ' - WROTE FILE %s %s', write_file.nice_size(), write_file)
+            _jobs = list(parse_job_details(_lines, rtime=_start))
+            if _uids is None:
+                _uids = [_job.uid for _job in _jobs]
+
+        _result = self._apply_jobs(_jobs, uids=_uids)
+        self.poll_time = time.time()
+        if _full:
+            self.full_time = self.poll_time
+        farm.JOBS_READ_TIME = self.poll_time
+        farm.JOBS_READ_DUR = self.poll_time - _start
+        _LOGGER.info(
+            ' - POLLED %d DEADLINE JOBS IN %.01fs (read=%d added=%d '
+            'updated=%d removed=%d)', len(self.jobs), farm.JOBS_READ_DUR,
+            len(_jobs), *[len(_items) for _items in _result])
+
+        return _result
+
+    def _apply_jobs(self, jobs, uids):
+        """Apply jobs which have been read to the job table.
+
+        Args:
+            jobs (CDFarmJob list): jobs which have been read
+            uids (str list): ids of all current jobs
+
+        Returns:
+            (tuple): added/updated/removed jobs
+        """
+        _added, _updated, _removed = [], [], []
+
+        for _job in jobs:
+            _cur_job = self.jobs.get(_job.uid)
+            if not _cur_job:
+                self.jobs[_job.uid] = _job
+                _added.append(_job)
+                continue
+            _cur_job.rtime = _job.rtime
+            _changed = False
+            for _attr in _UPDATE_ATTRS:
+                _val = getattr(_job, _attr)
+                if getattr(_cur_job, _attr) != _val:
+                    setattr(_cur_job, _attr, _val)
+                    _changed = True
+            if _changed:
+                _updated.append(_cur_job)
+
+        _uids = set(uids)
+        for _uid in list(self.jobs):
+            if _uid not in _uids:
+                _removed.append(self.jobs.pop(_uid))
+
+        trace_count('farm.jobs_added', len(_added))
+        trace_count('farm.jobs_updated', len(_updated))
+        return _added, _updated, _removed
+
+
+def _stream_cmds(cmds):
+    """Execute a command and yield its output line by line.
+
+    If the command fails (ie. it has a non-zero return code or it writes
+    to stderr) then an error is raised once its output has been read,
+    rather than treating the partial output as a complete result - eg. a
+    failed GetJobIdsFilter would otherwise read as no jobs.
+
+    Args:
+        cmds (list): command to execute
+
+    Returns:
+        (str iterator): output lines
+    """
+    _cmds = [to_str(_cmd) for _cmd in cmds]
+    _LOGGER.debug(' - STREAM %s', _cmds)
+    with tempfile.TemporaryFile(mode='w+') as _err_hook:
+        with subprocess.Popen(
+                _cmds, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                stderr=_err_hook, universal_newlines=True) as _pipe:
+            for _line in _pipe.stdout:
+                yield _line.rstrip('\r\n')
+        _err_hook.seek(0)
+        _err = _err_hook.read().strip()
+    if _pipe.returncode or _err:
+        _LOGGER.warning(
+            ' - DEADLINE COMMAND FAILED %s (code=%d) %s', _cmds[1],
+            _pipe.returncode, _err)
+        raise RuntimeError(
+            f'Deadline command {_cmds[1]} failed (code={_pipe.returncode}) '
+            f'- {_err}')
+
+
+def _stream_cmds_list(cmds_list):
+    """Execute a list of commands and yield their output line by line.
+
+    Blank lines are added between the output of each command so that
+    the details of the last job read by each command are kept separate.
+
+    Args:
+        cmds_list (list): commands to execute
+
+    Returns:
+        (str iterator): output lines
+    """
+    for _cmds in cmds_list:
+        yield from _stream_cmds(_cmds)
+        yield ''
+        yield ''
+
+
+def parse_job_details(lines, rtime):
+    """Parse job details output by deadlinecommand.
+
+    The details are read in a single pass, and each job is yielded as soon
+    as its details have been read. Jobs are separated by two or more
+    blank lines.
+
+    Args:
+        lines (str iterator): lines of details
+        rtime (float): details read time
+
+    Returns:
+        (CDFarmJob iterator): farm jobs
+    """
+    _data = {}
+    _n_blank = 0
+    for _line in lines:
+        _line = _line.strip()
+        if not _line:
+            _n_blank += 1
+            if _n_blank >= 2 and _data:
+                yield _data_to_job(_data, rtime=rtime)
+                _data = {}
+            continue
+        _n_blank = 0
+
+        _key, _val = _line.split('=', 1)
+        _key = _READ_KEYS.get(_key)
+        if not _key:
+            continue
+        assert _key not in _data
+        _data[_key] = _val
+
+    if _data:
+        yield _data_to_job(_data, rtime=rtime)
+
+
+def _data_to_job(data, rtime):
+    """Convert job details data to a farm job object.
+
+    Args:
+        data (dict): job details data (read from deadline command)
+        rtime (float): details read time
+
+    Returns:
+        (CDFarmJob): farm job
+    """
+    check_heart()
+    _data = dict(data)
+    _data['rtime'] = rtime
+
+    # Clean data
+    if 'ctime' in _data:
+        _fmt = '%m/%d/%Y %H:%M:%S'
+        _LOGGER.debug('   - CONVERT TIME "%s"', _data['ctime'])
+        _data['ctime'] = to_time_f(time.strptime(_data['ctime'], _fmt))
+
+    # Build output path
+    _path = None
+    _out_dirs = _data.pop('out_dirs', None)
+    _out_fname = _data.pop('out_fname', None)
+    _info_dict = _data.pop('info_dict', None)
+    if _out_fname and _info_dict:
+        _extn = File(_out_fname).extn
+        _path = _info_dict_to_path(_info_dict, extn=_extn)
+    if not _path and _out_dirs and _out_fname:
+        _LOGGER.debug(' - OUT DIRS %s', _out_dirs)
+        _LOGGER.debug(' - OUT FNAME %s', _out_fname)
+        _path = abs_path(f'{_out_dirs}/{_out_fname}')
+        _path = _path.replace('.####.', '.%04d.')
+    _data['path'] = _path
+    _LOGGER.debug('   - PATH %s', _path)
+
+    _LOGGER.debug('   - ADD JOB %s', _data)
+    return d_farm_job.CDFarmJob(**_data)
+
+
+def _info_dict_to_path(dict_s, extn, log=10):
+    """Read output path from info dict.
+
+    Args:
+        dict_s (str): plugin info dict string
+        extn (str): output extension
+        log (int): log level
+
+    Returns:
+        (str): output path
+    """
+    _LOGGER.log(log, ' - INFO DICT %s', dict_s)
+    if not dict_s:
+        return None
+
+    # Process string into dict
+    _data = {}
+    for _kvp_s in dict_s.split(','):
+        _LOGGER.debug('   - KVP %s', _kvp_s)
+        _key, _val = _kvp_s.split('=', 1)
+        _LOGGER.debug('     - KEY / VAL %s %s', _key, _val)
+        _data[_key] = _val
+
+    for _key in [
+            'SceneFile', 'RenderLayer', 'OutputFilePrefix', 'OutputFilePath']:
+        if _key not in _data:
+            return None
+
+    # Determine prefix
+    _scn = _data['SceneFile']
+    _lyr = _data['RenderLayer']
+    if _lyr.startswith('rs_'):
+        _lyr = _lyr[3:]
+    _prefix = _data['OutputFilePrefix']
+    for _tokens, _val in [
+            (['<layer>', '<Layer>'], _lyr),
+            (['<Scene>'], File(_scn).base),
+    ]:
+        for _token in _tokens:
+            _prefix = _prefix.replace(_token, _val)
+    _LOGGER.log(log, ' - PREFIX %s', _prefix)
+
+    # Build path
+    _path = f'{_data["OutputFilePath"]}/{_prefix}.%04d.{extn}'
+    _LOGGER.log(log, ' - PATH %s', _path)
+
+    return _path
@@ -12,6 +12,7 @@ from pini.utils import single, plural, ints_to_str
 from maya_pini import open_maya as pom
 from maya_pini.utils import cur_renderer
 
+from .. import base
 from . import d_farm, submit
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,9 +23,10 @@ class CDMayaFarm(d_farm.CDFarm):
 
     def submit_maya_render(  # pylint: disable=too-many-branches,too-many-statements
             self, camera=None, comment='', priority=50, machine_limit=0,
-            frames=None, chunk_size=1, version_up=False, checks_data=None,
+            frames=None, chunk_size=None, version_up=False, checks_data=None,
             submit_=True, metadata=None, layers=None,
-            result='jobs', res_pc=None, force=False, **kwargs):
+            result='jobs', res_pc=None, validate_frames=True, force=False,
+            **kwargs):
         """Submit maya render job to the farm.
 
         Args:
@@ -33,7 +35,8 @@ class CDMayaFarm(d_farm.CDFarm):
             priority (int): job priority (0 [low] - 100 [high])
             machine_limit (int): job machine limit
             frames (int list): frames to render
-            chunk_size (int): apply job chunk size
+            chunk_size (int): force job chunk size (by default this is
+                calculated from the layer's render history)
             version_up (bool): version up on render
             checks_data (dict): override sanity checks data
             submit_ (bool): submit render to deadline (disable for debugging)
@@ -43,6 +46,8 @@ class CDMayaFarm(d_farm.CDFarm):
                 jobs - list of submitted jobs
                 msg - submit message
             res_pc (float): override render resolution (in %)
+            validate_frames (bool): render first, middle and last frames
+                first so that issues are found early
             force (bool): submit without confirmation dialogs
 
         Returns:
@@ -69,6 +74,7 @@ class CDMayaFarm(d_farm.CDFarm):
         # Submit render jobs
         _render_jobs = []
         _outs = []
+        _schedules = {}
         for _lyr in _lyrs:
 
             _LOGGER.debug(' - SUBMIT LYR %s', _lyr)
@@ -91,8 +97,15 @@ class CDMayaFarm(d_farm.CDFarm):
             _job = submit.CDMayaRenderJob(
                 stime=_stime, layer=_lyr.pass_name, priority=priority,
                 work=_work, frames=_frames, camera=_cam, comment=comment,
-                machine_limit=machine_limit, chunk_size=chunk_size,
-                scene=_render_scene, res_pc=res_pc, **kwargs)
+                machine_limit=machine_limit, scene=_render_scene,
+                res_pc=res_pc, **kwargs)
+            _sched = base.schedule_frames(
+                _frames, output=_job.output, chunk_size=chunk_size,
+                validate=validate_frames)
+            _LOGGER.info('   - SCHEDULE %s %s', _lyr.pass_name, _sched)
+            _job.frames = _sched.frames
+            _job.chunk_size = _sched.chunk_size
+            _schedules[_job.output.path] = _sched.to_chunks()
             _render_jobs.append(_job)
             _LOGGER.debug('   - SCENE %s', _job.scene)
             assert _job.scene == _render_scene
@@ -116,7 +129,8 @@ class CDMayaFarm(d_farm.CDFarm):
         _update_job = self.submit_update_job(
             work=_work, dependencies=_render_jobs, comment=comment,
             batch_name=_batch, stime=_stime, metadata=_metadata,
-            priority=priority, submit_=submit_, outputs=_outs)
+            priority=priority, submit_=submit_, outputs=_outs,
+            schedules=_schedules)
         _progress.set_pc(100)
         _progress.close()
 
@@ -36,6 +36,18 @@ def _build_reload_tool():
         name='ReloadBasic', command=_cmd,
         icon=icons.REFRESH, label='Reload tools (without reinstall)')
     _refresh.add_context(_basic_reload)
+
+    # Build incremental refresh tool (changed modules + dependents)
+    _cmd = '\n'.join([
+        'from pini import refresh',
+        'from pini.tools import usage',
+        '_refresh = usage.get_tracker(name="ReloadChangedTools")(',
+        '    refresh.reload_changed_libs)',
+        '_refresh()'])
+    _changed_reload = PITool(
+        name='ReloadChanged', command=_cmd,
+        icon=icons.REFRESH, label='Reload changed tools')
+    _refresh.add_context(_changed_reload)
     _refresh.add_divider('ReloadDivider')
 
     # Add dev options
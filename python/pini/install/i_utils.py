@@ -18,7 +18,10 @@ def setup(build_ui=True, setup_logging=False):
     Returns:
         (bool): whether pini was installed successfully
     """
-    from pini import install
+    from pini import install, refresh
+
+    # Record module sources so that changed modules can be reloaded
+    refresh.snapshot_mods()
 
     # Test for disable
     if os.environ.get('PINI_INSTALL_DISABLE'):
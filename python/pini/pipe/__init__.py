@@ -1,10 +1,12 @@
-"""Tools for managing the pipeline (disk structure)."""
+"""Tools for managing the pipeline (disk structure).
 
-# pylint: disable=wrong-import-position
+Attributes are loaded lazily on first access (see pini.utils.u_lazy).
+"""
 
 import os
 
 from pini.utils import HOME_PATH, Dir
+from pini.utils.u_lazy import lazy_import
 
 VERSION = 11
 
@@ -18,29 +20,59 @@ SHOTGRID_AVAILABLE = bool(
     os.environ.get('PINI_SG_URL'))
 SUBMIT_AVAILABLE = os.environ.get('PINI_PIPE_ENABLE_SUBMIT', False)
 
-from .elem import (
-    CPJob, ROOT, find_jobs, find_job, cur_job, CPRoot, obt_job,
-    to_job, CPSequence, cur_sequence, CPAsset,
-    cur_asset, CPShot, cur_shot, to_shot, CPEntity, to_entity,
-    cur_entity, find_entity, recent_entities, CPWorkDir, cur_work_dir,
-    to_work_dir, cur_task, map_task, CPWork, cur_work, add_recent_work,
-    recent_work, load_recent, to_work, CPOutputFile, CPOutputSeq,
-    OUTPUT_FILE_TYPES, OUTPUT_SEQ_TYPES, to_output, ver_sort, CPOutputVideo,
-    OUTPUT_VIDEO_TYPES, CPOutputBase, cur_output, CPOutputSeqDir,
-    STATUS_ORDER, RECENT_WORK_YAML, OUTPUT_SEQ_CACHE_EXTNS,
-    to_default_settings, NoCurrentWork, check_cur_work)
 
-from .cp_template import CPTemplate, glob_templates, glob_template
-from .cp_utils import (
-    validate_token, admin_mode, is_valid_token, task_sort, cur_user,
-    EXTN_TO_DCC, validate_tokens, map_path, tag_sort, output_clip_sort,
-    passes_filters, DEFAULT_TAG, ASSET_PROFILE, SHOT_PROFILE,
-    expand_pattern_variations)
+def _build_entity_types():
+    """Build entity types tuple.
 
-from .cp_tools import version_up
+    Returns:
+        (tuple): entity types
+    """
+    from .elem import CPAsset, CPShot
+    return CPAsset, CPShot
 
-from . import cache
 
-ENTITY_TYPES = CPAsset, CPShot
+def _build_cache():
+    """Build pipeline cache.
 
-CACHE = cache.CCPRoot(ROOT.path)
+    This is built on first access to avoid reading the pipeline
+    on import.
+
+    Returns:
+        (CCPRoot): pipeline cache
+    """
+    from .cache import CCPRoot
+    from .elem import ROOT
+    return CCPRoot(ROOT.path)
+
+
+__getattr__, __dir__ = lazy_import(
+    __name__, globals(),
+    mods={'cache': '.cache'},
+    attrs={
+        '.elem': [
+            'CPJob', 'ROOT', 'find_jobs', 'find_job', 'cur_job', 'CPRoot',
+            'obt_job', 'to_job', 'CPSequence', 'cur_sequence', 'CPAsset',
+            'cur_asset', 'CPShot', 'cur_shot', 'to_shot', 'CPEntity',
+            'to_entity', 'cur_entity', 'find_entity', 'recent_entities',
+            'CPWorkDir', 'cur_work_dir', 'to_work_dir', 'cur_task',
+            'map_task', 'CPWork', 'cur_work', 'add_recent_work',
+            'recent_work', 'load_recent', 'to_work', 'CPOutputFile',
+            'CPOutputSeq', 'OUTPUT_FILE_TYPES', 'OUTPUT_SEQ_TYPES',
+            'to_output', 'ver_sort', 'CPOutputVideo', 'OUTPUT_VIDEO_TYPES',
+            'CPOutputBase', 'cur_output', 'CPOutputSeqDir', 'STATUS_ORDER',
+            'RECENT_WORK_YAML', 'RECENT_WORK', 'OUTPUT_SEQ_CACHE_EXTNS',
+            'to_default_settings', 'NoCurrentWork', 'check_cur_work'],
+
+        '.cp_template': ['CPTemplate', 'glob_templates', 'glob_template'],
+        '.cp_utils': [
+            'validate_token', 'admin_mode', 'is_valid_token', 'task_sort',
+            'cur_user', 'EXTN_TO_DCC', 'validate_tokens', 'map_path',
+            'tag_sort', 'output_clip_sort', 'passes_filters', 'DEFAULT_TAG',
+            'ASSET_PROFILE', 'SHOT_PROFILE', 'expand_pattern_variations'],
+
+        '.cp_tools': ['version_up'],
+    },
+    builders={
+        'ENTITY_TYPES': _build_entity_types,
+        'CACHE': _build_cache,
+    })
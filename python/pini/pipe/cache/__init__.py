@@ -15,5 +15,8 @@ from .output import (
     CCPOutputFile, CCPOutputSeq, CCPOutputSeqDir, CCPOutputBase,
     CCPOutputVideo, CCPOutputGhost, OUTPUT_MEDIA_CONTENT_TYPES)
 
+from .ccp_warm import (
+    warm_job_cache, submit_warm_cache_job, is_cache_stale, CacheWarmReport)
 from .ccp_utils import (
-    pipe_cache_on_obj, pipe_cache_result, CACHE_START, get_pipe_result_cacher)
+    pipe_cache_on_obj, pipe_cache_result, CACHE_START, get_pipe_result_cacher,
+    CCPIndex)
@@ -173,7 +173,7 @@ class CCPRoot(elem.CPRoot):
         _match = match
         if isinstance(_match, elem.CPJob):
             try:
-                _result = single(_job for _job in self.jobs if _job == _match)
+                _result = single(self._obt_jobs_index().find(_match.path))
             except ValueError as _exc:
                 raise ValueError(
                     f'Job {_match.name} is missing from jobs list (maybe '
@@ -195,8 +195,7 @@ class CCPRoot(elem.CPRoot):
                 return self.obt_job(_job)
 
             _name_match = single(
-                [_job for _job in self.jobs if _job.name == _match],
-                catch=True)
+                self._obt_jobs_index().find(_match, key='name'), catch=True)
             if _name_match:
                 return _name_match
 
@@ -209,6 +208,15 @@ class CCPRoot(elem.CPRoot):
 
         raise NotImplementedError(match)
 
+    @ccp_utils.pipe_cache_on_obj
+    def _obt_jobs_index(self):
+        """Obtain index of jobs on the current pipeline.
+
+        Returns:
+            (CCPIndex): jobs index
+        """
+        return ccp_utils.CCPIndex(lambda: [self._read_jobs()])
+
     def find_jobs(self, cfg_name=None, force=False, **kwargs):
         """Find jobs on the current pipeline.
 
@@ -274,7 +282,7 @@ class CCPRoot(elem.CPRoot):
             (CCPJob): job object
         """
         _existing = single(
-            [_job for _job in self.jobs if _job.name == name], catch=True)
+            self._obt_jobs_index().find(name, key='name'), catch=True)
         if _existing:
             return _existing
         _path = self.to_subdir(name)
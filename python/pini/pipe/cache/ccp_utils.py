@@ -1,6 +1,11 @@
 """General utilities for the pipeline cache."""
 
-from pini.utils import get_result_cacher, get_method_to_file_cacher
+import logging
+
+from pini.utils import (
+    get_result_cacher, get_method_to_file_cacher, obt_force_count)
+
+_LOGGER = logging.getLogger(__name__)
 
 CACHE_START = 1729706863
 
@@ -55,3 +60,64 @@ def pipe_cache_to_file(func):
     _cacher = get_method_to_file_cacher(
         mtime_outdates=False, min_mtime=CACHE_START, namespace='pipe')
     return _cacher(func)
+
+
+class CCPIndex:
+    """Dict index of cached lists of pipeline elements.
+
+    Cached lists are returned as the same list object until they are
+    reread, so the index is rebuilt whenever the identity of any of its
+    source lists changes. The source lists are only checked after a
+    result in the pipe namespace has been forced to recalculate, so
+    exact matches can be looked up without reading or scanning them.
+    """
+
+    def __init__(self, read_srcs, keys=('name', 'path')):
+        """Constructor.
+
+        Args:
+            read_srcs (fn): function which returns the source lists
+            keys (str tuple): attributes to index elements by
+        """
+        self.read_srcs = read_srcs
+        self.keys = keys
+
+        self._srcs = ()
+        self._indexes = {}
+        self._force_count = None
+
+    def find(self, value, key='path'):
+        """Find elements matching the given value.
+
+        Args:
+            value (any): key value to match (eg. name/path)
+            key (str): index key (eg. name/path)
+
+        Returns:
+            (list): matching elements
+        """
+        self.update()
+        return list(self._indexes[key].get(value, ()))
+
+    def update(self):
+        """Rebuild this index if any of its source lists have been reread."""
+        _force_count = obt_force_count(namespace='pipe')
+        if _force_count == self._force_count:
+            return
+        _srcs = tuple(self.read_srcs())
+        self._force_count = _force_count
+        if len(_srcs) == len(self._srcs) and all(
+                _src is _cur_src for _src, _cur_src in zip(_srcs, self._srcs)):
+            return
+        _LOGGER.debug('REBUILD INDEX %s', self.read_srcs)
+        _indexes = {_key: {} for _key in self.keys}
+        for _src in _srcs:
+            for _elem in _src:
+                for _key, _index in _indexes.items():
+                    _index.setdefault(getattr(_elem, _key), []).append(_elem)
+        self._indexes = _indexes
+        self._srcs = _srcs
+
+    def __len__(self):
+        self.update()
+        return sum(len(_src) for _src in self._srcs)
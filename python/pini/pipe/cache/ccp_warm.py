@@ -0,0 +1,311 @@
+"""Tools for pre-populating the pipeline disk caches of a job.
+
+The first read of a big job pays for all the disk walks behind the
+pipe_cache_to_file methods (eg. publishes, work outputs, work dir
+scans). This allows those caches to be built in advance, eg. from
+a cron job:
+
+    $ warm_pipe_cache MyJob --workers 16
+
+or on the farm:
+
+    >>> from pini.pipe import cache
+    >>> cache.submit_warm_cache_job(pipe.CACHE.cur_job)
+
+Only stale caches are refreshed - ie. caches which are missing, which
+were written before the cache format was last updated or which are
+older than the given max age.
+"""
+
+import concurrent.futures
+import logging
+import threading
+import time
+
+from pini.utils import File, trace_span
+
+from .ccp_utils import CACHE_START
+from .ccp_work import update_outputs_caches
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CacheWarmReport:
+    """Stores the results of a cache warming operation."""
+
+    def __init__(self, job):
+        """Constructor.
+
+        Args:
+            job (CCPJob): job being warmed
+        """
+        self.job = job
+        self.refreshed = []
+        self.n_fresh = 0
+        self.failed = []
+        self.dur = None
+        self._lock = threading.Lock()
+
+    def add_fresh(self):
+        """Mark that a cache was found to be fresh."""
+        with self._lock:
+            self.n_fresh += 1
+
+    def add_failed(self, file_, exc):
+        """Add a cache which failed to refresh.
+
+        Args:
+            file_ (File): cache file
+            exc (Exception): error raised on refresh
+        """
+        with self._lock:
+            self.failed.append((file_, exc))
+
+    def add_refreshed(self, file_, dur):
+        """Add a cache which was refreshed.
+
+        Args:
+            file_ (File): cache file
+            dur (float): time taken to refresh (in seconds)
+        """
+        with self._lock:
+            self.refreshed.append((file_, dur))
+
+    def print_summary(self):
+        """Print summary of this warming operation."""
+        print(
+            f'WARMED {self.job.name} CACHE IN {self.dur:.01f}s - '
+            f'refreshed={len(self.refreshed):d} fresh={self.n_fresh:d} '
+            f'failed={len(self.failed):d}')
+        for _file, _dur in sorted(self.refreshed, key=lambda _item: -_item[1]):
+            print(f' - REFRESHED {_file.path} ({_dur:.02f}s)')
+        for _file, _exc in self.failed:
+            print(f' - FAILED {_file.path} ({_exc})')
+
+
+def is_cache_stale(obj, func, max_age=None):
+    """Test whether the given method's disk cache is stale.
+
+    Args:
+        obj (any): method's parent object (must have cache_fmt)
+        func (str): name of method
+        max_age (float): maximum cache age (in seconds)
+
+    Returns:
+        (bool): whether cache needs to be refreshed
+    """
+    _file = to_cache_file(obj, func)
+    if not _file.exists():
+        return True
+    _mtime = _file.mtime()
+    if _mtime < CACHE_START:
+        return True
+    if max_age and time.time() - _mtime > max_age:
+        return True
+    return False
+
+
+def to_cache_file(obj, func):
+    """Obtain the disk cache file for the given method.
+
+    Args:
+        obj (any): method's parent object (must have cache_fmt)
+        func (str): name of method
+
+    Returns:
+        (File): cache file
+    """
+    return File(obj.cache_fmt.format(func=func))
+
+
+def warm_job_cache(
+        job, workers=8, max_age=None, force=False, shotgrid=None,
+        filter_=None):
+    """Pre-populate the disk caches for the given job.
+
+    Entities are processed in parallel using a pool of worker threads.
+
+    Args:
+        job (CPJob|str): job to warm
+        workers (int): number of worker threads
+        max_age (float): refresh caches older than this (in seconds)
+        force (bool): refresh all caches
+        shotgrid (bool): also warm shotgrid caches (by default
+            this is applied if the pipeline is shotgrid-based)
+        filter_ (str): apply entity name filter
+
+    Returns:
+        (CacheWarmReport): report of caches refreshed
+    """
+    from pini import pipe
+
+    _start = time.time()
+    _job = pipe.CACHE.obt_job(job)
+    _shotgrid = pipe.MASTER == 'shotgrid' if shotgrid is None else shotgrid
+    _report = CacheWarmReport(_job)
+    _LOGGER.info('WARM JOB CACHE %s workers=%d', _job.name, workers)
+
+    _tasks = []
+    if _shotgrid:
+        _tasks += _find_sg_warm_tasks(_job, filter_=filter_)
+    _tasks += [(_warm_entity_cache, _ety)
+               for _ety in _job.find_entities(filter_=filter_)]
+    _LOGGER.info(' - FOUND %d TASKS', len(_tasks))
+
+    with trace_span('cache.warm', job=_job.name):
+        with concurrent.futures.ThreadPoolExecutor(workers) as _pool:
+            _futures = [
+                _pool.submit(_func, _obj, report=_report, max_age=max_age,
+                             force=force)
+                for _func, _obj in _tasks]
+            for _future in concurrent.futures.as_completed(_futures):
+                _future.result()
+
+    _report.dur = time.time() - _start
+    return _report
+
+
+def _find_sg_warm_tasks(job, filter_=None):
+    """Find shotgrid cache warming tasks for the given job.
+
+    Args:
+        job (CCPJob): job to warm
+        filter_ (str): apply entity filter
+
+    Returns:
+        (tuple list): list of warm function/object to warm
+    """
+    from pini import pipe
+    from pini.pipe import shotgrid
+    _tasks = []
+    if pipe.MASTER == 'shotgrid':
+        _tasks.append((_warm_sg_job_cache, job))
+    _proj = shotgrid.SGC.find_proj(job, catch=True)
+    if _proj:
+        _tasks += [
+            (_warm_sg_entity_cache, _ety)
+            for _ety in _proj.find_entities(filter_=filter_)]
+    return _tasks
+
+
+def _refresh_cache(obj, func, report, max_age, force, **kwargs):
+    """Refresh a method's disk cache if it is stale.
+
+    Args:
+        obj (any): method's parent object
+        func (str): name of method to refresh
+        report (CacheWarmReport): report to update
+        max_age (float): refresh caches older than this (in seconds)
+        force (bool): refresh even if cache is not stale
+        kwargs (dict): additional args to pass to the method
+
+    Returns:
+        (bool): whether cache was refreshed
+    """
+    _file = to_cache_file(obj, func)
+    if not force and not is_cache_stale(obj, func, max_age=max_age):
+        report.add_fresh()
+        return False
+    _start = time.time()
+    try:
+        getattr(obj, func)(force=True, **kwargs)
+    except Exception as _exc:  # pylint: disable=broad-except
+        _LOGGER.warning('FAILED TO REFRESH %s - %s', _file.path, _exc)
+        report.add_failed(_file, _exc)
+        return False
+    report.add_refreshed(_file, dur=time.time() - _start)
+    return True
+
+
+def _warm_entity_cache(entity, report, max_age, force):
+    """Refresh stale caches in the given entity.
+
+    Args:
+        entity (CCPEntity): entity to warm
+        report (CacheWarmReport): report to update
+        max_age (float): refresh caches older than this (in seconds)
+        force (bool): refresh all caches
+    """
+    from pini import pipe
+    _LOGGER.debug('WARM ENTITY %s', entity)
+    if pipe.MASTER == 'disk':
+        _refresh_cache(
+            entity, '_read_publishes', report=report, max_age=max_age,
+            force=force)
+
+    # Find works with stale outputs caches
+    _works = []
+    for _work_dir in entity.find_work_dirs():
+        _refresh_cache(
+            _work_dir, 'has_works', report=report, max_age=max_age,
+            force=force)
+        for _work in _work_dir.find_works():
+            if not force and not is_cache_stale(
+                    _work, '_read_outputs', max_age=max_age):
+                report.add_fresh()
+                continue
+            _works.append(_work)
+    if not _works:
+        return
+
+    # Reread entity/work dir/seq dir outputs once, rather than once
+    # per work, then rebuild each work's outputs from those caches
+    try:
+        update_outputs_caches(entity=entity, works=_works)
+    except Exception as _exc:  # pylint: disable=broad-except
+        _LOGGER.warning('FAILED TO UPDATE OUTPUTS %s - %s', entity, _exc)
+    for _work in _works:
+        _refresh_cache(
+            _work, '_read_outputs', report=report, max_age=max_age,
+            force=True, update_caches=False)
+
+
+def _warm_sg_job_cache(job, report, max_age, force):
+    """Refresh stale shotgrid caches in the given job.
+
+    Args:
+        job (CCPJob): job to warm
+        report (CacheWarmReport): report to update
+        max_age (float): refresh caches older than this (in seconds)
+        force (bool): refresh all caches
+    """
+    _refresh_cache(
+        job, '_read_publishes', report=report, max_age=max_age, force=force)
+
+
+def _warm_sg_entity_cache(entity, report, max_age, force):
+    """Refresh stale shotgrid caches in the given entity.
+
+    Args:
+        entity (SGCAsset|SGCShot): shotgrid cache entity to warm
+        report (CacheWarmReport): report to update
+        max_age (float): refresh caches older than this (in seconds)
+        force (bool): refresh all caches
+    """
+    _refresh_cache(
+        entity, '_build_pub_files_cache', report=report, max_age=max_age,
+        force=force)
+
+
+def submit_warm_cache_job(job, workers=8, max_age=None, force=False):
+    """Submit a farm job to warm the given job's cache.
+
+    Args:
+        job (CPJob): job to warm
+        workers (int): number of worker threads
+        max_age (float): refresh caches older than this (in seconds)
+        force (bool): refresh all caches
+
+    Returns:
+        (str list): job ids
+    """
+    from pini import farm
+    _py = '\n'.join([
+        'from pini.pipe import cache',
+        '',
+        '_report = cache.warm_job_cache(',
+        f'    "{job.name}", workers={workers:d}, max_age={max_age},',
+        f'    force={force})',
+        '_report.print_summary()',
+    ])
+    return farm.submit_py(name=f'{job.name} [warm cache]', py=_py)
@@ -98,12 +98,16 @@ class CCPWork(CPWork):
         return super().find_outputs(*args, **kwargs)
 
     @pipe_cache_to_file
-    def _read_outputs(self, match_metadata=True, force=False):
+    def _read_outputs(
+            self, match_metadata=True, update_caches=True, force=False):
         """Read outputs generated from this work file.
 
         Args:
             match_metadata (bool): ignore outputs without this file
                 marked as their source in their metadata
+            update_caches (bool): on force, reread the entity/work dir
+                outputs caches first - this can be disabled if they
+                have already been reread (see update_outputs_caches)
             force (bool): force reread from disk
 
         Returns:
@@ -111,7 +115,7 @@ class CCPWork(CPWork):
         """
         _LOGGER.debug('READ OUTPUTS force=%d %s', force, self)
 
-        if force:
+        if force and update_caches:
             self._update_outputs_cache()
         _outs = super()._read_outputs()
         _LOGGER.debug(' - FOUND %d OUTPUTS %s', len(_outs), self)
@@ -129,30 +133,7 @@ class CCPWork(CPWork):
 
     def _update_outputs_cache(self):
         """Rebuild outputs cache."""
-        from pini import pipe
-        _LOGGER.debug(' - UPDATING CACHE')
-        if pipe.MASTER == 'disk':
-            _LOGGER.debug(' - REREAD ENTITY/WORK_DIR CACHES')
-            self.entity.find_outputs(force=True)
-            self.work_dir.find_outputs(force=True)
-            _LOGGER.debug(' - REREAD ENTITY/WORK_DIR CACHES COMPLETE')
-
-            # Update seq disk caches
-            _seq_dirs = self.entity.find_output_seq_dirs(
-                ver_n=self.ver_n, tag=self.tag, task=self.task)
-            _LOGGER.debug(
-                ' - FOUND %d VERSION OUTPUT SEQ DIRS %s', len(_seq_dirs),
-                self.entity)
-            for _seq_dir in _seq_dirs:
-                _LOGGER.debug(' - CHECKING %s', _seq_dir)
-                _out_seqs = _seq_dir.find_outputs(force=True)
-                _LOGGER.debug(
-                    ' - FOUND %d SEQS %s', len(_out_seqs), _seq_dir)
-            _LOGGER.debug(' - UPDATED CACHES %s', self)
-        elif pipe.MASTER == 'shotgrid':
-            self.entity.find_outputs(force=True)
-        else:
-            raise ValueError(pipe.MASTER)
+        update_outputs_caches(entity=self.entity, works=[self])
 
     def find_vers(self, force=False):
         """Find version of this work file.
@@ -318,3 +299,43 @@ class CCPWork(CPWork):
             _helper.ui.WWorks.redraw(force=True)
             if update_helper:
                 _helper.jump_to(self)
+
+
+def update_outputs_caches(entity, works):
+    """Reread the outputs caches which the given works' outputs are read from.
+
+    Each entity, work dir and seq dir is only reread once, so this can
+    be used to update the caches for many works in a single pass, and
+    then each work's outputs can be rebuilt without a further disk walk.
+
+    Args:
+        entity (CCPEntity): entity containing works
+        works (CCPWork list): works to update outputs caches for
+    """
+    from pini import pipe
+    _LOGGER.debug(' - UPDATING CACHE %s (%d works)', entity, len(works))
+    if pipe.MASTER == 'disk':
+        _LOGGER.debug(' - REREAD ENTITY/WORK_DIR CACHES')
+        entity.find_outputs(force=True)
+        _work_dirs = {_work.work_dir.path: _work.work_dir for _work in works}
+        for _work_dir in _work_dirs.values():
+            _work_dir.find_outputs(force=True)
+        _LOGGER.debug(' - REREAD ENTITY/WORK_DIR CACHES COMPLETE')
+
+        # Update seq disk caches
+        _seq_dirs = {}
+        for _work in works:
+            for _seq_dir in entity.find_output_seq_dirs(
+                    ver_n=_work.ver_n, tag=_work.tag, task=_work.task):
+                _seq_dirs[_seq_dir.path] = _seq_dir
+        _LOGGER.debug(
+            ' - FOUND %d VERSION OUTPUT SEQ DIRS %s', len(_seq_dirs), entity)
+        for _seq_dir in _seq_dirs.values():
+            _LOGGER.debug(' - CHECKING %s', _seq_dir)
+            _out_seqs = _seq_dir.find_outputs(force=True)
+            _LOGGER.debug(' - FOUND %d SEQS %s', len(_out_seqs), _seq_dir)
+        _LOGGER.debug(' - UPDATED CACHES %s', entity)
+    elif pipe.MASTER == 'shotgrid':
+        entity.find_outputs(force=True)
+    else:
+        raise ValueError(pipe.MASTER)
@@ -9,7 +9,7 @@ import time
 from pini import icons, qt
 from pini.utils import single, cache_method_to_file, str_to_seed
 
-from ..ccp_utils import pipe_cache_result
+from ..ccp_utils import pipe_cache_result, pipe_cache_on_obj, CCPIndex
 from ...elem import CPJob, CPEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -226,9 +226,22 @@ class CCPJobBase(CPJob):
         """
         from pini import pipe
         if isinstance(match, pipe.CPSequence):
-            return single([_seq for _seq in self.sequences if _seq == match])
+            return single(self._obt_sequences_index().find(match.path))
+        if isinstance(match, str):
+            _name_seqs = self._obt_sequences_index().find(match, key='name')
+            if len(_name_seqs) == 1:
+                return single(_name_seqs)
         return super().find_sequence(match)
 
+    @pipe_cache_on_obj
+    def _obt_sequences_index(self):
+        """Obtain index of sequences in this job.
+
+        Returns:
+            (CCPIndex): sequences index
+        """
+        return CCPIndex(lambda: [self.find_sequences()])
+
     @pipe_cache_result
     def find_sequences(self, class_=None, filter_=None, head=None, force=False):
         """Find sequences in this job.
@@ -298,20 +311,47 @@ class CCPJobBase(CPJob):
 
         if isinstance(_match, str):
             _LOGGER.debug(' - STR MATCH %s', _match)
-            _matches = [_ety for _ety in self.entities
-                        if _ety.name == _match]
+            _matches = self._obt_entities_index().find(_match, key='name')
             _LOGGER.debug(' - STR MATCHES %s', _matches)
             return single(_matches)
 
         if isinstance(_match, CPEntity):
-            _etys = self.entities
-            _LOGGER.log(9, ' - ETYS %s', _etys)
-            _matches = [_ety for _ety in _etys if _ety == _match]
+            _matches = self._obt_entities_index().find(_match.path)
             _LOGGER.log(9, ' - ETY MATCHES %s', _matches)
             return single(_matches, catch=True)
 
         return super().find_entity(_match)
 
+    @pipe_cache_on_obj
+    def _obt_entities_index(self):
+        """Obtain index of entities in this job.
+
+        Returns:
+            (CCPIndex): entities index
+        """
+        return CCPIndex(self._read_entity_lists)
+
+    def _read_entity_lists(self):
+        """Read cached lists of entities in this job.
+
+        These are the lists which back the entities list, and are used to
+        detect when the entities index needs to be rebuilt.
+
+        Returns:
+            (CCPEntity list list): cached entity lists
+        """
+        return self._read_asset_lists() + [
+            _seq._read_shots()  # pylint: disable=protected-access
+            for _seq in self.find_sequences()]
+
+    def _read_asset_lists(self):
+        """Read cached lists of assets in this job.
+
+        Returns:
+            (CCPAsset list list): cached asset lists
+        """
+        raise NotImplementedError
+
     def obt_work_dir(self, match, catch=False):
         """Obtain a work dir object within this job.
 
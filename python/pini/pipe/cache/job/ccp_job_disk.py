@@ -42,6 +42,15 @@ class CCPJobDisk(ccp_job_base.CCPJobBase):
 
         return _assets
 
+    def _read_asset_lists(self):
+        """Read cached lists of assets in this job.
+
+        Returns:
+            (CCPAsset list list): cached asset lists (one per asset type)
+        """
+        return [self.read_type_assets(asset_type=_type)
+                for _type in self.asset_types]
+
     def _read_publishes(self, force=False):
         """Read publishes in this job.
 
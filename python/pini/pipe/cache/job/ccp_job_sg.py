@@ -52,6 +52,14 @@ class CCPJobSG(ccp_job_base.CCPJobBase):
         _LOGGER.debug('READ ASSETS')
         return super()._read_assets(class_=class_ or cache.CCPAsset)
 
+    def _read_asset_lists(self):
+        """Read cached lists of assets in this job.
+
+        Returns:
+            (CCPAsset list list): cached asset lists
+        """
+        return [self._read_assets()]
+
     @pipe_cache_result
     def read_shots(self, class_=None, filter_=None, force=False):
         """Read shots from shotgrid.
@@ -10,7 +10,8 @@ import time
 import lucidity
 
 from pini import dcc
-from pini.utils import File, norm_path, Dir, is_abs, single, to_str
+from pini.utils import (
+    File, norm_path, Dir, is_abs, single, to_str, traced)
 
 from .cp_utils import (
     is_valid_token, are_valid_tokens, validate_tokens,
@@ -391,6 +392,7 @@ class CPTemplate(lucidity.Template):
         """
         return len(self.keys()) == 0
 
+    @traced('template.parse')
     def parse(self, path, safe=True):
         """Wrapper for parse function.
 
@@ -25,4 +25,4 @@ from .work_dir import (
     CPWorkDir, cur_work_dir, to_work_dir, cur_task, map_task)
 from .work import (
     CPWork, cur_work, add_recent_work, recent_work, load_recent, to_work,
-    RECENT_WORK_YAML, NoCurrentWork, check_cur_work)
+    RECENT_WORK_YAML, RECENT_WORK, NoCurrentWork, check_cur_work)
@@ -306,7 +306,9 @@ class CPWorkBase(File):  # pylint: disable=too-many-public-methods
         _data = self.metadata
         _mtime = _data.get('mtime', int(File(self).mtime()))
         _bkp = self._to_bkp_file(mtime=_mtime)
-        return _bkp.exists()
+        if _bkp.exists():
+            return True
+        return _bkp.filename in cp_work_bkp.read_bkp_manifest(_bkp.to_dir())
 
     def _to_bkp_file(self, mtime=None, extn=None):
         """Build a backup file object.
@@ -327,13 +329,18 @@ class CPWorkBase(File):  # pylint: disable=too-many-public-methods
     def find_bkps(self):
         """Find backup files belonging to this work.
 
+        This includes backups copied to disk and backups held in the
+        backup store (see cp_work_bkp).
+
         Returns:
-            (File list): backup files
+            (CPWorkBkp list): backup files
         """
         _bkp_dir = self._to_bkp_file().to_dir()
-        return _bkp_dir.find(
+        _bkps = _bkp_dir.find(
             depth=1, type_='f', extn=self.extn, class_=cp_work_bkp.CPWorkBkp,
             catch_missing=True)
+        _bkps += cp_work_bkp.find_stored_bkps(_bkp_dir, extn=self.extn)
+        return sorted(_bkps)
 
     def flush_bkps(self, reason_filter=None):  # pylint: disable=arguments-differ
         """Remove backup files.
@@ -341,12 +348,17 @@ class CPWorkBase(File):  # pylint: disable=too-many-public-methods
         Args:
             reason_filter (str): filter list by reason
         """
+        _stored = []
         for _bkp in self.find_bkps():
             if reason_filter and not passes_filter(_bkp.reason, reason_filter):
                 continue
             _LOGGER.info(' - DELETE BKP %s %s', _bkp.reason, _bkp)
+            if _bkp.stored:
+                _stored.append(_bkp)
+                continue
             _bkp.yml.delete(force=True)
             _bkp.delete(force=True)
+        cp_work_bkp.flush_stored_bkps(_stored)
 
     def find_output(self, type_=None, catch=False, **kwargs):
         """Find a matching output belonging to this work file.
@@ -567,6 +579,8 @@ class CPWorkBase(File):  # pylint: disable=too-many-public-methods
         _LOGGER.debug(' - BKP %s', _bkp.path)
 
         # Save bkp
+        if cp_work_bkp.read_bkp_mode() == 'store':
+            return cp_work_bkp.store_bkp(_bkp, source=_src, data=_data)
         File(_src).copy_to(_bkp, force=True)
         _LOGGER.debug(' - SAVED BKP %s', _bkp.path)
         _bkp_yml = self._to_bkp_file(extn='yml', mtime=_mtime)
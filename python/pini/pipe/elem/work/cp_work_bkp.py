@@ -1,18 +1,45 @@
-"""Tools for managing work file backups."""
+"""Tools for managing work file backups.
 
+By default each backup is a full copy of the work file, with a yml file
+containing the backup metadata. If $PINI_WORK_BKP_MODE is set to "store"
+then backups are instead written to a content-addressed blob store in
+the work dir's backup dir, so chunks which are unchanged between backups
+(or between versions of a work file) are only stored once. Each work
+file's stored backups are then listed in a json manifest, which replaces
+the per-backup yml files.
+
+Updates to the store (ie. storing a backup, or flushing backups and the
+blobs which are no longer used) are guarded by a lock file in the store,
+so that a flush can't remove blobs which are being used by a backup
+which is still being written, and manifest updates aren't lost.
+"""
+
+import contextlib
+import hashlib
+import json
 import logging
+import os
 import time
 
-from pini.utils import File, cache_property, to_time_f
+from pini import dcc
+from pini.utils import (
+    File, PINI_TMP, BlobStore, cache_property, to_time_f, nice_size)
 
 _LOGGER = logging.getLogger(__name__)
 
 BKP_TSTAMP_FMT = '%y%m%d_%H%M%S'
 
+_MANIFEST_NAME = 'bkps.json'
+_STORE_NAME = '.store'
+_LOCK_NAME = '.lock'
+_LOCK_TIMEOUT = 300
+
 
 class CPWorkBkp(File):
     """Represents a work backup file."""
 
+    stored = False
+
     def mtime(self):
         """Obtain backup time by parsing filename.
 
@@ -47,3 +74,246 @@ class CPWorkBkp(File):
             (File): yml file
         """
         return self.to_file(extn='yml')
+
+
+class CPWorkStoredBkp(CPWorkBkp):
+    """Represents a work backup which is held in a blob store.
+
+    This has the path that the backup would have if it was copied, but
+    the file itself isn't written - it can be extracted from the store.
+    """
+
+    stored = True
+
+    def __init__(self, file_, entry):
+        """Constructor.
+
+        Args:
+            file_ (str): path to backup
+            entry (dict): backup manifest entry
+        """
+        super().__init__(file_)
+        self.entry = entry
+
+    @property
+    def metadata(self):
+        """Obtain backup metadata.
+
+        Returns:
+            (dict): metadata
+        """
+        return self.entry
+
+    @property
+    def store(self):
+        """Obtain blob store containing this backup.
+
+        Returns:
+            (BlobStore): store
+        """
+        return to_bkp_store(self.to_dir())
+
+    def extract(self, file_=None, force=True):
+        """Extract this backup from the store.
+
+        Args:
+            file_ (str): path to extract to (default is in $TMP/.pini)
+            force (bool): replace existing file without confirmation
+
+        Returns:
+            (File): extracted file
+        """
+        _file = file_ or PINI_TMP.to_file(
+            f'bkps/{self.to_dir().filename}/{self.filename}')
+        return self.store.restore(self.entry, _file, force=force)
+
+    def load(self, force=False):
+        """Extract this backup and load it in the current dcc.
+
+        Args:
+            force (bool): load scene without unsaved changes warnings
+        """
+        dcc.load(self.extract(), force=force)
+
+    def matches(self, other):
+        """Test if this backup matches another file.
+
+        Args:
+            other (str): path to other file
+
+        Returns:
+            (bool): whether files match
+        """
+        _other = File(other)
+        if _other.size() != self.entry['size']:
+            return False
+        _hash = hashlib.sha1()
+        with open(_other.path, 'rb') as _hook:
+            for _data in iter(lambda: _hook.read(1024 * 1024), b''):
+                _hash.update(_data)
+        return _hash.hexdigest() == self.entry['hash']
+
+
+def find_stored_bkps(dir_, extn=None):
+    """Find backups in the manifest of the given backup dir.
+
+    Args:
+        dir_ (Dir): work file backup dir
+        extn (str): filter by extension
+
+    Returns:
+        (CPWorkStoredBkp list): stored backups
+    """
+    _bkps = []
+    for _filename, _entry in read_bkp_manifest(dir_).items():
+        _bkp = CPWorkStoredBkp(dir_.to_file(_filename), entry=_entry)
+        if extn and _bkp.extn != extn:
+            continue
+        _bkps.append(_bkp)
+    return _bkps
+
+
+def flush_stored_bkps(bkps):
+    """Remove stored backups from their manifest.
+
+    Blobs which are no longer used by any manifest in the store's backup
+    dir are then removed.
+
+    Args:
+        bkps (CPWorkStoredBkp list): backups to remove
+    """
+    if not bkps:
+        return
+    _dir = bkps[0].to_dir()
+    with _lock_store(_dir):
+        _manifest = read_bkp_manifest(_dir)
+        for _bkp in bkps:
+            assert _bkp.to_dir() == _dir
+            _manifest.pop(_bkp.filename, None)
+        write_bkp_manifest(_dir, _manifest)
+
+        _entries = []
+        for _manifest in _dir.to_dir().find(
+                depth=2, type_='f', base=File(_MANIFEST_NAME).base,
+                extn='json', class_=File):
+            _entries += read_bkp_manifest(_manifest.to_dir()).values()
+        _freed = to_bkp_store(_dir).flush(keep=_entries)
+    _LOGGER.info(' - FREED %s FROM BKP STORE', nice_size(_freed))
+
+
+@contextlib.contextmanager
+def _lock_store(dir_, timeout=_LOCK_TIMEOUT):
+    """Lock the blob store used by the given backup dir.
+
+    The lock file is created exclusively, so only one process can update
+    the store at a time. A lock which is older than the timeout is
+    assumed to have been left by a process which died, and is replaced.
+
+    Args:
+        dir_ (Dir): work file backup dir
+        timeout (float): age (in secs) at which a lock is stale
+    """
+    _lock = to_bkp_store(dir_).to_file(_LOCK_NAME)
+    _lock.test_dir()
+    while True:
+        try:
+            _fd = os.open(_lock.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                _age = time.time() - os.path.getmtime(_lock.path)
+            except OSError:  # Lock was released
+                continue
+            if _age > timeout:
+                _LOGGER.warning(' - REPLACING STALE LOCK %s', _lock.path)
+                with contextlib.suppress(OSError):
+                    os.remove(_lock.path)
+            else:
+                time.sleep(0.05)
+            continue
+        os.close(_fd)
+        break
+    try:
+        yield
+    finally:
+        os.remove(_lock.path)
+
+
+def read_bkp_manifest(dir_):
+    """Read manifest of stored backups.
+
+    Args:
+        dir_ (Dir): work file backup dir
+
+    Returns:
+        (dict): backup filename/entry
+    """
+    _file = dir_.to_file(_MANIFEST_NAME)
+    if not _file.exists():
+        return {}
+    return _file.read_json()
+
+
+def read_bkp_mode():
+    """Read how work file backups are saved ($PINI_WORK_BKP_MODE).
+
+    Returns:
+        (str): backup mode (copy/store)
+    """
+    return os.environ.get('PINI_WORK_BKP_MODE', 'copy')
+
+
+def store_bkp(bkp, source, data):
+    """Write a backup to the blob store.
+
+    Args:
+        bkp (File): path of backup
+        source (File): file to back up
+        data (dict): backup metadata
+
+    Returns:
+        (CPWorkStoredBkp): stored backup
+    """
+    _dir = bkp.to_dir()
+    with _lock_store(_dir):
+        _entry = to_bkp_store(_dir).write_file(source)
+        _written = _entry.pop('written')
+        _entry.update(data)
+
+        _manifest = read_bkp_manifest(_dir)
+        _manifest[bkp.filename] = _entry
+        write_bkp_manifest(_dir, _manifest)
+    _LOGGER.debug(
+        ' - STORED BKP %s size=%s written=%s', bkp.path,
+        nice_size(_entry['size']), nice_size(_written))
+
+    return CPWorkStoredBkp(bkp, entry=_entry)
+
+
+def to_bkp_store(dir_):
+    """Obtain blob store for the given backup dir.
+
+    A single store is shared by all the work files in a work dir.
+
+    Args:
+        dir_ (Dir): work file backup dir
+
+    Returns:
+        (BlobStore): blob store
+    """
+    return BlobStore(dir_.to_dir().to_subdir(_STORE_NAME))
+
+
+def write_bkp_manifest(dir_, data):
+    """Write manifest of stored backups.
+
+    The manifest is written to a tmp file which is then moved into
+    place, so that the manifest can't be left partially written.
+
+    Args:
+        dir_ (Dir): work file backup dir
+        data (dict): backup filename/entry
+    """
+    _file = dir_.to_file(_MANIFEST_NAME)
+    _tmp = dir_.to_file(f'.{_MANIFEST_NAME}.tmp')
+    _tmp.write(json.dumps(data, indent=1), force=True)
+    os.replace(_tmp.path, _file.path)
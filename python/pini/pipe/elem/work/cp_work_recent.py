@@ -0,0 +1,140 @@
+"""Tools for managing the list of recently used work files.
+
+The list is stored in a yaml settings file as a list of paths, newest
+first. Building a work file object from a path requires matching it
+against the pipeline templates, so the parsed work files are stored in
+memory keyed by path, and the settings file is only re-read if it has
+been modified (eg. by another dcc session).
+
+Entries whose work dir no longer exists are pruned in a background
+thread after the settings file is read - the pruned list is written
+on the next push.
+"""
+
+import collections
+import logging
+import os
+import threading
+
+from pini import pipe
+from pini.utils import File
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CPRecentWork:
+    """Memoised list of recent work files."""
+
+    def __init__(self, file_, limit=20, prune=True):
+        """Constructor.
+
+        Args:
+            file_ (str): path to settings file
+            limit (int): maximum number of work files to store
+            prune (bool): prune missing work files in a background thread
+                when the settings file is read
+        """
+        self.file = File(file_)
+        self.limit = limit
+        self.auto_prune = prune
+
+        self._works = collections.OrderedDict()
+        self._stat = None
+        self._lock = threading.Lock()
+        self._prune_thread = None
+
+    def _read_stat(self):
+        """Read settings file modification data.
+
+        Returns:
+            (tuple|None): mtime/size (None if the file is missing)
+        """
+        try:
+            _stat = os.stat(self.file.path)
+        except OSError:
+            return None
+        return _stat.st_mtime_ns, _stat.st_size
+
+    def _update(self):
+        """Re-read settings file if it has been modified.
+
+        Work files which were already parsed are reused.
+        """
+        _stat = self._read_stat()
+        if _stat == self._stat:
+            return
+        _LOGGER.debug('READ RECENT WORK %s', self.file.path)
+        _paths = self.file.read_yml(catch=True) or []
+        _works = collections.OrderedDict()
+        for _path in _paths:
+            if _path in _works:
+                continue
+            _work = self._works.get(_path)
+            if not _work:
+                try:
+                    _work = pipe.CPWork(_path)
+                except ValueError:
+                    _LOGGER.debug(' - REJECTED %s', _path)
+                    continue
+            _works[_path] = _work
+        with self._lock:
+            self._works = _works
+            self._stat = _stat
+        if self.auto_prune:
+            self._start_prune()
+
+    def _start_prune(self):
+        """Start pruning missing work files in a background thread."""
+        if self._prune_thread and self._prune_thread.is_alive():
+            return
+        self._prune_thread = threading.Thread(target=self.prune, daemon=True)
+        self._prune_thread.start()
+
+    def prune(self):
+        """Remove work files whose work dir no longer exists.
+
+        Returns:
+            (str list): paths which were removed
+        """
+        with self._lock:
+            _works = list(self._works.items())
+        _missing = [
+            _path for _path, _work in _works if not os.path.isdir(_work.dir)]
+        if _missing:
+            _LOGGER.debug('PRUNE %d RECENT WORKS', len(_missing))
+            with self._lock:
+                for _path in _missing:
+                    self._works.pop(_path, None)
+        return _missing
+
+    def push(self, work):
+        """Add a work file to the front of the list.
+
+        Args:
+            work (CPWork): work file to add
+        """
+        _work = work.to_work(ver_n=0)
+        _path = str(_work.path)
+        self._update()
+        with self._lock:
+            self._works[_path] = _work
+            self._works.move_to_end(_path, last=False)
+            while len(self._works) > self.limit:
+                self._works.popitem()
+            _paths = list(self._works)
+        self.file.write_yml(_paths, force=True)
+        with self._lock:
+            self._stat = self._read_stat()
+
+    def to_works(self):
+        """Obtain list of recent work files.
+
+        Returns:
+            (CPWork list): recent work files (newest first)
+        """
+        self._update()
+        with self._lock:
+            return list(self._works.values())
+
+    def __len__(self):
+        return len(self.to_works())
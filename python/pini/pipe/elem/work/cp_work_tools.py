@@ -7,10 +7,12 @@ from pini.tools import error
 from pini.utils import abs_path, HOME
 
 from ...cp_utils import map_path
+from .cp_work_recent import CPRecentWork
 
 _LOGGER = logging.getLogger(__name__)
 
 RECENT_WORK_YAML = HOME.to_file(f'.pini/{dcc.NAME}_recent_work.yml')
+RECENT_WORK = CPRecentWork(RECENT_WORK_YAML)
 
 
 class NoCurrentWork(error.HandledError):
@@ -36,19 +38,7 @@ def add_recent_work(work):
     Args:
         work (CPWork): work file to add
     """
-    _v000 = work.to_work(ver_n=0)
-    _recent = recent_work()
-    _recent.insert(0, _v000)
-
-    _paths = []
-    for _work in _recent:
-        _path = str(_work.path)
-        if _path in _paths:
-            continue
-        _paths.append(_path)
-    _paths = _paths[:20]
-
-    RECENT_WORK_YAML.write_yml(_paths, force=True)
+    RECENT_WORK.push(work)
 
 
 def check_cur_work(parent=None):
@@ -113,25 +103,13 @@ def load_recent(force=False):
 def recent_work():
     """Read list of recent work file.
 
-    The newest is at the front of the list.
+    The newest is at the front of the list. The list is stored in memory
+    and only re-read if the settings file has been modified.
 
     Returns:
         (CPWork list): recent work files
     """
-    _LOGGER.debug('RECENT WORK %s', RECENT_WORK_YAML.path)
-    _LOGGER.debug(' - WORK %s', pipe.CPWork)
-
-    _paths = RECENT_WORK_YAML.read_yml(catch=True) or []
-    _works = []
-    for _path in _paths:
-        _LOGGER.debug(' - ADD PATH %s', _path)
-        try:
-            _work = pipe.CPWork(_path)
-        except ValueError:
-            _LOGGER.debug(' - REJECTED %s', _path)
-            continue
-        _works.append(_work)
-    return _works
+    return RECENT_WORK.to_works()
 
 
 def to_work(file_, catch=True):
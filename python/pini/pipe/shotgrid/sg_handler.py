@@ -3,24 +3,28 @@
 This managing iteraction with the shotgrid via the shotgun_api3 api.
 """
 
+import concurrent.futures
 import logging
 import os
 import pprint
+import threading
 import time
 
 import shotgun_api3
 
 from pini import pipe
 from pini.utils import (
-    plural, basic_repr, error_on_file_system_disabled, Video)
+    plural, basic_repr, error_on_file_system_disabled, Video, trace_span)
 
 from . import sg_utils
 
 _SG_KEY = os.environ.get('PINI_SG_KEY')
 _SG_SCRIPT_NAME = os.environ.get('PINI_SG_SCRIPT', 'PiniAccess')
 _SG_URL = os.environ.get('PINI_SG_URL')
+_SG_UPLOAD_WORKERS = int(os.environ.get('PINI_SG_UPLOAD_WORKERS', 4))
 
 _LOGGER = logging.getLogger(__name__)
+_THREAD_DATA = threading.local()
 
 
 class _CSGHandler(shotgun_api3.Shotgun):
@@ -45,8 +49,21 @@ class _CSGHandler(shotgun_api3.Shotgun):
         """
         return sorted(self.schema_entity_read().keys())
 
-    # def batch(self, data):
-    #     return super()
+    def batch(self, requests):
+        """Batch multiple requests.
+
+        Args:
+            requests (dict list): requests data
+
+        Returns:
+            (dict list): batch result
+        """
+        self.n_requests += 1
+        _start = time.time()
+        with trace_span('sg.batch', n_requests=len(requests)):
+            _result = super().batch(requests)
+        self.request_t += time.time() - _start
+        return _result
 
     def create(self, entity_type, data, safe=True):  # pylint: disable=arguments-renamed
         """Create an entity.
@@ -62,7 +79,8 @@ class _CSGHandler(shotgun_api3.Shotgun):
         if safe:
             assert entity_type in self._read_entity_types()
         try:
-            _result = super().create(entity_type, data)
+            with trace_span('sg.create', entity_type=entity_type):
+                _result = super().create(entity_type, data)
         except shotgun_api3.Fault as _exc:
             _LOGGER.warning('SHOTGRID CREATE FAILED')
             pprint.pprint(data)
@@ -116,12 +134,13 @@ class _CSGHandler(shotgun_api3.Shotgun):
                         f'Bad field{plural(_bad_fields)} {_bad_fields_s}')
 
         _start = time.time()
-        _result = super().find(
-            entity_type, filters, fields, order=order,
-            filter_operator=filter_operator, limit=limit,
-            retired_only=retired_only, page=page,
-            include_archived_projects=include_archived_projects,
-            additional_filter_presets=additional_filter_presets)
+        with trace_span('sg.find', entity_type=entity_type):
+            _result = super().find(
+                entity_type, filters, fields, order=order,
+                filter_operator=filter_operator, limit=limit,
+                retired_only=retired_only, page=page,
+                include_archived_projects=include_archived_projects,
+                additional_filter_presets=additional_filter_presets)
         self.request_t += time.time() - _start
         return _result
 
@@ -152,7 +171,66 @@ class _CSGHandler(shotgun_api3.Shotgun):
         _LOGGER.debug('SG FIND ONE %s %s %s', entity_type, filters, fields)
         self.n_requests += 1
         _start = time.time()
-        _result = super().find_one(entity_type, filters, fields)
+        with trace_span('sg.find_one', entity_type=entity_type):
+            _result = super().find_one(entity_type, filters, fields)
+        self.request_t += time.time() - _start
+        return _result
+
+    def update(  # pylint: disable=arguments-differ
+            self, entity_type, entity_id, data, **kwargs):
+        """Update the given entry.
+
+        Args:
+            entity_type (str): entity type (eg. Shot/Asset)
+            entity_id (int): entity id
+            data (dict): data to apply
+
+        Returns:
+            (dict): updated entry
+        """
+        self.n_requests += 1
+        _start = time.time()
+        with trace_span('sg.update', entity_type=entity_type):
+            _result = super().update(entity_type, entity_id, data, **kwargs)
+        self.request_t += time.time() - _start
+        return _result
+
+    def upload(  # pylint: disable=arguments-differ
+            self, entity_type, entity_id, path, **kwargs):
+        """Upload a file to the given entry.
+
+        Args:
+            entity_type (str): entity type (eg. Shot/Asset)
+            entity_id (int): entity id
+            path (str): path to file to upload
+
+        Returns:
+            (int): attachment id
+        """
+        self.n_requests += 1
+        _start = time.time()
+        with trace_span('sg.upload', entity_type=entity_type):
+            _result = super().upload(entity_type, entity_id, path, **kwargs)
+        self.request_t += time.time() - _start
+        return _result
+
+    def upload_thumbnail(  # pylint: disable=arguments-differ
+            self, entity_type, entity_id, path, **kwargs):
+        """Upload a thumbnail to the given entry.
+
+        Args:
+            entity_type (str): entity type (eg. Shot/Asset)
+            entity_id (int): entity id
+            path (str): path to thumbnail
+
+        Returns:
+            (int): attachment id
+        """
+        self.n_requests += 1
+        _start = time.time()
+        with trace_span('sg.upload_thumbnail', entity_type=entity_type):
+            _result = super().upload_thumbnail(
+                entity_type, entity_id, path, **kwargs)
         self.request_t += time.time() - _start
         return _result
 
@@ -340,6 +418,23 @@ def to_handler(force=False, use_basic=False):
     return _CSGHandler(_SG_URL, _SG_SCRIPT_NAME, _SG_KEY)
 
 
+def _to_thread_handler():
+    """Obtain a shotgrid handler for the current thread.
+
+    A handler holds a single http connection, so it can't be shared
+    between threads - worker threads are each given their own handler.
+
+    Returns:
+        (CSGHandler): pini shotgrid handler
+    """
+    if threading.current_thread() is threading.main_thread():
+        return to_handler()
+    if not getattr(_THREAD_DATA, 'handler', None):
+        to_handler()  # Check env
+        _THREAD_DATA.handler = _CSGHandler(_SG_URL, _SG_SCRIPT_NAME, _SG_KEY)
+    return _THREAD_DATA.handler
+
+
 def update(entity_type, entity_id, data):
     """Update the given entry.
 
@@ -394,5 +489,33 @@ def upload_thumbnail(entity_type, entity_id, path):
         entity_id (int): entity id
         path (str): path to thumbnail
     """
-    to_handler().upload_thumbnail(
+    _to_thread_handler().upload_thumbnail(
         entity_type=entity_type, entity_id=entity_id, path=path)
+
+
+def upload_thumbnails(entity_type, thumbs, max_workers=None):
+    """Upload thumbnails for a list of entries.
+
+    Uploads are run concurrently, using a bounded pool of threads which
+    each hold their own shotgrid connection.
+
+    Args:
+        entity_type (str): entity type (eg. PublishedFile)
+        thumbs (tuple list): list of entity id/thumbnail path
+        max_workers (int): maximum number of concurrent uploads
+            (default is $PINI_SG_UPLOAD_WORKERS)
+    """
+    if not thumbs:
+        return
+    _start = time.time()
+    _workers = min(max_workers or _SG_UPLOAD_WORKERS, len(thumbs))
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=_workers) as _pool:
+        _futures = [
+            _pool.submit(upload_thumbnail, entity_type, _id, _path)
+            for _id, _path in thumbs]
+        for _future in concurrent.futures.as_completed(_futures):
+            _future.result()
+    _LOGGER.info(
+        ' - UPLOADED %d THUMBS IN %.01fs (%d WORKERS)', len(thumbs),
+        time.time() - _start, _workers)
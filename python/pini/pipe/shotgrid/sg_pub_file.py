@@ -1,5 +1,6 @@
 """Tools for managing PublishedFile entries in shotgrid."""
 
+import collections
 import logging
 import operator
 import os
@@ -11,7 +12,8 @@ import time
 from pini import pipe, qt
 from pini.pipe import cache
 from pini.utils import (
-    Seq, Video, TMP, single, File, to_str, abs_path, check_heart, safe_zip)
+    Seq, Video, TMP, single, File, to_str, abs_path, check_heart, safe_zip,
+    build_thumbnails)
 
 from . import sg_handler
 
@@ -126,27 +128,52 @@ def _apply_thumb(thumb, id_, path=None):
         path (Path): path being registered
     """
     from pini.pipe import shotgrid
+    _thumb = _obt_thumb(thumb=thumb, path=path)
+    if _thumb:
+        shotgrid.upload_thumbnail('PublishedFile', id_, _thumb.path)
+
+
+def _obt_thumb(thumb, path=None, tmp=None):
+    """Obtain thumbnail image to apply.
+
+    If no thumbnail is given, a thumbnail is built for image sequences
+    and videos.
+
+    Args:
+        thumb (File): thumbnail image
+        path (Path): path being registered
+        tmp (File): override path for built thumbnail
 
-    # Obtain thumb
+    Returns:
+        (File|None): thumbnail (if any)
+    """
     _thumb = thumb
-    if not _thumb:
-        _build_thumb = False
-        if (
-                isinstance(path, Seq) and
-                path.extn not in pipe.OUTPUT_SEQ_CACHE_EXTNS and
-                path.extn not in ('iff', )):
-            _build_thumb = True
-        elif isinstance(path, Video):
-            _build_thumb = True
-        if _build_thumb:
-            path.build_thumbnail(_TMP_THUMB, width=None, force=True)
-            _thumb = _TMP_THUMB
-
-    # Apply thumb
+    if not _thumb and _can_build_thumb(path):
+        _thumb = tmp or _TMP_THUMB
+        path.build_thumbnail(_thumb, width=None, force=True)
+
     if _thumb:
-        _LOGGER.debug(' - APPLY THUMB %s', _thumb)
+        _LOGGER.debug(' - THUMB %s', _thumb)
         assert _thumb.exists()
-        shotgrid.upload_thumbnail('PublishedFile', id_, _thumb.path)
+
+    return _thumb
+
+
+def _can_build_thumb(path):
+    """Test whether a thumbnail can be built for the given path.
+
+    Args:
+        path (Path): path being registered
+
+    Returns:
+        (bool): whether thumbnail can be built (image sequences
+            and videos)
+    """
+    if isinstance(path, Seq):
+        return (
+            path.extn not in pipe.OUTPUT_SEQ_CACHE_EXTNS and
+            path.extn not in ('iff', ))
+    return isinstance(path, Video)
 
 
 def _build_path_data(file_, name=None):
@@ -362,9 +389,53 @@ def _find_sg_pub(output, sg_ety):
         (SGCPubFile|None): pub file entry (if any)
     """
     _LOGGER.info(' - FIND SG PUB %s', output)
+    return _select_sg_pub(
+        output, sg_pubs=sg_ety.find_pub_files(path=output.path))
+
+
+def _find_sg_pubs(outputs):
+    """Find any existing shotgrid published files for a list of outputs.
 
-    _sg_pubs = sg_ety.find_pub_files(path=output.path)
-    _sg_pubs.sort(key=operator.attrgetter('updated_at'))
+    The pub files of each entity are read once, and then matched to the
+    outputs by path.
+
+    Args:
+        outputs (CPOutput list): outputs to search for
+
+    Returns:
+        (dict): output/pub file entry (if any)
+    """
+    _ety_outs = collections.defaultdict(list)
+    for _out in outputs:
+        _ety_outs[_out.entity].append(_out)
+
+    _sg_pubs = {}
+    for _ety, _outs in _ety_outs.items():
+        _LOGGER.info(' - FIND SG PUBS %s (%d outputs)', _ety, len(_outs))
+        _path_pubs = collections.defaultdict(list)
+        for _sg_pub in _ety.sg_entity.find_pub_files():
+            _path_pubs[_sg_pub.path].append(_sg_pub)
+        for _out in _outs:
+            _sg_pubs[_out] = _select_sg_pub(
+                _out, sg_pubs=_path_pubs[_out.path])
+
+    return _sg_pubs
+
+
+def _select_sg_pub(output, sg_pubs):
+    """Select shotgrid published file to use for the given output.
+
+    If there more than one file matches then all but the latest one are
+    omitted.
+
+    Args:
+        output (CPOutput): output being registered
+        sg_pubs (SGCPubFile list): pub files matching output path
+
+    Returns:
+        (SGCPubFile|None): pub file entry (if any)
+    """
+    _sg_pubs = sorted(sg_pubs, key=operator.attrgetter('updated_at'))
     if len(_sg_pubs) == 1:
         _sg_pub = single(_sg_pubs)
         _LOGGER.info(' - MATCHED SINGLE PUB %d %s', _sg_pub.id_, _sg_pub)
@@ -374,7 +445,7 @@ def _find_sg_pub(output, sg_ety):
         return None
 
     # Test for a single or no entry that is not omitted
-    _unomitted = sg_ety.find_pub_files(path=output.path, omitted=False)
+    _unomitted = [_sg_pub for _sg_pub in _sg_pubs if not _sg_pub.omitted]
     if len(_unomitted) == 1:
         _sg_pub = single(_unomitted)
         _LOGGER.info(' - MATCHED SINGLE UNOMITTED %d %s', _sg_pub.id_, _sg_pub)
@@ -561,26 +632,36 @@ def _normalise_path_to_pipeline(path, entity):
 
 
 def create_pub_files_from_outputs(
-        outputs, thumb=None, upstream_files=None, force=False):
+        outputs, thumb=None, upstream_files=None, force=False,
+        max_workers=None):
     """Create mutiple pub files from outputs in batch operation.
 
+    Existing entries are found using one query per entity, entries are
+    then created/updated in a single batch request, and thumbnails are
+    built and uploaded concurrently. Only the pipeline cache of the
+    entities which were updated is refreshed.
+
     Args:
         outputs (CPOutput list): outputs to register
         thumb (str): path to thumbnail
         upstream_files (list): upstream files
         force (bool): update existing entries
+        max_workers (int): maximum number of concurrent thumbnail
+            builds/uploads
 
     Returns:
         (dict list): new entries data
     """
+    from pini.pipe import shotgrid
 
     # Prepare batch data
     _batch_data = []
     _batch_outs = []
     _results_map = {}
+    _sg_pubs = _find_sg_pubs(outputs)
     for _out in outputs:
 
-        _sg_pub = _find_sg_pub(_out, sg_ety=_out.entity.sg_entity)
+        _sg_pub = _sg_pubs[_out]
         if _sg_pub and not force:
             _results_map[_out] = {
                 'id': _sg_pub.id_, 'entity_type': 'PublishedFile'}
@@ -613,22 +694,42 @@ def create_pub_files_from_outputs(
         for _out, _result in safe_zip(_batch_outs, _batch_result):
             _results_map[_out] = {
                 'id': _result['id'], 'entity_type': 'PublishedFile'}
-
-    # Update cache (required for thumbs)
     _results = [_results_map[_out] for _out in outputs]
     _LOGGER.debug(' - RESULTS %s', pprint.pformat(_results))
-    pipe.CACHE.reset()
 
-    # Apply thumbs
-    for _out, _result in qt.progress_bar(
-            safe_zip(outputs, _results),
-            'Applying {:d} shotgrid thumb{}', stack_key='BatchThumbs'):
+    # Update cache of updated entities (required for thumbs)
+    _etys = {_out.entity for _out in _batch_outs}
+    for _ety in sorted(_etys):
+        _LOGGER.debug(' - UPDATING CACHE %s', _ety)
+        pipe.CACHE.obt(_ety).find_outputs(force=True)
+
+    # Build thumbs (in batch)
+    _thumbs = []
+    _builds = []
+    for _out, _result in safe_zip(outputs, _results):
         _out = pipe.CACHE.obt(_out)
         _thumb = thumb
         if _out.is_media() or _out.content_type in ('Texture', ):
             _thumb = None
         elif thumb and not _thumb:
             continue
-        _apply_thumb(thumb=_thumb, id_=_result['id'], path=_out)
+        if _thumb:
+            _thumb = _obt_thumb(thumb=_thumb, path=_out)
+            _thumbs.append((_result['id'], File(_thumb).path))
+        elif _can_build_thumb(_out):
+            _tmp = TMP.to_file(f'PiniTmp/thumb_{_result["id"]:d}.jpg')
+            _builds.append((_result['id'], _out, _tmp))
+    if _builds:
+        _built = build_thumbnails(
+            [_out for _, _out, _ in _builds],
+            [_tmp for _, _, _tmp in _builds], width=None, force=True,
+            max_workers=max_workers, catch=True)
+        for (_id, _, _), _thumb in safe_zip(_builds, _built):
+            if _thumb:
+                _thumbs.append((_id, _thumb.path))
+
+    # Upload thumbs
+    shotgrid.upload_thumbnails(
+        'PublishedFile', _thumbs, max_workers=max_workers)
 
     return _results
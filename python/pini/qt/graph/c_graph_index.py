@@ -0,0 +1,274 @@
+"""Tools for managing a spatial index of graph space elements.
+
+The index is a uniform grid in graph space - each top level element is
+stored in each cell which its bounds overlap, where an element's bounds
+is the union of the regions it and its children draw in. This allows
+the elements in a region (eg. the visible area, or a click position) to
+be found without testing every element in the graph.
+
+Elements are flagged when they move or resize, and their bounds are
+updated on the next query.
+"""
+
+import logging
+import math
+
+from ..q_mgr import QtCore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CGraphIndex:
+    """Spatial index of the top level elements in a graph space."""
+
+    def __init__(self, cell_size=250.0, max_cells=256):
+        """Constructor.
+
+        Args:
+            cell_size (float): grid cell size (in graph space)
+            max_cells (int): elements which overlap more than this number
+                of cells are not stored in the grid, and are always
+                returned as candidates
+        """
+        self.cell_size = cell_size
+        self.max_cells = max_cells
+
+        self.elems = []
+        self._order = {}
+        self._bounds = {}
+        self._cells = {}
+        self._large = set()
+        self._dirty = set()
+
+    def add_elem(self, elem):
+        """Add an element to the index.
+
+        Its bounds are read on the next query.
+
+        Args:
+            elem (CGBasicElem): top level element to add
+        """
+        self._order[elem] = len(self.elems)
+        self.elems.append(elem)
+        self._dirty.add(elem)
+
+    def flush(self):
+        """Remove all elements from the index."""
+        self.elems = []
+        self._order = {}
+        self._bounds = {}
+        self._cells = {}
+        self._large = set()
+        self._dirty = set()
+
+    def flag_elem(self, elem):
+        """Flag that an element has moved or resized.
+
+        Args:
+            elem (CGBasicElem): top level element
+
+        Returns:
+            (QRectF|None): element's bounds before the change (if indexed)
+        """
+        if elem not in self._order:
+            return None
+        self._dirty.add(elem)
+        _bounds = self._bounds.get(elem)
+        if not _bounds:
+            return None
+        return _bounds_to_rect(_bounds)
+
+    def update(self):
+        """Update bounds of flagged elements."""
+        if not self._dirty:
+            return
+        _LOGGER.log(9, 'UPDATE INDEX %d ELEMS', len(self._dirty))
+        for _elem in self._dirty:
+            self._remove_cells(_elem)
+            _bounds = _read_elem_bounds(_elem)
+            self._bounds[_elem] = _bounds
+            _cells = list(self._to_cells(_bounds))
+            if len(_cells) > self.max_cells:
+                self._large.add(_elem)
+                continue
+            for _cell in _cells:
+                self._cells.setdefault(_cell, []).append(_elem)
+        self._dirty = set()
+
+    def _remove_cells(self, elem):
+        """Remove an element from the grid.
+
+        Args:
+            elem (CGBasicElem): element to remove
+        """
+        _bounds = self._bounds.pop(elem, None)
+        if not _bounds:
+            return
+        if elem in self._large:
+            self._large.remove(elem)
+            return
+        for _cell in self._to_cells(_bounds):
+            _elems = self._cells[_cell]
+            _elems.remove(elem)
+            if not _elems:
+                del self._cells[_cell]
+
+    def _to_cells(self, bounds):
+        """Obtain the grid cells which overlap the given bounds.
+
+        Args:
+            bounds (tuple): left/top/right/bottom bounds
+
+        Returns:
+            (iterator): cell indices
+        """
+        _l_idx, _t_idx, _r_idx, _b_idx = self._to_cell_range(bounds)
+        for _x_idx in range(_l_idx, _r_idx + 1):
+            for _y_idx in range(_t_idx, _b_idx + 1):
+                yield _x_idx, _y_idx
+
+    def _to_cell_range(self, bounds):
+        """Obtain range of cell indices overlapped by the given bounds.
+
+        Args:
+            bounds (tuple): left/top/right/bottom bounds
+
+        Returns:
+            (tuple): left/top/right/bottom cell indices
+        """
+        _left, _top, _right, _bottom = bounds
+        return (
+            math.floor(_left / self.cell_size),
+            math.floor(_top / self.cell_size),
+            math.floor(_right / self.cell_size),
+            math.floor(_bottom / self.cell_size))
+
+    def to_bounds(self, elem):
+        """Obtain bounds of the given element.
+
+        Args:
+            elem (CGBasicElem): top level element
+
+        Returns:
+            (QRectF): bounds (in graph space)
+        """
+        self.update()
+        return _bounds_to_rect(self._bounds[elem])
+
+    def find_elems(self, rect):
+        """Find elements whose bounds overlap the given rect.
+
+        Args:
+            rect (QRectF|QRectF list): region to search (in graph space) -
+                if a list is passed, elements overlapping any of the
+                regions are returned
+
+        Returns:
+            (CGBasicElem list): top level elements (in draw order)
+        """
+        self.update()
+        _elems = set()
+        for _rect in rect if isinstance(rect, list) else [rect]:
+            _elems |= self._find_rect_elems(_rect)
+        return sorted(_elems, key=self._order.get)
+
+    def _find_rect_elems(self, rect):
+        """Find elements whose bounds overlap the given rect.
+
+        Args:
+            rect (QRectF): region to search (in graph space)
+
+        Returns:
+            (set): top level elements
+        """
+        _bounds = _rect_to_bounds(rect)
+        _l_idx, _t_idx, _r_idx, _b_idx = self._to_cell_range(_bounds)
+        _n_cells = (_r_idx - _l_idx + 1) * (_b_idx - _t_idx + 1)
+
+        # Find candidates - if the region covers lots of cells, it's
+        # faster to check the bounds of every element
+        if _n_cells > len(self._cells):
+            _cands = self.elems
+        else:
+            _cands = set(self._large)
+            for _cell in self._to_cells(_bounds):
+                _cands.update(self._cells.get(_cell, ()))
+
+        return {
+            _elem for _elem in _cands
+            if _bounds_overlap(self._bounds[_elem], _bounds)}
+
+    def find_elems_at(self, pos):
+        """Find elements whose bounds contain the given point.
+
+        Args:
+            pos (QPointF): point to test (in graph space)
+
+        Returns:
+            (CGBasicElem list): top level elements (in draw order)
+        """
+        return self.find_elems(QtCore.QRectF(pos, QtCore.QSizeF(0, 0)))
+
+    def __contains__(self, elem):
+        return elem in self._order
+
+    def __len__(self):
+        return len(self.elems)
+
+
+def _bounds_overlap(bounds_a, bounds_b):
+    """Test whether two bounds overlap (including touching edges).
+
+    Args:
+        bounds_a (tuple): left/top/right/bottom bounds
+        bounds_b (tuple): left/top/right/bottom bounds
+
+    Returns:
+        (bool): whether bounds overlap
+    """
+    return (
+        bounds_a[0] <= bounds_b[2] and bounds_b[0] <= bounds_a[2] and
+        bounds_a[1] <= bounds_b[3] and bounds_b[1] <= bounds_a[3])
+
+
+def _bounds_to_rect(bounds):
+    """Convert bounds to a rect.
+
+    Args:
+        bounds (tuple): left/top/right/bottom bounds
+
+    Returns:
+        (QRectF): rect
+    """
+    _left, _top, _right, _bottom = bounds
+    return QtCore.QRectF(_left, _top, _right - _left, _bottom - _top)
+
+
+def _rect_to_bounds(rect):
+    """Convert a rect to bounds.
+
+    Args:
+        rect (QRectF): rect to convert
+
+    Returns:
+        (tuple): left/top/right/bottom bounds
+    """
+    _rect = rect.normalized()
+    return (
+        _rect.left(), _rect.top(),
+        _rect.left() + _rect.width(), _rect.top() + _rect.height())
+
+
+def _read_elem_bounds(elem):
+    """Read bounds of an element, including all of its children.
+
+    Args:
+        elem (CGBasicElem): element to read
+
+    Returns:
+        (tuple): left/top/right/bottom bounds
+    """
+    _rect = QtCore.QRectF(elem.draw_rect_g)
+    for _child in elem.find_elems():
+        _rect |= _child.draw_rect_g
+    return _rect_to_bounds(_rect)
@@ -1,23 +1,37 @@
-"""Tools for managing a graph space container."""
+"""Tools for managing a graph space container.
+
+The background, grid and elements are rendered to a cached scene pixmap,
+and overlays (eg. draw callbacks, controls) are drawn on top of this on
+each redraw. Elements flag when they move, resize or change selection,
+which allows redraw_dirty to re-render just the regions of the scene
+which have changed. When the space is panned, the cached scene is
+shifted and only the exposed strips are rendered. Elements are stored
+in a spatial index (see CGraphIndex), which is used to find the elements
+to draw in a region and the elements under a click.
+"""
 
 # pylint: disable=too-many-public-methods,too-many-instance-attributes
 
 import collections
 import logging
 import operator
+import time
 
 from pini.utils import strftime, check_heart, HOME, File
 
 from .. import wrapper, q_utils
 from ..q_mgr import QtGui, QtCore, Qt
 
-from . import c_graph_elem
+from . import c_graph_elem, c_graph_index
 
 _LOGGER = logging.getLogger(__name__)
 
 _MAJ_GRAPH_LINE_COL = wrapper.CColor('Grey', alpha=0.25)
 _MIN_GRAPH_LINE_COL = wrapper.CColor('Grey', alpha=0.75)
 
+_DIRTY_PAD_P = 8
+_MAX_DIRTY_RECTS = 16
+
 
 class CGraphSpace(wrapper.CPixmapLabel, c_graph_elem.CGraphElemBase):
     """Represents a graph, a window into a pannable 2D space."""
@@ -26,6 +40,9 @@ class CGraphSpace(wrapper.CPixmapLabel, c_graph_elem.CGraphElemBase):
     _settings_file = None
     _window = None
 
+    _scene = None
+    _scene_view = None
+
     def __init__(
             self, parent, col='BottleGreen', legend='Graph Space'):
         """Constructor.
@@ -38,9 +55,16 @@ class CGraphSpace(wrapper.CPixmapLabel, c_graph_elem.CGraphElemBase):
         super().__init__(parent, col=col, margin=0)
 
         self.elems = []
+        self.index = c_graph_index.CGraphIndex()
         self.draw_callbacks = []
         self.legend = legend
 
+        # Dirty region tracking
+        self._dirty_rects_g = []
+        self._dirty_elems = set()
+        self._overlay_kwargs = {}
+        self._press_callback = False
+
         # Offset + zoom controls
         self.offset_p = wrapper.CVector2D()
         self.zoom = 1.0
@@ -60,6 +84,8 @@ class CGraphSpace(wrapper.CPixmapLabel, c_graph_elem.CGraphElemBase):
         """
         if not self._window:
             _parent = self.parent()
+            if not _parent:
+                return None
             while _parent.parent():
                 check_heart()
                 # _LOGGER.info(' - PARENT %s', _parent)
@@ -118,14 +144,164 @@ class CGraphSpace(wrapper.CPixmapLabel, c_graph_elem.CGraphElemBase):
             grid (bool): draw background grid
             shortcuts (bool): list shortcuts in the bottom right
         """
-        super().draw_pixmap(pix)
+        self._scene = self._render_scene(grid=grid)
+        self._scene_view = self._to_view(grid=grid)
+        self._dirty_rects_g = []
+        self._dirty_elems = set()
+
+        self._overlay_kwargs = {
+            'markers': markers, 'controls': controls, 'shortcuts': shortcuts}
+        self._draw_overlays(pix, **self._overlay_kwargs)
+
+    def redraw_dirty(self):
+        """Redraw this space, only updating regions which have changed.
+
+        Regions flagged by elements are re-rendered, and if the space has
+        been panned the cached scene is shifted so that only the exposed
+        areas need to be rendered. If the scene can't be updated (eg. on
+        zoom or resize) then a full redraw is applied.
+
+        Returns:
+            (CPixmap): space pixmap
+        """
+        if (
+                self._scene is None or
+                self.draw_pixmap_func or
+                self.draw_sel):
+            return self.redraw()
+        _grid = self._scene_view[-1]
+        _view = self._to_view(grid=_grid)
+        if (
+                _view[:2] != self._scene_view[:2] or
+                _view[3:] != self._scene_view[3:]):
+            return self.redraw()
+
+        # Find regions to update
+        _scene_rect = self._scene.rect()
+        _regions = []
+        _offs_x, _offs_y = _view[2]
+        _d_x = _offs_x - self._scene_view[2][0]
+        _d_y = _offs_y - self._scene_view[2][1]
+        if _d_x or _d_y:
+            if (
+                    _d_x != int(_d_x) or _d_y != int(_d_y) or
+                    abs(_d_x) >= _scene_rect.width() or
+                    abs(_d_y) >= _scene_rect.height()):
+                return self.redraw()
+            self._scene = _shift_pixmap(self._scene, int(_d_x), int(_d_y))
+            _regions += _to_exposed_rects(_scene_rect, int(_d_x), int(_d_y))
+        _regions += self._read_dirty_rects()
+        _LOGGER.log(9, 'REDRAW DIRTY %s %d REGIONS', self, len(_regions))
+
+        # Render regions
+        _regions = [
+            _region.intersected(_scene_rect) for _region in _regions]
+        _regions = [_region for _region in _regions if not _region.isEmpty()]
+        if _regions:
+            _render = self._render_scene(regions=_regions, grid=_grid)
+            for _region in _regions:
+                _paste_pixmap(self._scene, _render, rect=_region)
+        self._scene_view = _view
+
+        _pix = wrapper.CPixmap(self.size())
+        _pix.fill('Transparent')
+        self._draw_overlays(_pix, **self._overlay_kwargs)
+        self.setPixmap(_pix)
+        self.update_t = time.time()
+        return _pix
+
+    def _to_view(self, grid):
+        """Obtain data which describes the current view of the scene.
+
+        If any of this changes, apart from offset, the whole scene needs
+        to be re-rendered.
+
+        Args:
+            grid (bool): whether grid is drawn
+
+        Returns:
+            (tuple): size, zoom, offset, colour and grid
+        """
+        _col = q_utils.to_col(self.col)
+        return (
+            (self.width(), self.height()), self.zoom,
+            (self.offset_p.x(), self.offset_p.y()), _col.name(), grid)
+
+    def _read_dirty_rects(self):
+        """Read regions which have been flagged since the last redraw.
+
+        Returns:
+            (QRect list): dirty regions (in pixmap space)
+        """
+        for _elem in self._dirty_elems:
+            if _elem in self.index:
+                self._dirty_rects_g.append(self.index.to_bounds(_elem))
+        _rects = []
+        for _rect_g in self._dirty_rects_g:
+            _rect_p = self.g2p(_rect_g).adjusted(
+                -_DIRTY_PAD_P, -_DIRTY_PAD_P, _DIRTY_PAD_P, _DIRTY_PAD_P)
+            _rects.append(_rect_p.toAlignedRect())
+        if len(_rects) > _MAX_DIRTY_RECTS:
+            _rect = _rects[0]
+            for _other in _rects[1:]:
+                _rect |= _other
+            _rects = [_rect]
+        self._dirty_rects_g = []
+        self._dirty_elems = set()
+        return _rects
+
+    def flag_dirty(self, elem, moved=False):
+        """Flag that an element needs to be redrawn.
+
+        This is called by elements when they change.
+
+        Args:
+            elem (CGBasicElem): element which has changed
+            moved (bool): whether the element has moved or resized (in
+                which case its bounds in the index need updating)
+        """
+        _top = elem
+        while _top.parent:
+            _top = _top.parent
+        if moved:
+            _bounds = self.index.flag_elem(_top)
+            if _bounds:
+                self._dirty_rects_g.append(_bounds)
+            self._dirty_elems.add(_top)
+        elif elem.size_g is not None:
+            self._dirty_rects_g.append(elem.rect_g)
+
+    def _render_scene(self, regions=None, grid=True):
+        """Render the scene (background, grid and elements).
 
-        # Draw background grid
+        Args:
+            regions (QRect list): only draw elements which overlap these
+                regions (in pixmap space) - the rest of the pixmap is
+                not valid
+            grid (bool): draw background grid
+
+        Returns:
+            (CPixmap): scene pixmap
+        """
+        _pix = wrapper.CPixmap(self.size())
+        _pix.fill('Transparent')
+        super().draw_pixmap(_pix)
         if grid:
-            self._draw_grid(pix)
+            self._draw_grid(_pix, regions=regions)
+        self._draw_elems(pix=_pix, regions=regions)
+        return _pix
 
-        # Draw elements
-        self._draw_elems(pix=pix)
+    def _draw_overlays(
+            self, pix, markers=False, controls=True, shortcuts=True):
+        """Draw cached scene and overlays.
+
+        Args:
+            pix (CPixmap): pixmap to draw on
+            markers (bool): draw markers (drag marker overlays)
+            controls (bool): draw controls in bottom left (offset/zoom data)
+            shortcuts (bool): list shortcuts in the bottom right
+        """
+        pix.draw_overlay(self._scene)
 
         # Execute draw callbacks
         for _callback in self.draw_callbacks:
@@ -142,24 +318,43 @@ class CGraphSpace(wrapper.CPixmapLabel, c_graph_elem.CGraphElemBase):
         if self.legend:
             pix.draw_text(self.legend, (10, 10))
 
-    def _draw_elems(self, pix):
+    def _draw_elems(self, pix, regions=None):
         """Draw elements on this graph's pixmap.
 
+        Elements whose bounds overlap the pixmap are found using the index,
+        padded to allow for overdraw (eg. selection outlines).
+
         Args:
             pix (CPixmap): pixmap to draw on
+            regions (QRect list): override regions to draw (in pixmap space)
         """
-        _rect_p = pix.rect()
-        _rect_g = self.p2g(_rect_p)
+        self._sync_index()
+        _rects_g = []
+        for _rect_p in regions or [pix.rect()]:
+            _rect_p = QtCore.QRectF(_rect_p).adjusted(
+                -_DIRTY_PAD_P, -_DIRTY_PAD_P, _DIRTY_PAD_P, _DIRTY_PAD_P)
+            _rects_g.append(self.p2g(_rect_p))
         _n_elems_drawn = 0
-        for _elem in self.elems:
-            if not _rect_g.intersects(_elem.rect_g):
-                continue
+        for _elem in self.index.find_elems(_rects_g):
             if _elem.is_tiny():
                 continue
             _elem.draw(pix=pix)
             _n_elems_drawn += 1
         _LOGGER.debug(' - DREW %d ELEMS', _n_elems_drawn)
 
+    def _sync_index(self):
+        """Make sure the index contains this space's elements.
+
+        The index is rebuilt if the list of elements has been modified
+        directly (rather than using append_child_elem/flush_elems).
+        """
+        if self.index.elems == self.elems:
+            return
+        _LOGGER.debug('REBUILD INDEX %s', self)
+        self.index.flush()
+        for _elem in self.elems:
+            self.index.add_elem(_elem)
+
     def _draw_markers(self, pix):
         """Draw offset/zoom markers.
 
@@ -233,15 +428,26 @@ class CGraphSpace(wrapper.CPixmapLabel, c_graph_elem.CGraphElemBase):
             _text, pix.rect().bottomRight() - q_utils.to_p(10, 10),
             anchor='BR')
 
-    def _draw_grid(self, pix):
+    def _draw_grid(self, pix, regions=None):
         """Draw background grid.
 
         Args:
             pix (CPixmap): pixmap to draw on
+            regions (QRect list): only draw the grid in these regions (in
+                pixmap space) - lines are clipped to the regions so that
+                no part of a line is drawn twice
         """
         _step = 100 if self.zoom > 0.1 else 1000
-        _rect_p = pix.rect()
-        _rect_g = self.p2g(_rect_p)
+        if regions:
+            _rects_g = [
+                self.p2g(QtCore.QRectF(_region).adjusted(
+                    -_DIRTY_PAD_P, -_DIRTY_PAD_P, _DIRTY_PAD_P, _DIRTY_PAD_P))
+                for _region in regions]
+        else:
+            _rects_g = [self.p2g(pix.rect())]
+        _rect_g = QtCore.QRectF(_rects_g[0])
+        for _other_g in _rects_g[1:]:
+            _rect_g |= _other_g
         _LOGGER.log(9, 'DRAW GRID %s', _rect_g)
 
         # Draw vertical lines
@@ -249,11 +455,15 @@ class CGraphSpace(wrapper.CPixmapLabel, c_graph_elem.CGraphElemBase):
         _LOGGER.log(9, ' - X PLOT START %f', _x_plot_g)
         while _x_plot_g < _rect_g.right() + _step:
             check_heart()
-            _top_g = q_utils.to_p(_x_plot_g, _rect_g.top())
-            _bot_g = q_utils.to_p(_x_plot_g, _rect_g.bottom())
             _col = (_MAJ_GRAPH_LINE_COL if _x_plot_g % 1000
                     else _MIN_GRAPH_LINE_COL)
-            pix.draw_line(self.g2p(_top_g), self.g2p(_bot_g), col=_col)
+            for _top, _bot in _merge_spans([
+                    (_rect.top(), _rect.bottom()) for _rect in _rects_g
+                    if _rect.left() <= _x_plot_g <= _rect.right()] if regions
+                    else [(_rect_g.top(), _rect_g.bottom())]):
+                _top_g = q_utils.to_p(_x_plot_g, _top)
+                _bot_g = q_utils.to_p(_x_plot_g, _bot)
+                pix.draw_line(self.g2p(_top_g), self.g2p(_bot_g), col=_col)
             _x_plot_g += _step
 
         # Draw horizontal lines
@@ -261,16 +471,32 @@ class CGraphSpace(wrapper.CPixmapLabel, c_graph_elem.CGraphElemBase):
         _LOGGER.log(9, ' - Y PLOT START %f', _y_plot_g)
         while _y_plot_g < _rect_g.bottom() + _step:
             check_heart()
-            _left_g = q_utils.to_p(_rect_g.left(), _y_plot_g)
-            _right_g = q_utils.to_p(_rect_g.right(), _y_plot_g)
             _col = (_MAJ_GRAPH_LINE_COL if _y_plot_g % 1000
                     else _MIN_GRAPH_LINE_COL)
-            pix.draw_line(self.g2p(_left_g), self.g2p(_right_g), col=_col)
+            for _left, _right in _merge_spans([
+                    (_rect.left(), _rect.right()) for _rect in _rects_g
+                    if _rect.top() <= _y_plot_g <= _rect.bottom()] if regions
+                    else [(_rect_g.left(), _rect_g.right())]):
+                _left_g = q_utils.to_p(_left, _y_plot_g)
+                _right_g = q_utils.to_p(_right, _y_plot_g)
+                pix.draw_line(
+                    self.g2p(_left_g), self.g2p(_right_g), col=_col)
             _y_plot_g += _step
 
+    def append_child_elem(self, elem):
+        """Add element to this space.
+
+        Args:
+            elem (CGraphElem): element to add
+        """
+        super().append_child_elem(elem)
+        self.index.add_elem(elem)
+
     def flush_elems(self):
         """Flush all elements and empty the graph."""
         self.elems = []
+        self.index.flush()
+        self._scene = None
 
     def frame_elems(
             self, margin_fr=0.05, draw_region=False, elems=None, anchor='C'):
@@ -348,6 +574,24 @@ class CGraphSpace(wrapper.CPixmapLabel, c_graph_elem.CGraphElemBase):
 
         self.redraw()
 
+    def find_elems_at(self, pos_g):
+        """Find visible elements at the given position.
+
+        Args:
+            pos_g (QPointF): position to test (in graph space)
+
+        Returns:
+            (CGBasicElem list): elements (highest level first)
+        """
+        self._sync_index()
+        _elems = []
+        for _top in self.index.find_elems_at(pos_g):
+            for _elem in [_top] + _top.find_elems():
+                if _elem.visible and _elem.contains(pos_g):
+                    _elems.append(_elem)
+        _elems.sort(key=operator.attrgetter('level'), reverse=True)
+        return _elems
+
     def clear_selection(self):
         """Clear current selection."""
         for _elem in self.find_elems():
@@ -361,7 +605,7 @@ class CGraphSpace(wrapper.CPixmapLabel, c_graph_elem.CGraphElemBase):
         """
         self.clear_selection()
         elem.selected = True
-        self.redraw()
+        self.redraw_dirty()
 
     def reset_selected_elems(self):
         """Reset selected elements."""
@@ -509,15 +753,14 @@ class CGraphSpace(wrapper.CPixmapLabel, c_graph_elem.CGraphElemBase):
         # Check for elems accepting event - if the event isn't passed from a
         # higher level element, elements underneath don't recieve event
         self.drag_elem = None
+        self._press_callback = False
         _click_elems = []
         if event.button() == Qt.LeftButton:
-            _click_elems = [
-                _elem for _elem in self.find_elems()
-                if _elem.visible and _elem.contains(_pos_g)]
-            _click_elems.sort(key=operator.attrgetter('level'), reverse=True)
+            _click_elems = self.find_elems_at(_pos_g)
 
         # Pass click down through elements until one blocks it
         for _elem in _click_elems:
+            self._press_callback |= bool(_elem.callback)
             _event = _elem.mousePressEvent(event=_event)
             _LOGGER.debug(
                 ' - PRESS IN ELEM %s level=%d event=%s %d', _elem,
@@ -561,7 +804,7 @@ class CGraphSpace(wrapper.CPixmapLabel, c_graph_elem.CGraphElemBase):
                 self.offset_p = wrapper.CVector2D(self.offset_p)
                 # self.update_t = time.time()
 
-            self.redraw()
+            self.redraw_dirty()
 
     def mouseReleaseEvent(self, event):
         """Triggered by mouse release.
@@ -576,7 +819,11 @@ class CGraphSpace(wrapper.CPixmapLabel, c_graph_elem.CGraphElemBase):
             self.drag_elem.mouseReleaseEvent(event)
             self.drag_elem = None
 
-        self.redraw()
+        # Callbacks can make changes which aren't flagged
+        if self._press_callback:
+            self.redraw()
+        else:
+            self.redraw_dirty()
 
     def mouseDoubleClickEvent(self, event):
         """Triggered by mouse double click.
@@ -665,6 +912,85 @@ class CGraphSpace(wrapper.CPixmapLabel, c_graph_elem.CGraphElemBase):
         self.redraw()
 
 
+def _paste_pixmap(pix, over, pos=None, rect=None):
+    """Paste a pixmap onto another, replacing the pixels underneath.
+
+    Args:
+        pix (QPixmap): pixmap to paste onto
+        over (QPixmap): pixmap to paste
+        pos (QPoint): paste position
+        rect (QRect): paste only this region of the pixmap (the
+            region is pasted to the same position)
+    """
+    _pnt = QtGui.QPainter()
+    _pnt.begin(pix)
+    _pnt.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+    if rect:
+        _pnt.drawPixmap(rect, over, rect)
+    else:
+        _pnt.drawPixmap(pos, over)
+    _pnt.end()
+
+
+def _merge_spans(spans):
+    """Merge overlapping spans.
+
+    Args:
+        spans (tuple list): list of start/end values
+
+    Returns:
+        (tuple list): sorted non-overlapping spans
+    """
+    _spans = []
+    for _start, _end in sorted(spans):
+        if _spans and _start <= _spans[-1][1]:
+            _spans[-1] = _spans[-1][0], max(_end, _spans[-1][1])
+        else:
+            _spans.append((_start, _end))
+    return _spans
+
+
+def _shift_pixmap(pix, d_x, d_y):
+    """Shift the contents of a pixmap.
+
+    Args:
+        pix (QPixmap): pixmap to shift
+        d_x (int): horizontal shift (in pixels)
+        d_y (int): vertical shift (in pixels)
+
+    Returns:
+        (CPixmap): shifted pixmap (exposed areas are transparent)
+    """
+    _pix = wrapper.CPixmap(pix.size())
+    _pix.fill('Transparent')
+    _paste_pixmap(_pix, pix, pos=QtCore.QPoint(d_x, d_y))
+    return _pix
+
+
+def _to_exposed_rects(rect, d_x, d_y):
+    """Obtain regions of a pixmap which are exposed by a shift.
+
+    Args:
+        rect (QRect): pixmap rect
+        d_x (int): horizontal shift (in pixels)
+        d_y (int): vertical shift (in pixels)
+
+    Returns:
+        (QRect list): exposed regions
+    """
+    _width, _height = rect.width(), rect.height()
+    _rects = []
+    if d_x > 0:
+        _rects.append(QtCore.QRect(0, 0, d_x, _height))
+    elif d_x < 0:
+        _rects.append(QtCore.QRect(_width + d_x, 0, -d_x, _height))
+    if d_y > 0:
+        _rects.append(QtCore.QRect(0, 0, _width, d_y))
+    elif d_y < 0:
+        _rects.append(QtCore.QRect(0, _height + d_y, _width, -d_y))
+    return _rects
+
+
 def _graph_to_pixmap(item, offset, zoom):
     """Map the given item from graph to pixmap space.
 
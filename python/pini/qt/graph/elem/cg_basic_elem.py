@@ -26,7 +26,6 @@ class CGBasicElem(c_graph_elem.CGraphElemBase):
     """Base class for any graph space element."""
 
     graph = None
-    visible = True
 
     # Drag controls
     drag_end_g = None
@@ -38,8 +37,10 @@ class CGBasicElem(c_graph_elem.CGraphElemBase):
     drag_target_p = None
     drag_vect_p = None
 
-    local_pos_g = None
-    size_g = None
+    _local_pos_g = None
+    _size_g = None
+    _selected = False
+    _visible = True
 
     def __init__(
             self, parent, name=None, pos=(0, 0), size=(100, 100), col='Yellow',
@@ -152,6 +153,90 @@ class CGBasicElem(c_graph_elem.CGraphElemBase):
             raise ValueError(space)
         assert isinstance(self.size_g, wrapper.CSizeF)
 
+    @property
+    def local_pos_g(self):
+        """Obtain position relative to parent.
+
+        Returns:
+            (QPointF): local position (in graph space)
+        """
+        return self._local_pos_g
+
+    @local_pos_g.setter
+    def local_pos_g(self, pos):
+        """Set position relative to parent.
+
+        Args:
+            pos (QPointF): local position (in graph space)
+        """
+        self._local_pos_g = pos
+        if self.graph:
+            self.graph.flag_dirty(self, moved=True)
+
+    @property
+    def size_g(self):
+        """Obtain graph size.
+
+        Returns:
+            (QSizeF): size (in graph space)
+        """
+        return self._size_g
+
+    @size_g.setter
+    def size_g(self, size):
+        """Set graph size.
+
+        Args:
+            size (QSizeF): size (in graph space)
+        """
+        self._size_g = size
+        if self.graph:
+            self.graph.flag_dirty(self, moved=True)
+
+    @property
+    def selected(self):
+        """Obtain selected state.
+
+        Returns:
+            (bool): whether selected
+        """
+        return self._selected
+
+    @selected.setter
+    def selected(self, selected):
+        """Set selected state.
+
+        Args:
+            selected (bool): selected state
+        """
+        if selected == self._selected:
+            return
+        self._selected = selected
+        if self.graph:
+            self.graph.flag_dirty(self)
+
+    @property
+    def visible(self):
+        """Obtain visibility.
+
+        Returns:
+            (bool): whether visible
+        """
+        return self._visible
+
+    @visible.setter
+    def visible(self, visible):
+        """Set visibility.
+
+        Args:
+            visible (bool): visibility
+        """
+        if visible == self._visible:
+            return
+        self._visible = visible
+        if self.graph:
+            self.graph.flag_dirty(self)
+
     @property
     def full_name(self):
         """Obtain full element name (including parent name if any).
@@ -196,6 +281,24 @@ class CGBasicElem(c_graph_elem.CGraphElemBase):
             pos=self.pos_g, size=self.size_g, anchor=self.anchor,
             class_=QtCore.QRectF)
 
+    @property
+    def draw_rect_g(self):
+        """Obtain the region which this element draws in.
+
+        This includes any overflow of the label outside the element's
+        rectangle, which is estimated from the label length and text size.
+
+        Returns:
+            (QRectF): draw region (in graph space)
+        """
+        _rect = self.rect_g
+        if not self.label:
+            return _rect
+        _text_w = len(str(self.label)) * self.text_size_g
+        _over_x = max(_text_w - _rect.width(), 0) / 2
+        _over_y = max(self.text_size_g * 2 - _rect.height(), 0) / 2
+        return _rect.adjusted(-_over_x, -_over_y, _over_x, _over_y)
+
     @property
     def rect_p(self):
         """Obtain graph rectangle.
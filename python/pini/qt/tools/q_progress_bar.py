@@ -12,7 +12,7 @@ import time
 
 from pini.utils import (
     plural, check_heart, to_time_t, str_to_seed, dprint, HOME,
-    basic_repr, apply_filter)
+    basic_repr, apply_filter, console_progress)
 
 from ..q_mgr import QtWidgets, QtCore
 
@@ -67,7 +67,7 @@ class _ProgressDialog(QtWidgets.QDialog):
             self, items, title='Processing {:d} item{}', col=None, show=True,
             pos=None, parent=None, stack_key='DefaultProgress', lock_vis=False,
             show_delay=None, plural_=None, raise_stop=True, auto_pos=True,
-            modal=False):
+            modal=False, max_fps=30):
         """Constructor.
 
         Args:
@@ -86,6 +86,9 @@ class _ProgressDialog(QtWidgets.QDialog):
             auto_pos (bool): automatically position beneath
                 existing progress dialogs
             modal (bool): dialog locks parent interface running
+            max_fps (float): maximum number of interface updates per
+                second - between updates, iterating only increments
+                the counter (0 to update on every item)
         """
         from pini import dcc, qt
         _flush_unused_bars(stack_key=stack_key)
@@ -103,12 +106,13 @@ class _ProgressDialog(QtWidgets.QDialog):
         self.show_delay = show_delay
         self.raise_stop = raise_stop
         self.lock_vis = lock_vis
+        self.max_fps = max_fps
 
         self.counter = 0
         self.last_update = time.time()
         self.last_redraw = time.time()
         self.start = time.time()
-        self.durs = []
+        self.durs = collections.deque(maxlen=5)
         self.info = ''
         self._display_pc = None
         self._pos = pos
@@ -217,8 +221,7 @@ class _ProgressDialog(QtWidgets.QDialog):
     def print_eta(self):
         """Print expected time remaining."""
         _n_remaining = len(self.items) - self.counter + 1
-        _durs = self.durs[-5:]
-        _avg_dur = sum(_durs) / len(_durs)
+        _avg_dur = sum(self.durs) / len(self.durs)
         _etr = _avg_dur * _n_remaining
         _eta = time.time() + _etr
         _eta_s = time.strftime('%H:%M:%S', to_time_t(_eta))
@@ -292,28 +295,14 @@ class _ProgressDialog(QtWidgets.QDialog):
 
     def __next__(self, update_ui=True):
 
-        from pini import qt
-
-        _dur = time.time() - self.start
-        if self._hidden and self.show_delay and _dur > self.show_delay:
-            self.show()
-            self._hidden = False
-        _LOGGER.log(9, 'ITERATING %s %s', self.isVisible(), _dur)
-        check_heart()
-        check_heart(heart=_PROGRESS_HEART)
-
-        if not self._hidden and not self.isVisible():
-            self._finalise()
-            raise qt.DialogCancelled
-
-        # Apply update - if last redraw was more than a second ago still apply
-        # update so that cancelling progress bar still registers in long lists
-        _t_since_redraw = time.time() - self.last_redraw
-        if self.cur_pc != self._display_pc or _t_since_redraw > 1:
-            self.progress_bar.setValue(self.cur_pc)
-            if update_ui:
-                self.update_ui()
-        self._display_pc = self.cur_pc
+        # Apply update - this is rate limited so that iterating long lists
+        # of quick items isn't dominated by redrawing/processing events
+        _time = time.time()
+        if (
+                self._display_pc is None or
+                not self.max_fps or
+                _time - self.last_redraw >= 1.0 / self.max_fps):
+            self._apply_update(update_ui=update_ui)
 
         # Increment item
         self.counter += 1
@@ -326,12 +315,37 @@ class _ProgressDialog(QtWidgets.QDialog):
                 raise StopIteration from _exc
             return None
 
-        _dur = time.time() - self.last_update
-        self.durs.append(_dur)
-        self.last_update = time.time()
+        self.durs.append(_time - self.last_update)
+        self.last_update = _time
 
         return _result
 
+    def _apply_update(self, update_ui=True):
+        """Update progress bar and check for cancel.
+
+        Args:
+            update_ui (bool): process events
+        """
+        from pini import qt
+
+        _dur = time.time() - self.start
+        if self._hidden and self.show_delay and _dur > self.show_delay:
+            self.show()
+            self._hidden = False
+        _LOGGER.log(9, 'UPDATING %s %s', self.isVisible(), _dur)
+        check_heart()
+        check_heart(heart=_PROGRESS_HEART)
+
+        if not self._hidden and not self.isVisible():
+            self._finalise()
+            raise qt.DialogCancelled
+
+        if self.cur_pc != self._display_pc:
+            self.progress_bar.setValue(self.cur_pc)
+            self._display_pc = self.cur_pc
+        if update_ui:
+            self.update_ui()
+
     def __repr__(self):
         return basic_repr(self, self.stack_key)
 
@@ -356,21 +370,23 @@ def close_all_progress_bars(filter_=None):
 def progress_bar(items, *args, **kwargs):
     """Show a progress bar dialog while iterating the given item list.
 
+    In batch mode, progress is printed to the console instead.
+
     Args:
         items (list): items to iterator
 
     Returns:
-        (ProgressDialog): iterator which displays a progress dialog
+        (ProgressDialog|ConsoleProgress): iterator which displays progress
     """
     from pini import dcc, qt
     _show = kwargs.get('show', True)
     if not _show:
         return items
-    if dcc.batch_mode():
-        _LOGGER.info('DISABLE PROGRESS BAR IN BATCH MODE')
-        return items
     if not items:
         return items
+    if dcc.batch_mode():
+        _LOGGER.debug('USING CONSOLE PROGRESS IN BATCH MODE')
+        return console_progress(items, *args, **kwargs)
     qt.get_application()
     return _ProgressDialog(items, *args, **kwargs)
 
@@ -141,7 +141,7 @@ class CPainter(QtGui.QPainter):
             _rect = QtCore.QRect(0, 0, 2 * _x + 1, _y + 1)
             _align = Qt.AlignHCenter | Qt.AlignBottom
         elif anchor == 'C':
-            _rect = QtCore.QRect(0, 0, 2 * _x + 1, 2 * _y + 1)
+            _rect = QtCore.QRect(_x - _w, _y - _h, 2 * _w + 1, 2 * _h + 1)
             _align = Qt.AlignHCenter | Qt.AlignVCenter
         elif anchor == 'L':
             _rect = QtCore.QRect(_x, 0, _w + 1, 2 * _y + 1)
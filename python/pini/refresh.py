@@ -2,9 +2,18 @@
 
 NOTE: this should be as low level as possible to allow usage in
 environments where qt is not availabe (eg. C4D).
+
+As well as reloading all modules (reload_libs), modules can be reloaded
+incrementally (reload_changed_libs). This reads the import graph of the
+loaded modules from their source, and then reloads only the modules
+whose source has changed since they were imported, along with the
+modules which depend on them, with each module reloaded after its
+dependencies.
 """
 
+import ast
 import importlib
+import importlib.util
 import logging
 import os
 import sys
@@ -198,6 +207,9 @@ RELOAD_ORDER = [
     'hou_pini',
 ]
 
+_IMPORTS_CACHE = {}
+_MTIMES = {}
+
 _RELOAD_ORDER_APPEND = os.environ.get('PINI_RELOAD_ORDER_APPEND')
 if _RELOAD_ORDER_APPEND:
     RELOAD_ORDER += _RELOAD_ORDER_APPEND.split(',')
@@ -480,3 +492,377 @@ def update_libs(check_root, filter_=None, attempts=7, verbose=1):
         for _mod in _mods:
             _LOGGER.info('   - MOD %s', _mod)
     _LOGGER.info(' - UPDATE SUCCESSFUL attempts=%d root=%s', _attempt, _root)
+
+
+class _ImportReader(ast.NodeVisitor):
+    """Reads the imports executed when a module is imported.
+
+    Imports inside functions are ignored, as these are resolved when the
+    function is called rather than when the module is imported. Lazy
+    attributes declared using pini.utils.u_lazy are also read, so that
+    names imported from a lazy package can be traced to their source
+    module.
+    """
+
+    def __init__(self, package):
+        """Constructor.
+
+        Args:
+            package (str): package of module being read (used to resolve
+                relative imports)
+        """
+        self.package = package
+        self.mods = set()
+        self.from_names = set()
+        self.lazy_attrs = {}
+
+    def _resolve_name(self, name):
+        """Resolve a module name which may be relative.
+
+        Args:
+            name (str): module name (eg. .u_misc)
+
+        Returns:
+            (str|None): absolute module name (if resolvable)
+        """
+        try:
+            return importlib.util.resolve_name(name, self.package)
+        except (ImportError, ValueError):
+            return None
+
+    def _read_lazy_attrs(self, node):
+        """Read lazy attributes declared by a lazy_import call.
+
+        Args:
+            node (ast.Call): lazy_import call node
+        """
+        for _kwarg in node.keywords:
+            if _kwarg.arg not in ('attrs', 'mods'):
+                continue
+            try:
+                _data = ast.literal_eval(_kwarg.value)
+            except ValueError:
+                continue
+            if _kwarg.arg == 'mods':
+                _items = [(_mod, [_attr]) for _attr, _mod in _data.items()]
+            else:
+                _items = _data.items()
+            for _mod, _attrs in _items:
+                _mod = self._resolve_name(_mod)
+                if not _mod:
+                    continue
+                self.mods.add(_mod)
+                for _attr in _attrs:
+                    self.lazy_attrs[_attr] = _mod
+
+    def visit_Call(self, node):  # pylint: disable=invalid-name
+        """Visit a call node.
+
+        Args:
+            node (ast.Call): node to visit
+        """
+        _func = node.func
+        _func_name = getattr(_func, 'id', getattr(_func, 'attr', None))
+        if _func_name == 'lazy_import':
+            self._read_lazy_attrs(node)
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node):  # pylint: disable=invalid-name
+        """Ignore function bodies (apart from decorators).
+
+        Args:
+            node (ast.FunctionDef): node to visit
+        """
+        for _dec in node.decorator_list:
+            self.visit(_dec)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Import(self, node):  # pylint: disable=invalid-name
+        """Visit an import node.
+
+        Args:
+            node (ast.Import): node to visit
+        """
+        for _alias in node.names:
+            self.mods.add(_alias.name)
+
+    def visit_ImportFrom(self, node):  # pylint: disable=invalid-name
+        """Visit an import from node.
+
+        Args:
+            node (ast.ImportFrom): node to visit
+        """
+        _base = node.module
+        if node.level:
+            _base = self._resolve_name(
+                '.' * node.level + (node.module or ''))
+            if not _base:
+                return
+        for _alias in node.names:
+            self.from_names.add((_base, _alias.name))
+
+
+def _read_mod_file(mod):
+    """Read source file of the given module.
+
+    Args:
+        mod (mod): module to read
+
+    Returns:
+        (str|None): path to source file (if any)
+    """
+    _file = getattr(mod, '__file__', None)
+    if not _file or not _file.endswith('.py') or not os.path.exists(_file):
+        return None
+    return _file
+
+
+def _read_file_key(file_):
+    """Read key used to detect changes to a source file.
+
+    Args:
+        file_ (str): path to source file
+
+    Returns:
+        (tuple): mtime (in nanoseconds) and size
+    """
+    _stat = os.stat(file_)
+    return _stat.st_mtime_ns, _stat.st_size
+
+
+def _read_import_key(mod, file_):
+    """Read change detection key of a module's source when it was imported.
+
+    This is read from the snapshot of source mtimes/sizes, which is
+    updated on each reload. Modules imported since the snapshot was
+    taken are added to it when they are first read.
+
+    Args:
+        mod (mod): module to read
+        file_ (str): path to module source
+
+    Returns:
+        (tuple): mtime and size
+    """
+    _name = mod.__name__
+    if _name not in _MTIMES:
+        _MTIMES[_name] = _read_file_key(file_)
+    return _MTIMES[_name]
+
+
+def snapshot_mods(base=None):
+    """Record source mtime/size of loaded modules not already recorded.
+
+    This is applied when this module is first imported, and on dcc
+    setup (see install.setup), so that source changes made after this
+    are detected by find_changed_mods.
+
+    Args:
+        base (str): match by module base (eg. pini)
+    """
+    for _mod in find_mods(base=base):
+        if _mod.__name__ in _MTIMES:
+            continue
+        _file = _read_mod_file(_mod)
+        if _file:
+            _MTIMES[_mod.__name__] = _read_file_key(_file)
+
+
+def flush_import_cache():
+    """Flush cache of imports read from module source."""
+    _IMPORTS_CACHE.clear()
+
+
+def _read_mod_imports(mod, file_):
+    """Read the imports executed by the given module.
+
+    Results are cached by source mtime.
+
+    Args:
+        mod (mod): module to read
+        file_ (str): path to module source
+
+    Returns:
+        (_ImportReader): import reader
+    """
+    _key = _read_file_key(file_)
+    _cached = _IMPORTS_CACHE.get(file_)
+    if _cached and _cached[0] == _key:
+        return _cached[1]
+    with open(file_, 'rb') as _hook:
+        _body = ast.parse(_hook.read(), filename=file_)
+    _package = mod.__package__
+    if _package is None:
+        _package = mod.__name__.rpartition('.')[0]
+    _reader = _ImportReader(package=_package)
+    _reader.visit(_body)
+    _IMPORTS_CACHE[file_] = _key, _reader
+    return _reader
+
+
+def build_import_graph(base='pini'):
+    """Build graph of imports between loaded modules.
+
+    A module depends on the modules it imports, and on the modules which
+    provide any names it imports from a package. For names imported
+    from a lazy package, the dependency is on the module which provides
+    the name rather than on the package, as the package doesn't hold
+    the value until it's accessed.
+
+    Args:
+        base (str): match by module base (eg. pini)
+
+    Returns:
+        (dict): module name/names of loaded modules it depends on
+    """
+
+    # Read imports
+    _readers = {}
+    for _mod in find_mods(base=base):
+        _file = _read_mod_file(_mod)
+        if not _file:
+            continue
+        try:
+            _readers[_mod.__name__] = _read_mod_imports(_mod, _file)
+        except (SyntaxError, ValueError) as _exc:
+            _LOGGER.warning(
+                ' - FAILED TO READ IMPORTS %s %s', _mod.__name__, _exc)
+            _readers[_mod.__name__] = _ImportReader(package=None)
+
+    # Build graph
+    _graph = {}
+    for _name, _reader in _readers.items():
+        _deps = set(_reader.mods)
+        for _base, _attr in _reader.from_names:
+            _base_reader = _readers.get(_base)
+            if f'{_base}.{_attr}' in _readers:
+                _deps.add(f'{_base}.{_attr}')
+            elif _base_reader and _attr in _base_reader.lazy_attrs:
+                _deps.add(_base_reader.lazy_attrs[_attr])
+            else:
+                _deps.add(_base)
+        _graph[_name] = {
+            _dep for _dep in _deps if _dep in _readers and _dep != _name}
+
+    return _graph
+
+
+def find_changed_mods(base='pini'):
+    """Find modules whose source has changed since they were imported.
+
+    Args:
+        base (str): match by module base (eg. pini)
+
+    Returns:
+        (str list): names of changed modules
+    """
+    _changed = []
+    for _mod in find_mods(base=base):
+        _file = _read_mod_file(_mod)
+        if not _file:
+            continue
+        if _read_import_key(_mod, _file) != _read_file_key(_file):
+            _changed.append(_mod.__name__)
+    return _changed
+
+
+def _sort_mods_by_deps(names, graph):
+    """Sort the given modules so that each follows its dependencies.
+
+    Import cycles are broken using the order the modules are visited in.
+
+    Args:
+        names (str list): module names to sort
+        graph (dict): import graph
+
+    Returns:
+        (str list): sorted module names
+    """
+    _names = set(names)
+    _sorted = []
+    _visited = set()
+    for _name in sorted(_names):
+        if _name in _visited:
+            continue
+        _stack = [(_name, iter(sorted(graph.get(_name, ()))))]
+        _visited.add(_name)
+        while _stack:
+            _cur, _deps = _stack[-1]
+            for _dep in _deps:
+                if _dep in _names and _dep not in _visited:
+                    _visited.add(_dep)
+                    _stack.append((_dep, iter(sorted(graph.get(_dep, ())))))
+                    break
+            else:
+                _stack.pop()
+                _sorted.append(_cur)
+    return _sorted
+
+
+def reload_changed_libs(base='pini', close_interfaces=True, verbose=1):
+    """Reload modules which have changed, and modules which depend on them.
+
+    Args:
+        base (str): match by module base (eg. pini)
+        close_interfaces (bool): close interfaces before reload (only
+            applied if modules have changed)
+        verbose (int): print process data
+
+    Returns:
+        (str list): names of reloaded modules
+    """
+    _start = time.time()
+    _changed = find_changed_mods(base=base)
+    if not _changed:
+        if verbose:
+            _LOGGER.info('No libs have changed')
+        return []
+
+    # Find dependents of changed modules
+    _graph = build_import_graph(base=base)
+    _users = {}
+    for _name, _deps in _graph.items():
+        for _dep in _deps:
+            _users.setdefault(_dep, set()).add(_name)
+    _to_reload = set()
+    _todo = list(_changed)
+    while _todo:
+        _name = _todo.pop()
+        if _name in _to_reload:
+            continue
+        _to_reload.add(_name)
+        _todo += _users.get(_name, ())
+    _names = _sort_mods_by_deps(_to_reload, graph=_graph)
+    _LOGGER.debug(' - CHANGED %s', _changed)
+
+    if close_interfaces:
+        from pini import qt
+        _LOGGER.debug(' - CLOSING INTERFACES')
+        qt.close_all_interfaces()
+        qt.close_all_progress_bars()
+
+    # Reload modules
+    _reloaded = []
+    _sort = get_mod_sort()
+    _mtimes, _imports_cache = _MTIMES, _IMPORTS_CACHE
+    for _name in _names:
+        _mod = sys.modules.get(_name)
+        if not _mod:
+            continue
+        _reload_mod(_mod, sort=_sort, verbose=verbose)
+        if sys.modules.get(_name) is _mod:
+            _mtimes[_name] = _read_file_key(_mod.__file__)
+            _reloaded.append(_name)
+    if _MTIMES is not _mtimes:  # This module was reloaded
+        _MTIMES.update(_mtimes)
+        _IMPORTS_CACHE.update(_imports_cache)
+
+    if verbose:
+        _LOGGER.info(
+            'Reloaded %d/%d libs in %.02fs (changed %s)', len(_reloaded),
+            len(_graph), time.time() - _start, ', '.join(sorted(_changed)))
+    return _reloaded
+
+
+snapshot_mods()
@@ -1,5 +1,14 @@
-"""Tools for testing pini."""
+"""Tools for testing pini.
 
+Benchmarks are loaded lazily on first access (see bench).
+"""
+
+from pini.utils.u_lazy import lazy_import
+
+from . import bench
+from .t_farm import (
+    build_fake_deadline_jobs, write_fake_deadline, read_fake_deadline_calls,
+    FAKE_DEADLINE_DIR)
 from .t_env import (
     enable_error_catch, enable_file_system, enable_find_seqs,
     enable_nice_id_repr, enable_sanity_check, insert_env_path,
@@ -15,3 +24,8 @@ from .t_profile import (
 from .t_tools import (
     dev_mode, setup_logging, TEST_YML, TEST_DIR, obt_image, set_dev_mode,
     clear_print, print_exec_code, inspect)
+
+__getattr__, __dir__ = lazy_import(
+    __name__, globals(),
+    attrs={'.bench': [
+        _attr for _attrs in bench.LAZY_ATTRS.values() for _attr in _attrs]})
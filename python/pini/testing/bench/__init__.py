@@ -0,0 +1,31 @@
+"""Tools for benchmarking pini.
+
+Each feature's benchmark is stored in its own module, and attributes are
+loaded lazily on first access so that importing pini.testing doesn't
+import the dependencies of every benchmark. These attributes are also
+available from pini.testing (see LAZY_ATTRS).
+"""
+
+from pini.utils.u_lazy import lazy_import
+
+LAZY_ATTRS = {
+    '.tb_utils': ['BENCH_DIR', 'compare_bench_results'],
+    '.tb_bkp': ['run_bkp_store_bench'],
+    '.tb_copy': ['run_copy_bench'],
+    '.tb_farm': ['run_farm_bench'],
+    '.tb_graph': ['run_graph_bench'],
+    '.tb_image': ['run_image_res_bench', 'write_bench_image'],
+    '.tb_ma': ['run_ma_file_bench'],
+    '.tb_pipe': [
+        'build_bench_jobs', 'find_bench_jobs', 'run_pipe_bench',
+        'BENCH_JOB_PREFIX', 'run_pipe_index_bench'],
+    '.tb_progress': ['run_progress_bench'],
+    '.tb_pyui': ['run_pyui_bench'],
+    '.tb_reload': ['run_reload_bench'],
+    '.tb_sanity': ['run_sanity_check_bench'],
+    '.tb_sync': ['run_sync_bench'],
+    '.tb_system': ['run_system_bench'],
+    '.tb_thumb': ['run_thumb_bench', 'write_bench_seqs'],
+}
+
+__getattr__, __dir__ = lazy_import(__name__, globals(), attrs=LAZY_ATTRS)
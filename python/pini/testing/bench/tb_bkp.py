@@ -0,0 +1,112 @@
+"""Tools for benchmarking storing work file backups.
+
+Backups are stored in a deduplicated blob store:
+
+    >>> testing.run_bkp_store_bench(n_saves=20)
+"""
+
+import logging
+import random
+import time
+
+from .tb_utils import BENCH_DIR, write_bench_results
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def run_bkp_store_bench(
+        n_saves=20, n_nodes=20000, n_edits=10, name='bkp_store',
+        write=True):
+    """Run work file backup store benchmark.
+
+    A synthetic ma file is saved repeatedly, with some of its nodes
+    edited between saves. The disk use and write time of copying each
+    backup (as applied by the default backup mode) is compared with
+    writing each backup to a blob store.
+
+    Args:
+        n_saves (int): number of saves
+        n_nodes (int): number of mesh nodes in ma file
+        n_edits (int): number of nodes edited between saves
+        name (str): benchmark name (used in json filename)
+        write (bool): write results to json
+
+    Returns:
+        (dict): benchmark results
+    """
+    from pini.utils import strftime, BlobStore, nice_size
+    _dir = BENCH_DIR.to_subdir('bkp_store')
+    _dir.delete(force=True)
+    _ma = _dir.to_file('test.ma')
+    _store = BlobStore(_dir.to_subdir('store'))
+    _results = {
+        'name': name,
+        'time': strftime(),
+        'n_saves': n_saves,
+        'n_nodes': n_nodes,
+        'ops': {}}
+    _ops = _results['ops']
+
+    # Write backups
+    _rand = random.Random(0)
+    _pts = [[_rand.uniform(-10, 10) for _ in range(24)]
+            for _ in range(n_nodes)]
+    _copy_dur, _copy_size, _store_dur = 0.0, 0, 0.0
+    _entries = []
+    for _idx in range(n_saves):
+        _write_bench_ma(_ma, pts=_pts)
+        _start = time.time()
+        _ma.copy_to(_dir.to_file(f'copy/test_{_idx:03d}.ma'), verbose=0)
+        _copy_dur += time.time() - _start
+        _copy_size += _ma.size()
+        _start = time.time()
+        _entries.append(_store.write_file(_ma))
+        _store_dur += time.time() - _start
+        for _node_idx in _rand.sample(range(n_nodes), n_edits):
+            _pts[_node_idx] = [
+                _rand.uniform(-10, 10) for _ in range(24)]
+    _store_size = sum(_blob.size() for _blob in _store.find_blobs())
+    _ops['copy'] = {'dur': _copy_dur, 'size': _copy_size}
+    _ops['store'] = {'dur': _store_dur, 'size': _store_size}
+
+    # Time restore
+    _start = time.time()
+    _store.restore(_entries[-1], _dir.to_file('restore.ma'), force=True)
+    _ops['restore'] = {'dur': time.time() - _start, 'size': _ma.size()}
+
+    for _op, _data in _ops.items():
+        _LOGGER.info(
+            ' - %-8s %8.03fs %10s', _op, _data['dur'],
+            nice_size(_data['size']))
+    _LOGGER.info(' - SAVING %.01f%%', 100 * (1 - _store_size / _copy_size))
+
+    _dir.delete(force=True)
+    if write:
+        write_bench_results(_results)
+
+    return _results
+
+
+def _write_bench_ma(file_, pts):
+    """Write a synthetic ma file.
+
+    Args:
+        file_ (File): file to write
+        pts (float list list): points for each mesh node
+    """
+    from pini.utils import strftime
+    _lines = [
+        '//Maya ASCII 2023 scene',
+        f'//Name: {file_.filename}',
+        f'//Last modified: {strftime()}',
+        'requires maya "2023";']
+    for _idx, _node_pts in enumerate(pts):
+        _vals = ' '.join(f'{_pt:.6f}' for _pt in _node_pts)
+        _lines += [
+            f'createNode transform -n "node{_idx:d}";',
+            f'\trename -uid "{_idx:08X}-0000-0000-0000-000000000000";',
+            f'createNode mesh -n "node{_idx:d}Shape" -p "node{_idx:d}";',
+            '\tsetAttr -k off ".v";',
+            f'\tsetAttr -s 8 ".vt[0:7]" {_vals};']
+    _lines.append(f'// End of {file_.filename}')
+    file_.write('\n'.join(_lines) + '\n', force=True)
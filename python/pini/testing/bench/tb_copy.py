@@ -0,0 +1,92 @@
+"""Tools for benchmarking file copy throughput.
+
+eg. to a network location:
+
+    >>> testing.run_copy_bench(trg_dir='/mnt/jobs/tmp/copy_bench')
+"""
+
+import logging
+import os
+import shutil
+import time
+
+from .tb_utils import BENCH_DIR, write_bench_results
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def run_copy_bench(
+        n_files=50, size=4 * 1024 * 1024, workers=(1, 4, 8, 16),
+        src_dir=None, trg_dir=None, name='copy', write=True):
+    """Run file copy throughput benchmark.
+
+    A serial copy (as applied by File.copy_to) is timed, followed by
+    parallel copies using each of the given worker counts.
+
+    Args:
+        n_files (int): number of files to copy
+        size (int): size of each file (in bytes)
+        workers (int list): worker counts to test
+        src_dir (Dir): override source dir
+        trg_dir (Dir): override target dir (eg. on a network mount)
+        name (str): benchmark name (used in json filename)
+        write (bool): write results to json
+
+    Returns:
+        (dict): benchmark results
+    """
+    from pini.utils import Dir, strftime, copy_files
+    _src_dir = Dir(src_dir or BENCH_DIR.to_subdir('copy/src'))
+    _trg_dir = Dir(trg_dir or BENCH_DIR.to_subdir('copy/trg'))
+    _results = {
+        'name': name,
+        'time': strftime(),
+        'n_files': n_files,
+        'size': size,
+        'trg_dir': _trg_dir.path,
+        'ops': {}}
+    _ops = _results['ops']
+
+    # Build source files
+    _srcs = [_src_dir.to_file(f'file{_idx:04d}.bin')
+             for _idx in range(n_files)]
+    for _src in _srcs:
+        if _src.exists() and _src.size() == size:
+            continue
+        _src.test_dir()
+        with open(_src.path, 'wb') as _hook:
+            _hook.write(os.urandom(size))
+    _n_bytes = n_files * size
+
+    # Time copies
+    _trgs = [_trg_dir.to_file(_src.filename) for _src in _srcs]
+    _files = list(zip(_srcs, _trgs))
+    for _workers in [None] + list(workers):
+        _trg_dir.delete(force=True)
+        _trg_dir.mkdir()
+        _start = time.time()
+        if _workers is None:
+            _op = 'serial'
+            for _src, _trg in _files:
+                shutil.copyfile(_src.path, _trg.path)
+        else:
+            _op = f'workers_{_workers:d}'
+            copy_files(_files, check=None, workers=_workers)
+        _dur = time.time() - _start
+        _ops[_op] = {
+            'dur': _dur, 'count': n_files,
+            'mb_per_sec': _n_bytes / _dur / 1024 / 1024}
+        _LOGGER.info(
+            ' - %-12s %8.03fs %8.01fMB/s', _op, _dur,
+            _ops[_op]['mb_per_sec'])
+
+    # Time quick check skip of identical files
+    _start = time.time()
+    copy_files(_files, check='size_mtime')
+    _ops['skip_identical'] = {'dur': time.time() - _start, 'count': n_files}
+
+    _trg_dir.delete(force=True)
+    if write:
+        write_bench_results(_results)
+
+    return _results
@@ -0,0 +1,75 @@
+"""Tools for benchmarking polling farm jobs.
+
+This uses a fake deadlinecommand (see t_farm):
+
+    >>> testing.run_farm_bench(n_jobs=5000)
+"""
+
+import logging
+import os
+
+from .tb_utils import BENCH_DIR, write_bench_results, time_bench_op
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def run_farm_bench(n_jobs=5000, n_active=50, name='farm', write=True):
+    """Run farm job polling benchmark.
+
+    A fake deadlinecommand is used to serve the given number of jobs.
+    A full read of all jobs is timed, followed by an incremental poll
+    where the given number of jobs are still active.
+
+    Args:
+        n_jobs (int): number of jobs on the farm
+        n_active (int): number of jobs still active
+        name (str): benchmark name (used in json filename)
+        write (bool): write results to json
+
+    Returns:
+        (dict): benchmark results
+    """
+    from pini.farm import deadline
+    from pini.utils import strftime
+    from .. import t_farm
+
+    _jobs = t_farm.build_fake_deadline_jobs(n_jobs)
+    for _job in _jobs[-n_active:]:
+        _job['Status'] = 'Rendering'
+    _dir = BENCH_DIR.to_subdir('farm')
+    _exe = t_farm.write_fake_deadline(_jobs, dir_=_dir)
+    _results = {
+        'name': name,
+        'time': strftime(),
+        'n_jobs': n_jobs,
+        'n_active': n_active,
+        'ops': {}}
+    _ops = _results['ops']
+
+    _env = os.environ.get('PINI_DEADLINECOMMAND_EXE')
+    os.environ['PINI_DEADLINECOMMAND_EXE'] = _exe.path
+    try:
+        _poller = deadline.CDJobPoller()
+
+        def _poll():
+            _poller.poll()
+            return _poller.jobs
+
+        time_bench_op(_ops, 'full', _poll)
+        for _job in _jobs[-n_active:]:
+            _job['Status'] = 'Completed'
+        t_farm.write_fake_deadline(_jobs, dir_=_dir)
+        time_bench_op(_ops, 'incremental', _poll)
+        time_bench_op(_ops, 'incremental_idle', _poll)
+    finally:
+        if _env is None:
+            del os.environ['PINI_DEADLINECOMMAND_EXE']
+        else:
+            os.environ['PINI_DEADLINECOMMAND_EXE'] = _env
+    for _op, _data in _ops.items():
+        _LOGGER.info(' - %-16s %8.03fs', _op, _data['dur'])
+
+    if write:
+        write_bench_results(_results)
+
+    return _results
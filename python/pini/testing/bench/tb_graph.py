@@ -0,0 +1,152 @@
+"""Tools for benchmarking a large graph space.
+
+The graph is redrawn/hit tested offscreen, compared with full redraws
+and checking every element:
+
+    >>> testing.run_graph_bench(n_elems=10000)
+"""
+
+import logging
+import os
+import random
+
+from .tb_utils import write_bench_results, time_bench_op
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def run_graph_bench(
+        n_elems=10000, res=(1920, 1080), n_frames=50, n_clicks=200,
+        name='graph', write=True):
+    """Run graph space redraw benchmark.
+
+    A graph space is populated with a grid of elements and rendered
+    offscreen. Panning and dragging an element using full redraws is
+    compared with only redrawing dirty regions, and finding the elements
+    under a click by checking every element is compared with using the
+    spatial index.
+
+    Args:
+        n_elems (int): number of elements in graph
+        res (tuple): graph space resolution
+        n_frames (int): number of frames to redraw for pan/drag
+        n_clicks (int): number of click positions to test
+        name (str): benchmark name (used in json filename)
+        write (bool): write results to json
+
+    Returns:
+        (dict): benchmark results
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from pini import qt
+    from pini.utils import strftime
+
+    qt.get_application()
+    _results = {
+        'name': name,
+        'time': strftime(),
+        'n_elems': n_elems,
+        'res': list(res),
+        'ops': {}}
+    _ops = _results['ops']
+
+    # Build graph
+    _graph = qt.CGraphSpace(None)
+    _graph.resize(*res)
+    _cols = int(n_elems ** 0.5)
+    for _idx in range(n_elems):
+        _elem = _graph.add_basic_elem(
+            name=f'Elem{_idx:05d}',
+            pos=(_idx % _cols * 100, int(_idx / _cols) * 100),
+            size=(60, 40), selectable=True, draggable=True)
+        if not _idx % 10:
+            _elem.add_basic_elem(
+                name='Child', pos=(5, 5), size=(20, 10), anchor='TL')
+    _graph.offset_p = qt.CVector2D(-_cols * 50, -_cols * 50)
+    time_bench_op(_ops, 'initial', _redraw_bench_graph, _graph, n_frames=1)
+
+    # Test hit testing
+    _rand = random.Random(0)
+    _width = _cols * 100
+    _pts = [
+        qt.CPointF(_rand.uniform(0, _width), _rand.uniform(0, _width))
+        for _ in range(n_clicks)]
+    _linear = time_bench_op(
+        _ops, 'hit_linear', _find_bench_graph_hits, _graph, _pts,
+        index=False)
+    _indexed = time_bench_op(
+        _ops, 'hit_index', _find_bench_graph_hits, _graph, _pts, index=True)
+    assert _linear == _indexed
+
+    # Test pan/drag redraws
+    _elem = _graph.find_elem(f'Elem{int(n_elems / 2 + _cols / 2):05d}')
+    for _dirty in (False, True):
+        _label = 'dirty' if _dirty else 'full'
+        time_bench_op(
+            _ops, f'{_label}_pan', _redraw_bench_graph, _graph,
+            n_frames=n_frames, pan=qt.CVector2D(7, -3), dirty=_dirty)
+        time_bench_op(
+            _ops, f'{_label}_drag', _redraw_bench_graph, _graph,
+            n_frames=n_frames, drag=_elem, dirty=_dirty)
+
+    for _op, _data in _ops.items():
+        _LOGGER.info(
+            ' - %-12s %8.03fs %8.03fms/op', _op, _data['dur'],
+            _data['dur'] / _data['count'] * 1000)
+
+    _graph.deleteLater()
+    if write:
+        write_bench_results(_results)
+
+    return _results
+
+
+def _find_bench_graph_hits(graph, pts, index):
+    """Find the elements under each of the given points.
+
+    Args:
+        graph (CGraphSpace): graph to test
+        pts (QPointF list): click positions (in graph space)
+        index (bool): use spatial index (otherwise check every element)
+
+    Returns:
+        (list): element names found for each click
+    """
+    _hits = []
+    for _pt in pts:
+        if index:
+            _elems = graph.find_elems_at(_pt)
+        else:
+            _elems = [
+                _elem for _elem in graph.find_elems()
+                if _elem.visible and _elem.contains(_pt)]
+        _hits.append(sorted(_elem.name for _elem in _elems))
+    return _hits
+
+
+def _redraw_bench_graph(graph, n_frames, pan=None, drag=None, dirty=False):
+    """Redraw a graph space a number of times.
+
+    Args:
+        graph (CGraphSpace): graph to redraw
+        n_frames (int): number of redraws
+        pan (QVector2D): offset to pan by on each frame
+        drag (CGBasicElem): element to move on each frame
+        dirty (bool): only redraw dirty regions
+
+    Returns:
+        (int list): frame indices
+    """
+    from pini import qt
+    for _frame in range(n_frames):
+        if pan:
+            graph.offset_p = graph.offset_p + pan
+        if drag:
+            _sign = 1 if _frame % 20 < 10 else -1
+            drag.local_pos_g = drag.local_pos_g + qt.CPointF(
+                _sign * 5, _sign * 2)
+        if dirty:
+            graph.redraw_dirty()
+        else:
+            graph.redraw()
+    return list(range(n_frames))
@@ -0,0 +1,147 @@
+"""Tools for benchmarking reading image resolutions from file headers.
+
+    >>> testing.run_image_res_bench(n_images=500)
+"""
+
+import logging
+import struct
+import zlib
+
+from .tb_utils import BENCH_DIR, write_bench_results, time_bench_op
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def run_image_res_bench(
+        n_images=500, res=(1920, 1080), size=256 * 1024, n_ffprobe=20,
+        name='image_res', write=True):
+    """Run image resolution benchmark.
+
+    Synthetic images are written in each format which supports reading
+    resolution from the file header, and then the time taken to read
+    their resolutions is measured, both with an empty cache and with a
+    populated cache. If ffprobe is available, this is compared with
+    reading resolution using ffprobe on a subset of the images.
+
+    Args:
+        n_images (int): number of images of each format
+        res (tuple): image resolution
+        size (int): image file size (header is padded to this size)
+        n_ffprobe (int): number of images of each format to read
+            using ffprobe
+        name (str): benchmark name (used in json filename)
+        write (bool): write results to json
+
+    Returns:
+        (dict): benchmark results
+    """
+    from pini.utils import strftime, Image, find_exe, flush_image_res_cache
+    _dir = BENCH_DIR.to_subdir('image_res')
+    _dir.delete(force=True)
+    _results = {
+        'name': name,
+        'time': strftime(),
+        'n_images': n_images,
+        'ops': {}}
+    _ops = _results['ops']
+
+    for _extn in ('png', 'jpg', 'exr', 'tif', 'dpx'):
+
+        _imgs = []
+        for _idx in range(n_images):
+            _img = Image(_dir.to_file(f'{_extn}/image.{_idx:04d}.{_extn}'))
+            write_bench_image(_img, res=res, size=size)
+            _imgs.append(_img)
+
+        flush_image_res_cache()
+        _ress = time_bench_op(
+            _ops, f'{_extn}_header', _read_bench_ress, _imgs)
+        assert set(_ress) == {res}
+        time_bench_op(_ops, f'{_extn}_cached', _read_bench_ress, _imgs)
+        if find_exe('ffprobe'):
+            time_bench_op(
+                _ops, f'{_extn}_ffprobe', _read_bench_ress,
+                _imgs[:n_ffprobe], ffprobe=True)
+
+    for _op, _data in _ops.items():
+        _LOGGER.info(
+            ' - %-12s %8.03fs %8.01f files/s', _op, _data['dur'],
+            _data['count'] / max(_data['dur'], 0.000001))
+
+    _dir.delete(force=True)
+    if write:
+        write_bench_results(_results)
+
+    return _results
+
+
+def _read_bench_ress(imgs, ffprobe=False):
+    """Read resolutions of the given images.
+
+    Args:
+        imgs (Image list): images to read
+        ffprobe (bool): read resolutions using ffprobe
+
+    Returns:
+        (tuple list): resolutions
+    """
+    if ffprobe:
+        _ress = [
+            _img._read_res_ffprobe()  # pylint: disable=protected-access
+            for _img in imgs]
+    else:
+        _ress = [_img.to_res() for _img in imgs]
+    return [(_res.width, _res.height) for _res in _ress]
+
+
+def write_bench_image(file_, res, size=0):
+    """Write a synthetic image with a valid header.
+
+    The format is determined by the file extension (png, jpg, exr, tif
+    or dpx). Only the header is valid - the image data is padding.
+
+    Args:
+        file_ (File): file to write
+        res (tuple): image width/height
+        size (int): pad file to this size
+    """
+    from pini.utils import File
+    _width, _height = res
+    _extn = File(file_).extn.lower()
+    if _extn == 'png':
+        _ihdr = struct.pack('>IIBBBBB', _width, _height, 8, 2, 0, 0, 0)
+        _data = b'\x89PNG\r\n\x1a\n' + struct.pack(
+            '>I4s13sI', 13, b'IHDR', _ihdr, zlib.crc32(b'IHDR' + _ihdr))
+    elif _extn in ('jpg', 'jpeg'):
+        _app = b'Exif\x00\x00' + bytes(1024)
+        _data = b''.join([
+            b'\xff\xd8',
+            b'\xff\xe1' + struct.pack('>H', len(_app) + 2) + _app,
+            b'\xff\xc0' + struct.pack(
+                '>HBHHB', 17, 8, _height, _width, 3) + bytes(9)])
+    elif _extn == 'exr':
+        _attrs = [
+            (b'channels', b'chlist', bytes(1)),
+            (b'compression', b'compression', bytes(1)),
+            (b'dataWindow', b'box2i', struct.pack(
+                '<iiii', 0, 0, _width - 1, _height - 1)),
+            (b'displayWindow', b'box2i', struct.pack(
+                '<iiii', 0, 0, _width - 1, _height - 1))]
+        _data = b'\x76\x2f\x31\x01' + struct.pack('<I', 2) + b''.join(
+            _name + b'\x00' + _type + b'\x00' +
+            struct.pack('<i', len(_val)) + _val
+            for _name, _type, _val in _attrs) + b'\x00'
+    elif _extn in ('tif', 'tiff'):
+        _data = b'II*\x00' + struct.pack('<I', 8) + struct.pack(
+            '<HHHIIHHII', 2, 256, 4, 1, _width, 257, 3, 1, _height) + (
+                struct.pack('<I', 0))
+    elif _extn == 'dpx':
+        _data = b'SDPX' + bytes(764) + struct.pack(
+            '>HHII', 1, 1, _width, _height)
+    else:
+        raise NotImplementedError(_extn)
+    _data += bytes(max(size - len(_data), 0))
+
+    File(file_).test_dir()
+    with open(File(file_).path, 'wb') as _hook:
+        _hook.write(_data)
@@ -0,0 +1,113 @@
+"""Tools for benchmarking reading and editing ma files.
+
+A synthetic maya ascii scene is written, and then the time and peak
+memory of reading its references, finding nodes and saving an edit
+are measured:
+
+    >>> testing.run_ma_file_bench(n_nodes=100000)
+"""
+
+import logging
+import time
+import tracemalloc
+
+from .tb_utils import BENCH_DIR, write_bench_results, time_bench_op
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def run_ma_file_bench(n_nodes=100000, n_refs=200, name='ma_file', write=True):
+    """Run ma file benchmark.
+
+    Args:
+        n_nodes (int): number of transform/mesh node pairs in scene
+        n_refs (int): number of references in scene
+        name (str): benchmark name (used in json filename)
+        write (bool): write results to json
+
+    Returns:
+        (dict): benchmark results
+    """
+    from pini.utils import MaFile, strftime, nice_size
+    _dir = BENCH_DIR.to_subdir('ma_file')
+    _dir.delete(force=True)
+    _file = _dir.to_file('test.ma')
+    _write_bench_scene(_file, n_nodes=n_nodes, n_refs=n_refs)
+    _results = {
+        'name': name,
+        'time': strftime(),
+        'n_nodes': n_nodes,
+        'n_refs': n_refs,
+        'size': _file.size(),
+        'ops': {}}
+    _ops = _results['ops']
+    _LOGGER.info('WROTE SCENE %s %s', nice_size(_file.size()), _file.path)
+
+    # Time read (peak memory is read in a separate pass as tracemalloc
+    # slows down the read)
+    _refs = time_bench_op(
+        _ops, 'read_refs',
+        lambda: MaFile(_file).find_exprs(cmd='file'))
+    tracemalloc.start()
+    MaFile(_file).find_exprs(cmd='file')
+    _ops['read_refs']['peak_mem'] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # Time find/edit/save
+    _ma = MaFile(_file)
+    _name = f'node{n_nodes // 2:d}Shape'
+    time_bench_op(
+        _ops, 'find_nodes', lambda: _ma.find_nodes(type_='mesh', name=_name))
+    _ref = _ma.find_exprs(cmd='file')[0]
+    _ref.replace('v001', 'v002')
+    _start = time.time()
+    _ma.save(_dir.to_file('test_out.ma'), force=True)
+    _ops['save'] = {'dur': time.time() - _start, 'count': 1}
+    assert len(_refs) == n_refs
+
+    for _op, _data in _ops.items():
+        _LOGGER.info(' - %-10s %8.03fs', _op, _data['dur'])
+    _LOGGER.info(
+        ' - PEAK READ MEMORY %s', nice_size(_ops['read_refs']['peak_mem']))
+
+    _dir.delete(force=True)
+    if write:
+        write_bench_results(_results)
+
+    return _results
+
+
+def _write_bench_scene(file_, n_nodes, n_refs):
+    """Write a synthetic ma scene.
+
+    Args:
+        file_ (File): file to write
+        n_nodes (int): number of transform/mesh node pairs
+        n_refs (int): number of references
+    """
+    file_.test_dir()
+    with open(file_.path, 'w', newline='\n', encoding='utf-8') as _hook:
+        _hook.write(
+            '//Maya ASCII 2022 scene\n'
+            f'//Name: {file_.filename}\n'
+            '//Codeset: UTF-8\n'
+            'requires maya "2022";\n')
+        for _idx in range(n_refs):
+            _hook.write(
+                f'file -rdi 1 -ns "ref{_idx:d}" -rfn "ref{_idx:d}RN" '
+                f'-typ "mayaAscii"\n\t\t '
+                f'"/jobs/test/assets/ref{_idx:d}/rig_v001.ma";\n')
+        _hook.write('currentUnit -l centimeter -a degree -t film;\n')
+        for _idx in range(n_nodes):
+            _hook.write(
+                f'createNode transform -n "node{_idx:d}";\n'
+                f'\trename -uid "ABC{_idx:d}";\n'
+                f'\tsetAttr ".t" -type "double3" {_idx:d} 0 0 ;\n'
+                f'createNode mesh -n "node{_idx:d}Shape" -p "node{_idx:d}";\n'
+                '\tsetAttr -k off ".v";\n'
+                '\tsetAttr ".vir" yes;\n'
+                '\tsetAttr -s 8 ".vt[0:7]"  -0.5 -0.5 0.5 0.5 -0.5 0.5 '
+                '-0.5 0.5 0.5 0.5 0.5 0.5\n'
+                '\t\t -0.5 0.5 -0.5 0.5 0.5 -0.5 -0.5 -0.5 -0.5 0.5 -0.5 '
+                '-0.5;\n')
+        _hook.write(f'// End of {file_.filename}\n')
@@ -0,0 +1,393 @@
+"""Tools for benchmarking pipeline traversal using synthetic jobs.
+
+Synthetic jobs are built using a real job config template and are
+populated with empty work/publish/output files, so they can be traversed
+by the pipeline api in the same way as a production job. Their size is
+configurable (jobs x sequences x shots x tasks x versions x outputs),
+which allows the cost of pipeline traversal to be measured at scale:
+
+    >>> from pini import testing
+    >>> testing.build_bench_jobs(n_jobs=2, n_seqs=4, n_shots=20)
+    >>> _results = testing.run_pipe_bench()
+
+Entities can also be resolved in a large synthetic job using the pipe
+cache indexes, compared with scanning the cached entities list:
+
+    >>> testing.run_pipe_index_bench(n_seqs=50, n_shots=100)
+
+Jobs are created in the current jobs root, so to avoid adding them to
+a production root $PINI_JOBS_ROOT should be pointed at a scratch dir.
+"""
+
+import logging
+import random
+import time
+
+from .tb_utils import write_bench_results, time_bench_op
+
+_LOGGER = logging.getLogger(__name__)
+
+BENCH_JOB_PREFIX = 'PiniBench'
+
+
+def build_bench_jobs(
+        n_jobs=1, n_seqs=2, n_shots=5, n_assets=5, n_tasks=2, n_vers=3,
+        n_outputs=2, cfg_name='Rhea', prefix=BENCH_JOB_PREFIX, force=False):
+    """Build synthetic jobs for benchmarking.
+
+    Each shot/asset receives a work file for each task/version. Shots
+    receive caches for each output and assets receive a publish for
+    each task/version.
+
+    Args:
+        n_jobs (int): number of jobs
+        n_seqs (int): number of sequences per job
+        n_shots (int): number of shots per sequence
+        n_assets (int): number of assets per job
+        n_tasks (int): number of tasks per entity
+        n_vers (int): number of versions per task
+        n_outputs (int): number of outputs per shot work file
+        cfg_name (str): job config template to apply (eg. Rhea/Pluto)
+        prefix (str): job name prefix
+        force (bool): rebuild jobs which already exist
+
+    Returns:
+        (CPJob list): jobs
+    """
+    from pini import pipe
+
+    _jobs = []
+    for _job_idx in range(n_jobs):
+        _job = pipe.CPJob(pipe.ROOT.to_subdir(f'{prefix}{_job_idx + 1:03d}'))
+        if _job.cfg_file.exists() and not force:
+            _LOGGER.info('BENCH JOB EXISTS %s', _job.path)
+        else:
+            _start = time.time()
+            _job.setup_cfg(cfg_name)
+            _n_files = _build_bench_job(
+                job=_job, n_seqs=n_seqs, n_shots=n_shots, n_assets=n_assets,
+                n_tasks=n_tasks, n_vers=n_vers, n_outputs=n_outputs)
+            _LOGGER.info(
+                'BUILT BENCH JOB %s - %d files in %.01fs', _job.name,
+                _n_files, time.time() - _start)
+        _jobs.append(_job)
+    return _jobs
+
+
+def _build_bench_job(
+        job, n_seqs, n_shots, n_assets, n_tasks, n_vers, n_outputs):
+    """Populate a synthetic job with files.
+
+    Args:
+        job (CPJob): job to populate
+        n_seqs (int): number of sequences
+        n_shots (int): number of shots per sequence
+        n_assets (int): number of assets
+        n_tasks (int): number of tasks per entity
+        n_vers (int): number of versions per task
+        n_outputs (int): number of outputs per shot work file
+
+    Returns:
+        (int): number of files created
+    """
+    _shot_tasks = _to_bench_tasks(job, profile='shots', count=n_tasks)
+    _asset_tasks = _to_bench_tasks(job, profile='assets', count=n_tasks)
+    _files = []
+
+    # Add shots
+    for _seq_idx in range(n_seqs):
+        _seq = f'seq{_seq_idx + 1:02d}'
+        for _shot_idx in range(n_shots):
+            _shot = job.to_shot(
+                sequence=_seq, shot=f'{_seq}_{(_shot_idx + 1) * 10:04d}')
+            for _task in _shot_tasks:
+                for _ver_n in range(1, n_vers + 1):
+                    _files.append(_shot.to_work(
+                        task=_task, ver_n=_ver_n, dcc_='maya'))
+                    for _out_idx in range(n_outputs):
+                        _files.append(_shot.to_output(
+                            'cache', task=_task, ver_n=_ver_n, dcc_='maya',
+                            output_name=f'char{_out_idx + 1:02d}',
+                            extn='abc'))
+
+    # Add assets
+    for _asset_idx in range(n_assets):
+        _asset = job.to_asset(
+            asset_type='char', asset=f'asset{_asset_idx + 1:03d}')
+        for _task in _asset_tasks:
+            for _ver_n in range(1, n_vers + 1):
+                _files.append(_asset.to_work(
+                    task=_task, ver_n=_ver_n, dcc_='maya'))
+                _files.append(_asset.to_output(
+                    'publish', task=_task, ver_n=_ver_n, dcc_='maya',
+                    extn='ma'))
+
+    for _file in _files:
+        _file.touch()
+    return len(_files)
+
+
+def _to_bench_tasks(job, profile, count):
+    """Obtain list of tasks to use in a synthetic job.
+
+    The tasks from the job config are used first and then generic
+    tasks are appended to reach the requested count.
+
+    Args:
+        job (CPJob): job
+        profile (str): entity profile (shots/assets)
+        count (int): number of tasks required
+
+    Returns:
+        (str list): tasks
+    """
+    _tasks = list(job.cfg['tasks'].get(profile, []))[:count]
+    while len(_tasks) < count:
+        _tasks.append(f'task{len(_tasks) + 1:02d}')
+    return _tasks
+
+
+def find_bench_jobs(prefix=BENCH_JOB_PREFIX):
+    """Find synthetic benchmark jobs in the current jobs root.
+
+    Args:
+        prefix (str): job name prefix
+
+    Returns:
+        (CPJob list): jobs
+    """
+    from pini import pipe
+    return [_job for _job in pipe.ROOT.find_jobs()
+            if _job.name.startswith(prefix)]
+
+
+def run_pipe_bench(
+        name='pipe', n_paths=100000, prefix=BENCH_JOB_PREFIX, write=True):
+    """Run pipeline traversal benchmark on existing synthetic jobs.
+
+    Each traversal operation is timed on a new (cold) cache root and
+    then again on the same (warm) root. The to_output operation is timed
+    on a list of paths generated from the synthetic job outputs.
+
+    Args:
+        name (str): benchmark name (used in json filename)
+        n_paths (int): number of paths to test to_output on
+        prefix (str): synthetic job name prefix
+        write (bool): write results to json
+
+    Returns:
+        (dict): benchmark results
+    """
+    from pini import pipe
+    from pini.utils import flush_caches, strftime
+
+    _results = {
+        'name': name,
+        'pipe_version': pipe.VERSION,
+        'master': pipe.MASTER,
+        'time': strftime(),
+        'ops': {}}
+    _ops = _results['ops']
+
+    # Time traversal cold then warm
+    flush_caches(namespace='pipe')
+    _root = pipe.cache.CCPRoot(pipe.ROOT.path)
+    for _mode in ['cold', 'warm']:
+        _LOGGER.info('RUNNING %s TRAVERSAL', _mode.upper())
+        _start = time.time()
+        _jobs = time_bench_op(
+            _ops, f'find_jobs.{_mode}', _root.find_jobs, filter_=prefix)
+        if not _jobs:
+            raise RuntimeError(
+                f'No jobs with prefix "{prefix}" found in {pipe.ROOT.path} '
+                f'- see build_bench_jobs')
+        _etys = time_bench_op(
+            _ops, f'find_entities.{_mode}', _sum_job_results, _jobs,
+            'find_entities')
+        time_bench_op(
+            _ops, f'find_works.{_mode}', _sum_job_results, _jobs,
+            'find_works')
+        time_bench_op(
+            _ops, f'find_outputs.{_mode}', _sum_job_results, _jobs,
+            'find_outputs')
+        time_bench_op(
+            _ops, f'_read_publishes.{_mode}', _sum_job_results, _jobs,
+            '_read_publishes', force=2 if _mode == 'cold' else False)
+        _ops[f'root.{_mode}'] = {
+            'dur': time.time() - _start, 'count': len(_etys)}
+
+    # Time mapping paths to outputs
+    _paths = _build_bench_paths(_jobs, count=n_paths)
+    time_bench_op(_ops, 'to_output', _map_paths_to_outputs, _paths)
+
+    # Report
+    for _op, _data in _ops.items():
+        _LOGGER.info(
+            ' - %-24s %8.03fs %8d', _op, _data['dur'], _data['count'])
+    if write:
+        write_bench_results(_results)
+
+    return _results
+
+
+def run_pipe_index_bench(
+        n_seqs=50, n_shots=100, n_lookups=1000, name='pipe_index',
+        prefix='PiniIndexBench', write=True):
+    """Run pipe cache lookup benchmark on a synthetic job.
+
+    A job with one work file per shot is built (if needed), and then
+    entities are obtained from a warm cache root using the indexed
+    lookups, compared with scanning the cached entities list.
+
+    Args:
+        n_seqs (int): number of sequences in the job
+        n_shots (int): number of shots per sequence
+        n_lookups (int): number of shots to look up
+        name (str): benchmark name (used in json filename)
+        prefix (str): synthetic job name prefix
+        write (bool): write results to json
+
+    Returns:
+        (dict): benchmark results
+    """
+    from pini import pipe
+    from pini.utils import flush_caches, strftime, single
+
+    _job = single(build_bench_jobs(
+        n_seqs=n_seqs, n_shots=n_shots, n_assets=n_lookups // 10,
+        n_tasks=1, n_vers=1, n_outputs=0, prefix=prefix))
+    _results = {
+        'name': name,
+        'pipe_version': pipe.VERSION,
+        'master': pipe.MASTER,
+        'time': strftime(),
+        'n_shots': n_seqs * n_shots,
+        'ops': {}}
+    _ops = _results['ops']
+
+    # Warm cache
+    flush_caches(namespace='pipe')
+    _root = pipe.cache.CCPRoot(pipe.ROOT.path)
+    _job_c = time_bench_op(_ops, 'obt_job', _root.obt_job, _job.name)
+    _etys = time_bench_op(_ops, 'entities', _job_c.find_entities)
+    _LOGGER.info('BENCH JOB %s - %d ENTITIES', _job_c.name, len(_etys))
+
+    # Time lookups - plain entity objects are used as the cache will
+    # look them up on first use (ie. when mapping paths to outputs)
+    _shots = random.Random(0).sample(
+        _job_c.find_shots(), min(n_lookups, len(_job_c.shots)))
+    _shots = [pipe.CPShot(_shot.path) for _shot in _shots]
+    time_bench_op(
+        _ops, 'scan_entity', _scan_bench_entities, _job_c, _shots)
+    time_bench_op(
+        _ops, 'obt_entity', _obt_bench_items, _job_c.obt_entity, _shots)
+    time_bench_op(
+        _ops, 'obt_entity_name', _obt_bench_items, _job_c.obt_entity,
+        [_shot.name for _shot in _shots])
+    time_bench_op(
+        _ops, 'root_obt_entity', _obt_bench_items, _root.obt_entity,
+        [_shot.path for _shot in _shots])
+    time_bench_op(
+        _ops, 'obt_sequence', _obt_bench_items, _root.obt_sequence,
+        [pipe.CPSequence(_seq.path) for _seq in _job_c.find_sequences()])
+
+    # Report
+    for _op, _data in _ops.items():
+        _LOGGER.info(
+            ' - %-16s %8.03fs %8d %8.01fus/item', _op, _data['dur'],
+            _data['count'], _data['dur'] / max(_data['count'], 1) * 1000000)
+    if write:
+        write_bench_results(_results)
+
+    return _results
+
+
+def _scan_bench_entities(job, etys):
+    """Obtain cached entities by scanning the job's entity list.
+
+    This is how entities were obtained before the cache was indexed.
+
+    Args:
+        job (CCPJob): job to search
+        etys (CPEntity list): entities to obtain
+
+    Returns:
+        (CCPEntity list): cached entities
+    """
+    from pini.utils import single
+    return [single([_ety for _ety in job.entities if _ety == _match])
+            for _match in etys]
+
+
+def _obt_bench_items(func, items):
+    """Obtain cached pipeline elements.
+
+    Args:
+        func (fn): obtain function (eg. CCPJob.obt_entity)
+        items (list): items to obtain
+
+    Returns:
+        (list): cached elements
+    """
+    _results = [func(_item) for _item in items]
+    assert all(_results)
+    return _results
+
+
+def _sum_job_results(jobs, method, **kwargs):
+    """Sum the results of the given method on a list of jobs.
+
+    Args:
+        jobs (CCPJob list): jobs
+        method (str): name of job method to call
+
+    Returns:
+        (list): combined results
+    """
+    _results = []
+    for _job in jobs:
+        _results += getattr(_job, method)(**kwargs)
+    return _results
+
+
+def _build_bench_paths(jobs, count):
+    """Build list of output paths to test path mapping with.
+
+    Paths are generated using the template of each existing output,
+    incrementing the version until the required count is reached.
+
+    Args:
+        jobs (CCPJob list): jobs to read outputs from
+        count (int): number of paths to generate
+
+    Returns:
+        (str list): output paths
+    """
+    _outs = [_out for _out in _sum_job_results(jobs, 'find_outputs')
+             if _out.ver]
+    if not _outs:
+        return []
+    _paths = []
+    _ver_n = 1
+    while len(_paths) < count:
+        for _out in _outs:
+            _data = dict(_out.data)
+            _data['ver'] = str(_ver_n).zfill(len(_out.ver))
+            _paths.append(_out.template.format(_data))
+            if len(_paths) == count:
+                break
+        _ver_n += 1
+    return _paths
+
+
+def _map_paths_to_outputs(paths):
+    """Map a list of paths to output objects.
+
+    Args:
+        paths (str list): paths to map
+
+    Returns:
+        (CPOutput list): outputs
+    """
+    from pini import pipe
+    return [pipe.to_output(_path) for _path in paths]
@@ -0,0 +1,77 @@
+"""Tools for benchmarking the overhead of reporting progress.
+
+A loop of many trivial items is iterated (the qt dialog is only tested
+outside batch mode):
+
+    >>> testing.run_progress_bench(n_items=100000)
+"""
+
+import logging
+
+from .tb_utils import write_bench_results, time_bench_op
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def run_progress_bench(n_items=100000, name='progress', write=True):
+    """Run progress reporting overhead benchmark.
+
+    A loop of trivial items is iterated bare, and using console progress.
+    Outside batch mode, the qt progress dialog is also tested with and
+    without rate limited updates.
+
+    Args:
+        n_items (int): number of items to iterate
+        name (str): benchmark name (used in json filename)
+        write (bool): write results to json
+
+    Returns:
+        (dict): benchmark results
+    """
+    from pini import dcc
+    from pini.utils import strftime, ConsoleProgress
+
+    _items = list(range(n_items))
+    _results = {
+        'name': name,
+        'time': strftime(),
+        'n_items': n_items,
+        'ops': {}}
+    _ops = _results['ops']
+
+    time_bench_op(_ops, 'bare', _iter_bench_progress, _items)
+    time_bench_op(
+        _ops, 'console', _iter_bench_progress, ConsoleProgress(_items))
+    if not dcc.batch_mode():
+        from pini import qt
+        for _op, _max_fps in [('qt_unthrottled', 0), ('qt', 30)]:
+            time_bench_op(
+                _ops, _op, _iter_bench_progress, qt.progress_bar(
+                    _items, f'Bench {_op} {{:d}} item{{}}',
+                    max_fps=_max_fps, stack_key='ProgressBench'))
+
+    _bare = _ops['bare']['dur']
+    for _op, _data in _ops.items():
+        _LOGGER.info(
+            ' - %-14s %8.03fs %8.03fus/item overhead', _op, _data['dur'],
+            (_data['dur'] - _bare) / n_items * 1000000)
+
+    if write:
+        write_bench_results(_results)
+
+    return _results
+
+
+def _iter_bench_progress(items):
+    """Iterate the given items.
+
+    Args:
+        items (iterable): items to iterate
+
+    Returns:
+        (list): items
+    """
+    _items = []
+    for _item in items:
+        _items.append(_item)
+    return _items
@@ -0,0 +1,137 @@
+"""Tools for benchmarking reading pyui interfaces.
+
+Interfaces are read from a cached spec, compared with importing and
+parsing the module:
+
+    >>> testing.run_pyui_bench(n_defs=500)
+"""
+
+import logging
+import sys
+
+from .tb_utils import BENCH_DIR, write_bench_results, time_bench_op
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def run_pyui_bench(n_defs=500, n_sects=20, name='pyui', write=True):
+    """Run pyui interface spec benchmark.
+
+    A large pyui file is generated, and the time taken to read its ui
+    elements (and their args) by importing and parsing the module is
+    compared with reading them from its interface spec, with the spec
+    built from scratch, read from disk and read from memory.
+
+    Args:
+        n_defs (int): number of functions in the pyui file
+        n_sects (int): number of sections in the pyui file
+        name (str): benchmark name (used in json filename)
+        write (bool): write results to json
+
+    Returns:
+        (dict): benchmark results
+    """
+    from pini.tools import pyui
+    from pini.tools.pyui.cpnt import pu_spec
+    from pini.utils import strftime
+
+    _dir = BENCH_DIR.to_subdir('pyui/python')
+    _dir.delete(force=True)
+    _mod_name = f'pini_bench_pyui_{n_defs:d}'
+    _py = pyui.PUFile(_dir.to_file(f'{_mod_name}.py'))
+    _write_bench_pyui(_py, n_defs=n_defs, n_sects=n_sects)
+    sys.path.insert(0, _dir.path)
+    _results = {
+        'name': name,
+        'time': strftime(),
+        'n_defs': n_defs,
+        'ops': {}}
+    _ops = _results['ops']
+
+    try:
+        time_bench_op(
+            _ops, 'import', _read_bench_pyui_elems, _py, spec=False)
+        time_bench_op(
+            _ops, 'reimport', _read_bench_pyui_elems, _py, spec=False)
+        time_bench_op(_ops, 'build_spec', _read_bench_pyui_elems, _py,
+                      spec=True, force=True)
+        pu_spec.flush_spec_cache()
+        time_bench_op(
+            _ops, 'spec_disk', _read_bench_pyui_elems, _py, spec=True)
+        time_bench_op(
+            _ops, 'spec_mem', _read_bench_pyui_elems, _py, spec=True)
+    finally:
+        sys.path.remove(_dir.path)
+        sys.modules.pop(_mod_name, None)
+
+    for _op, _data in _ops.items():
+        _LOGGER.info(
+            ' - %-12s %8.03fs %5d elems', _op, _data['dur'], _data['count'])
+
+    _dir.delete(force=True)
+    if write:
+        write_bench_results(_results)
+
+    return _results
+
+
+def _read_bench_pyui_elems(py_file, spec, force=False):
+    """Read pyui elements and args (as they are read to build a ui).
+
+    Args:
+        py_file (PUFile): pyui file
+        spec (bool): read elements from interface spec
+        force (bool): rebuild interface spec
+
+    Returns:
+        (list): elements and their args
+    """
+    if force:
+        py_file.read_spec(force=True)
+    _elems = []
+    for _elem in py_file.find_ui_elems(spec=spec):
+        _args = _elem.find_args() if hasattr(_elem, 'find_args') else []
+        _elems.append((_elem, _args))
+    return _elems
+
+
+def _write_bench_pyui(file_, n_defs, n_sects):
+    """Write a synthetic pyui file.
+
+    Args:
+        file_ (File): file to write
+        n_defs (int): number of functions
+        n_sects (int): number of sections
+    """
+    _lines = [
+        '"""Synthetic pyui file for benchmarking."""',
+        '',
+        'from pini.tools import pyui',
+        '',
+        "PYUI_TITLE = 'Pyui Bench'",
+        '']
+    for _idx in range(n_defs):
+        if not _idx % max(n_defs // n_sects, 1):
+            _lines += ['', f"pyui.set_section('Section {_idx:d}')", '']
+        _lines += [
+            '',
+            '@pyui.install(',
+            "    clear=['name'], browser=['path'],",
+            "    choices={'mode': ['Apple', 'Cherry', 'Banana']})",
+            f'def bench_func_{_idx:d}(',
+            "        name='test', path='', mode='Apple', count=1,",
+            '        scale=1.0, enabled=True, node=None):',
+            f'    """Benchmark function {_idx:d}.',
+            '',
+            '    Args:',
+            '        name (str): name to apply',
+            '        path (str): path to read',
+            '        mode (str): mode to apply',
+            '        count (int): number of items',
+            '        scale (float): scale to apply',
+            '        enabled (bool): whether enabled',
+            '        node (str): node to apply to',
+            '    """',
+            '    print(name, path, mode, count, scale, enabled, node)',
+            '']
+    file_.write('\n'.join(_lines), force=True)
@@ -0,0 +1,96 @@
+"""Tools for benchmarking reloading modules.
+
+Modules are reloaded incrementally, compared with reloading all modules:
+
+    >>> testing.run_reload_bench()
+"""
+
+import importlib
+import logging
+import os
+import pkgutil
+import sys
+import time
+
+from .tb_utils import write_bench_results, time_bench_op
+
+_LOGGER = logging.getLogger(__name__)
+
+_RELOAD_BENCH_MODS = (
+    'pini.utils.u_image_header', 'pini.utils.u_misc', 'pini.tools.usage')
+
+
+def run_reload_bench(mod_names=_RELOAD_BENCH_MODS, name='reload', write=True):
+    """Run module reload benchmark.
+
+    All pini modules are imported, and then the time taken to reload all
+    of them is compared with reloading only changed modules (and their
+    dependents) after each of the given modules is changed. Changes are
+    simulated by updating the module's mtime, which is then restored.
+    The import graph is built first, as the cost of parsing all modules
+    is only paid on the first incremental reload.
+
+    Args:
+        mod_names (str list): names of modules to change
+        name (str): benchmark name (used in json filename)
+        write (bool): write results to json
+
+    Returns:
+        (dict): benchmark results
+    """
+    import pini
+    from pini import refresh
+    from pini.utils import strftime
+
+    # Import all modules
+    _fails = 0
+    for _info in pkgutil.walk_packages(pini.__path__, 'pini.'):
+        if '.tests' in _info.name:
+            continue
+        try:
+            importlib.import_module(_info.name)
+        except Exception as _exc:  # pylint: disable=broad-except
+            _LOGGER.debug(' - FAILED TO IMPORT %s %s', _info.name, _exc)
+            _fails += 1
+    _mods = refresh.find_mods(base='pini')
+    _LOGGER.info(' - IMPORTED %d MODS (%d FAILED)', len(_mods), _fails)
+    _results = {
+        'name': name,
+        'time': strftime(),
+        'n_mods': len(_mods),
+        'ops': {}}
+    _ops = _results['ops']
+
+    # Time reloads
+    _start = time.time()
+    refresh.reload_libs(close_interfaces=False, verbose=0)
+    _ops['reload_libs'] = {
+        'dur': time.time() - _start, 'count': len(_mods)}
+    refresh.reload_changed_libs(close_interfaces=False, verbose=0)
+    refresh.flush_import_cache()
+    _start = time.time()
+    _graph = refresh.build_import_graph()
+    _ops['build_graph'] = {'dur': time.time() - _start, 'count': len(_graph)}
+    for _mod_name in mod_names:
+        _file = sys.modules[_mod_name].__file__
+        _stat = os.stat(_file)
+        os.utime(_file, (_stat.st_atime, _stat.st_mtime + 5))
+        try:
+            time_bench_op(
+                _ops, f'changed_{_mod_name}', refresh.reload_changed_libs,
+                close_interfaces=False, verbose=0)
+        finally:
+            os.utime(_file, (_stat.st_atime, _stat.st_mtime))
+        refresh.reload_changed_libs(close_interfaces=False, verbose=0)
+    time_bench_op(
+        _ops, 'unchanged', refresh.reload_changed_libs,
+        close_interfaces=False, verbose=0)
+
+    for _op, _data in _ops.items():
+        _LOGGER.info(
+            ' - %-40s %8.03fs %5d mods', _op, _data['dur'], _data['count'])
+
+    if write:
+        write_bench_results(_results)
+
+    return _results
@@ -0,0 +1,72 @@
+"""Tools for benchmarking finding sanity checks.
+
+eg. on opening the publish dialog:
+
+    >>> testing.run_sanity_check_bench(action='BasicPublish')
+"""
+
+import logging
+import sys
+
+from pini.utils import EMPTY
+
+from .tb_utils import write_bench_results, time_bench_op
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def run_sanity_check_bench(
+        action='BasicPublish', task=EMPTY, name='sanity_check', write=True):
+    """Run sanity check discovery benchmark.
+
+    This measures finding checks as applied on opening the publish
+    dialog. Check modules are removed from sys.modules before each cold
+    run so that import time is included. Importing every check module
+    (as applied before checks were filtered using the static manifest)
+    is compared with find_checks, which only imports modules containing
+    matching checks.
+
+    Args:
+        action (str): export action (eg. BasicPublish)
+        task (str): override task
+        name (str): benchmark name (used in json filename)
+        write (bool): write results to json
+
+    Returns:
+        (dict): benchmark results
+    """
+    from pini.tools import sanity_check
+    from pini.utils import flush_caches, strftime
+
+    def _flush_checks():
+        for _mod_name in list(sys.modules):
+            if _mod_name.startswith('pini.tools.sanity_check.checks.'):
+                del sys.modules[_mod_name]
+        sanity_check.core.flush_manifest_cache()
+        flush_caches()
+
+    _results = {
+        'name': name,
+        'time': strftime(),
+        'action': action,
+        'ops': {}}
+    _ops = _results['ops']
+
+    _flush_checks()
+    time_bench_op(_ops, 'import_all_cold', sanity_check.read_checks)
+    _flush_checks()
+    time_bench_op(
+        _ops, 'find_checks_cold', sanity_check.find_checks, action=action,
+        task=task)
+    time_bench_op(
+        _ops, 'find_checks_warm', sanity_check.find_checks, action=action,
+        task=task)
+    for _op, _data in _ops.items():
+        _LOGGER.info(
+            ' - %-16s %8.03fs (%d checks)', _op, _data['dur'],
+            _data['count'])
+
+    if write:
+        write_bench_results(_results)
+
+    return _results
@@ -0,0 +1,107 @@
+"""Tools for benchmarking syncing a large directory tree.
+
+The tree is synced incrementally, compared with checking every file:
+
+    >>> testing.run_sync_bench(n_files=100000, change=0.01)
+"""
+
+import logging
+import os
+import random
+import time
+
+from .tb_utils import BENCH_DIR, write_bench_results
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def run_sync_bench(
+        n_files=100000, change=0.01, files_per_dir=1000, name='sync',
+        write=True):
+    """Run directory sync benchmark.
+
+    A tree of small files is synced, then a fraction of the files are
+    modified (half with a size change, half with the same size). Finding
+    the changes by checking every file (as previously applied by
+    Dir.sync_to) is then compared with an incremental sync using cached
+    manifests.
+
+    Args:
+        n_files (int): number of files in tree
+        change (float): fraction of files to modify
+        files_per_dir (int): number of files in each subdirectory
+        name (str): benchmark name (used in json filename)
+        write (bool): write results to json
+
+    Returns:
+        (dict): benchmark results
+    """
+    from pini.utils import strftime, sync_dirs, find_unmatched_files
+    _dir = BENCH_DIR.to_subdir('sync')
+    _dir.delete(force=True)
+    _src_dir = _dir.to_subdir('src')
+    _trg_dir = _dir.to_subdir('trg')
+    _results = {
+        'name': name,
+        'time': strftime(),
+        'n_files': n_files,
+        'change': change,
+        'ops': {}}
+    _ops = _results['ops']
+
+    # Build source tree
+    _rel_paths = [
+        f'dir{int(_idx / files_per_dir):04d}/file{_idx:06d}.txt'
+        for _idx in range(n_files)]
+    for _idx, _rel_path in enumerate(_rel_paths):
+        _path = f'{_src_dir.path}/{_rel_path}'
+        if not _idx % files_per_dir:
+            os.makedirs(os.path.dirname(_path))
+        with open(_path, 'w', encoding='utf-8') as _hook:
+            _hook.write(f'file {_idx:06d}\n')
+
+    _start = time.time()
+    sync_dirs(_src_dir, _trg_dir)
+    _ops['initial'] = {'dur': time.time() - _start, 'count': n_files}
+
+    # Modify files
+    _rand = random.Random(0)
+    _changed = _rand.sample(_rel_paths, int(n_files * change))
+    for _idx, _rel_path in enumerate(_changed):
+        _path = f'{_src_dir.path}/{_rel_path}'
+        with open(_path, 'r', encoding='utf-8') as _hook:
+            _text = _hook.read()
+        _text = _text.upper() if _idx % 2 else _text + 'changed\n'
+        with open(_path, 'w', encoding='utf-8') as _hook:
+            _hook.write(_text)
+
+    # Find delta by checking every file
+    _start = time.time()
+    _src_paths = _src_dir.find(full_path=False, type_='f')
+    _files = [(_src_dir.to_file(_path), _trg_dir.to_file(_path))
+              for _path in _src_paths]
+    _unmatched = find_unmatched_files(_files, check='cmp')
+    _ops['legacy_delta'] = {
+        'dur': time.time() - _start, 'count': len(_unmatched)}
+
+    # Find delta/apply sync using manifests
+    for _op, _dry_run in [
+            ('dry_run', True), ('incremental', False), ('noop', False)]:
+        _start = time.time()
+        _report = sync_dirs(_src_dir, _trg_dir, dry_run=_dry_run)
+        _ops[_op] = {
+            'dur': time.time() - _start,
+            'count': len(_report['copy'] + _report['update']),
+            'hashed': _report['hashed']}
+    assert _ops['dry_run']['count'] == len(_changed)
+    assert not _ops['noop']['count']
+
+    for _op, _data in _ops.items():
+        _LOGGER.info(
+            ' - %-12s %8.03fs %8d files', _op, _data['dur'], _data['count'])
+
+    _dir.delete(force=True)
+    if write:
+        write_bench_results(_results)
+
+    return _results
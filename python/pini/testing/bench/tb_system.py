@@ -0,0 +1,64 @@
+"""Tools for benchmarking concurrent execution of subprocesses.
+
+eg. ffprobe/pylint:
+
+    >>> testing.run_system_bench(n_cmds=50)
+"""
+
+import logging
+import sys
+
+from .tb_utils import write_bench_results, time_bench_op
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def run_system_bench(
+        n_cmds=20, sleep=0.2, workers=(4, 8, 16), name='system', write=True):
+    """Run concurrent subprocess execution benchmark.
+
+    A stand-in command which sleeps for the given duration is used, which
+    simulates a latency-bound process like ffprobe or deadlinecommand.
+    The commands are run serially (as applied by system), and then
+    concurrently using system_many and asystem_many with each of the
+    given worker counts.
+
+    Args:
+        n_cmds (int): number of commands to run
+        sleep (float): duration of each command (in seconds)
+        workers (int list): worker counts to test
+        name (str): benchmark name (used in json filename)
+        write (bool): write results to json
+
+    Returns:
+        (dict): benchmark results
+    """
+    import asyncio
+    from pini.utils import strftime, system, system_many, asystem_many
+    _cmds = [
+        [sys.executable, '-c',
+         f'import time; time.sleep({sleep}); print({_idx:d})']
+        for _idx in range(n_cmds)]
+    _results = {
+        'name': name,
+        'time': strftime(),
+        'n_cmds': n_cmds,
+        'sleep': sleep,
+        'ops': {}}
+    _ops = _results['ops']
+
+    time_bench_op(_ops, 'serial', lambda: [system(_cmd) for _cmd in _cmds])
+    for _workers in workers:
+        time_bench_op(
+            _ops, f'threads_{_workers:d}', system_many, _cmds,
+            max_workers=_workers)
+        time_bench_op(
+            _ops, f'asyncio_{_workers:d}', lambda _workers=_workers: (
+                asyncio.run(asystem_many(_cmds, max_workers=_workers))))
+    for _op, _data in _ops.items():
+        _LOGGER.info(' - %-12s %8.03fs', _op, _data['dur'])
+
+    if write:
+        write_bench_results(_results)
+
+    return _results
@@ -0,0 +1,90 @@
+"""Tools for benchmarking building thumbnails for image sequences.
+
+Thumbnails are built for many image sequences in batch:
+
+    >>> testing.run_thumb_bench(n_seqs=50)
+"""
+
+import logging
+
+from .tb_utils import BENCH_DIR, write_bench_results, time_bench_op
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def run_thumb_bench(
+        n_seqs=50, n_frames=5, res=(1920, 1080), name='thumb', write=True):
+    """Run batch thumbnail benchmark.
+
+    Synthetic png and exr sequences are written using ffmpeg, and then
+    the time taken to build their thumbnails using a single worker is
+    compared with using a worker pool. The time taken to skip thumbnails
+    which are up to date is also measured.
+
+    Args:
+        n_seqs (int): number of sequences of each format
+        n_frames (int): number of frames in each sequence
+        res (tuple): image resolution
+        name (str): benchmark name (used in json filename)
+        write (bool): write results to json
+
+    Returns:
+        (dict): benchmark results
+    """
+    from pini.utils import strftime, Seq, build_thumbnails
+    _dir = BENCH_DIR.to_subdir('thumb')
+    _dir.delete(force=True)
+    _results = {
+        'name': name,
+        'time': strftime(),
+        'n_seqs': n_seqs,
+        'ops': {}}
+    _ops = _results['ops']
+
+    _seqs = []
+    for _extn in ('png', 'exr'):
+        _seqs += [
+            Seq(_dir.to_file(f'{_extn}/seq{_idx:03d}/image.%04d.{_extn}'))
+            for _idx in range(n_seqs)]
+    write_bench_seqs(_seqs, res=res, n_frames=n_frames)
+    _thumbs = [_dir.to_file(f'thumb/{_idx:03d}.jpg')
+               for _idx in range(len(_seqs))]
+
+    time_bench_op(
+        _ops, 'serial', build_thumbnails, _seqs, _thumbs, max_workers=1)
+    time_bench_op(_ops, 'pool', build_thumbnails, _seqs, _thumbs, force=True)
+    time_bench_op(_ops, 'skip', build_thumbnails, _seqs, _thumbs)
+
+    for _op, _data in _ops.items():
+        _LOGGER.info(
+            ' - %-8s %8.03fs %8.01f thumbs/s', _op, _data['dur'],
+            _data['count'] / max(_data['dur'], 0.000001))
+
+    _dir.delete(force=True)
+    if write:
+        write_bench_results(_results)
+
+    return _results
+
+
+def write_bench_seqs(seqs, res=(320, 180), n_frames=5, start=1001):
+    """Write synthetic image sequences using ffmpeg.
+
+    The format is determined by the sequence extension (eg. png/exr).
+
+    Args:
+        seqs (Seq list): sequences to write
+        res (tuple): image width/height
+        n_frames (int): number of frames in each sequence
+        start (int): start frame
+    """
+    from pini.utils import system_many, find_exe
+    _ffmpeg = find_exe('ffmpeg')
+    _cmds = []
+    for _seq in seqs:
+        _seq.test_dir()
+        _cmds.append([
+            _ffmpeg, '-f', 'lavfi',
+            '-i', f'testsrc=size={res[0]:d}x{res[1]:d}:rate=25',
+            '-frames:v', n_frames, '-start_number', start, _seq])
+    system_many(_cmds)
@@ -0,0 +1,83 @@
+"""General utilities for benchmarking pini.
+
+Results are written to $TMP/.pini/benchmark as json, so that they can
+be compared between releases:
+
+    >>> testing.compare_bench_results(_old_json, _new_json)
+"""
+
+import json
+import logging
+import time
+
+from pini.utils import PINI_TMP, File, strftime
+
+_LOGGER = logging.getLogger(__name__)
+
+BENCH_DIR = PINI_TMP.to_subdir('benchmark')
+
+
+def write_bench_results(results):
+    """Write benchmark results to json.
+
+    Args:
+        results (dict): benchmark results
+
+    Returns:
+        (File): json file
+    """
+    _json = BENCH_DIR.to_file(
+        f'{results["name"]}_{strftime("%y%m%d_%H%M%S")}.json')
+    _json.write(json.dumps(results, indent=4), force=True)
+    _LOGGER.info('WROTE BENCH RESULTS %s', _json.path)
+    return _json
+
+
+def time_bench_op(ops, name, func, *args, **kwargs):
+    """Time the given operation and store the result.
+
+    Args:
+        ops (dict): operation results to update
+        name (str): operation name
+        func (fn): operation to execute
+
+    Returns:
+        (list): operation result
+    """
+    _start = time.time()
+    _result = func(*args, **kwargs)
+    ops[name] = {'dur': time.time() - _start, 'count': len(_result)}
+    _LOGGER.debug(' - %s %.03fs', name, ops[name]['dur'])
+    return _result
+
+
+def compare_bench_results(file_a, file_b, threshold=0.1):
+    """Compare two benchmark result files.
+
+    Args:
+        file_a (File): baseline results json (eg. previous release)
+        file_b (File): results json to compare
+        threshold (float): fractional slowdown which is flagged as
+            a regression
+
+    Returns:
+        (dict): operation name/slowdown fraction of each regression
+    """
+    _data_a = json.loads(File(file_a).read())
+    _data_b = json.loads(File(file_b).read())
+    _regressions = {}
+    for _op, _op_a in _data_a['ops'].items():
+        _op_b = _data_b['ops'].get(_op)
+        if not _op_b or not _op_a['dur']:
+            continue
+        _frac = _op_b['dur'] / _op_a['dur'] - 1
+        _LOGGER.info(
+            ' - %-24s %8.03fs -> %8.03fs %+6.01f%%', _op, _op_a['dur'],
+            _op_b['dur'], _frac * 100)
+        if _frac > threshold:
+            _regressions[_op] = _frac
+    if _regressions:
+        _LOGGER.info(
+            'FOUND %d REGRESSIONS: %s', len(_regressions),
+            ', '.join(sorted(_regressions)))
+    return _regressions
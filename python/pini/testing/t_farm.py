@@ -0,0 +1,171 @@
+"""Tools for testing the farm api without a farm.
+
+A fake deadlinecommand executable can be written to disk, which serves
+job details from a json file of jobs. This can be applied using the
+$PINI_DEADLINECOMMAND_EXE override:
+
+    >>> _jobs = testing.build_fake_deadline_jobs(10)
+    >>> _exe = testing.write_fake_deadline(_jobs)
+    >>> os.environ['PINI_DEADLINECOMMAND_EXE'] = _exe.path
+
+Each call to the fake executable is logged to calls.txt so that tests
+can check which jobs were read. Job reports can be served by passing
+a dict of job uid/report paths, and deadline errors can be simulated
+by passing an error message.
+"""
+
+import getpass
+import json
+import logging
+import os
+import platform
+import sys
+
+from pini.utils import PINI_TMP, Dir, strftime
+
+_LOGGER = logging.getLogger(__name__)
+
+FAKE_DEADLINE_DIR = PINI_TMP.to_subdir('fake_deadline')
+
+_FAKE_DEADLINE_PY = '''
+import json
+import os
+import sys
+
+if sys.argv[1] in ['-Groups', '-GetLimitGroupNames']:
+    print('none')
+    sys.exit()
+
+_dir = os.path.dirname(os.path.abspath(__file__))
+_fail = os.path.join(_dir, 'fail.txt')
+if os.path.exists(_fail):
+    with open(_fail) as _hook:
+        sys.stderr.write(_hook.read())
+    sys.exit(1)
+with open(os.path.join(_dir, 'jobs.json')) as _hook:
+    _jobs = json.load(_hook)
+_cmd, _args = sys.argv[1], sys.argv[2:]
+
+# Apply filters
+if _cmd in ['GetJobsFilter', 'GetJobIdsFilter']:
+    for _arg in _args:
+        _key, _val = _arg.split('=', 1)
+        _jobs = [_job for _job in _jobs if _job.get(_key) == _val]
+elif _cmd == 'GetJob':
+    _ids = _args[0].split(',')
+    _jobs = [_job for _job in _jobs if _job['ID'] in _ids]
+elif _cmd in ['GetJobErrorReportFilenames', 'GetJobLogReportFilenames']:
+    with open(os.path.join(_dir, 'reports.json')) as _hook:
+        _reports = json.load(_hook)
+    _jobs = [_job for _job in _jobs if _job['ID'] == _args[0]]
+else:
+    raise NotImplementedError(_cmd)
+with open(os.path.join(_dir, 'calls.txt'), 'a') as _hook:
+    _hook.write(f'{_cmd} {len(_jobs)}\\n')
+
+# Print results
+if _cmd == 'GetJobIdsFilter':
+    for _job in _jobs:
+        print(_job['ID'])
+elif _cmd.endswith('ReportFilenames'):
+    for _path in _reports.get(_args[0], []):
+        print(_path)
+else:
+    for _job in _jobs:
+        for _key, _val in _job.items():
+            print(f'{_key}={_val}')
+        print()
+        print()
+'''
+
+
+def build_fake_deadline_jobs(count, status='Completed', user=None):
+    """Build job details data for the fake deadlinecommand.
+
+    Args:
+        count (int): number of jobs
+        status (str): job status
+        user (str): job user (default is current user)
+
+    Returns:
+        (dict list): job details
+    """
+    _user = user or getpass.getuser()
+    _ctime = strftime('%m/%d/%Y %H:%M:%S')
+    _jobs = []
+    for _idx in range(count):
+        _jobs.append({
+            'ID': f'{_idx:024x}',
+            'BatchName': f'batch{_idx // 10:04d}',
+            'Comment': '',
+            'JobName': f'job{_idx:05d}',
+            'JobOutputDirectories': f'/tmp/renders/job{_idx:05d}',
+            'JobOutputFileNames': f'job{_idx:05d}.####.exr',
+            'PluginInfoDictionary': '',
+            'Priority': '50',
+            'Status': status,
+            'SubmitDateTimeString': _ctime,
+            'UserName': _user,
+        })
+    return _jobs
+
+
+def write_fake_deadline(jobs, dir_=None, reports=None, error=None):
+    """Write fake deadlinecommand executable.
+
+    If the executable already exists, just the jobs are updated.
+
+    Args:
+        jobs (dict list): job details
+        dir_ (Dir): override output dir
+        reports (dict): job uid/report paths
+        error (str): make job commands fail with this error
+
+    Returns:
+        (File): executable
+    """
+    _dir = Dir(dir_ or FAKE_DEADLINE_DIR)
+    _dir.to_file('jobs.json').write(json.dumps(jobs), force=True)
+    _dir.to_file('reports.json').write(json.dumps(reports or {}), force=True)
+    _fail = _dir.to_file('fail.txt')
+    if error:
+        _fail.write(error, force=True)
+    else:
+        _fail.delete(force=True)
+    _py = _dir.to_file('deadlinecommand.py')
+    _py.write(_FAKE_DEADLINE_PY, force=True)
+
+    if platform.system() == 'Windows':
+        _exe = _dir.to_file('deadlinecommand.bat')
+        _exe.write(f'@"{sys.executable}" "{_py.path}" %*', force=True)
+    else:
+        _exe = _dir.to_file('deadlinecommand')
+        _exe.write(
+            f'#!/bin/sh\nexec "{sys.executable}" "{_py.path}" "$@"\n',
+            force=True)
+        os.chmod(_exe.path, 0o755)
+
+    return _exe
+
+
+def read_fake_deadline_calls(dir_=None, reset=False):
+    """Read calls made to the fake deadlinecommand.
+
+    Args:
+        dir_ (Dir): override fake deadline dir
+        reset (bool): clear calls after reading
+
+    Returns:
+        (tuple list): list of command/number of jobs read
+    """
+    _file = Dir(dir_ or FAKE_DEADLINE_DIR).to_file('calls.txt')
+    _calls = []
+    if _file.exists():
+        for _line in _file.read().split('\n'):
+            if not _line:
+                continue
+            _cmd, _count = _line.split()
+            _calls.append((_cmd, int(_count)))
+        if reset:
+            _file.delete(force=True)
+    return _calls
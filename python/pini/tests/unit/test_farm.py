@@ -0,0 +1,153 @@
+import bz2
+import logging
+import os
+import time
+import unittest
+
+from pini import testing, farm
+from pini.farm import deadline, base
+from pini.utils import assert_eq
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TestDeadline(unittest.TestCase):
+
+    def test_frame_schedule(self):
+
+        # Check chunk size + ordering
+        _sched = base.schedule_frames(
+            range(1, 101), frame_dur=60, target_dur=600)
+        assert_eq(_sched.chunk_size, 10)
+        assert_eq(_sched.frames_str, '1,51,100,2-50,52-99')
+        _chunks = _sched.to_chunks()
+        assert_eq(len(_chunks), 10)
+        assert_eq(_chunks[0], [1, 51, 100, 2, 3, 4, 5, 6, 7, 8])
+        assert_eq(base.schedule_frames(range(1, 11)).chunk_size, 2)
+        assert_eq(base.schedule_frames([1], frame_dur=1).chunk_size, 1)
+        assert_eq(
+            base.schedule_frames(range(1, 11), validate=False).frames_str,
+            '1-10')
+
+        # Check reading frame durations from mtimes
+        _mtimes = {1: 100.0, 51: 160.0, 100: 230.0, 2: 300.0, 3: 380.0}
+        assert_eq(
+            base.chunks_to_frame_durs(_mtimes, [[1, 51, 100], [2, 3]]),
+            [60.0, 70.0, 80.0])
+
+    def test_submission_files(self):
+
+        if not farm.IS_AVAILABLE:
+            return
+
+        class _TestJob(deadline.CDCmdlineJob):
+            job = testing.TEST_JOB
+
+        _sched = base.schedule_frames(range(1, 21), chunk_size=5)
+        _sub = _TestJob(
+            cmds=['echo', 'test'], name='ScheduleTest', stime=time.time(),
+            frames=_sched.frames, chunk_size=_sched.chunk_size,
+            group=farm.find_groups()[0])
+        _sub.write_submission_files()
+        _info = _sub.info_file.read()
+        _sub.info_file.to_dir().delete(force=True)
+        assert 'Frames=1,11,20,2-10,12-19\n' in _info
+        assert 'ChunkSize=5\n' in _info
+
+    def test_job_poller(self):
+
+        _jobs = testing.build_fake_deadline_jobs(20)
+        for _job in _jobs[-5:]:
+            _job['Status'] = 'Rendering'
+        _exe = testing.write_fake_deadline(_jobs)
+        testing.read_fake_deadline_calls(reset=True)
+
+        _env = os.environ.get('PINI_DEADLINECOMMAND_EXE')
+        os.environ['PINI_DEADLINECOMMAND_EXE'] = _exe.path
+        try:
+
+            # Check full read
+            _poller = deadline.CDJobPoller()
+            _added, _, _ = _poller.poll()
+            assert_eq(len(_added), 20)
+            _job = _poller.jobs[_jobs[-1]['ID']]
+            assert_eq(_job.status, 'Rendering')
+            assert_eq(_job.path, '/tmp/renders/job00019/job00019.%04d.exr')
+            assert_eq(
+                testing.read_fake_deadline_calls(reset=True),
+                [('GetJobsFilter', 20)])
+
+            # Check incremental read only reads active jobs
+            _jobs[-1]['Status'] = 'Completed'
+            _jobs.pop(0)
+            _jobs += testing.build_fake_deadline_jobs(21)[-1:]
+            testing.write_fake_deadline(_jobs)
+            _added, _updated, _removed = _poller.poll()
+            assert_eq(len(_added), 1)
+            assert_eq(_updated, [_job])
+            assert_eq(len(_removed), 1)
+            assert_eq(_job.status, 'Completed')
+            assert_eq(len(_poller.find_jobs()), 20)
+            assert_eq(
+                testing.read_fake_deadline_calls(reset=True),
+                [('GetJobIdsFilter', 20), ('GetJob', 6)])
+
+            # Check failed read leaves table unchanged
+            testing.write_fake_deadline(_jobs, error='Error: no connection')
+            with self.assertRaises(RuntimeError):
+                _poller.poll()
+            assert_eq(len(_poller.find_jobs()), 20)
+            testing.write_fake_deadline(_jobs)
+
+        finally:
+            if _env is None:
+                del os.environ['PINI_DEADLINECOMMAND_EXE']
+            else:
+                os.environ['PINI_DEADLINECOMMAND_EXE'] = _env
+
+    def test_job_logs(self):
+
+        # Build reports
+        _jobs = testing.build_fake_deadline_jobs(3, status='Failed')
+        _reports = {}
+        for _idx, _job in enumerate(_jobs):
+            _report = testing.FAKE_DEADLINE_DIR.to_file(
+                f'reports/{_job["ID"]}.bz2')
+            _report.delete(force=True)
+            _report.test_dir()
+            _lines = [f'line {_line_idx:d}' for _line_idx in range(10)]
+            _lines[5] = f'Error: job {_idx:d} failed'
+            with bz2.open(_report.path, 'wt') as _hook:
+                _hook.write('\n'.join(_lines))
+            _reports[_job['ID']] = [_report.path]
+        _exe = testing.write_fake_deadline(_jobs, reports=_reports)
+
+        _env = os.environ.get('PINI_DEADLINECOMMAND_EXE')
+        os.environ['PINI_DEADLINECOMMAND_EXE'] = _exe.path
+        try:
+
+            _poller = deadline.CDJobPoller()
+            _poller.poll()
+            _farm_jobs = _poller.find_jobs()
+            _errors = deadline.read_job_errors(_farm_jobs, max_errors=1)
+            assert_eq(
+                _errors[_farm_jobs[0]], [(5, 'Error: job 0 failed')])
+
+            # Check index/text cache
+            _log = _farm_jobs[1].find_logs()[0]
+            _log.index_file.delete(force=True)
+            _log.text_file.delete(force=True)
+            assert_eq(_log.read_index()['n_lines'], 10)
+            assert _log.text_file.exists()
+            assert_eq(_log.find_errors(), [(5, 'Error: job 1 failed')])
+            assert_eq(
+                deadline.read_job_logs(_farm_jobs[1:2])[0].split('\n')[5],
+                'Error: job 1 failed')
+            assert 'line 6: Error: job 2 failed' in (
+                deadline.summarise_job_failures(_farm_jobs))
+
+        finally:
+            if _env is None:
+                del os.environ['PINI_DEADLINECOMMAND_EXE']
+            else:
+                os.environ['PINI_DEADLINECOMMAND_EXE'] = _env
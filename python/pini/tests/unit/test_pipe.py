@@ -1,11 +1,16 @@
+import collections
 import logging
 import os
 import pprint
+import threading
 import time
+import types
 import unittest
+from unittest import mock
 
 from pini import pipe, testing, dcc
 from pini.pipe import cache, cp_template
+from pini.pipe.elem.work import cp_work_recent
 from pini.utils import (
     File, single, flush_caches, assert_eq, Seq, MetadataFile, PINI_TMP)
 
@@ -192,6 +197,39 @@ class TestPipe(unittest.TestCase):
         assert _shot.settings
         testing.enable_file_system(True)
 
+    def test_recent_work(self):
+
+        _yml = PINI_TMP.to_file('RecentWorkTest/recent.yml')
+        _yml.delete(force=True)
+        _recent = cp_work_recent.CPRecentWork(_yml, limit=3, prune=False)
+        assert not _recent.to_works()
+
+        # Test push to front
+        _work = testing.TEST_SHOT.to_work_dir('light').to_work(ver_n=0)
+        _other = _work.to_work(tag='recent')
+        _recent.push(_work)
+        _recent.push(_other)
+        _recent.push(_work.to_work(ver_n=2))
+        _works = _recent.to_works()
+        assert_eq(_works, [_work, _other])
+        assert_eq(_yml.read_yml(), [_work.path, _other.path])
+
+        # Test works are reused unless settings file is modified
+        assert _recent.to_works()[0] is _works[0]
+        time.sleep(0.01)
+        _yml.write_yml([_other.path, _work.path], force=True)
+        assert_eq(_recent.to_works(), [_other, _work])
+        assert _recent.to_works()[0] is _works[1]
+
+        # Test missing work dirs are pruned
+        _missing = testing.TEST_SHOT.to_work_dir('recent').to_work(
+            ver_n=0)
+        if not _missing.work_dir.exists():
+            _recent.push(_missing)
+            assert _recent.to_works()[0] == _missing
+            _recent.prune()
+            assert _missing not in _recent.to_works()
+
     def test_task_sort(self):
 
         assert pipe.task_sort('ani/anim') > pipe.task_sort('ani/lay')
@@ -516,6 +554,40 @@ class TestDiskPipe(unittest.TestCase):
         _pub_c = testing.TEST_YML.read_yml()
         assert isinstance(_pub_c.work_dir, cache.CCPWorkDir)
 
+    def test_stored_work_bkps(self):
+
+        _work_dir = testing.TMP_ASSET.to_work_dir(task='model')
+        _work_dir.flush(force=True)
+        _work = _work_dir.to_work(tag='bkp', ver_n=1)
+        _work.write('test A\n', force=True)
+        _mtime = int(_work.mtime())
+
+        # Check backups are saved to store
+        with mock.patch.dict(os.environ, {'PINI_WORK_BKP_MODE': 'store'}):
+            assert not _work.has_bkp()
+            _bkp = _work._save_bkp('test', mtime=_mtime)
+            assert _bkp.stored
+            assert not _bkp.exists()
+            assert _work.has_bkp()
+            _work.write('test B\n', force=True)
+            _work._save_bkp('test', mtime=_mtime + 1)
+        _bkps = _work.find_bkps()
+        assert_eq(len(_bkps), 2)
+        assert all(_bkp.stored for _bkp in _bkps)
+        assert_eq(_bkps[0].reason, 'test')
+        assert _bkps[1].matches(_work)
+        assert not _bkps[0].matches(_work)
+
+        # Check restore + flush
+        _restored = _bkps[0].extract(force=True)
+        assert_eq(_restored.read(), 'test A\n')
+        _work.flush_bkps()
+        assert not _work.find_bkps()
+        assert not _work.has_bkp()
+        assert not _bkps[0].store.find_blobs()
+
+        _work_dir.delete(force=True)
+
     def test_validate_token(self):
 
         _LOGGER.info('JOBS ROOT %s', pipe.ROOT)
@@ -615,6 +687,32 @@ class TestCache(unittest.TestCase):
         assert _pub_c.entity is _ety_c
         assert _pub_c.work_dir.entity is _ety_c
 
+    def test_lookup_indexes(self):
+
+        _shot = testing.TEST_SHOT
+        _job_c = pipe.CACHE.obt_job(_shot.job)
+        assert pipe.CACHE.obt_job(_shot.job.name) is _job_c
+        assert pipe.CACHE.to_job(_shot.job.name) is _job_c
+
+        # Test index matches scanning cached lists
+        _shot_c = _job_c.obt_entity(_shot)
+        assert _shot_c is single(
+            _ety for _ety in _job_c.entities if _ety == _shot)
+        assert _job_c.obt_entity(_shot.name) is _shot_c
+        _seq = _shot.to_sequence()
+        _seq_c = _job_c.obt_sequence(_seq)
+        assert _seq_c is single(
+            _o_seq for _o_seq in _job_c.sequences if _o_seq == _seq)
+
+        # Test index is rebuilt when shots are reread
+        _seq_c.find_shots(force=True)
+        _idx = _job_c._obt_entities_index()  # pylint: disable=protected-access
+        _shot_c = single(_idx.find(_shot.path))
+        assert _shot_c is single(
+            _ety for _ety in _job_c.entities if _ety == _shot)
+        assert _shot_c is single(
+            _o_shot for _o_shot in _seq_c.shots if _o_shot == _shot)
+
     def test_reset_cache(self):
 
         _shot = testing.TMP_SHOT
@@ -626,6 +724,20 @@ class TestCache(unittest.TestCase):
         pipe.CACHE.reset()
         assert pipe.CACHE.obt_entity(_shot) is not _shot_c
 
+    def test_warm_cache(self):
+
+        _shot = testing.TEST_SHOT
+        _report = cache.warm_job_cache(
+            _shot.job, filter_=_shot.name, shotgrid=False, workers=4)
+        assert not _report.failed
+        _report = cache.warm_job_cache(
+            _shot.job, filter_=_shot.name, shotgrid=False, workers=4)
+        assert not _report.refreshed
+        assert _report.n_fresh
+        _report = cache.warm_job_cache(
+            _shot.job, filter_=_shot.name, shotgrid=False, max_age=0.001)
+        assert _report.refreshed
+
     def test_output_ghost_obj(self):
 
         _pub = pipe.CACHE.obt(testing.TEST_JOB).find_publishes()[0]
@@ -636,3 +748,190 @@ class TestCache(unittest.TestCase):
         assert _out_c == _out_g
         assert _out_c in [_out_g]
         assert _out_g in [_out_c]
+
+
+class _CountingSGHandler:
+    """Mock shotgrid handler which counts requests.
+
+    Pub files are served from a list of data dicts, each with an entity
+    key which is matched against an entity filter.
+    """
+
+    def __init__(self, pubs=()):
+        """Constructor.
+
+        Args:
+            pubs (dict list): existing pub files data
+        """
+        self.pubs = list(pubs)
+        self.counts = collections.Counter()
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        """Count a request (uploads are made from worker threads).
+
+        Args:
+            name (str): request name
+        """
+        with self._lock:
+            self.counts[name] += 1
+
+    def find(self, entity_type, filters, fields=(), limit=0, order=None):
+        """Find pub files matching the entity filter.
+
+        Args:
+            entity_type (str): type of entity to find
+            filters (list): filter the results
+            fields (tuple): fields to return
+            limit (int): limit number of results
+            order (dict list): apply sorting
+
+        Returns:
+            (dict list): results
+        """
+        assert entity_type == 'PublishedFile'
+        self._count('find')
+        _ety = single(
+            _val for _key, _, _val in filters if _key == 'entity')
+        return [dict(_pub) for _pub in self.pubs if _pub['entity'] == _ety]
+
+    def batch(self, requests):
+        """Apply batch request.
+
+        Args:
+            requests (dict list): requests data
+
+        Returns:
+            (dict list): batch result
+        """
+        self._count('batch')
+        self.batches.append(requests)
+        return [{'id': 1000 + _idx} for _idx, _ in enumerate(requests)]
+
+    def upload_thumbnail(self, entity_type, entity_id, path):
+        """Upload thumbnail.
+
+        Args:
+            entity_type (str): entity type
+            entity_id (int): entity id
+            path (str): path to thumbnail
+        """
+        self._count('upload_thumbnail')
+
+
+class _FakeSGEntity:
+    """Fake entity whose pub files are read using the shotgrid handler."""
+
+    def __init__(self, name):
+        """Constructor.
+
+        Args:
+            name (str): entity name
+        """
+        self.name = name
+        self.n_refreshes = 0
+
+    @property
+    def sg_entity(self):
+        """Obtain shotgrid entity (ie. this object).
+
+        Returns:
+            (_FakeSGEntity): entity
+        """
+        return self
+
+    def find_pub_files(self):
+        """Read pub files in this entity.
+
+        Returns:
+            (SimpleNamespace list): pub files
+        """
+        from pini.pipe import shotgrid
+        return [
+            types.SimpleNamespace(
+                id_=_data['id'], path=_data['path'], omitted=False,
+                updated_at=_data['updated_at'])
+            for _data in shotgrid.find(
+                'PublishedFile', filters=[('entity', 'is', self.name)])]
+
+    def find_outputs(self, force=False):
+        """Refresh outputs cache.
+
+        Args:
+            force (bool): force reread outputs
+
+        Returns:
+            (list): outputs
+        """
+        assert force
+        self.n_refreshes += 1
+        return []
+
+    def __lt__(self, other):
+        return self.name < other.name
+
+
+class _FakeSGOutput:
+    """Fake output for registering in shotgrid."""
+
+    content_type = 'Model'
+
+    def __init__(self, entity, path):
+        """Constructor.
+
+        Args:
+            entity (_FakeSGEntity): parent entity
+            path (str): output path
+        """
+        self.entity = entity
+        self.path = path
+
+    def is_media(self):
+        """Test whether this output is media.
+
+        Returns:
+            (bool): whether media
+        """
+        return False
+
+
+class TestShotgrid(unittest.TestCase):
+
+    def test_create_pub_files_requests(self):
+
+        from pini.pipe import shotgrid
+        from pini.pipe.shotgrid import sg_handler, sg_pub_file
+
+        # Build outputs across two entities, with one already registered
+        _etys = [_FakeSGEntity('shot010'), _FakeSGEntity('shot020')]
+        _outs = [
+            _FakeSGOutput(_ety, path=f'/tmp/{_ety.name}/out{_idx:d}.abc')
+            for _ety in _etys for _idx in range(3)]
+        _handler = _CountingSGHandler(pubs=[{
+            'id': 1, 'entity': 'shot010', 'path': _outs[0].path,
+            'updated_at': 0}])
+
+        _cache = types.SimpleNamespace(obt=lambda obj: obj)
+        with mock.patch.object(sg_handler, 'to_handler', lambda: _handler), \
+                mock.patch.object(
+                    sg_handler, '_to_thread_handler', lambda: _handler), \
+                mock.patch.object(pipe, 'CACHE', _cache), \
+                mock.patch.object(
+                    sg_pub_file, '_build_pub_data_from_output',
+                    lambda out, **kwargs: {'path': out.path}), \
+                mock.patch.object(
+                    sg_pub_file, '_obt_thumb',
+                    lambda thumb, path=None: thumb):
+            _results = shotgrid.create_pub_files_from_outputs(
+                _outs, thumb='/tmp/thumb.jpg')
+
+        # One pub files read per entity, one batch, one upload per output
+        assert_eq(
+            dict(_handler.counts),
+            {'find': 2, 'batch': 1, 'upload_thumbnail': 6})
+        assert_eq(len(single(_handler.batches)), 5)
+        assert_eq(
+            [_result['id'] for _result in _results],
+            [1, 1000, 1001, 1002, 1003, 1004])
+        assert_eq([_ety.n_refreshes for _ety in _etys], [1, 1])
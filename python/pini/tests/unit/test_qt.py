@@ -1,5 +1,7 @@
 import logging
 import math
+import operator
+import random
 import unittest
 
 from pini import qt
@@ -62,6 +64,40 @@ class TestQt(unittest.TestCase):
             _LOGGER.info(' - %10s %30s %.02f', _angle, _vec, _vec.bearing())
             assert _angle == _vec.bearing()
 
+    def test_graph_space(self):
+
+        _graph = qt.CGraphSpace(None)
+        _graph.resize(400, 300)
+        _rand = random.Random(0)
+        for _idx in range(100):
+            _elem = _graph.add_basic_elem(
+                name=f'Elem{_idx:d}',
+                pos=(_rand.uniform(0, 2000), _rand.uniform(0, 1500)),
+                size=(60, 40), selectable=True, draggable=True)
+            if not _idx % 10:
+                _elem.add_basic_elem(
+                    name='Child', pos=(10, 10), size=(20, 10), anchor='TL')
+        _graph.zoom = 0.5
+        _graph.redraw()
+
+        # Test hit testing matches checking every element
+        for _ in range(50):
+            _pt = qt.CPointF(_rand.uniform(0, 2000), _rand.uniform(0, 1500))
+            _elems = [
+                _elem for _elem in _graph.find_elems()
+                if _elem.visible and _elem.contains(_pt)]
+            _elems.sort(key=operator.attrgetter('level'), reverse=True)
+            assert _graph.find_elems_at(_pt) == _elems
+
+        # Test dirty redraw matches full redraw
+        _graph.find_elem('Elem5').local_pos_g = qt.CPointF(100, 100)
+        _graph.find_elem('Elem7').selected = True
+        _graph.offset_p = _graph.offset_p + qt.CVector2D(37, -12)
+        _dirty = _graph.redraw_dirty().toImage()
+        _full = _graph.redraw().toImage()
+        assert _dirty == _full
+        _graph.deleteLater()
+
     def test_list_widget(self):
 
         _list = qt.CListWidget()
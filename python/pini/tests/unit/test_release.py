@@ -721,6 +721,25 @@ class TestRelease(unittest.TestCase):
 
         _LOGGER.info('CHECKS PASSED')
 
+    def test_import_time(self):
+
+        for _mod_name, _heavy_mods in [
+                ('pini.utils', [
+                    'pini.utils.u_email', 'pini.utils.clip',
+                    'pini.utils.u_ma_file', 'pini.utils.py_file', 'yaml']),
+                ('pini.pipe', ['pini.pipe.elem', 'pini.pipe.cache']),
+                ('pini.qt', ['pini.qt.wrapper', 'pini.qt.graph']),
+        ]:
+            _lazy = release.read_loaded_mods(_mod_name)
+            _eager = release.read_loaded_mods(_mod_name, lazy=False)
+            _LOGGER.info(
+                'IMPORT %s LOADED %d MODS (EAGER %d)', _mod_name,
+                len(_lazy), len(_eager))
+            assert _mod_name in _lazy
+            for _heavy_mod in _heavy_mods:
+                assert _heavy_mod in _eager
+                assert _heavy_mod not in _lazy
+
     def test_remove_unused_imports(self):
 
         _names = set()
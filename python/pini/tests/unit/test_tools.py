@@ -1,11 +1,16 @@
 import importlib
 import logging
+import os
+import sys
+import time
 import unittest
 
 import pini
 
-from pini.tools import usage, error, pyui
-from pini.utils import File, PyFile, assert_eq
+from pini import refresh
+from pini.tools import usage, error, pyui, sanity_check
+from pini.utils import (
+    File, PyFile, assert_eq, PINI_TMP, strftime, single, safe_zip)
 
 _LOGGER = logging.getLogger(__name__)
 _DIR = File(__file__).to_dir()
@@ -57,6 +62,100 @@ class TestErrorCatcher(unittest.TestCase):
             error.error_from_str(_tb)
 
 
+class TestSanityCheck(unittest.TestCase):
+
+    def test_engine(self):
+
+        _order = []
+
+        class _TestCheck(sanity_check.SCCheck):
+
+            is_disabled = False
+
+            def run(self):
+                time.sleep(0.05)
+                _order.append(self.name)
+
+        class CheckMain(_TestCheck):
+            sort = 10
+
+        class CheckPure(_TestCheck):
+            pure = True
+
+        class CheckPureDep(_TestCheck):
+            pure = True
+            depends_on = (CheckMain, )
+
+        class CheckChatty(_TestCheck):
+            pure = True
+
+            def run(self):
+                for _idx in range(3000):
+                    self.write_log('line %d', _idx)
+                self.add_fail('Test fail')
+
+        _checks = [CheckPureDep(), CheckChatty(), CheckPure(), CheckMain()]
+        _profile = sanity_check.execute_checks(_checks, use_cache=False)
+        assert_eq(
+            sorted(_profile), sorted(_check.name for _check in _checks))
+        assert_eq(
+            [_check.status for _check in sorted(_checks)],
+            ['passed', 'failed', 'passed', 'passed'])
+        assert _order.index('CheckPureDep') > _order.index('CheckMain')
+
+        # Check log ring buffer
+        _log = _checks[1].log.strip().split('\n')
+        assert_eq(len(_log), 2001)
+        assert _log[0].endswith(' lines dropped')
+        assert _log[-1].split(' ', 1)[1].startswith('Completed check')
+
+    def test_manifest(self):
+
+        _dir = PINI_TMP.to_subdir('SanityCheckManifestTest')
+        _py = _dir.to_file('checks.py', class_=PyFile)
+        _py.write(
+            'from pini.tools.sanity_check import core\n\n\n'
+            'class CheckA(core.SCCheck):\n'
+            '    dcc_filter = "maya"\n'
+            '    task_filter = "model"\n\n\n'
+            'class CheckB(CheckA):\n'
+            '    action_filter = "Render"\n\n\n'
+            'class CheckC(core.SCCheck):\n'
+            '    task_filter = " ".join(["model", "rig"])\n',
+            force=True)
+        _nuke_py = _dir.to_file('nuke_checks.py', class_=PyFile)
+        _nuke_py.write(
+            'import nuke\n\n'
+            'from pini.tools.sanity_check import core\n\n\n'
+            'class CheckD(core.SCCheck):\n'
+            '    pass\n',
+            force=True)
+
+        _infos = {
+            _info.name: _info
+            for _info in sanity_check.core.read_manifest([_py, _nuke_py])}
+        assert_eq(sorted(_infos), ['CheckA', 'CheckB', 'CheckC'])
+        assert_eq(_infos['CheckB'].dcc_filter, 'maya')
+        assert_eq(_infos['CheckB'].action_filter, 'Render')
+        assert _infos['CheckB'].is_static
+        assert not _infos['CheckC'].is_static
+        _nuke_info = sanity_check.core.read_py_manifest(_nuke_py)[0]
+        assert_eq(_nuke_info.dcc, 'nuke')
+
+        # Check broken file is skipped
+        _broken_py = _dir.to_file('broken_checks.py', class_=PyFile)
+        _broken_py.write(
+            'from pini.tools.sanity_check import core\n\n\n'
+            'class CheckE(core.SCCheck)\n'
+            '    pass\n',
+            force=True)
+        assert_eq(sanity_check.core.read_py_manifest(_broken_py), [])
+        _infos = sanity_check.core.read_manifest([_py, _broken_py])
+        assert_eq(
+            sorted(_info.name for _info in _infos),
+            ['CheckA', 'CheckB', 'CheckC'])
+
+
 class TestPyui(unittest.TestCase):
 
     def test_read_py_file_qt(self):
@@ -95,9 +194,176 @@ class TestPyui(unittest.TestCase):
         _ui.hide()
         _ui.delete()
 
+    def test_spec(self):
+
+        # Check computed icon means test file is built from module
+        _spec = pyui.PUFile(_TEST_PY).read_spec(force=True)
+        assert not _spec['static']
+        assert_eq(_spec['title'], 'Test PYUI')
+
+        _dir = PINI_TMP.to_subdir('test/pyui_spec/python')
+        _py = _dir.to_file('pinipyuistatictest.py', class_=pyui.PUFile)
+        _py.write(
+            'from pini.tools import pyui\n\n'
+            'PYUI_TITLE = "Static Test"\n\n\n'
+            'def print_something(something="test"):\n'
+            '    """Print something."""\n'
+            '    print(something)\n\n\n'
+            '@pyui.install(\n'
+            '    clear=["none_test"], browser=["path_test"],\n'
+            '    choices={"choices_test": ["Apple", "Cherry", "Banana"]})\n'
+            'def args_test(\n'
+            '        bool_test=True, str_test="hello", int_test=-1,\n'
+            '        none_test=None, path_test="", choices_test="Apple"):\n'
+            '    """Test for args."""\n',
+            force=True)
+        sys.path.insert(0, _dir.path)
+        try:
+            _spec = _py.read_spec(force=True)
+            assert _spec['static']
+            assert_eq(_spec['title'], 'Static Test')
+
+            # Check elems read from spec match module without importing
+            _elems = _py.find_ui_elems()
+            _def = _py.find_ui_elem('args_test')
+            _mod_name = _spec['mod_name']
+            del sys.modules[_mod_name]
+            _spec_elems = _py.find_ui_elems(spec=True)
+            assert _mod_name not in sys.modules
+            assert_eq([_elem.name for _elem in _spec_elems],
+                      [_elem.name for _elem in _elems])
+            _spec_def = single(_elem for _elem in _spec_elems
+                               if _elem.name == 'args_test')
+            assert_eq(_spec_def.label, _def.label)
+            assert_eq(_spec_def.icon, _def.icon)
+            for _arg, _spec_arg in safe_zip(
+                    _def.find_args(), _spec_def.find_args()):
+                for _attr in ['name', 'default', 'label', 'clear', 'browser',
+                              'choices', 'docs']:
+                    assert_eq(
+                        getattr(_spec_arg, _attr), getattr(_arg, _attr))
+            assert_eq(_spec_def.py_def.to_docs('Title'), 'Test for args.')
+
+            # Check module only imported on execute
+            _spec_def = single(_elem for _elem in _py.find_ui_elems(spec=True)
+                               if _elem.name == 'print_something')
+            assert _mod_name not in sys.modules
+            _spec_def.execute(something='test')
+            assert _mod_name in sys.modules
+        finally:
+            sys.path.remove(_dir.path)
+
+    def test_spec_dynamic(self):
+
+        _dir = PINI_TMP.to_subdir('test/pyui_spec/python')
+        _dir.to_file('pinipyuispecconst.py').write(
+            'VAL = "apple"\n', force=True)
+        _py = _dir.to_file('pinipyuidynamictest.py', class_=pyui.PUFile)
+        _py.write(
+            'import os\n\n'
+            'import pinipyuispecconst\n\n'
+            'from pini.tools import pyui\n\n'
+            'ICON = os.environ.get("PINI_PYUI_SPEC_TEST")\n\n\n'
+            '@pyui.install(icon=os.environ.get("PINI_PYUI_SPEC_TEST"))\n'
+            'def dynamic_test(text=pinipyuispecconst.VAL):\n'
+            '    """Test for computed data."""\n',
+            force=True)
+        sys.path.insert(0, _dir.path)
+        try:
+            _const = importlib.import_module('pinipyuispecconst')
+
+            # Check computed data is re-evaluated on each load
+            for _val in ['apple', 'banana']:
+                os.environ['PINI_PYUI_SPEC_TEST'] = f'{_val}.png'
+                _const.VAL = _val
+                _def = single(_py.find_ui_elems(spec=True))
+                assert not _py.read_spec()['static']
+                assert_eq(_def.icon, f'{_val}.png')
+                assert_eq(single(_def.find_args()).default, _val)
+                assert_eq(_py.icon, f'{_val}.png')
+
+        finally:
+            sys.path.remove(_dir.path)
+            del os.environ['PINI_PYUI_SPEC_TEST']
+
+
+class TestRefresh(unittest.TestCase):
+
+    def test_reload_changed_libs(self):
+
+        _dir = PINI_TMP.to_subdir('test/reload')
+        _dir.delete(force=True)
+        _pkg = _dir.to_subdir('pinireloadtest')
+        _pkg.to_file('__init__.py').write('')
+        _pkg.to_file('r_a.py').write('VAL = 1\n')
+        _pkg.to_file('r_b.py').write('from .r_a import VAL\n')
+        _pkg.to_file('r_c.py').write('import os\n')
+        sys.path.insert(0, _dir.path)
+        try:
+            importlib.import_module('pinireloadtest.r_c')
+            _b = importlib.import_module('pinireloadtest.r_b')
+            assert_eq(refresh.find_changed_mods('pinireloadtest'), [])
+            _graph = refresh.build_import_graph('pinireloadtest')
+            assert_eq(_graph['pinireloadtest.r_b'], {'pinireloadtest.r_a'})
+            assert_eq(_graph['pinireloadtest.r_c'], set())
+
+            _a = _pkg.to_file('r_a.py')
+            _a.write('VAL = 22\n', force=True)
+            _reloaded = refresh.reload_changed_libs(
+                'pinireloadtest', close_interfaces=False)
+            assert_eq(
+                _reloaded, ['pinireloadtest.r_a', 'pinireloadtest.r_b'])
+            assert_eq(_b.VAL, 22)
+            assert_eq(refresh.reload_changed_libs(
+                'pinireloadtest', close_interfaces=False), [])
+
+            # Check change before first check is detected from snapshot
+            _d = _pkg.to_file('r_d.py')
+            _d.write('VAL = 1\n')
+            importlib.import_module('pinireloadtest.r_d')
+            refresh.snapshot_mods('pinireloadtest')
+            _d.write('VAL = 333\n', force=True)
+            assert_eq(
+                refresh.find_changed_mods('pinireloadtest'),
+                ['pinireloadtest.r_d'])
+        finally:
+            sys.path.remove(_dir.path)
+            for _name in list(sys.modules):
+                if _name.startswith('pinireloadtest'):
+                    del sys.modules[_name]
+
 
 class TestRelease(unittest.TestCase):
 
     def test_usage(self):
 
         assert usage._read_mod_ver(pini, force=True)
+
+    def test_usage_events(self):
+
+        _root = PINI_TMP.to_subdir('test/usage')
+        _root.delete(force=True)
+        _writer = usage._UsageWriter()
+        for _user, _func in [('a', 'Load'), ('a', 'Save'), ('b', 'Load')]:
+            _file = _root.to_file(f'{_user}/{strftime("%y%m%d")}.jsonl')
+            _writer.add(_file, {'func': _func, 'time': int(time.time())})
+        assert_eq(_writer.flush(), 3)
+        assert_eq(_writer.flush(), 0)
+        assert_eq(usage.read_usage_counts(root=_root)['Load'], 2)
+        assert_eq(usage.read_usage_counts(root=_root, key='user')['a'], 2)
+        assert_eq(len(usage.read_usage(root=_root, func_filter='Save')), 1)
+
+        # Check bad event doesn't stop other events being written
+        _file = _root.to_file(f'c/{strftime("%y%m%d")}.jsonl')
+        _writer.add(_file, {'func': 'Bad', 'time': object()})
+        _writer.add(_root.to_file(f'a/{strftime("%y%m%d")}.jsonl'),
+                    {'func': 'Load', 'time': int(time.time())})
+        assert_eq(_writer.flush(), 2)
+        assert_eq(usage.read_usage_counts(root=_root)['Load'], 3)
+
+        # Check legacy yml usage is read
+        _yml = _root.to_file('d/200101.yml')
+        _yml.write_yml([{'func': 'Load', 'time': 1577836800}])
+        assert_eq(usage.read_usage_counts(root=_root)['Load'], 4)
+        assert_eq(usage.read_usage_counts(
+            root=_root, start=time.time() - 60)['Load'], 3)
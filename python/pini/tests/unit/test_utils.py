@@ -1,3 +1,4 @@
+import asyncio
 import getpass
 import inspect
 import logging
@@ -5,6 +6,7 @@ import os
 import pprint
 import platform
 import random
+import subprocess
 import sys
 import time
 import unittest
@@ -18,7 +20,10 @@ from pini.utils import (
     merge_dicts, to_snake, strftime, to_ord, to_camel, PyFile, Res, HOME,
     file_to_seq, split_base_index, nice_age, find_viewers, to_pascal,
     Image, TMP, search_dict_for_key, MetadataFile, get_result_to_file_cacher,
-    build_cache_fmt)
+    build_cache_fmt, TRACER, trace_span, trace_count, copy_files, copy_file,
+    find_unmatched_files, system_many, asystem_many, MaFile, BlobStore,
+    read_image_res, build_thumbnails, sync_dirs, ConsoleProgress,
+    obt_force_count, pick_thumb_frame)
 from pini.utils.u_mel_file import _MelExpr
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,6 +31,37 @@ _LOGGER = logging.getLogger(__name__)
 
 class TestUtils(unittest.TestCase):
 
+    def test_console_progress(self):
+
+        _items = list(range(1000))
+        _progress = ConsoleProgress(_items, verbose=False)
+        assert len(_progress) == 1000
+        assert list(_progress) == _items
+        assert _progress.is_finished()
+        assert _progress.cur_pc == 100
+
+        # Test updates are rate limited
+        _progress = ConsoleProgress(_items, interval=0.0, verbose=False)
+        _n_updates = 0
+        for _ in _progress:
+            _n_updates += _progress.last_redraw != _progress.start
+        assert _n_updates
+        _progress = ConsoleProgress(_items, interval=60.0, verbose=False)
+        assert list(_progress) == _items
+        assert _progress.last_redraw == _progress.start
+        _progress = ConsoleProgress(_items, interval=60.0, verbose=False)
+        _progress.last_redraw = 0.0
+        _progress.__next__(update_ui=False)
+        assert _progress.last_redraw
+
+        # Test manual percent
+        _progress = ConsoleProgress(
+            range(100), raise_stop=False, verbose=False)
+        _progress.set_pc(50)
+        assert _progress.cur_pc == 51
+        _progress.set_pc(100)
+        assert _progress.is_finished()
+
     def test_filter(self):
 
         assert passes_filter('C:/tmp/test2.txt', '')
@@ -51,6 +87,46 @@ class TestUtils(unittest.TestCase):
         assert_eq(ints_to_str([1, 2]), '1-2')
         assert_eq(ints_to_str([-1, 2, 3]), '-1,2-3')
 
+    def test_ma_file(self):
+
+        _file = TMP.to_file('pini/test/test.ma')
+        _file.write(
+            '//Maya ASCII 2023 scene\n'
+            '//Name: test.ma\n'
+            'requires maya "2023";\n'
+            'file -rdi 1 -rfn "assetRN" "/tmp/asset.ma";\n'
+            'createNode transform -n "node1";\n'
+            '\tsetAttr ".t" -type "double3" 1 2 3 ;\n'
+            'createNode mesh -n "nodeShape1" -p "node1";\n'
+            '\tsetAttr ".vir" yes;\n'
+            '\tsetAttr ".vif" yes;\n'
+            'createNode transform -n "node2";\n'
+            '// End of test.ma\n', force=True)
+
+        _ma = MaFile(_file)
+        assert_eq([_node.name for _node in _ma.find_nodes()],
+                  ['node1', 'nodeShape1', 'node2'])
+        _mesh = _ma.find_node(type_='mesh')
+        assert_eq(_mesh.line_n, 7)
+        assert_eq(len(_mesh.children), 2)
+        assert _mesh.children[0].indented
+        assert_eq(_mesh.children[0].children, [])
+        _ref = single(_ma.find_exprs(cmd='file'))
+        assert_eq(_ref.read_flag('rfn'), 'assetRN')
+
+        # Test edits are saved
+        _ref.replace('/tmp/asset.ma', '/tmp/asset_v002.ma')
+        _ma.remove(_ma.find_node(name='node2'))
+        _ma.remove(_mesh.children[0])
+        _ma.save(force=True)
+        _ma = MaFile(_file)
+        assert_eq([_node.name for _node in _ma.find_nodes()],
+                  ['node1', 'nodeShape1'])
+        assert '"/tmp/asset_v002.ma";\n' in _ma.body
+        assert 'setAttr ".vir"' not in _ma.body
+        assert 'setAttr ".vif"' in _ma.body
+        assert _ma.body.endswith('// End of test.ma\n')
+
     def test_mel_file(self):
 
         _text = '''shelfButton -command "/*\n======\n===\n\n     bhGhost 1.32 - - bug fix for crashing issue with 'Create Trackers' function in Maya 2017/2018\n\t \n\t \n\t \n     \n     - added option to ghost bh Multiples automatically if they are in the scene\n     \n\t 140616 _ added check for existing 'hide on playback' layer so that checkbox in UI is updated to" -blah'''
@@ -162,6 +238,37 @@ class TestUtils(unittest.TestCase):
         assert str_to_seed('blah').random() == str_to_seed('blah').random()
         assert str_to_seed('blah').random() != str_to_seed('blahasda').random()
 
+    def test_system_many(self):
+
+        # Check results are ordered + run concurrently
+        _cmds = [
+            [sys.executable, '-c',
+             f'import time; time.sleep({0.3 - _idx * 0.05}); print({_idx})']
+            for _idx in range(5)]
+        _start = time.time()
+        _results = system_many(_cmds, max_workers=5)
+        assert time.time() - _start < 1.2
+        assert_eq([_result.strip() for _result in _results],
+                  ['0', '1', '2', '3', '4'])
+        _results = asyncio.run(asystem_many(_cmds, max_workers=2))
+        assert_eq([_result.strip() for _result in _results],
+                  ['0', '1', '2', '3', '4'])
+
+        # Check streaming
+        _lines = []
+        system_many(
+            _cmds[:2], callback=lambda *args: _lines.append(args))
+        assert_eq(sorted(_lines), [(0, 'out', '0\n'), (1, 'out', '1\n')])
+
+        # Check timeout
+        _cmds = [[sys.executable, '-c', 'import time; time.sleep(10)'],
+                 [sys.executable, '-c', 'print(1)']]
+        with self.assertRaises(subprocess.TimeoutExpired):
+            system_many(_cmds, timeout=0.5)
+        _results = system_many(_cmds, timeout=0.5, catch=True)
+        assert_eq(_results[0], None)
+        assert_eq(_results[1].strip(), '1')
+
     def test_to_camel(self):
         assert_eq(to_camel('cat_ginger_A'), 'catGingerA')
         assert_eq(to_camel('This Is Some Text'), 'thisIsSomeText')
@@ -185,6 +292,41 @@ class TestUtils(unittest.TestCase):
         _str = 'aasdas - asdadd - asdss'
         assert to_pascal(_str) == 'AasdasAsdaddAsdss'
 
+    def test_trace(self):
+
+        _enabled = TRACER.enabled
+        TRACER.enable()
+        TRACER.reset()
+        try:
+            with trace_span('test.outer'):
+                with trace_span('test.inner', idx=1):
+                    time.sleep(0.01)
+                trace_count('test.counter', 2)
+                TMP.find(depth=1)
+        finally:
+            TRACER.enable(_enabled)
+        _timers = TRACER.read_timers()
+        assert _timers['test.outer']['count'] == 1
+        assert _timers['test.inner']['total'] >= 0.01
+        assert _timers['test.outer']['self'] < _timers['test.outer']['total']
+        assert _timers['fs.find']['count'] == 1
+        assert TRACER.read_counters()['test.counter'] == 2
+        _trace = TRACER.to_chrome_trace()
+        assert sorted(
+            _event['name'] for _event in _trace['traceEvents']
+            if _event['ph'] == 'X') == ['fs.find', 'test.inner', 'test.outer']
+
+        # Check disabled
+        TRACER.reset()
+        TRACER.enable(False)
+        try:
+            with trace_span('test.outer'):
+                trace_count('test.counter')
+        finally:
+            TRACER.enable(_enabled)
+        assert not TRACER.read_timers()
+        assert not TRACER.read_counters()
+
     def test_to_snake(self):
         assert_eq(to_snake('a test'), 'a_test')
         assert_eq(to_snake('MyTest'), 'my_test')
@@ -237,6 +379,10 @@ class TestCache(unittest.TestCase):
         assert _test(1, 2, ddd=False) != _result
         assert _test(1, 2) == _test(1, 2)
         assert _test(1, 2) != _test(1, 2, force=True)
+        _force_count = obt_force_count()
+        _test(1, 2)
+        _test(1, 2, force=True)
+        assert obt_force_count() == _force_count + 1
 
         class _Test:
 
@@ -358,6 +504,36 @@ class TestPath(unittest.TestCase):
         assert abs_path('file:///mnt/jobs') == '/mnt/jobs'
         assert abs_path('file:///C:/Users/test.yml') == 'C:/Users/test.yml'
 
+    def test_blob_store(self):
+
+        _dir = TMP.to_subdir('pini/test/blob_store')
+        _dir.delete(force=True)
+        _store = BlobStore(_dir.to_subdir('store'))
+        _rand = random.Random(0)
+        _lines = [f'setAttr ".t{_idx:d}" {_rand.random():f};\n'
+                  for _idx in range(20000)]
+
+        # Test unchanged chunks are only stored once
+        _file = _dir.to_file('test.ma')
+        _file.write(''.join(_lines), force=True)
+        _entry_a = _store.write_file(_file)
+        assert len(_entry_a['chunks']) > 1
+        assert _entry_a['written'] < _file.size()
+        _lines[100] = 'setAttr ".blah" 1;\n'
+        _file.write(''.join(_lines), force=True)
+        _entry_b = _store.write_file(_file)
+        assert _entry_b['written'] < _entry_a['written'] / 2
+        assert_eq(_store.write_file(_file)['written'], 0)
+
+        # Test restore + flush
+        _restored = _store.restore(
+            _entry_a, _dir.to_file('restored.ma'), force=True)
+        assert _restored.read() != _file.read()
+        _store.flush(keep=[_entry_b])
+        _restored = _store.restore(_entry_b, _restored, force=True)
+        assert _restored.read() == _file.read()
+        _dir.delete(force=True)
+
     def test_bkp_file(self):
 
         _file = TMP.to_file('test/.minttyrc')
@@ -442,6 +618,28 @@ class TestPath(unittest.TestCase):
         assert not _tmp_dir.find(catch_missing=True)
         assert isinstance(_tmp_dir.find(catch_missing=True), list)
 
+    def test_copy_files(self):
+
+        _dir = testing.TEST_DIR.to_subdir('copy')
+        _dir.flush(force=True)
+        _files = []
+        for _idx in range(10):
+            _src = _dir.to_file(f'src/file{_idx:d}.txt')
+            _src.write(f'test {_idx:d}', force=True)
+            _files.append((_src, _dir.to_file(f'trg/file{_idx:d}.txt')))
+        _stats = copy_files(_files, workers=4)
+        assert _stats['copied'] == 10
+        assert not find_unmatched_files(_files, check='content')
+        _stats = copy_files(_files, workers=4)
+        assert _stats['skipped'] == 10
+
+        # Test resume partial copy
+        _src, _trg = _files[0]
+        _trg.delete(force=True)
+        File(_trg.path + '.pinipart').write('test', force=True)
+        assert copy_file(_src, _trg) == 2
+        assert _trg.read() == 'test 0'
+
     def test_matches(self):
 
         # Test matches
@@ -497,6 +695,44 @@ class TestPath(unittest.TestCase):
             raise AssertionError
         assert _dir.rel_path(_adj, allow_outside=True) == '../out'
 
+    def test_sync_dirs(self):
+
+        _dir = testing.TEST_DIR.to_subdir('sync')
+        _dir.flush(force=True)
+        _src = _dir.to_subdir('src')
+        _trg = _dir.to_subdir('trg')
+        for _idx in range(10):
+            _src.to_file(f'sub{_idx % 3:d}/file{_idx:d}.txt').write(
+                f'test {_idx:d}', force=True)
+        _src.to_file('.hidden.txt').write('hidden', force=True)
+
+        # Test initial sync
+        _report = sync_dirs(_src, _trg, dry_run=True)
+        assert_eq(len(_report['copy']), 10)
+        assert not _trg.exists()
+        _report = sync_dirs(_src, _trg)
+        assert_eq(len(_report['copy']), 10)
+        assert _trg.to_file('sub1/file4.txt').read() == 'test 4'
+        assert not _trg.to_file('.hidden.txt').exists()
+        _report = sync_dirs(_src, _trg)
+        assert_eq(_report['skipped'], 10)
+        assert not _report['hashed']
+
+        # Test changes
+        _src.to_file('sub0/file0.txt').write('changed', force=True)
+        _src.to_file('sub1/file1.txt').touch()
+        _trg.to_file('extra.txt').write('extra', force=True)
+        _report = sync_dirs(_src, _trg, dry_run=True, delete=True)
+        assert_eq(_report['update'], ['sub0/file0.txt'])
+        assert_eq(_report['delete'], ['extra.txt'])
+        assert_eq(_report['hashed'], 2)
+        _report = sync_dirs(_src, _trg, delete=True)
+        assert_eq(_report['hashed'], 0)
+        assert _trg.to_file('sub0/file0.txt').read() == 'changed'
+        assert not _trg.to_file('extra.txt').exists()
+        _report = sync_dirs(_src, _trg, delete=True)
+        assert_eq(_report['skipped'], 10)
+
     def test_write_yaml(self):
 
         # Test write yml
@@ -524,6 +760,21 @@ class TestImage(unittest.TestCase):
         _path = icons.find('Green Apple')
         assert Image(_path).to_res() == Res(144, 144)
 
+    def test_header_res(self):
+
+        _dir = TMP.to_subdir('PiniTmp/header_res')
+        _dir.delete(force=True)
+        for _extn in ['png', 'jpg', 'exr', 'tif', 'dpx']:
+            _img = Image(_dir.to_file(f'test.{_extn}'))
+            testing.write_bench_image(_img, res=(640, 360), size=8192)
+            assert_eq(_img.to_res(), Res(640, 360))
+            testing.write_bench_image(_img, res=(320, 180))
+            assert_eq(read_image_res(_img.path), Res(320, 180))
+        _txt = _dir.to_file('test.txt')
+        _txt.write('test')
+        assert read_image_res(_txt.path) is None
+        _dir.delete(force=True)
+
 
 class TestSeq(unittest.TestCase):
 
@@ -573,6 +824,41 @@ class TestSeq(unittest.TestCase):
         assert _seq.contains('/tmp/test.0001.jpg')
         assert not _seq.contains('/tmp/test.1.jpg')
 
+    def test_build_thumbnails(self):
+
+        _dir = TMP.to_subdir('PiniTmp/build_thumbs')
+        _dir.delete(force=True)
+        _seqs = [Seq(_dir.to_file(f'seq{_idx:d}/image.%04d.{_extn}'))
+                 for _idx, _extn in enumerate(['png', 'exr', 'png'])]
+        testing.write_bench_seqs(_seqs, res=(320, 180), n_frames=3)
+        _thumbs = [_dir.to_file(f'thumb/{_idx:d}.jpg') for _idx in range(3)]
+        _sheet = _dir.to_file('sheet.jpg')
+        build_thumbnails(_seqs, _thumbs, contact_sheet=_sheet, cols=2)
+        for _thumb in _thumbs:
+            assert_eq(read_image_res(_thumb.path), Res(100, 56))
+        assert_eq(read_image_res(_sheet.path), Res(200, 112))
+
+        # Check only outdated thumbs are rebuilt
+        _mtimes = [_thumb.mtime() for _thumb in _thumbs]
+        time.sleep(0.05)
+        os.utime(_seqs[1][1002])
+        build_thumbnails(_seqs, _thumbs, width=50)
+        assert_eq([_thumb.mtime() == _mtime
+                   for _thumb, _mtime in zip(_thumbs, _mtimes)],
+                  [True, False, True])
+        assert_eq(read_image_res(_thumbs[1].path), Res(50, 28))
+
+        # Check frame selection is shared with seq methods
+        assert_eq(_seqs[0].to_frame_file(), pick_thumb_frame(_seqs[0]))
+        assert_eq(_seqs[0].to_frame_file(), File(_seqs[0][1002]))
+        assert_eq(pick_thumb_frame(_seqs[0], frame='middle'),
+                  File(_seqs[0][1002]))
+        assert_eq(_seqs[0].to_frame_file('last'), File(_seqs[0][1003]))
+        _seqs[0].build_thumbnail(
+            _thumbs[0], width=50, frame='last', force=True)
+        assert_eq(read_image_res(_thumbs[0].path), Res(50, 28))
+        _dir.delete(force=True)
+
     def test_find_seqs(self):
 
         testing.TEST_DIR.flush(force=True)
@@ -10,7 +10,8 @@ import webbrowser
 from pini import pipe, icons, dcc, qt
 from pini.dcc import pipe_ref, export
 from pini.utils import (
-    File, wrap_fn, chain_fns, strftime, Video, Seq, VIDEO_EXTNS, to_str)
+    File, wrap_fn, chain_fns, strftime, Video, Seq, VIDEO_EXTNS, to_str,
+    record_trace)
 
 from . import phu_header, phu_work_tab, phu_export_tab, phu_scene_tab
 from ..ph_utils import LOOKDEV_BG_ICON, obt_recent_work, obt_pixmap
@@ -279,10 +280,11 @@ class PHUiBase(
         return _trg, _trg_tab, _trg_ety
 
     def _callback__Refresh(self):
-        self.target = self.work
-        pipe.CACHE.reset()
-        self.ui.Job.redraw()  # Rebuild ui elements
-        self.target = None
+        with record_trace('helper.refresh'):
+            self.target = self.work
+            pipe.CACHE.reset()
+            self.ui.Job.redraw()  # Rebuild ui elements
+            self.target = None
 
     def reset(self):
         """Reset pini helper."""
@@ -642,6 +642,10 @@ class PHWorkTab:
                 _bkp_menu = _bkps_menu.add_menu(_label, icon=_icon)
                 _bkp_menu.add_label(f'Backup: {_bkp.filename}')
                 _bkp_menu.add_separator()
+                if _bkp.stored:
+                    _bkp_menu.add_action(
+                        'Load backup', _bkp.load, icon=icons.LOAD)
+                    continue
                 _bkp_menu.add_file_actions(_bkp)
 
         # Add outputs
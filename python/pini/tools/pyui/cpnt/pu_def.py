@@ -204,8 +204,6 @@ class PUDef:
         Returns:
             (str): python code
         """
-        _mod = self.pyui_file.to_module()
-        _tokens = _mod.__name__.split('.')
         _cmds = [
             'from pini.tools import pyui',
             '',
@@ -238,7 +236,23 @@ def _func_to_icon(func):
     Returns:
         (str): path to icon
     """
-    _path = abs_path(inspect.getfile(func))
+    return path_to_def_icon(inspect.getfile(func), func.__name__)
+
+
+def path_to_def_icon(path, name):
+    """Map a def to a random icon, using the name and file as a key.
+
+    This allows a def's default icon to be obtained without importing
+    its module.
+
+    Args:
+        path (str): path to file containing def
+        name (str): def name
+
+    Returns:
+        (str): path to icon
+    """
+    _path = abs_path(path)
     _LOGGER.debug(' - FUNC TO ICON %s', _path)
     for _splitter in [
             '/python/',
@@ -254,7 +268,7 @@ def _func_to_icon(func):
             _, _rel_path = _path.rsplit(_splitter, 1)
             break
     else:
-        raise RuntimeError(func, _path)
-    _uid = f'{_rel_path}.{func.__name__}'
+        raise RuntimeError(name, _path)
+    _uid = f'{_rel_path}.{name}'
     _rand = str_to_seed(_uid)
     return _rand.choice(icons.FRUIT)
@@ -11,7 +11,7 @@ from pini import icons, install
 from pini.utils import (
     PyFile, PyDef, single, str_to_seed, abs_path, to_nice, to_pascal)
 
-from . import pu_section
+from . import pu_section, pu_spec
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,9 +43,13 @@ class PUFile(PyFile):
         Returns:
             (str): path to icon
         """
-        _mod = self.to_module()
-        if hasattr(_mod, 'ICON'):
-            return _mod.ICON
+        _spec = self.read_spec()
+        if 'icon' not in _spec['dynamic']:
+            _icon = _spec['icon']
+        else:
+            _icon = getattr(self.to_module(), 'ICON', None)
+        if _icon:
+            return _icon
         _path = abs_path(self.path)
         _rand = str_to_seed(_path)
         return _rand.choice(icons.FRUIT)
@@ -57,10 +61,14 @@ class PUFile(PyFile):
         Returns:
             (str): title
         """
-        _mod = self.to_module()
-        if hasattr(_mod, 'PYUI_TITLE'):
-            return _mod.PYUI_TITLE
-        _tokens = _mod.__name__.split('.')
+        _spec = self.read_spec()
+        if 'title' not in _spec['dynamic']:
+            _title = _spec['title']
+        else:
+            _title = getattr(self.to_module(), 'PYUI_TITLE', None)
+        if _title:
+            return _title
+        _tokens = _spec['mod_name'].split('.')
         if _tokens[-1] == '__init__':
             _tokens.pop()
         return to_nice(_tokens[-1]).title()
@@ -110,15 +118,24 @@ class PUFile(PyFile):
             return single(_match_elems)
         raise ValueError(match)
 
-    def find_ui_elems(self):
+    def find_ui_elems(self, spec=False):
         """Find elements which are to be build into the ui.
 
+        Args:
+            spec (bool): build elements from the cached interface spec
+                (if possible) to avoid importing the module
+
         Returns:
             (PUDef|PUSection list): ui elements
         """
         from pini.tools import pyui
         _LOGGER.debug('FIND UI ELEMS %s', self)
 
+        if spec:
+            _spec = self.read_spec()
+            if _spec['static']:
+                return pu_spec.spec_to_elems(_spec, file_=self)
+
         _mod = self.to_module(reload_=True)
         _LOGGER.debug(' - RELOADED MOD %s', _mod)
 
@@ -150,6 +167,17 @@ class PUFile(PyFile):
 
         return _elems
 
+    def read_spec(self, force=False):
+        """Read interface spec for this file.
+
+        Args:
+            force (bool): rebuild spec, ignoring any cached copy
+
+        Returns:
+            (dict): interface spec
+        """
+        return pu_spec.read_spec(self, force=force)
+
     def to_tool(self, prefix='', title=None, label=None):
         """Build this interface into a pini install tool.
 
@@ -198,7 +226,7 @@ class PUFile(PyFile):
 
         # Add contents as context options
         _div_count = 0
-        for _elem in self.find_ui_elems():
+        for _elem in self.find_ui_elems(spec=True):
             if isinstance(_elem, pyui.PUDef):
                 if not _div_count:
                     _tool.add_divider(_name + str(_div_count))
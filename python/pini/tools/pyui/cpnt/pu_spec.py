@@ -0,0 +1,395 @@
+"""Tools for managing serialised pyui interface specs.
+
+Building an interface from a pyui file requires importing the module,
+parsing its ast and inspecting each function to read its args, icon and
+label. To avoid this, the elements are serialised to a spec which is
+cached on disk, keyed by the hash of the file contents. An interface can
+then be built from the spec without importing the module, which is only
+imported when a function is executed.
+
+Only data which is declared as a literal in the pyui file is read from
+the spec, since anything computed when the module is imported (eg. an
+icon found using pini.icons, or a default read from the environment) can
+change between loads. If any def has a computed arg default or decorator
+arg, the spec is marked as not static and the file is built from its
+module as normal. A computed ICON/PYUI_TITLE/PYUI_COL setting is flagged
+as dynamic and read from the module when it is needed.
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import uuid
+
+from pini.utils import HOME, EMPTY, PyArg, basic_repr
+
+from . import pu_arg, pu_def, pu_section
+
+_LOGGER = logging.getLogger(__name__)
+
+_SPEC_ROOT = HOME.to_subdir('.pini/cache/pyui')
+_SPEC_VERSION = 2
+_SPECS = {}
+_PLAIN_TYPES = (type(None), bool, int, float, str)
+_SETTINGS = [('icon', 'ICON'), ('title', 'PYUI_TITLE'), ('col', 'PYUI_COL')]
+
+
+class PUSpecPyDef:
+    """Stands in for a PyDef when an interface is built from a spec.
+
+    This provides the def data used by the ui builders without parsing
+    the python file.
+    """
+
+    def __init__(self, name, py_file, line_n, title, docstring):
+        """Constructor.
+
+        Args:
+            name (str): def name
+            py_file (PUFile): parent pyui file
+            line_n (int): def line number
+            title (str): first line of docs
+            docstring (str): def docstring
+        """
+        self.name = name
+        self.clean_name = name
+        self.py_file = py_file
+        self.line_n = line_n
+        self.title = title
+        self.docstring = docstring
+
+    def edit(self):
+        """Edit the def in a text editor."""
+        self.py_file.edit(line_n=self.line_n)
+
+    def to_docs(self, mode='Title'):
+        """Obtain documentation for this def.
+
+        Args:
+            mode (str): type of data to retrive
+                Title - first line of docs
+
+        Returns:
+            (str): docs
+        """
+        if mode == 'Title':
+            return self.title
+        raise ValueError(mode)
+
+    def to_docstring(self):
+        """Obtain docstring.
+
+        Returns:
+            (str): docs
+        """
+        return self.docstring
+
+    def __repr__(self):
+        return basic_repr(self, self.name)
+
+
+class PUSpecDef(pu_def.PUDef):
+    """A pyui function built from a spec.
+
+    The function itself is only obtained (by importing the module) when
+    it is executed.
+    """
+
+    def __init__(self, data, pyui_file):  # pylint: disable=super-init-not-called
+        """Constructor.
+
+        Args:
+            data (dict): def spec
+            pyui_file (PUFile): parent pyui file
+        """
+        self.pyui_file = pyui_file
+        self.py_def = PUSpecPyDef(
+            data['name'], py_file=pyui_file, line_n=data['line_n'],
+            title=data['title'], docstring=data['docstring'])
+
+        self.name = data['name']
+        self.__name__ = data['name']
+        self.icon = data['icon'] or pu_def.path_to_def_icon(
+            pyui_file.path, data['name'])
+        self.label = data['label']
+        self.col = data['col']
+        self.label_w = data['label_w']
+        self.block_reload = data['block_reload']
+        self.arg_specs = data['args']
+
+        self.clear = ()
+        self.browser = ()
+        self.selection = ()
+        self.hide = ()
+        self.choices = {}
+        self.callbacks = {}
+        self.labels = {}
+
+    @property
+    def func(self):
+        """Obtain this def's function (this imports the module).
+
+        Returns:
+            (fn): function
+        """
+        _func = getattr(self.pyui_file.to_module(), self.name)
+        if isinstance(_func, pu_def.PUDef):
+            _func = _func.func
+        return _func
+
+    def find_args(self):
+        """Read this functions args.
+
+        Returns:
+            (PUArg list): args
+        """
+        _args = []
+        for _data in self.arg_specs:
+            _py_arg = PyArg(
+                _data['name'], parent=self.py_def,
+                has_default=_data['has_default'], default=_data['default'])
+            _arg = pu_arg.PUArg(
+                _data['name'], py_arg=_py_arg, py_def=self.py_def,
+                pyui_file=self.pyui_file, clear=_data['clear'],
+                browser=_data['browser'], choices=_data['choices'],
+                selection=_data['selection'], label=_data['label'],
+                label_w=self.label_w, docs=_data['docs'])
+            _args.append(_arg)
+        return _args
+
+
+def flush_spec_cache():
+    """Flush in-memory cache of interface specs."""
+    _SPECS.clear()
+
+
+def read_spec(file_, force=False):
+    """Read interface spec for the given pyui file.
+
+    Args:
+        file_ (PUFile): pyui file
+        force (bool): rebuild spec, ignoring any cached copy
+
+    Returns:
+        (dict): interface spec
+    """
+    with open(file_.path, 'rb') as _hook:
+        _hash = hashlib.sha1(_hook.read())
+    _hash.update(f'{file_.path}/{_SPEC_VERSION:d}'.encode())
+    _hash = _hash.hexdigest()
+    _json = _SPEC_ROOT.to_file(f'{_hash[:2]}/{_hash}.json')
+
+    # Read cached spec
+    if not force:
+        _spec = _SPECS.get(_hash)
+        if not _spec and _json.exists():
+            try:
+                _spec = _json.read_json()
+            except ValueError:
+                _LOGGER.warning(' - FAILED TO READ SPEC %s', _json.path)
+        if _spec:
+            _LOGGER.debug(' - READ SPEC %s', _json.path)
+            _SPECS[_hash] = _spec
+            return _spec
+
+    # Build spec and write to disk
+    _spec = build_spec(file_)
+    _SPECS[_hash] = _spec
+    _json.test_dir()
+    _tmp = f'{_json.path}.{uuid.uuid4().hex}.tmp'
+    with open(_tmp, 'w', encoding='utf-8') as _hook:
+        json.dump(_spec, _hook)
+    os.replace(_tmp, _json.path)
+    _LOGGER.debug(' - WROTE SPEC %s', _json.path)
+
+    return _spec
+
+
+def build_spec(file_):
+    """Build interface spec for the given pyui file.
+
+    This imports the module and reads its ui elements.
+
+    Args:
+        file_ (PUFile): pyui file
+
+    Returns:
+        (dict): interface spec
+    """
+    _elems = file_.find_ui_elems(spec=False)
+    _mod = file_.to_module()
+    _dyn_attrs, _dyn_defs, _def_icons = _read_dynamic_data(file_)
+    _spec = {
+        'path': file_.path, 'mod_name': _mod.__name__, 'elems': [],
+        'dynamic': []}
+    _static = True
+    for _key, _attr in _SETTINGS:
+        _val = getattr(_mod, _attr, None)
+        if _attr in _dyn_attrs or not isinstance(_val, _PLAIN_TYPES):
+            _val = None
+            _spec['dynamic'].append(_key)
+        _spec[_key] = _val
+
+    for _elem in _elems:
+        if isinstance(_elem, pu_section.PUSection):
+            _spec['elems'].append({
+                'type': 'section', 'name': _elem.name,
+                'collapse': _elem.collapse})
+        elif isinstance(_elem, pu_def.PUDef):
+            _data = None
+            if _elem.name not in _dyn_defs:
+                _data = _def_to_spec(_elem, icon=_def_icons.get(_elem.name))
+            _static = _static and _data is not None
+            if _data:
+                _spec['elems'].append(_data)
+        else:
+            raise ValueError(_elem)
+
+    _spec['static'] = _static
+    _LOGGER.debug(' - BUILT SPEC %s static=%d', file_.path, _static)
+    return _spec
+
+
+def _is_literal(node):
+    """Test whether the given ast node is a literal.
+
+    Args:
+        node (AST): node to test
+
+    Returns:
+        (bool): whether literal
+    """
+    try:
+        ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, RecursionError):
+        return False
+    return True
+
+
+def _read_dynamic_data(file_):
+    """Read the ast of a pyui file to find data which isn't a literal.
+
+    Any data which is computed on import (eg. a default read from the
+    environment) needs to be re-evaluated each time the ui is loaded,
+    so it can't be read from the spec.
+
+    Args:
+        file_ (PUFile): pyui file
+
+    Returns:
+        (tuple): dynamic settings attrs (eg. ICON), names of defs with
+            dynamic data, literal icons declared in def decorators
+    """
+    _body = ast.parse(file_.read(), filename=file_.path).body
+    _dyn_attrs, _dyn_defs, _def_icons = set(), set(), {}
+    _attrs = [_attr for _, _attr in _SETTINGS]
+    for _item in _body:
+
+        if isinstance(_item, ast.Assign):
+            for _trg in _item.targets:
+                if (
+                        isinstance(_trg, ast.Name) and
+                        _trg.id in _attrs and
+                        not _is_literal(_item.value)):
+                    _dyn_attrs.add(_trg.id)
+
+        elif isinstance(_item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            _nodes = list(_item.args.defaults)
+            _nodes += [_node for _node in _item.args.kw_defaults if _node]
+            for _dec in _item.decorator_list:
+                if not isinstance(_dec, ast.Call):
+                    continue
+                _nodes += _dec.args
+                for _kwarg in _dec.keywords:
+                    _nodes.append(_kwarg.value)
+                    if _kwarg.arg == 'icon' and _is_literal(_kwarg.value):
+                        _def_icons[_item.name] = ast.literal_eval(
+                            _kwarg.value)
+            if not all(_is_literal(_node) for _node in _nodes):
+                _dyn_defs.add(_item.name)
+
+    return _dyn_attrs, _dyn_defs, _def_icons
+
+
+def _def_to_spec(def_, icon=None):
+    """Serialise a pyui def.
+
+    Args:
+        def_ (PUDef): def to serialise
+        icon (str): icon declared in the def's decorator (if not declared,
+            the default icon is applied when the spec is loaded)
+
+    Returns:
+        (dict|None): def spec (None if the def has data which can't
+            be serialised)
+    """
+    if def_.callbacks or not isinstance(def_.col, _PLAIN_TYPES):
+        return None
+
+    _args = []
+    for _arg in def_.find_args():
+        _choices = _arg.choices
+        if isinstance(_choices, (list, tuple)):
+            _choices = list(_choices)
+            if not all(isinstance(_choice, _PLAIN_TYPES)
+                       for _choice in _choices):
+                return None
+        elif _choices is not None:
+            return None
+        _default = _arg.py_arg.default
+        if _default is EMPTY or not _arg.py_arg.has_default:
+            _default = None
+        if not (isinstance(_default, _PLAIN_TYPES) and
+                isinstance(_arg.browser, (bool, str)) and
+                isinstance(_arg.selection, (bool, str)) and
+                not _arg.callback):
+            return None
+        _args.append({
+            'name': _arg.name,
+            'default': _default,
+            'has_default': _arg.py_arg.has_default,
+            'label': _arg.label,
+            'clear': _arg.clear,
+            'browser': _arg.browser,
+            'choices': _choices,
+            'selection': _arg.selection,
+            'docs': _arg.docs})
+
+    return {
+        'type': 'def',
+        'name': def_.name,
+        'line_n': def_.py_def.line_n,
+        'title': def_.py_def.to_docs('Title'),
+        'docstring': def_.py_def.to_docstring(),
+        'icon': icon,
+        'label': def_.label,
+        'col': def_.col,
+        'label_w': def_.label_w,
+        'block_reload': def_.block_reload,
+        'args': _args,
+    }
+
+
+def spec_to_elems(spec, file_):
+    """Build ui elements from an interface spec.
+
+    Args:
+        spec (dict): interface spec
+        file_ (PUFile): parent pyui file
+
+    Returns:
+        (PUDef|PUSection list): ui elements
+    """
+    _elems = []
+    for _data in spec['elems']:
+        if _data['type'] == 'section':
+            _elem = pu_section.PUSection(
+                _data['name'], collapse=_data['collapse'])
+        elif _data['type'] == 'def':
+            _elem = PUSpecDef(_data, pyui_file=file_)
+        else:
+            raise ValueError(_data['type'])
+        _elems.append(_elem)
+    return _elems
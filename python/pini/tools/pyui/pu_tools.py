@@ -21,7 +21,7 @@ def find_ui(match=None):
 
     _matches = [
         _ui for _file, _ui in _uis.items()
-        if match in (_ui.mod.__name__, _file)]
+        if match in (_ui.name, _file)]
     if len(_matches) == 1:
         return single(_matches)
 
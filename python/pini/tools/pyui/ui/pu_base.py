@@ -58,18 +58,19 @@ class PUBaseUi:
             def_filter (str): apply def name filter
         """
         self.py_file = cpnt.PUFile(py_file)
-        self.name = self.mod.__name__
+        self.spec = self.py_file.read_spec()
+        self.name = self.spec['mod_name']
         self.settings_file = _SETTING_ROOT.to_file(self.name + '.pkl')
 
         self.title = title
-        if not self.title and hasattr(self.mod, 'PYUI_TITLE'):
-            self.title = self.mod.PYUI_TITLE
+        if not self.title:
+            self.title = self._read_mod_attr('title', 'PYUI_TITLE')
         if not self.title:
             self.title = self.name
 
         self.base_col = base_col
-        if not self.base_col and hasattr(self.mod, 'PYUI_COL'):
-            self.base_col = self.mod.PYUI_COL
+        if not self.base_col:
+            self.base_col = self._read_mod_attr('col', 'PYUI_COL')
         if not self.base_col:
             _rand = str_to_seed(self.name)
             self.base_col = _rand.choice(_NICE_COLS)
@@ -94,6 +95,23 @@ class PUBaseUi:
             self._mod = self.py_file.to_module()
         return self._mod
 
+    def _read_mod_attr(self, key, attr):
+        """Read a module-level interface setting (eg. PYUI_TITLE).
+
+        This is read from the interface spec if possible, to avoid
+        importing the module.
+
+        Args:
+            key (str): spec key
+            attr (str): module attribute name
+
+        Returns:
+            (any): setting value
+        """
+        if key not in self.spec['dynamic']:
+            return self.spec[key]
+        return getattr(self.mod, attr, None)
+
     def build_ui(self, load_settings=True, def_filter=None):
         """Build interface.
 
@@ -104,10 +122,10 @@ class PUBaseUi:
         _LOGGER.debug(' - BUILD UI')
 
         # Read elems before start building ui in case reload fails
-        _elems = self.py_file.find_ui_elems()
+        _elems = self.py_file.find_ui_elems(spec=True)
 
         _LOGGER.debug('   - RESET CALLBACKS')
-        CALLBACKS_CACHE[self.mod.__name__] = self.callbacks  # pylint: disable=no-member
+        CALLBACKS_CACHE[self.name] = self.callbacks
         self.init_ui()
 
         for _last, _item in last(_elems):
@@ -272,7 +290,7 @@ class PUBaseUi:
         self.save_settings()
 
         # Obtain args
-        _callbacks = CALLBACKS_CACHE[self.mod.__name__]['defs'][def_.name]
+        _callbacks = CALLBACKS_CACHE[self.name]['defs'][def_.name]
         _kwargs = {}
         for _arg in def_.find_args():
             _LOGGER.debug('   - ARG %s', _arg)
@@ -369,6 +387,7 @@ class PUBaseUi:
 
         _mod = self.py_file.to_module()
         importlib.reload(_mod)
+        self.py_file.read_spec(force=True)
 
         # Obtain fresh copy of class to survive reload
         _type = type(self)
@@ -33,7 +33,7 @@ class PUMayaUi(pu_base.PUBaseUi):
         Returns:
             (str): unique indentifier
         """
-        return 'PYUI_' + self.mod.__name__.replace('.', '_')
+        return 'PYUI_' + self.name.replace('.', '_')
 
     def init_ui(self):
         """Inititiate interface window."""
@@ -287,7 +287,7 @@ class PUMayaUi(pu_base.PUBaseUi):
         _cmd = '\n'.join([
             'import {} as _mod',
             'print(_mod.{})',
-        ]).format(self.py_file.to_module().__name__, def_.name)
+        ]).format(self.name, def_.name)
         cmds.menuItem(
             'Copy import statement', parent=_menu,
             image=icons.COPY,
@@ -337,7 +337,7 @@ class PUMayaUi(pu_base.PUBaseUi):
 
     def collapse_all(self):
         """Collapse all sections."""
-        _callbacks = sys.PYUI_CALLBACKS[self.mod.__name__]
+        _callbacks = sys.PYUI_CALLBACKS[self.name]
         for _sect_name, _sect_callbacks in _callbacks['sections'].items():
             _sect_callbacks['set'](True)
         cmds.evalDeferred(self._resize_to_fit_children)
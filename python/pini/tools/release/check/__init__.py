@@ -1,4 +1,4 @@
 """Tools for managing checking files on release."""
 
 from .r_docs import suggest_docs, transfer_kwarg_docs
-from .r_check import CheckFile, check_file
+from .r_check import CheckFile, check_file, check_files
@@ -10,7 +10,7 @@ from pini import qt
 from pini.utils import (
     File, PyFile, find_exe, system, get_method_to_file_cacher, MetadataFile,
     PyDef, PyClass, abs_path, to_str, cache_result, merge_dicts,
-    passes_filter, to_time_f, nice_age)
+    passes_filter, to_time_f, nice_age, system_many)
 
 from . import r_docs, r_issue, r_autofix
 
@@ -314,15 +314,29 @@ class CheckFile(MetadataFile):
         return _issues
 
     @get_method_to_file_cacher(mtime_outdates=True)
-    def to_pylint_reading(self, force=False):
+    def to_pylint_reading(self, force=False, value=None):
         """Obtain pylint reading for this file.
 
         Args:
             force (bool): force regenerate checks data
+            value (str): apply pylint reading (eg. if it has been read
+                as part of a batch) rather than running pylint
 
         Returns:
             (str): pylint reading
         """
+        if value is not None:
+            return value
+        _cmds = self._to_pylint_cmds()
+        _out, _err = system(_cmds, result='out/err', verbose=1)
+        return self._check_pylint_result(out=_out, err=_err)
+
+    def _to_pylint_cmds(self):
+        """Build pylint commands for this file.
+
+        Returns:
+            (list): pylint commands
+        """
         from pini.tools import release
 
         # Find checks to disable
@@ -368,14 +382,34 @@ class CheckFile(MetadataFile):
             _init_py = '; '.join(_init)
             _cmds += ['--init-hook', _init_py]
 
-        _out, _err = system(_cmds, result='out/err', verbose=1)
-        if 'Your code has been rated at' not in _out:
+        return _cmds
+
+    def _check_pylint_result(self, out, err):
+        """Check pylint ran successfully on this file.
+
+        Args:
+            out (str): pylint stdout
+            err (str): pylint stderr
+
+        Returns:
+            (str): pylint reading
+        """
+        if 'Your code has been rated at' not in out:
             _LOGGER.info('OUT')
-            print(_out)
+            print(out)
             _LOGGER.info('ERR')
-            print(_err)
+            print(err)
             raise RuntimeError(f'Linting failed {self.path}')
-        return _out
+        return out
+
+    def _pylint_reading_is_stale(self):
+        """Test whether this file's cached pylint reading is out of date.
+
+        Returns:
+            (bool): whether pylint needs to be run
+        """
+        _cache = File(self.cache_fmt.format(func='to_pylint_reading'))
+        return not _cache.exists() or _cache.mtime() < self.mtime()
 
 
 def check_file(file_, pylint=True, pycodestyle=True):
@@ -391,6 +425,40 @@ def check_file(file_, pylint=True, pycodestyle=True):
     _file.apply_checks(pylint=pylint, pycodestyle=pycodestyle)
 
 
+def check_files(files, pylint=True, pycodestyle=True, max_workers=None):
+    """Apply release checks to a list of files.
+
+    Pylint is the slowest check, so any stale pylint readings are
+    generated up front by running pylint on the files concurrently.
+
+    Args:
+        files (str list): paths to files to check
+        pylint (bool): apply pylint checks
+        pycodestyle (bool): apply pycodestyle checks
+        max_workers (int): maximum number of concurrent pylint processes
+    """
+    _files = [CheckFile(abs_path(to_str(_file))) for _file in files]
+
+    # Read pylint in parallel
+    if pylint:
+        # pylint: disable=protected-access
+        _to_lint = [
+            _file for _file in _files
+            if not _file.has_passed_checks() and
+            not _file._is_empty() and
+            _file._pylint_reading_is_stale()]
+        _LOGGER.info('RUNNING PYLINT ON %d FILES', len(_to_lint))
+        _results = system_many(
+            [_file._to_pylint_cmds() for _file in _to_lint],
+            max_workers=max_workers, result='out/err', verbose=1)
+        for _file, (_out, _err) in zip(_to_lint, _results):
+            _reading = _file._check_pylint_result(out=_out, err=_err)
+            _file.to_pylint_reading(force=True, value=_reading)
+
+    for _file in _files:
+        _file.apply_checks(pylint=pylint, pycodestyle=pycodestyle)
+
+
 @cache_result
 def _find_pycodestyle_exe():
     """Find pycodestyle exe.
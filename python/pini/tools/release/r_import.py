@@ -0,0 +1,81 @@
+"""Tools for measuring module import times and checking lazy imports."""
+
+import logging
+import os
+import subprocess
+import sys
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _build_env(lazy):
+    """Build environment for importing a module in a fresh interpreter.
+
+    Args:
+        lazy (bool): apply lazy import mode ($PINI_LAZY_IMPORT)
+
+    Returns:
+        (dict): environment
+    """
+    _env = dict(os.environ)
+    _env['PYTHONPATH'] = os.pathsep.join(
+        [_path for _path in sys.path if _path])
+    _env['PINI_LAZY_IMPORT'] = '1' if lazy else '0'
+    return _env
+
+
+def read_import_times(mod_name, lazy=True, python=None):
+    """Read import times for the given module.
+
+    This imports the module in a fresh python interpreter using the
+    -X importtime flag and parses the report.
+
+    Args:
+        mod_name (str): name of module to import (eg. pini.utils)
+        lazy (bool): apply lazy import mode ($PINI_LAZY_IMPORT)
+        python (str): override python executable
+
+    Returns:
+        (dict): module name/cumulative import time (in seconds) of each
+            module imported
+    """
+    _python = python or sys.executable
+    _cmds = [_python, '-X', 'importtime', '-c', f'import {mod_name}']
+    _LOGGER.debug('READ IMPORT TIMES %s', ' '.join(_cmds))
+    _result = subprocess.run(
+        _cmds, env=_build_env(lazy=lazy), capture_output=True, text=True,
+        check=True)
+
+    _times = {}
+    for _line in _result.stderr.split('\n'):
+        if not _line.startswith('import time:'):
+            continue
+        _, _, _cumul, _name = [
+            _token.strip() for _token in _line.replace(':', '|', 1).split('|')]
+        if not _cumul.isdigit():
+            continue
+        _times[_name] = int(_cumul) / 1000000
+    return _times
+
+
+def read_loaded_mods(mod_name, lazy=True, python=None):
+    """Read which modules are loaded by importing the given module.
+
+    This imports the module in a fresh python interpreter and reads
+    the names of the modules in sys.modules.
+
+    Args:
+        mod_name (str): name of module to import (eg. pini.utils)
+        lazy (bool): apply lazy import mode ($PINI_LAZY_IMPORT)
+        python (str): override python executable
+
+    Returns:
+        (str list): names of loaded modules
+    """
+    _python = python or sys.executable
+    _cmds = [_python, '-c', f'import sys, {mod_name}; print(*sys.modules)']
+    _LOGGER.debug('READ LOADED MODS %s', ' '.join(_cmds))
+    _result = subprocess.run(
+        _cmds, env=_build_env(lazy=lazy), capture_output=True, text=True,
+        check=True)
+    return _result.stdout.split()
@@ -3,7 +3,8 @@
 from pini import dcc
 
 from .core import (
-    find_checks, SCCheck, find_check, read_checks, SCFail)
+    find_checks, SCCheck, find_check, read_checks, SCFail, SCEngine,
+    execute_checks, flush_passed_cache)
 from .ui import launch_ui, UI_FILE, ICON, launch_export_ui
 
 if dcc.NAME == 'maya':
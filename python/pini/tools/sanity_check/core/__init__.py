@@ -4,7 +4,11 @@ from pini import dcc
 
 from .sc_check import SCCheck
 from .sc_checks import find_checks, find_check, read_checks
+from .sc_engine import (
+    SCEngine, execute_checks, flush_passed_cache, to_scene_fingerprint)
 from .sc_fail import SCFail
+from .sc_manifest import (
+    SCCheckInfo, read_manifest, read_py_manifest, flush_manifest_cache)
 
 if dcc.NAME == 'maya':
     from .sc_maya_check import SCMayaCheck
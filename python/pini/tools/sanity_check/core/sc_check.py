@@ -2,18 +2,22 @@
 
 # pylint: disable=too-many-public-methods
 
+import collections
 import inspect
 import logging
 import time
 
 from pini import dcc, pipe
 from pini.tools import error
-from pini.utils import to_nice, strftime, nice_age, check_heart, PyFile
+from pini.utils import (
+    to_nice, strftime, nice_age, check_heart, PyFile, trace_span)
 
 from . import sc_fail
 
 _LOGGER = logging.getLogger(__name__)
 
+_LOG_MAX_LINES = 2000
+
 
 class SCCheck:
     """Base class for all sanity checks."""
@@ -22,11 +26,12 @@ class SCCheck:
     _task = None
     _update_ui = None
 
-    log = ''
     status = 'ready'
     error = None
     progress = 0.0
+    dur = None
     sort = 50
+    pure = False  # ie. pure-python/read-only so can run in a thread
 
     # Filters
     enabled = True
@@ -110,6 +115,21 @@ class SCCheck:
         """
         return self._label or to_nice(self.name).capitalize()
 
+    @property
+    def log(self):
+        """Obtain log text for this check.
+
+        The log is held in a ring buffer so only the most recent lines
+        are kept for chatty checks.
+
+        Returns:
+            (str): log text
+        """
+        _lines = list(self._log_lines)
+        if self._log_dropped:
+            _lines.insert(0, f'... {self._log_dropped:d} lines dropped')
+        return ''.join(f'{_line}\n' for _line in _lines)
+
     @property
     def name(self):
         """Obtain name of this sanity check.
@@ -222,20 +242,22 @@ class SCCheck:
         _check = PyFile(_path).find_class(_name)
         _check.edit()
 
-    def execute(self, catch=True, update_ui=None):
+    def execute(self, catch=True, update_ui=None, disabled=None):
         """Execute this check.
 
         Args:
             catch (bool): don't error if the check fails
             update_ui (fn): function to update a ui to give
                 progress feedback
+            disabled (bool): apply disabled state (to avoid reading
+                scene data, eg. if running in a thread)
         """
         _LOGGER.debug('EXECUTE %s update_ui=%s', self, update_ui)
         _start = time.time()
 
         # Init vars
-        self.reset()
-        if self.is_disabled:
+        self.reset(disabled=disabled)
+        if self.status == 'disabled':
             self.write_log('Disabled')
             return
         self.status = 'running'
@@ -243,24 +265,26 @@ class SCCheck:
 
         # Run the actual check
         self.write_log('Starting check')
-        if not catch:
-            self.run()
-        else:
-            try:
+        with trace_span('sanity_check.execute', check=self.name):
+            if not catch:
                 self.run()
-            except Exception as _exc:  # pylint: disable=broad-except
-                _LOGGER.info(' - ERRORED %s', _exc)
-                self.write_log('Errored - %s', str(_exc).strip())
-                self.status = 'errored'
-                self.error = error.PEError()
-                error.TRIGGERED = True
+            else:
+                try:
+                    self.run()
+                except Exception as _exc:  # pylint: disable=broad-except
+                    _LOGGER.info(' - ERRORED %s', _exc)
+                    self.write_log('Errored - %s', str(_exc).strip())
+                    self.status = 'errored'
+                    self.error = error.PEError()
+                    error.TRIGGERED = True
         if not self.error:
             self.status = 'failed' if self.fails else 'passed'
 
         # Mark completed
-        _dur = time.time() - _start
+        self.dur = time.time() - _start
         self.write_log(
-            'Completed check - status=%s dur=%s', self.status, nice_age(_dur))
+            'Completed check - status=%s dur=%s', self.status,
+            nice_age(self.dur))
         self.set_progress(100.0)
 
     def update_progress(self, data):
@@ -306,17 +330,25 @@ class SCCheck:
             _settings = pipe.to_default_settings()
         return _settings.get('sanity_check').get(self.name, {})
 
-    def reset(self):
-        """Reset this check."""
+    def reset(self, disabled=None):
+        """Reset this check.
+
+        Args:
+            disabled (bool): apply disabled state (to avoid reading
+                scene data)
+        """
         self.fails = []
 
         self.error = None
+        self.dur = None
         self.status = 'ready'
-        if self.is_disabled:
+        _disabled = self.is_disabled if disabled is None else disabled
+        if _disabled:
             self.status = 'disabled'
 
         self._update_ui = None
-        self.log = ''
+        self._log_lines = collections.deque(maxlen=_LOG_MAX_LINES)
+        self._log_dropped = 0
         self.set_progress(0)
 
     def reset_and_run(self, **kwargs):
@@ -419,7 +451,9 @@ class SCCheck:
         if args:
             _text = text % args
         _t_stamp = strftime('[%H:%M:%S]')
-        self.log += f'{_t_stamp} {_text}\n'
+        if len(self._log_lines) == self._log_lines.maxlen:
+            self._log_dropped += 1
+        self._log_lines.append(f'{_t_stamp} {_text}')
 
     def __eq__(self, other):
         return self.name == other.name
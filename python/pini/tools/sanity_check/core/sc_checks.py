@@ -13,7 +13,7 @@ from pini.utils import (
     passes_filter, File, PyFile, cache_result, abs_path, Dir, single,
     apply_filter, EMPTY, is_pascal)
 
-from . import sc_check
+from . import sc_check, sc_manifest
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,11 +34,15 @@ def find_check(name=None, catch=False, **kwargs):
     return single(_checks, catch=catch)
 
 
-def find_checks(  # pylint: disable=too-many-branches
+def find_checks(
         filter_=None, work=EMPTY, task=EMPTY, action=None, name=None,
         profile=None, force=False):
     """Find sanity checks to apply.
 
+    A static manifest of the checks is filtered first (see sc_manifest),
+    so that only modules containing checks which could match are
+    imported. The imported checks are then filtered again.
+
     Args:
         filter_ (str): filter checks by name
         work (CPWork): override work file
@@ -66,19 +70,19 @@ def find_checks(  # pylint: disable=too-many-branches
             raise ValueError(action)
         assert is_pascal(action)
 
-    _all_checks = read_checks(force=force)
+    _infos = sc_manifest.read_manifest(_find_check_pys(), force=force)
     _work = work if work is not EMPTY else pipe.cur_work()
     _profile = profile or (_work.profile if _work else None)
     _sc_settings = _work.entity.settings['sanity_check'] if _work else {}
 
     # Apply name/filter elimination first to help debugging
     if name:
-        _all_checks = [_check for _check in _all_checks if _check.name == name]
-        _LOGGER.debug(' - NAME %s -> %d CHECKS', name, len(_all_checks))
+        _infos = [_info for _info in _infos if _info.name == name]
+        _LOGGER.debug(' - NAME %s -> %d CHECKS', name, len(_infos))
     if filter_:
-        _all_checks = apply_filter(
-            _all_checks, filter_, key=operator.attrgetter('name'))
-        _LOGGER.debug(' - FILTER %s -> %d CHECKS', filter_, len(_all_checks))
+        _infos = apply_filter(
+            _infos, filter_, key=operator.attrgetter('name'))
+        _LOGGER.debug(' - FILTER %s -> %d CHECKS', filter_, len(_infos))
 
     # Determine task
     if task is not EMPTY:
@@ -88,84 +92,109 @@ def find_checks(  # pylint: disable=too-many-branches
     _glob_disable_task_filter = _task == 'all'
     if not _glob_disable_task_filter:
         _task = pipe.map_task(_task, fmt='pini')
+    _filter_kwargs = {
+        'sc_settings': _sc_settings, 'profile': _profile, 'action': action,
+        'task': _task, 'disable_task_filter': _glob_disable_task_filter}
+
+    # Filter manifest to avoid importing checks which can't match
+    _infos = [
+        _info for _info in _infos
+        if not _info.is_static or _passes_filters(_info, **_filter_kwargs)]
+    _all_checks = _infos_to_checks(_infos, force=force)
 
     # Apply checks filtering based on work
     _LOGGER.debug(
         ' - FILTERING CHECKS %d action=%s task=%s work=%s', len(_all_checks),
         action, _task, _work)
-    _checks = []
-    for _idx, _check in enumerate(_all_checks):
-
-        _LOGGER.debug(' - CHECKING [%d] %s', _idx, _check)
-        _check_settings = _sc_settings.get(_check.name)
-        _LOGGER.debug('   - CHECK SETTINGS %s', _check_settings)
-
-        # Check enabled
-        if _check.name in _sc_settings:
-            _enabled = _check_settings.get('enabled', _check.enabled)
-            if not _enabled:
-                _LOGGER.debug('   - CHECK DISABLED IN SETTINGS')
-                continue
-        elif not _check.enabled:
-            _LOGGER.debug('   - CHECK DISABLED IN CODE')
-            continue
+    _checks = [
+        _check for _check in _all_checks
+        if _passes_filters(_check, **_filter_kwargs)]
+    _LOGGER.info(' - FOUND %d "%s" CHECKS', len(_checks), _task)
 
-        # Apply dcc filter
-        if not passes_filter(dcc.NAME, _check.dcc_filter):
-            _LOGGER.debug('   - DCC FILTER REJECTED %s', filter_)
-            continue
+    return sorted(_checks)
 
-        # Apply profile filter
-        if _check.profile_filter:
-            if not _profile:
-                _LOGGER.debug(
-                    '   - REJECTED NO PROFILE')
-                continue
-            if not passes_filter(_profile, _check.profile_filter):
-                _LOGGER.debug(
-                    '   - REJECTED PROFILE profile=%s filter=%s',
-                    _profile, _check.profile_filter)
-                continue
-
-        # Apply action filter
-        _LOGGER.debug('   - ACTION FILTER %s %s', action, _check.action_filter)
-        if not action and _check.action_filter and _check.action_req:
-            _LOGGER.debug('   - ACTION REQ FILTER')
-            continue
-        _disable_task_filter = _glob_disable_task_filter
-        if action and _check.action_filter:
-            if not passes_filter(action, _check.action_filter):
-                _LOGGER.debug('   - REJECTED ACTION')
-                continue
-            _LOGGER.debug('   - ACTION PASS DISABLES TASK FILTER')
-            _disable_task_filter = True
-
-        # Apply task filter
-        if _disable_task_filter:
-            _LOGGER.debug('   - TASK FILTER DISABLED')
-        elif _task is None:
-            if _check.task_filter:
-                _LOGGER.debug(
-                    '   - REJECTED TASK FILTER %s', _check.task_filter)
-                continue
-            _LOGGER.debug('   - NO TASK FILTER')
-        elif isinstance(_task, str):
-            if not passes_filter(_task, _check.task_filter):
-                _LOGGER.debug(
-                    '   - REJECTED TASK task=%s filter=%s',
-                    _task, _check.task_filter)
-                continue
-            _LOGGER.debug(
-                '   - PASSED TASK FILTER "%s" "%s"', _task, _check.task_filter)
-        else:
-            raise ValueError(_task)
 
-        _LOGGER.debug('   - ACCEPTED %s', _check)
-        _checks.append(_check)
+def _passes_filters(  # pylint: disable=too-many-return-statements,too-many-branches
+        check, sc_settings, profile, action, task, disable_task_filter):
+    """Test whether the given check passes the current filters.
 
-    _LOGGER.info(' - FOUND %d "%s" CHECKS', len(_checks), _task)
+    Args:
+        check (SCCheck|SCCheckInfo): check to test
+        sc_settings (dict): sanity check settings
+        profile (str): current profile (eg. asset/shot)
+        action (str): current action (eg. render/cache)
+        task (str): current task
+        disable_task_filter (bool): ignore task filter
 
-    return sorted(_checks)
+    Returns:
+        (bool): whether check passes
+    """
+    _LOGGER.debug(' - CHECKING %s', check)
+    _check_settings = sc_settings.get(check.name)
+    _LOGGER.debug('   - CHECK SETTINGS %s', _check_settings)
+
+    # Check enabled
+    if check.name in sc_settings:
+        _enabled = _check_settings.get('enabled', check.enabled)
+        if not _enabled:
+            _LOGGER.debug('   - CHECK DISABLED IN SETTINGS')
+            return False
+    elif not check.enabled:
+        _LOGGER.debug('   - CHECK DISABLED IN CODE')
+        return False
+
+    # Apply dcc filter
+    if not passes_filter(dcc.NAME, check.dcc_filter):
+        _LOGGER.debug('   - DCC FILTER REJECTED %s', check.dcc_filter)
+        return False
+
+    # Apply profile filter
+    if check.profile_filter:
+        if not profile:
+            _LOGGER.debug(
+                '   - REJECTED NO PROFILE')
+            return False
+        if not passes_filter(profile, check.profile_filter):
+            _LOGGER.debug(
+                '   - REJECTED PROFILE profile=%s filter=%s',
+                profile, check.profile_filter)
+            return False
+
+    # Apply action filter
+    _LOGGER.debug('   - ACTION FILTER %s %s', action, check.action_filter)
+    if not action and check.action_filter and check.action_req:
+        _LOGGER.debug('   - ACTION REQ FILTER')
+        return False
+    _disable_task_filter = disable_task_filter
+    if action and check.action_filter:
+        if not passes_filter(action, check.action_filter):
+            _LOGGER.debug('   - REJECTED ACTION')
+            return False
+        _LOGGER.debug('   - ACTION PASS DISABLES TASK FILTER')
+        _disable_task_filter = True
+
+    # Apply task filter
+    if _disable_task_filter:
+        _LOGGER.debug('   - TASK FILTER DISABLED')
+    elif task is None:
+        if check.task_filter:
+            _LOGGER.debug(
+                '   - REJECTED TASK FILTER %s', check.task_filter)
+            return False
+        _LOGGER.debug('   - NO TASK FILTER')
+    elif isinstance(task, str):
+        if not passes_filter(task, check.task_filter):
+            _LOGGER.debug(
+                '   - REJECTED TASK task=%s filter=%s',
+                task, check.task_filter)
+            return False
+        _LOGGER.debug(
+            '   - PASSED TASK FILTER "%s" "%s"', task, check.task_filter)
+    else:
+        raise ValueError(task)
+
+    _LOGGER.debug('   - ACCEPTED %s', check)
+    return True
 
 
 @cache_result
@@ -178,10 +207,22 @@ def read_checks(force=False):
     Returns:
         (SCCheck list): checks
     """
-    from .. import checks
-
     _LOGGER.debug('READ CHECKS')
     _start = time.time()
+    _infos = sc_manifest.read_manifest(_find_check_pys(), force=force)
+    _checks = _infos_to_checks(_infos, force=force)
+    _LOGGER.debug(
+        'FOUND %d CHECKS IN %.01fs', len(_checks), time.time() - _start)
+    return sorted(_checks)
+
+
+def _find_check_pys():
+    """Find python files in check directories.
+
+    Returns:
+        (PyFile list): check files
+    """
+    from .. import checks
 
     # Find search dirs
     _dirs = [File(checks.__file__).to_dir()]
@@ -204,20 +245,44 @@ def read_checks(force=False):
         _pys += _dir_pys
     _LOGGER.debug('PYS %d %s', len(_pys), _pys)
 
-    # Read py files to find checks
+    return _pys
+
+
+def _infos_to_checks(infos, force=False):
+    """Import the checks in the given manifest.
+
+    Only the modules containing the given checks are imported.
+
+    Args:
+        infos (SCCheckInfo list): checks to import
+        force (bool): force reimport checks
+
+    Returns:
+        (SCCheck list): checks
+    """
+    _names = {}
+    for _info in infos:
+        _names.setdefault(_info.py_file, set()).add(_info.name)
     _checks = []
-    for _py in _pys:
-        _checks += _checks_from_py(_py)
-    _LOGGER.debug(
-        'FOUND %d CHECKS IN %.01fs', len(_checks), time.time() - _start)
+    for _py, _py_names in _names.items():
+        _checks += [
+            _check for _check in _read_py_checks(_py, force=force)
+            if _check.name in _py_names]
+    return _checks
 
-    # Allow custom checks to replace default checks (by name)
-    _map = {}
-    for _check in _checks:
-        _map[_check.name] = _check
-    _checks = sorted(_map.values())
 
-    return sorted(_checks)
+@cache_result
+def _read_py_checks(py_file, force=False):
+    """Read checks from a python file.
+
+    Args:
+        py_file (PyFile): file to read
+        force (bool): force reimport checks
+
+    Returns:
+        (SCCheck list): checks
+    """
+    return _checks_from_py(py_file)
 
 
 def _checks_from_py(py_file) -> list:
@@ -250,7 +315,7 @@ def _checks_from_py(py_file) -> list:
     # Check these checks were defined in this py file
     _checks = []
     _class_names = [
-        _class.name for _class in py_file.find_classes(internal=False)]
+        _info.name for _info in sc_manifest.read_py_manifest(py_file)]
     for _type in _types:
         _src = abs_path(inspect.getfile(_type))
         _src = File(_src).to_file(extn='py')
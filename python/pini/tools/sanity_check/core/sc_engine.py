@@ -0,0 +1,272 @@
+"""Tools for executing a list of sanity checks.
+
+Checks which declare themselves as pure (ie. pure-python/read-only) are
+run concurrently in worker threads, while dcc-bound checks are run in
+order on the main thread. The depends_on attribute of each check is
+respected, so a check doesn't start until the checks it depends on
+have completed.
+
+Checks which pass are cached against a fingerprint of the current
+scene, so re-running checks on an unchanged scene (eg. re-publishing)
+skips checks which have already passed.
+"""
+
+import concurrent.futures
+import inspect
+import logging
+import os
+import time
+
+from pini import dcc
+from pini.utils import check_heart, nice_age
+
+_LOGGER = logging.getLogger(__name__)
+
+_PASSED_CACHE = {}
+
+
+class SCEngine:
+    """Executes a list of sanity checks."""
+
+    def __init__(
+            self, checks, update_ui=None, callback=None, max_workers=None,
+            use_cache=True, catch=True):
+        """Constructor.
+
+        Args:
+            checks (SCCheck list): checks to execute
+            update_ui (fn): function to update a ui to give progress
+                feedback (only passed to checks run on the main thread)
+            callback (fn): function called on the main thread when a check
+                starts or completes - the check is passed as an arg
+            max_workers (int): maximum number of worker threads for pure
+                checks
+            use_cache (bool): skip checks which have already passed on
+                the current scene
+            catch (bool): don't error if a check fails
+        """
+        self.checks = sorted(checks)
+        self.update_ui = update_ui
+        self.callback = callback
+        self.max_workers = max_workers
+        self.use_cache = use_cache
+        self.catch = catch
+
+        self.fingerprint = None
+        self.profile = {}
+
+        self._pool = None
+        self._futures = {}
+        self._pending = []
+        self._todo = set()
+
+    def run(self):
+        """Execute the checks.
+
+        Returns:
+            (dict): check name/duration
+        """
+        _start = time.time()
+        self.profile = {}
+        self.fingerprint = to_scene_fingerprint() if self.use_cache else None
+        _LOGGER.info(
+            'EXECUTING %d CHECKS fingerprint=%s', len(self.checks),
+            self.fingerprint)
+
+        # Read disabled state on main thread + apply cached passes
+        _to_run = []
+        for _check in self.checks:
+            _disabled = _check.is_disabled
+            if not _disabled and self._apply_cached_pass(_check):
+                continue
+            _to_run.append((_check, _disabled))
+        self._todo = {type(_check) for _check, _ in _to_run}
+        self._pending = [_item for _item in _to_run if _item[0].pure]
+        _main = [_item for _item in _to_run if not _item[0].pure]
+        _LOGGER.info(
+            ' - RUNNING %d CHECKS (%d PURE)', len(_to_run),
+            len(self._pending))
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers) as _pool:
+
+            self._pool = _pool
+            self._submit_ready()
+
+            # Run dcc checks on main thread
+            for _check, _disabled in _main:
+                while not self._deps_done(_check) and self._futures:
+                    self._harvest(wait=True)
+                    self._submit_ready()
+                check_heart()
+                _check.status = 'running'
+                self._notify(_check)
+                _check.execute(
+                    catch=self.catch, update_ui=self.update_ui,
+                    disabled=_disabled)
+                self._complete(_check)
+                self._harvest()
+                self._submit_ready()
+
+            # Wait for pure checks
+            while self._futures or self._pending:
+                if not self._futures:
+                    self._submit_ready(force=True)
+                self._harvest(wait=True)
+                self._submit_ready()
+
+        self._pool = None
+        _slowest = sorted(
+            self.profile.items(), key=lambda _item: _item[1], reverse=True)
+        for _name, _dur in _slowest[:5]:
+            _LOGGER.info(' - %s %s', nice_age(_dur), _name)
+        _LOGGER.info(
+            ' - EXECUTED %d CHECKS IN %s', len(self.checks),
+            nice_age(time.time() - _start))
+
+        return self.profile
+
+    def _apply_cached_pass(self, check):
+        """Apply cached pass to the given check (if any).
+
+        Args:
+            check (SCCheck): check to apply cache to
+
+        Returns:
+            (bool): whether cached pass was applied
+        """
+        if not self.fingerprint:
+            return False
+        _key = _to_check_key(check, fingerprint=self.fingerprint)
+        if _PASSED_CACHE.get(check.name) != _key:
+            return False
+        check.reset(disabled=False)
+        check.write_log('Passed on unchanged scene - skipping')
+        check.status = 'passed'
+        check.dur = 0.0
+        check.set_progress(100.0)
+        self.profile[check.name] = 0.0
+        self._notify(check)
+        return True
+
+    def _complete(self, check):
+        """Mark the given check as completed.
+
+        Args:
+            check (SCCheck): completed check
+        """
+        self._todo.discard(type(check))
+        self.profile[check.name] = check.dur or 0.0
+        if self.fingerprint and check.has_passed:
+            _PASSED_CACHE[check.name] = _to_check_key(
+                check, fingerprint=self.fingerprint)
+        self._notify(check)
+
+    def _deps_done(self, check):
+        """Test whether the given check's dependencies have completed.
+
+        Args:
+            check (SCCheck): check to test
+
+        Returns:
+            (bool): whether dependencies done
+        """
+        return not self._todo.intersection(check.depends_on)
+
+    def _harvest(self, wait=False):
+        """Read results of pure checks which have completed.
+
+        Args:
+            wait (bool): wait for at least one check to complete
+        """
+        if not self._futures:
+            return
+        if wait:
+            concurrent.futures.wait(
+                self._futures,
+                return_when=concurrent.futures.FIRST_COMPLETED)
+        for _future in [_future for _future in self._futures
+                        if _future.done()]:
+            _check = self._futures.pop(_future)
+            _future.result()
+            self._complete(_check)
+
+    def _notify(self, check):
+        """Notify callback and ui of a change in a check's status.
+
+        Args:
+            check (SCCheck): updated check
+        """
+        if self.callback:
+            self.callback(check)
+        if self.update_ui:
+            self.update_ui(check=check)
+
+    def _submit_ready(self, force=False):
+        """Submit pure checks which have their dependencies completed.
+
+        Args:
+            force (bool): submit all pending checks (eg. if dependencies
+                can't be met)
+        """
+        for _check, _disabled in list(self._pending):
+            if not force and not self._deps_done(_check):
+                continue
+            if force:
+                _LOGGER.warning(' - DEPENDENCIES NOT MET %s', _check)
+            self._pending.remove((_check, _disabled))
+            _check.status = 'running'
+            _future = self._pool.submit(
+                _check.execute, catch=self.catch, disabled=_disabled)
+            self._futures[_future] = _check
+
+
+def execute_checks(checks, **kwargs):
+    """Execute a list of sanity checks.
+
+    Args:
+        checks (SCCheck list): checks to execute
+
+    Returns:
+        (dict): check name/duration
+    """
+    return SCEngine(checks, **kwargs).run()
+
+
+def flush_passed_cache():
+    """Flush cache of checks which have passed."""
+    _PASSED_CACHE.clear()
+
+
+def to_scene_fingerprint():
+    """Obtain fingerprint of the current scene.
+
+    This is based on the path, mtime and size of the current scene file,
+    so it's only available if the scene has been saved.
+
+    Returns:
+        (str|None): fingerprint (if scene is saved)
+    """
+    _file = dcc.cur_file()
+    if not _file or not os.path.exists(_file) or dcc.unsaved_changes():
+        return None
+    _stat = os.stat(_file)
+    return f'{_file}:{_stat.st_mtime}:{_stat.st_size:d}'
+
+
+def _to_check_key(check, fingerprint):
+    """Build key for caching a check result.
+
+    This combines the scene fingerprint with the check's settings and
+    the mtime of the check's code.
+
+    Args:
+        check (SCCheck): check to build key for
+        fingerprint (str): scene fingerprint
+
+    Returns:
+        (tuple): check key
+    """
+    _code = inspect.getfile(type(check))
+    _code_mtime = os.path.getmtime(_code) if os.path.exists(_code) else None
+    return fingerprint, repr(check.settings), _code_mtime
@@ -0,0 +1,241 @@
+"""Tools for reading a static manifest of sanity checks.
+
+Check files are parsed using ast rather than imported, so that checks
+can be filtered (eg. by dcc/profile/action/task) before any modules are
+imported. For each check class, the manifest records its base classes
+and any filter attributes which are declared as literals. Attributes are
+inherited from base classes which are also in the manifest.
+
+The dcc of a check file is determined from its top level imports, eg. a
+file which imports maya can only be imported in maya.
+
+Manifests are cached by file mtime.
+"""
+
+import ast
+import logging
+import os
+
+from pini import dcc
+from pini.utils import basic_repr
+
+from . import sc_check
+
+_LOGGER = logging.getLogger(__name__)
+
+_FILTER_ATTRS = (
+    'enabled', 'dcc_filter', 'profile_filter', 'task_filter',
+    'action_filter', 'action_req')
+_BASE_NAMES = ('SCCheck', 'SCMayaCheck')
+_DCC_MODS = {
+    'bpy': 'blender',
+    'flame': 'flame',
+    'flame_pini': 'flame',
+    'hou': 'hou',
+    'hou_pini': 'hou',
+    'maya': 'maya',
+    'maya_pini': 'maya',
+    'nuke': 'nuke',
+    'nuke_pini': 'nuke',
+    'spainter_pini': 'spainter',
+    'substance_painter': 'spainter',
+}
+_UNKNOWN = object()
+_CACHE = {}
+
+
+class SCCheckInfo:
+    """Static information about a sanity check class, read from source."""
+
+    def __init__(self, name, py_file, bases, attrs, dcc_=None):
+        """Constructor.
+
+        Args:
+            name (str): class name
+            py_file (PyFile): file containing class
+            bases (str list): names of base classes
+            attrs (dict): filter attributes declared on this class
+            dcc_ (str): dcc required to import file (if any)
+        """
+        self.name = name
+        self.py_file = py_file
+        self.bases = bases
+        self.attrs = attrs
+        self.dcc = dcc_
+
+        self.is_static = False
+        for _attr in _FILTER_ATTRS:
+            setattr(self, _attr, None)
+
+    def resolve(self, infos, stack=()):
+        """Resolve filter attributes, including inherited attributes.
+
+        If all filter attributes could be read then this check is marked
+        as static, meaning it can be filtered without being imported.
+
+        Args:
+            infos (dict): name/info of all checks in manifest
+            stack (tuple): names of checks being resolved (to avoid
+                cyclic inheritance)
+
+        Returns:
+            (dict): resolved filter attributes (None if not resolvable)
+        """
+        self.is_static = False
+        if self.name in stack or len(self.bases) != 1:
+            return None
+        _base = self.bases[0]
+        if _base in _BASE_NAMES:
+            _attrs = {_attr: getattr(sc_check.SCCheck, _attr)
+                      for _attr in _FILTER_ATTRS}
+        elif _base in infos:
+            _attrs = infos[_base].resolve(
+                infos, stack=stack + (self.name, ))
+        else:
+            _attrs = None
+        if _attrs is None:
+            return None
+
+        _attrs = dict(_attrs)
+        _attrs.update(self.attrs)
+        if _UNKNOWN in _attrs.values():
+            return None
+        for _attr, _val in _attrs.items():
+            setattr(self, _attr, _val)
+        self.is_static = True
+        return _attrs
+
+    def __repr__(self):
+        return basic_repr(self, self.name)
+
+
+def flush_manifest_cache():
+    """Flush manifest cache."""
+    _CACHE.clear()
+
+
+def read_manifest(py_files, force=False):
+    """Read manifest of the checks in the given files.
+
+    Files which require a different dcc are ignored, as they would fail
+    to import. If more than one check has the same name, the last one is
+    used, which allows custom checks to replace default checks.
+
+    Args:
+        py_files (PyFile list): check files to read
+        force (bool): force reread files
+
+    Returns:
+        (SCCheckInfo list): check info
+    """
+    _infos = {}
+    for _py in py_files:
+        for _info in read_py_manifest(_py, force=force):
+            if _info.dcc and _info.dcc != dcc.NAME:
+                continue
+            _infos[_info.name] = _info
+    for _info in _infos.values():
+        _info.resolve(_infos)
+    return list(_infos.values())
+
+
+def read_py_manifest(py_file, force=False):
+    """Read manifest of the classes in the given file.
+
+    Files which fail to parse (eg. syntax errors) are skipped.
+
+    Args:
+        py_file (PyFile): check file to read
+        force (bool): force reread file
+
+    Returns:
+        (SCCheckInfo list): check info
+    """
+    _mtime = os.path.getmtime(py_file.path)
+    _cached = _CACHE.get(py_file.path)
+    if not force and _cached and _cached[0] == _mtime:
+        return _cached[1]
+
+    _LOGGER.debug(' - PARSING %s', py_file.path)
+    try:
+        _body = ast.parse(py_file.read(), filename=py_file.path).body
+    except (SyntaxError, ValueError) as _exc:
+        _LOGGER.warning(' - FAILED TO PARSE %s - %s', py_file.path, _exc)
+        _CACHE[py_file.path] = _mtime, []
+        return []
+    _dcc = _read_dcc(_body)
+    _infos = []
+    for _node in _body:
+        if not isinstance(_node, ast.ClassDef) or _node.name.startswith('_'):
+            continue
+        _info = SCCheckInfo(
+            name=_node.name, py_file=py_file, dcc_=_dcc,
+            bases=[_to_base_name(_base) for _base in _node.bases],
+            attrs=_read_class_attrs(_node))
+        _infos.append(_info)
+    _CACHE[py_file.path] = _mtime, _infos
+
+    return _infos
+
+
+def _read_dcc(body):
+    """Read dcc required by a module from its top level imports.
+
+    Args:
+        body (ast.stmt list): module body
+
+    Returns:
+        (str|None): dcc name (if any)
+    """
+    for _node in body:
+        if isinstance(_node, ast.Import):
+            _mods = [_alias.name for _alias in _node.names]
+        elif isinstance(_node, ast.ImportFrom) and not _node.level:
+            _mods = [_node.module]
+        else:
+            continue
+        for _mod in _mods:
+            _dcc = _DCC_MODS.get(_mod.split('.')[0])
+            if _dcc:
+                return _dcc
+    return None
+
+
+def _read_class_attrs(node):
+    """Read filter attributes declared on a class.
+
+    Args:
+        node (ast.ClassDef): class node
+
+    Returns:
+        (dict): attribute name/value (values which aren't literals
+            are marked as unknown)
+    """
+    _attrs = {}
+    for _item in node.body:
+        if not isinstance(_item, ast.Assign):
+            continue
+        for _trg in _item.targets:
+            if not isinstance(_trg, ast.Name) or _trg.id not in _FILTER_ATTRS:
+                continue
+            try:
+                _attrs[_trg.id] = ast.literal_eval(_item.value)
+            except ValueError:
+                _attrs[_trg.id] = _UNKNOWN
+    return _attrs
+
+
+def _to_base_name(node):
+    """Read name of a base class.
+
+    Args:
+        node (ast.expr): base class node (eg. SCCheck/core.SCMayaCheck)
+
+    Returns:
+        (str|None): base class name
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
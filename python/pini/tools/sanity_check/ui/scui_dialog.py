@@ -365,20 +365,29 @@ class SanityCheckUi(qt.CUiDialog):
         self.reset_checks()
 
         _show_passed = self.ui.ShowPassed.isChecked()
-        _sel = None
-
-        for _item in self.ui.Checks.all_items():
-
-            self.ui.Checks.select_item(_item)
-            dcc.refresh()
-
-            _item.execute_check(update_ui=self._update_ui, checks=self.checks)
+        _items = {_item.check.name: _item
+                  for _item in self.ui.Checks.all_items()}
 
-            if not _show_passed and _item.check.has_passed:
+        def _on_check_update(check):
+            _item = _items.get(check.name)
+            if not _item:
+                return
+            if check.status == 'running':
+                self.ui.Checks.select_item(_item)
+                dcc.refresh()
+                return
+            _item.redraw()
+            if not _show_passed and check.has_passed:
                 self.ui.Checks.remove_item(_item)
-            if not _sel and _item.check.has_failed:
-                _sel = _item
+                del _items[check.name]
+
+        core.execute_checks(
+            [_item.check for _item in _items.values()],
+            update_ui=self._update_ui, callback=_on_check_update)
 
+        _sel = next((
+            _item for _item in self.ui.Checks.all_items()
+            if _item.check.has_failed), None)
         if _sel:
             self.ui.Checks.select_item(_sel)
 
@@ -1,15 +1,30 @@
 """Tools for tracking tool usage.
 
 This module provides a decorator which will log each time a function
-is used to a centralised yml file. These files are generated per day
+is used to a centralised file. These files are generated per day
 and per user.
+
+Events are written in json lines format (one json event per line), so
+that they can be appended without reading the existing file. To avoid
+blocking the ui on a slow network share, events are queued in memory
+and written in batches by a background thread - the queue is flushed
+every $PINI_USAGE_FLUSH_INTERVAL seconds and at exit.
+
+Usage can then be aggregated across users and days:
+
+    >>> usage.read_usage_counts(start=time.time() - 7 * DAY_SECS)
 """
 
+import atexit
+import collections
+import concurrent.futures
 import functools
+import json
 import logging
 import os
 import platform
 import sys
+import threading
 import time
 
 import pini
@@ -17,12 +32,13 @@ import pini
 from pini import dcc
 from pini.utils import (
     File, Dir, cache_result, strftime, assert_eq, is_pascal, get_user,
-    read_func_kwargs, Seq, to_camel, Path, to_session_dur)
+    read_func_kwargs, Seq, to_camel, Path, to_session_dur, passes_filter)
 
 _SESSION_START = time.time()
 _LOGGER = logging.getLogger(__name__)
 
 ROOT = os.environ.get('PINI_USAGE_DIR')
+FLUSH_INTERVAL = float(os.environ.get('PINI_USAGE_FLUSH_INTERVAL', 10))
 TIME_ZONE_MAP = {
     'Eastern Standard Time': 'EST',
     'Pacific Standard Time': 'PST',
@@ -170,11 +186,91 @@ def _build_data(func, args=None):
     return _data
 
 
-def _get_usage_yml():
-    """Obtain path to current usage yaml file.
+class _UsageWriter:
+    """Writes queued usage events to disk in a background thread."""
+
+    def __init__(self, interval=FLUSH_INTERVAL):
+        """Constructor.
+
+        Args:
+            interval (float): time between flushes (in seconds)
+        """
+        self.interval = interval
+        self._queue = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._thread = None
+
+    def add(self, file_, data):
+        """Add an event to the queue.
+
+        Args:
+            file_ (File): usage file to write to
+            data (dict): event data
+        """
+        with self._lock:
+            self._queue.append((file_, data))
+            if not self._thread:
+                self._thread = threading.Thread(
+                    target=self._run, name='UsageWriter', daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        """Write queued events to disk.
+
+        Events are grouped by file, so each file is only opened once
+        and all of its events are appended in a single write. Errors are
+        logged rather than raised, so the writer thread is never killed.
+
+        Returns:
+            (int): number of events written
+        """
+        with self._lock:
+            _queue, self._queue = self._queue, []
+        if not _queue:
+            return 0
+        _events = collections.defaultdict(list)
+        for _file, _data in _queue:
+            _events[_file].append(_data)
+        with self._write_lock:
+            for _file, _file_events in _events.items():
+                try:
+                    _lines = [json.dumps(_data) + '\n'
+                              for _data in _file_events]
+                    _file.test_dir()
+                    with open(_file.path, 'a', encoding='utf-8') as _hook:
+                        _hook.write(''.join(_lines))
+                except Exception as _exc:  # pylint: disable=broad-exception-caught
+                    _LOGGER.info(
+                        'WRITE USAGE FAILED "%s" (%s)', _exc, type(_exc))
+        _LOGGER.debug(' - FLUSHED %d USAGE EVENTS', len(_queue))
+        return len(_queue)
+
+    def _run(self):
+        """Flush queue on a timer."""
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
+_WRITER = _UsageWriter()
+atexit.register(_WRITER.flush)
+
+
+def flush_usage():
+    """Write any queued usage events to disk.
 
     Returns:
-        (File): usage yaml
+        (int): number of events written
+    """
+    return _WRITER.flush()
+
+
+def _get_usage_file():
+    """Obtain path to current usage file.
+
+    Returns:
+        (File): usage jsonl file
     """
     _user = get_user()
     _date = strftime('%y%m%d')
@@ -182,11 +278,12 @@ def _get_usage_yml():
     # Use $PINI_USAGE_FMT
     _fmt = os.environ.get('PINI_USAGE_FMT')
     if _fmt:
-        return File(_fmt.format(user=_user, date=_date))
+        return File(_fmt.format(user=_user, date=_date)).to_file(
+            extn='jsonl')
 
     # Use $PINI_USAGE_DIR
     if ROOT:
-        return Dir(ROOT).to_subdir(_user).to_file(_date + '.yml')
+        return Dir(ROOT).to_subdir(_user).to_file(_date + '.jsonl')
 
     _LOGGER.debug(' - ROOT NOT SET')
     return None
@@ -217,17 +314,133 @@ def _write_usage_event(func, args):
         return
     _LOGGER.debug('WRITE USAGE TO DISK args=%s', args)
 
-    _yml = _get_usage_yml()
-    if not _yml:
-        _LOGGER.debug(' - NO YML FOUND')
+    _file = _get_usage_file()
+    if not _file:
+        _LOGGER.debug(' - NO FILE FOUND')
         return
-    _LOGGER.debug(' - SET YML %s', _yml)
+    _LOGGER.debug(' - SET FILE %s', _file)
 
     _data = _build_data(func=func, args=args)
     _LOGGER.debug(' - SET DATA %s', _data)
 
-    _yml.write_yml([_data], mode='a')
-    _LOGGER.debug(' - WROTE YML')
+    _WRITER.add(_file, _data)
+    _LOGGER.debug(' - QUEUED EVENT')
+
+
+def find_usage_files(root=None, users=None, start=None, end=None):
+    """Find usage files.
+
+    This includes yml usage files written by older versions of pini.
+
+    Args:
+        root (str): override usage root (default is $PINI_USAGE_DIR)
+        users (str list): filter by user
+        start (float): ignore days before this time
+        end (float): ignore days after this time
+
+    Returns:
+        (File list): usage files
+    """
+    _root = Dir(root or ROOT)
+    _start = strftime('%y%m%d', start) if start else None
+    _end = strftime('%y%m%d', end) if end else None
+    _files = []
+    for _user_dir in _root.find(depth=1, type_='d', catch_missing=True,
+                                class_=Dir):
+        if users and _user_dir.filename not in users:
+            continue
+        for _file in _user_dir.find(
+                depth=1, type_='f', extns=('jsonl', 'yml'), class_=File):
+            if _start and _file.base < _start:
+                continue
+            if _end and _file.base > _end:
+                continue
+            _files.append(_file)
+    return _files
+
+
+def read_usage(root=None, users=None, start=None, end=None,
+               func_filter=None, max_workers=8):
+    """Read usage events.
+
+    Files are read in threads, as reading many small files from a network
+    share is latency bound.
+
+    Args:
+        root (str): override usage root (default is $PINI_USAGE_DIR)
+        users (str list): filter by user
+        start (float): ignore events before this time
+        end (float): ignore events after this time
+        func_filter (str): filter by function name
+        max_workers (int): maximum number of threads
+
+    Returns:
+        (dict list): usage events (with user added)
+    """
+    _files = find_usage_files(root=root, users=users, start=start, end=end)
+    _events = []
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers) as _pool:
+        for _file, _file_events in zip(
+                _files, _pool.map(_read_usage_file, _files)):
+            _user = _file.to_dir().filename
+            for _event in _file_events:
+                if start and _event['time'] < start:
+                    continue
+                if end and _event['time'] > end:
+                    continue
+                if func_filter and not passes_filter(
+                        _event['func'], func_filter):
+                    continue
+                _event['user'] = _user
+                _events.append(_event)
+    _events.sort(key=lambda _event: _event['time'])
+    return _events
+
+
+def read_usage_counts(key='func', **kwargs):
+    """Read usage counts, aggregated across users and days.
+
+    Args:
+        key (str|tuple): event field (or fields) to count by
+            (eg. func, user, dcc)
+
+    Returns:
+        (Counter): usage counts
+    """
+    _counts = collections.Counter()
+    for _event in read_usage(**kwargs):
+        if isinstance(key, tuple):
+            _val = tuple(_event.get(_key) for _key in key)
+        else:
+            _val = _event.get(key)
+        _counts[_val] += 1
+    return _counts
+
+
+def _read_usage_file(file_):
+    """Read events from a usage file.
+
+    Lines which can't be parsed (eg. an event being written) are ignored.
+    Yml files written by older versions are read as a list of events.
+
+    Args:
+        file_ (File): usage jsonl/yml file
+
+    Returns:
+        (dict list): usage events
+    """
+    if file_.extn == 'yml':
+        _events = file_.read_yml(catch=True)
+        return _events if isinstance(_events, list) else []
+    _events = []
+    with open(file_.path, encoding='utf-8') as _hook:
+        for _line in _hook:
+            try:
+                _events.append(json.loads(_line))
+            except ValueError:
+                continue
+    return _events
 
 
 def add_tracked_mod(mod, ver=None):
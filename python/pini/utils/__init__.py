@@ -1,54 +1,81 @@
-"""General utilities."""
+"""General utilities.
 
-from . import u_email as email
+Attributes are loaded lazily on first access (see u_lazy).
+"""
 
-from .u_assert import assert_eq
-from .u_callbacks import install_callback, find_callback
-from .u_exe import find_exe, find_exes
-from .u_filter import apply_filter, passes_filter
-from .u_func import wrap_fn, chain_fns, null_fn
-from .u_heart import check_heart, HEART
+from .u_lazy import lazy_import
 from .u_session import (
     PINI_SESSION_ID, DCC_SESSION_ID, to_session_dur, PINI_SESSION_START,
     DCC_SESSION_START)
-from .u_system import system
-from .u_time import (
-    nice_age, strftime, to_time_f, to_time_t, WEEK_SECS, DAY_SECS, YEAR_SECS,
-    HOUR_SECS)
-from .u_url import read_url
-
-from .u_text import (
-    is_pascal, is_camel, to_pascal, to_snake, to_ord, to_camel, copy_text,
-    to_nice, plural, add_indent, split_base_index, nice_cmds, is_snake)
-from .u_misc import (
-    lprint, single, search_dict_for_key, str_to_seed, dprint, str_to_ints,
-    val_map, safe_zip, get_user, last, ints_to_str, basic_repr, nice_id,
-    to_list, fr_enumerate, fr_range, EMPTY, SimpleNamespace, nice_size,
-    merge_dicts, null_dec, to_str, read_func_kwargs, check_logging_level,
-    first, clamp)
-
-from .u_mel_file import MelFile
-from .u_ma_file import MaFile
-
-from .u_image import Image
-from .u_res import Res
-from .u_yaml import register_custom_yaml_handler
-
-from .path import (
-    Path, Dir, File, abs_path, norm_path, HOME_PATH, TMP_PATH, find,
-    search_files_for_text, DATA_PATH, is_abs, restore_cwd, copied_path,
-    MetadataFile, HOME, TMP, error_on_file_system_disabled, DESKTOP,
-    search_dir_files_for_text, ReadDataError, MOUNTS, PINI_TMP,
-    PROPERTIES)
-
-from .cache import (
-    cache_property, cache_result, get_file_cacher, cache_method_to_file,
-    get_method_to_file_cacher, get_result_cacher, cache_on_obj,
-    build_cache_fmt, flush_caches, CacheOutdatedError,
-    get_result_to_file_cacher)
-from .clip import (
-    Seq, CacheSeq, find_seqs, Video, find_viewers, find_viewer, file_to_seq,
-    play_sound, to_seq, find_ffmpeg_exe, VIDEO_EXTNS)
-
-from .py_file import (
-    PyFile, to_py_file, PyDef, PyClass, PyArg, PyElem, PyDefDocs)
+
+__getattr__, __dir__ = lazy_import(
+    __name__, globals(),
+    mods={
+        'email': '.u_email',
+        'path': '.path',
+        'cache': '.cache',
+        'clip': '.clip',
+        'py_file': '.py_file',
+    },
+    attrs={
+        '.u_assert': ['assert_eq'],
+        '.u_callbacks': ['install_callback', 'find_callback'],
+        '.u_exe': ['find_exe', 'find_exes'],
+        '.u_filter': ['apply_filter', 'passes_filter'],
+        '.u_func': ['wrap_fn', 'chain_fns', 'null_fn'],
+        '.u_heart': ['check_heart', 'HEART'],
+        '.u_progress': ['ConsoleProgress', 'console_progress'],
+        '.u_system': ['system', 'system_many', 'asystem', 'asystem_many'],
+        '.u_trace': [
+            'TRACER', 'trace_count', 'trace_span', 'traced', 'record_trace'],
+        '.u_time': [
+            'nice_age', 'strftime', 'to_time_f', 'to_time_t', 'WEEK_SECS',
+            'DAY_SECS', 'YEAR_SECS', 'HOUR_SECS'],
+        '.u_url': ['read_url'],
+
+        '.u_text': [
+            'is_pascal', 'is_camel', 'to_pascal', 'to_snake', 'to_ord',
+            'to_camel', 'copy_text', 'to_nice', 'plural', 'add_indent',
+            'split_base_index', 'nice_cmds', 'is_snake'],
+        '.u_misc': [
+            'lprint', 'single', 'search_dict_for_key', 'str_to_seed',
+            'dprint', 'str_to_ints', 'val_map', 'safe_zip', 'get_user',
+            'last', 'ints_to_str', 'basic_repr', 'nice_id', 'to_list',
+            'fr_enumerate', 'fr_range', 'EMPTY', 'SimpleNamespace',
+            'nice_size', 'merge_dicts', 'null_dec', 'to_str',
+            'read_func_kwargs', 'check_logging_level', 'first', 'clamp'],
+
+        '.u_mel_file': ['MelFile'],
+        '.u_ma_file': ['MaFile'],
+
+        '.u_image': ['Image'],
+        '.u_image_header': ['read_image_res', 'flush_image_res_cache'],
+        '.u_res': ['Res'],
+        '.u_yaml': ['register_custom_yaml_handler'],
+
+        '.path': [
+            'Path', 'Dir', 'File', 'abs_path', 'norm_path', 'HOME_PATH',
+            'TMP_PATH', 'find', 'search_files_for_text', 'DATA_PATH',
+            'is_abs', 'restore_cwd', 'copied_path', 'MetadataFile', 'HOME',
+            'TMP', 'error_on_file_system_disabled', 'DESKTOP',
+            'search_dir_files_for_text', 'ReadDataError', 'MOUNTS',
+            'PINI_TMP', 'PROPERTIES', 'copy_file', 'copy_files', 'move_files',
+            'files_match', 'find_unmatched_files', 'BlobStore', 'sync_dirs'],
+
+        '.cache': [
+            'cache_property', 'cache_result', 'get_file_cacher',
+            'cache_method_to_file', 'get_method_to_file_cacher',
+            'get_result_cacher', 'cache_on_obj', 'build_cache_fmt',
+            'flush_caches', 'CacheOutdatedError',
+            'get_result_to_file_cacher', 'obt_force_count'],
+        '.clip': [
+            'Seq', 'CacheSeq', 'find_seqs', 'Video', 'find_viewers',
+            'find_viewer', 'file_to_seq', 'play_sound', 'to_seq',
+            'find_ffmpeg_exe', 'VIDEO_EXTNS', 'build_video_thumbnails',
+            'read_ffprobes', 'videos_to_frames', 'build_thumbnails',
+            'build_contact_sheet', 'pick_thumb_frame', 'THUMB_FRAMES'],
+
+        '.py_file': [
+            'PyFile', 'to_py_file', 'PyDef', 'PyClass', 'PyArg', 'PyElem',
+            'PyDefDocs'],
+    })
@@ -2,7 +2,7 @@
 
 from .uc_memory import (
     cache_result, get_result_cacher, cache_on_obj, flush_caches,
-    obt_results_cache)
+    obt_results_cache, obt_force_count)
 from .uc_disk import (
     get_file_cacher, cache_method_to_file, get_method_to_file_cacher,
     get_result_to_file_cacher)
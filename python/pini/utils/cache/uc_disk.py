@@ -4,6 +4,7 @@ import functools
 import logging
 
 from .uc_memory import obt_results_cache
+from ..u_trace import trace_count
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -132,6 +133,11 @@ def get_method_to_file_cacher(
         (func): method caching decorator
     """
 
+    _action_keys = {
+        'recache': f'cache.{namespace}.miss',
+        'use memory': f'cache.{namespace}.hit',
+        'use disk': f'cache.{namespace}.disk'}
+
     def _method_to_file_cacher_dec(func):
 
         _LOGGER.debug(
@@ -161,6 +167,7 @@ def get_method_to_file_cacher(
                 file_=_file, mtime_outdates=mtime_outdates,
                 min_mtime=min_mtime, max_age=max_age)
             _LOGGER.debug(' - CACHE ACTION %s', _action)
+            trace_count(_action_keys[_action])
             _write_func = {
                 'yml': _file.write_yml,
                 'pkl': _file.write_pkl}[_file.extn]
@@ -6,8 +6,11 @@ import time
 
 from inspect import getfullargspec as _get_args  # py3
 
+from ..u_trace import trace_count
+
 _LOGGER = logging.getLogger(__name__)
 _RESULTS = {}
+_FORCE_COUNTS = {}
 
 
 class _Result:
@@ -46,6 +49,31 @@ def obt_results_cache(namespace='default'):
     return _RESULTS[namespace]
 
 
+def obt_force_count(namespace='default'):
+    """Obtain number of forced recalculations in the given namespace.
+
+    This is incremented each time a result is forced to recalculate, or
+    the namespace is flushed, so it can be used to check cheaply whether
+    any cached results may have been replaced.
+
+    Args:
+        namespace (str): cache namespace
+
+    Returns:
+        (int): force count
+    """
+    return _FORCE_COUNTS.get(namespace, 0)
+
+
+def _increment_force_count(namespace):
+    """Increment the number of forced recalculations in the given namespace.
+
+    Args:
+        namespace (str): cache namespace
+    """
+    _FORCE_COUNTS[namespace] = _FORCE_COUNTS.get(namespace, 0) + 1
+
+
 def flush_caches(namespace=None):
     """Flush memory cached results.
 
@@ -56,7 +84,10 @@ def flush_caches(namespace=None):
     if namespace:
         if namespace in _RESULTS:
             del _RESULTS[namespace]
+        _increment_force_count(namespace)
     else:
+        for _namespace in set(_RESULTS) | set(_FORCE_COUNTS):
+            _increment_force_count(_namespace)
         _RESULTS = {}
 
 
@@ -73,6 +104,9 @@ def get_result_cacher(use_args=None, namespace='default', max_age=None):
         (fn): caching decorator
     """
 
+    _hit_key = f'cache.{namespace}.hit'
+    _miss_key = f'cache.{namespace}.miss'
+
     def _build_result_cacher(func):
 
         @functools.wraps(func)
@@ -90,6 +124,7 @@ def get_result_cacher(use_args=None, namespace='default', max_age=None):
             # Determine whether result needs to be calculated
             if _force:
                 _calculate = True
+                _increment_force_count(namespace)
             elif _args_key not in _results:
                 _calculate = True
             elif max_age and _results[_args_key].age > max_age:
@@ -99,11 +134,13 @@ def get_result_cacher(use_args=None, namespace='default', max_age=None):
 
             # Retrieve/generate retult
             if _calculate:
+                trace_count(_miss_key)
                 _result = func(*args, **kwargs)
                 _LOGGER.debug('[cache_result] - CALCULATED RESULT %s %s',
                               func.__name__, _result)
                 _results[_args_key] = _Result(_result)
             else:
+                trace_count(_hit_key)
                 _result = _results[_args_key].value
                 _LOGGER.debug('[cache_result] - USING CACHED RESULT %s %s',
                               func.__name__, _result)
@@ -5,5 +5,8 @@ from .uc_clip import Clip
 from .uc_seq import Seq
 from .uc_seq_tools import find_seqs, file_to_seq, to_seq
 from .uc_viewer import find_viewers, find_viewer
-from .uc_video import Video, VIDEO_EXTNS
-from .uc_ffmpeg import play_sound, find_ffmpeg_exe
+from .uc_video import Video, VIDEO_EXTNS, build_video_thumbnails
+from .uc_thumb import (
+    build_thumbnails, build_contact_sheet, pick_thumb_frame, THUMB_FRAMES)
+from .uc_ffmpeg import (
+    play_sound, find_ffmpeg_exe, read_ffprobes, videos_to_frames)
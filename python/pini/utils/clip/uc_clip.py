@@ -24,7 +24,8 @@ class Clip:
         Args:
             file_ (str): thumbnail path
             width (int): thumbnail width in pixels
-            frame (int): select frame to export (default is middle frame)
+            frame (int|str): select frame to export (see pick_thumb_frame -
+                default is middle frame)
             force (bool): overwrite existing without confirmation
         """
         raise NotImplementedError
@@ -9,7 +9,7 @@ from ..path import Dir, File, TMP_PATH, abs_path
 
 from ..u_exe import find_exe
 from ..u_misc import to_str, ints_to_str
-from ..u_system import system
+from ..u_system import system, system_many
 from ..u_time import strftime, nice_age
 
 _LOGGER = logging.getLogger(__name__)
@@ -208,16 +208,85 @@ def read_ffprobe(video):
     Returns:
         (str): ffprobe result
     """
-    _ffprobe_exe = find_exe('ffprobe')
-
-    _cmds = [_ffprobe_exe.path, video.path]
+    _cmds = _build_ffprobe_cmds(video)
     _LOGGER.debug(' - CMD %s', ' '.join(_cmds))
     _result = system(_cmds, result='err', decode='latin-1')
-    _lines = [_line.strip() for _line in _result.split('\n')]
+    return _ffprobe_to_lines(_result)
+
+
+def read_ffprobes(videos, max_workers=None):
+    """Read ffprobe results for a list of videos.
+
+    The ffprobe commands are run concurrently. If the videos are Video
+    objects then the results are also applied to their ffprobe caches.
+
+    Args:
+        videos (Video list): video files to read
+        max_workers (int): maximum number of concurrent ffprobe processes
+
+    Returns:
+        (str list list): ffprobe result for each video
+    """
+    from pini.utils import Video
+
+    _videos = list(videos)
+    _results = system_many(
+        [_build_ffprobe_cmds(_video) for _video in _videos],
+        max_workers=max_workers, result='err', decode='latin-1')
+    _lines = [_ffprobe_to_lines(_result) for _result in _results]
+    for _video, _video_lines in zip(_videos, _lines):
+        if isinstance(_video, Video):
+            _video._read_ffprobe(  # pylint: disable=protected-access
+                force=True, value=_video_lines)
 
     return _lines
 
 
+def prime_ffprobes(videos, max_workers=None):
+    """Read ffprobe results for any videos without a cached reading.
+
+    This allows the ffprobe readings for a batch of videos to be read
+    concurrently before reading eg. res/fps for each video.
+
+    Args:
+        videos (Video list): videos to check
+        max_workers (int): maximum number of concurrent ffprobe processes
+    """
+    _to_read = []
+    for _video in videos:
+        _cache = File(_video.cache_fmt.format(func='_read_ffprobe'))
+        if not _cache.exists() or _cache.mtime() < _video.mtime():
+            _to_read.append(_video)
+    _LOGGER.debug(' - PRIMING %d FFPROBES', len(_to_read))
+    if _to_read:
+        read_ffprobes(_to_read, max_workers=max_workers)
+
+
+def _build_ffprobe_cmds(video):
+    """Build ffprobe commands for the given video.
+
+    Args:
+        video (Video): video to read
+
+    Returns:
+        (str list): ffprobe commands
+    """
+    _ffprobe_exe = find_exe('ffprobe')
+    return [_ffprobe_exe.path, video.path]
+
+
+def _ffprobe_to_lines(result):
+    """Split ffprobe output into lines.
+
+    Args:
+        result (str): ffprobe stderr
+
+    Returns:
+        (str list): ffprobe lines
+    """
+    return [_line.strip() for _line in result.split('\n')]
+
+
 def seq_to_video(  # pylint: disable=too-many-branches,too-many-statements
         seq, video, fps=None, audio=None, audio_offset=0.0,
         use_scene_audio=False, crf=15, bitrate=None, denoise=None,
@@ -377,14 +446,17 @@ def _handle_conversion_fail(seq, video, err, args):
     raise RuntimeError('Conversion failed ' + seq.path)
 
 
-def video_to_frame(video, file_, res=None, frame=None, force=False):
+def video_to_frame(
+        video, file_, res=None, frame=None, secs=None, force=False):
     """Extract a frame from a video.
 
     Args:
         video (Video): source video
         file_ (File): output file path
         res (tuple): apply width/height
-        frame (int): select frame to export (default is middle frame)
+        frame (int|str): select frame to export (see pick_thumb_frame -
+            default is middle frame)
+        secs (float): time of frame to export (overrides frame)
         force (bool): overwrite existing without confirmation
 
     Returns:
@@ -395,13 +467,76 @@ def video_to_frame(video, file_, res=None, frame=None, force=False):
     _img.delete(force=force)
     _img.test_dir()
 
-    if frame is not None:
-        _time = frame / video.to_fps()
-    else:
-        _time = video.to_dur() / 2
+    _cmds = _build_video_to_frame_cmds(
+        video, img=_img, res=res, frame=frame, secs=secs)
+    assert not _img.exists()
+    _out, _err = system(_cmds, result='out/err', verbose=1)
+    _check_frame_export(_img, out=_out, err=_err)
+
+    return _img
+
+
+def videos_to_frames(
+        videos, files, res=None, frame=None, force=False, max_workers=None):
+    """Extract a frame from each of a list of videos (eg. thumbnails).
+
+    The ffprobe readings required to find the frame time are read
+    concurrently, and then the ffmpeg exports are run concurrently.
+
+    Args:
+        videos (Video list): source videos
+        files (File list): output file path for each video
+        res (tuple|tuple list): apply width/height (or a list of
+            width/height for each video)
+        frame (int|str): select frame to export (see pick_thumb_frame -
+            default is middle frame)
+        force (bool): overwrite existing without confirmation
+        max_workers (int): maximum number of concurrent processes
+
+    Returns:
+        (File list): output images
+    """
+    _videos = list(videos)
+    _imgs = [File(_file) for _file in files]
+    assert len(_videos) == len(_imgs)
+    _LOGGER.info('TO FRAMES %d VIDEOS', len(_videos))
+    _ress = res if isinstance(res, list) else [res] * len(_videos)
+    for _img in _imgs:
+        _img.delete(force=force)
+        _img.test_dir()
+
+    prime_ffprobes(_videos, max_workers=max_workers)
+    _cmds = [
+        _build_video_to_frame_cmds(_video, img=_img, res=_res, frame=frame)
+        for _video, _img, _res in zip(_videos, _imgs, _ress)]
+    _results = system_many(
+        _cmds, max_workers=max_workers, result='out/err', verbose=1)
+    for _img, (_out, _err) in zip(_imgs, _results):
+        _check_frame_export(_img, out=_out, err=_err)
+
+    return _imgs
+
+
+def _build_video_to_frame_cmds(video, img, res, frame, secs=None):
+    """Build ffmpeg commands to extract a frame from a video.
+
+    Args:
+        video (Video): source video
+        img (File): output image
+        res (tuple): apply width/height
+        frame (int|str): select frame to export (see pick_thumb_frame -
+            default is middle frame)
+        secs (float): time of frame to export (overrides frame)
+
+    Returns:
+        (list): ffmpeg commands
+    """
+    from .uc_thumb import pick_thumb_frame
+    _time = secs
+    if _time is None:
+        _time = pick_thumb_frame(video, frame=frame)
     _LOGGER.info(' - TIME %f', _time)
 
-    # Build ffmpeg commands
     _ffmpeg = find_exe('ffmpeg')
     _cmds = [
         _ffmpeg,
@@ -410,16 +545,22 @@ def video_to_frame(video, file_, res=None, frame=None, force=False):
         '-frames:v', 1]
     if res:
         _cmds += ['-vf', f'scale={res[0]:d}:{res[1]:d}']
-    _cmds += [_img]
+    _cmds += [img]
+    return _cmds
 
-    assert not _img.exists()
-    _out, _err = system(_cmds, result='out/err', verbose=1)
-    if not _img.exists():
-        _LOGGER.info('OUT %s', _out)
-        _LOGGER.info('ERR %s', _err)
-        raise RuntimeError('Failed to export image ' + _img.path)
 
-    return _img
+def _check_frame_export(img, out, err):
+    """Check a frame was exported by ffmpeg.
+
+    Args:
+        img (File): output image
+        out (str): ffmpeg stdout
+        err (str): ffmpeg stderr
+    """
+    if not img.exists():
+        _LOGGER.info('OUT %s', out)
+        _LOGGER.info('ERR %s', err)
+        raise RuntimeError('Failed to export image ' + img.path)
 
 
 def video_to_seq(video, seq, fps=None, res=None, force=False, verbose=1):
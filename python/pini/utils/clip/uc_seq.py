@@ -6,7 +6,9 @@ from ..u_misc import single, ints_to_str
 from ..u_text import plural
 from ..u_time import strftime
 
-from ..path import Path, norm_path, Dir, File, abs_path
+from ..path import (
+    Path, norm_path, Dir, File, abs_path, copy_files, move_files,
+    find_unmatched_files)
 
 from . import uc_ffmpeg, uc_clip
 
@@ -117,11 +119,13 @@ class Seq(uc_clip.Clip):  # pylint: disable=too-many-public-methods
         Args:
             file_ (str): thumbnail path
             width (int): thumbnail width in pixels
-            frame (int): select frame to export (default is middle frame)
+            frame (int|str): select frame to export (see pick_thumb_frame -
+                default is middle frame)
             force (bool): overwrite existing without confirmation
         """
         from pini import qt
         from pini.utils import Image, TMP
+        from .uc_thumb import pick_thumb_frame
 
         _LOGGER.info('BUILD THUMB %s', self.path)
         _thumb = File(file_)
@@ -132,7 +136,7 @@ class Seq(uc_clip.Clip):  # pylint: disable=too-many-public-methods
             return
 
         # Build pixmap
-        _frame = self.to_frame_file(frame=frame)
+        _frame = pick_thumb_frame(self, frame=frame)
         _LOGGER.debug(' - FRAME %s', _frame)
         assert _frame.exists()
         if _frame.extn in qt.PIXMAP_EXTNS:
@@ -188,15 +192,22 @@ class Seq(uc_clip.Clip):  # pylint: disable=too-many-public-methods
 
     def copy_to(
             self, target, frames=None, check_match=True, progress=True,
-            force=False, verbose=1):  # pylint: disable=unused-argument
+            force=False, match_check='size_mtime', workers=None,
+            verbose=1):  # pylint: disable=unused-argument
         """Copy this file sequence to another location.
 
+        Frames are copied in parallel. If the target exists, frames which
+        already match are skipped.
+
         Args:
             target (Seq): target location
             frames (int list): override frames to copy
             check_match (bool): check existing frame match before replacing
             progress (bool): show progress
             force (bool): replace existing without confirmation
+            match_check (str): check used to test whether existing frames
+                match (see files_match)
+            workers (int): override number of copy threads
             verbose (int): show process data
         """
         from pini import qt
@@ -210,29 +221,30 @@ class Seq(uc_clip.Clip):  # pylint: disable=too-many-public-methods
             # Check for target matches
             if check_match:
                 _LOGGER.info(' - CHECK WHETHER EXISTING FRAMES MATCH')
-                for _frame in qt.progress_bar(
-                        _frames, 'Checking {:d} frame{}', show=progress,
-                        stack_key='CheckFrames'):
-                    if (
-                            _frame not in target.frames or
-                            not File(self[_frame]).matches(target[_frame])):
-                        break
-                else:
+                _unmatched = find_unmatched_files(
+                    [(self[_frame], target[_frame]) for _frame in _frames],
+                    check=match_check, workers=workers)
+                if not _unmatched:
                     _LOGGER.info(' - ALL FRAMES MATCH')
                     return
+                _unmatched = {_src for _src, _ in _unmatched}
+                _frames = [
+                    _frame for _frame in _frames
+                    if self[_frame] in _unmatched]
+                _LOGGER.info(' - FOUND %d UNMATCHED FRAMES', len(_frames))
 
-            # Replace existing
+            # Confirm replace existing
             if not force:
                 qt.ok_cancel(
                     f'Replace existing frames {min(_frames):d}'
                     f'-{max(_frames):d}?\n\n{target.path}')
-            target.delete(frames=_frames, force=True)
 
         # Apply copy
-        for _frame in qt.progress_bar(
-                _frames, 'Copying {:d} frame{}', stack_key='CopyFrames',
-                show=progress):
-            File(self[_frame]).copy_to(target[_frame])
+        copy_files(
+            [(self[_frame], target[_frame]) for _frame in _frames],
+            check=None, workers=workers, progress=progress,
+            title='Copying {:d} frame{}')
+        for _frame in _frames:
             target.add_frame(_frame)
 
     def delete(
@@ -340,12 +352,15 @@ class Seq(uc_clip.Clip):  # pylint: disable=too-many-public-methods
                 return True
         return False
 
-    def move_to(self, target, progress=False):
+    def move_to(self, target, progress=False, workers=None):
         """Move this sequence.
 
+        Frames are moved in parallel.
+
         Args:
             target (Seq): target sequence
             progress (bool): show progress bar
+            workers (int): override number of move threads
         """
         _LOGGER.debug('MOVE TO')
         _LOGGER.debug(' - SRC %s', self)
@@ -356,15 +371,9 @@ class Seq(uc_clip.Clip):  # pylint: disable=too-many-public-methods
         assert isinstance(target, Seq)
 
         # Apply move
-        if progress:
-            from pini import qt
-            _frames = qt.progress_bar(
-                _frames, 'Moving {:d} frame{}')
-        for _frame in _frames:
-            _src_file = File(self[_frame])
-            _trg_file = target[_frame]
-            _LOGGER.debug(' - FRAMES %s', _frames)
-            _src_file.move_to(_trg_file)
+        move_files(
+            [(self[_frame], target[_frame]) for _frame in _frames],
+            workers=workers, progress=progress, title='Moving {:d} frame{}')
 
         # Update cache
         self.to_frames(frames=[])
@@ -484,19 +493,14 @@ class Seq(uc_clip.Clip):  # pylint: disable=too-many-public-methods
         """Obtain the file for the given frame.
 
         Args:
-            frame (int): frame number to request - by default the central
-                frame is used
+            frame (int|str): frame number to request, or first/middle/last
+                (see pick_thumb_frame) - by default the middle frame is used
 
         Returns:
             (File): frame file
         """
-        _frame = frame
-        if not _frame:
-            _frames = self.to_frames()
-            if not _frames:
-                raise RuntimeError('No frames found')
-            _frame = _frames[int(len(_frames) / 2)]
-        return File(self[_frame])
+        from .uc_thumb import pick_thumb_frame
+        return pick_thumb_frame(self, frame=frame)
 
     def to_frame_files(self):
         """Build list of all files in this sequence.
@@ -504,7 +508,7 @@ class Seq(uc_clip.Clip):  # pylint: disable=too-many-public-methods
         Returns:
             (File list): frame files
         """
-        return [self.to_frame_file(_frame) for _frame in self.frames]
+        return [File(self[_frame]) for _frame in self.frames]
 
     def to_frames(self, frames=None, force=False):
         """Find frames of this sequence.
@@ -0,0 +1,217 @@
+"""Tools for building thumbnails for many clips/images in batch.
+
+Each thumbnail is built by a single ffmpeg process, and the processes are
+run concurrently in a bounded worker pool - qt can't be used for this as
+pixmaps aren't thread safe, and building thumbnails one at a time is slow
+when many outputs are being published/registered.
+
+Thumbnails which are newer than their source are skipped, so this can
+also be used to maintain a cache of thumbnails:
+
+    >>> _thumbs = build_thumbnails(
+    ...     _seqs, files=[_thumb_dir.to_file(_seq.base + '.jpg')
+    ...                   for _seq in _seqs])
+    >>> build_contact_sheet(_thumbs, '/tmp/sheet.jpg', cols=4)
+"""
+
+import logging
+import math
+
+from ..path import File, TMP
+from ..u_exe import find_exe
+from ..u_system import system, system_many
+from . import uc_ffmpeg, uc_seq, uc_video
+
+_LOGGER = logging.getLogger(__name__)
+
+THUMB_FRAMES = ('first', 'middle', 'last')
+
+
+def pick_thumb_frame(clip, frame=None):
+    """Pick which frame of a clip to use for its thumbnail.
+
+    Args:
+        clip (Seq|Video|File): clip or image
+        frame (int|str): frame number, or one of first/middle/last
+            (default is middle)
+
+    Returns:
+        (File|float|None): frame file (for sequences), frame time in
+            secs (for videos) or None (for images)
+    """
+    if frame is None:
+        frame = 'middle'
+    elif isinstance(frame, str) and frame not in THUMB_FRAMES:
+        raise ValueError(frame)
+
+    if isinstance(clip, uc_seq.Seq):
+        if isinstance(frame, int):
+            return File(clip[frame])
+        _frames = clip.to_frames()
+        if not _frames:
+            raise RuntimeError('No frames found ' + clip.path)
+        _idx = {
+            'first': 0,
+            'middle': int(len(_frames) / 2),
+            'last': -1}[frame]
+        return File(clip[_frames[_idx]])
+
+    if isinstance(clip, uc_video.Video):
+        if isinstance(frame, int):
+            return frame / clip.to_fps()
+        _dur = clip.to_dur()
+        return {
+            'first': 0.0,
+            'middle': _dur / 2,
+            'last': max(_dur - 1 / clip.to_fps(), 0.0)}[frame]
+
+    return None
+
+
+def build_thumbnails(
+        clips, files, width=100, frame='middle', force=False,
+        contact_sheet=None, cols=8, max_workers=None, catch=False):
+    """Build thumbnails for a list of sequences, videos and/or images.
+
+    Args:
+        clips (list): sequences, videos or images to build thumbnails for
+        files (File list): thumbnail path for each clip
+        width (int): thumbnail width in pixels (None to use source width)
+        frame (int|str): frame to use (see pick_thumb_frame)
+        force (bool): rebuild thumbnails which are newer than their source
+        contact_sheet (File): also build a contact sheet of the
+            thumbnails to this path
+        cols (int): number of columns in contact sheet
+        max_workers (int): maximum number of concurrent processes
+        catch (bool): no error if a thumbnail fails to build - its entry
+            in the list of results is None
+
+    Returns:
+        (File list): thumbnails
+    """
+    _clips = [
+        _clip if isinstance(_clip, (uc_seq.Seq, uc_video.Video))
+        else File(_clip) for _clip in clips]
+    _thumbs = [File(_file) for _file in files]
+    if len(_clips) != len(_thumbs):
+        raise ValueError(
+            f'Mismatched clips/files {len(_clips):d}/{len(_thumbs):d}')
+    _LOGGER.info('BUILD %d THUMBS', len(_clips))
+
+    # Find thumbs which need building
+    _videos = [_clip for _clip in _clips
+               if isinstance(_clip, uc_video.Video)]
+    if _videos:
+        uc_ffmpeg.prime_ffprobes(_videos, max_workers=max_workers)
+    _todo = []
+    for _idx, (_clip, _thumb) in enumerate(zip(_clips, _thumbs)):
+        _src = pick_thumb_frame(_clip, frame=frame)
+        _src_file = _src if isinstance(_src, File) else File(_clip.path)
+        if (
+                not force and _thumb.exists() and
+                _thumb.mtime() >= _src_file.mtime()):
+            _LOGGER.debug(' - THUMB IS UP TO DATE %s', _thumb.path)
+            continue
+        _thumb.delete(force=True)
+        _thumb.test_dir()
+        _cmds = _build_thumb_cmds(_clip, src=_src, thumb=_thumb, width=width)
+        _todo.append((_idx, _cmds))
+    _LOGGER.info(' - %d THUMBS NEED BUILDING', len(_todo))
+
+    # Build thumbs
+    _results = system_many(
+        [_cmds for _, _cmds in _todo], max_workers=max_workers,
+        result='out/err', catch=catch)
+    for (_idx, _), _result in zip(_todo, _results):
+        _thumb = _thumbs[_idx]
+        if _thumb.exists():
+            continue
+        if not catch:
+            _LOGGER.info('ERR %s', _result[1])
+            raise RuntimeError('Failed to build thumbnail ' + _thumb.path)
+        _LOGGER.warning(' - FAILED TO BUILD THUMB %s', _clips[_idx].path)
+        _thumbs[_idx] = None
+
+    if contact_sheet:
+        build_contact_sheet(
+            [_thumb for _thumb in _thumbs if _thumb], contact_sheet,
+            cols=cols, width=width or 100)
+
+    return _thumbs
+
+
+def _build_thumb_cmds(clip, src, thumb, width):
+    """Build ffmpeg commands to build a thumbnail.
+
+    Args:
+        clip (Seq|Video|File): source clip or image
+        src (File|float|None): frame to use (see pick_thumb_frame)
+        thumb (File): thumbnail path
+        width (int): thumbnail width
+
+    Returns:
+        (list): ffmpeg commands
+    """
+    _cmds = [find_exe('ffmpeg')]
+    if isinstance(src, float):
+        _cmds += ['-ss', src]
+    _img = src if isinstance(src, File) else File(clip.path)
+    if _img.extn.lower() == 'exr' and thumb.extn.lower() != 'exr':
+        _cmds += ['-apply_trc', 'iec61966_2_1']
+    _cmds += ['-i', _img, '-frames:v', 1]
+    if width:
+        _cmds += ['-vf', f'scale={width:d}:-1']
+    _cmds += [thumb]
+    return _cmds
+
+
+def build_contact_sheet(imgs, file_, cols=8, width=100, height=None):
+    """Build a contact sheet from a list of images (eg. thumbnails).
+
+    Each image is fitted into a cell of the sheet, maintaining its
+    aspect ratio.
+
+    Args:
+        imgs (File list): images to include
+        file_ (File): contact sheet path
+        cols (int): number of columns
+        width (int): cell width in pixels
+        height (int): cell height in pixels (default is 16:9)
+
+    Returns:
+        (File): contact sheet
+    """
+    _imgs = [File(_img) for _img in imgs]
+    if not _imgs:
+        raise ValueError('No images for contact sheet')
+    _sheet = File(file_)
+    _width = width
+    _height = height or int(width * 9 / 16)
+    _cols = min(cols, len(_imgs))
+    _rows = int(math.ceil(len(_imgs) / _cols))
+    _LOGGER.info(
+        'BUILD CONTACT SHEET %s %dx%d', _sheet.path, _cols, _rows)
+
+    # Write images list for ffmpeg concat demuxer
+    _list = TMP.to_file(f'.pini/contact_sheet/{_sheet.base}.txt')
+    _lines = []
+    for _img in _imgs:
+        _path = _img.path.replace("'", r"'\''")
+        _lines.append(f"file '{_path}'")
+    _list.write('\n'.join(_lines), force=True)
+
+    _filter = ','.join([
+        f'scale={_width:d}:{_height:d}:force_original_aspect_ratio=decrease',
+        f'pad={_width:d}:{_height:d}:(ow-iw)/2:(oh-ih)/2',
+        f'tile={_cols:d}x{_rows:d}'])
+    _sheet.delete(force=True)
+    _sheet.test_dir()
+    _cmds = [
+        find_exe('ffmpeg'), '-f', 'concat', '-safe', 0, '-i', _list,
+        '-vf', _filter, '-frames:v', 1, _sheet]
+    _out, _err = system(_cmds, result='out/err')
+    if not _sheet.exists():
+        _LOGGER.info('ERR %s', _err)
+        raise RuntimeError('Failed to build contact sheet ' + _sheet.path)
+
+    return _sheet
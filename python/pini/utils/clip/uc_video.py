@@ -75,15 +75,19 @@ class Video(path.MetadataFile, uc_clip.Clip):
         return _dur
 
     @cache.get_method_to_file_cacher(mtime_outdates=True)
-    def _read_ffprobe(self, force=False):
+    def _read_ffprobe(self, force=False, value=None):
         """Obtain ffprobe reading for this video.
 
         Args:
             force (bool): force regenerate any cached result
+            value (str list): apply ffprobe reading (eg. if it has been
+                read as part of a batch) rather than reading from disk
 
         Returns:
             (str): ffprobe reading
         """
+        if value is not None:
+            return value
         assert self.exists()
         return uc_ffmpeg.read_ffprobe(self)
 
@@ -124,11 +128,15 @@ class Video(path.MetadataFile, uc_clip.Clip):
         Args:
             file_ (str): thumbnail path
             width (int): thumbnail width in pixels
-            frame (int): select frame to export (default is middle frame)
+            frame (int|str): select frame to export (see pick_thumb_frame -
+                default is middle frame)
             force (bool): overwrite existing without confirmation
         """
+        from .uc_thumb import pick_thumb_frame
         _res = self._to_thumb_res(width)
-        self.to_frame(file_, frame=frame, force=force, res=_res)
+        _secs = pick_thumb_frame(self, frame=frame)
+        uc_ffmpeg.video_to_frame(
+            video=self, file_=file_, force=force, res=_res, secs=_secs)
 
     def to_fps(self):
         """Obtain fps of this video.
@@ -152,7 +160,8 @@ class Video(path.MetadataFile, uc_clip.Clip):
         Args:
             file_ (File): path to write to
             res (tuple): covert resolution
-            frame (int): select frame to export (default is middle frame)
+            frame (int|str): select frame to export (see pick_thumb_frame -
+                default is middle frame)
             force (bool): overwrite existing without confirmation
 
         Returns:
@@ -200,3 +209,31 @@ class Video(path.MetadataFile, uc_clip.Clip):
             _token.replace('x', '').isdigit()], catch=True)
         _LOGGER.debug(' - RES TOKEN %s', _res_token)
         return tuple(int(_val) for _val in _res_token.split('x'))
+
+
+def build_video_thumbnails(
+        videos, files, width=100, frame=None, force=False, max_workers=None):
+    """Build thumbnails for a list of videos.
+
+    The ffprobe/ffmpeg processes are run concurrently, which is much faster
+    than building each thumbnail in turn.
+
+    Args:
+        videos (Video list): videos to build thumbnails for
+        files (File list): thumbnail path for each video
+        width (int): thumbnail width in pixels
+        frame (int): select frame to export (default is middle frame)
+        force (bool): overwrite existing without confirmation
+        max_workers (int): maximum number of concurrent processes
+
+    Returns:
+        (File list): thumbnails
+    """
+    _videos = list(videos)
+    uc_ffmpeg.prime_ffprobes(_videos, max_workers=max_workers)
+    _ress = [
+        _video._to_thumb_res(width)  # pylint: disable=protected-access
+        for _video in _videos]
+    return uc_ffmpeg.videos_to_frames(
+        _videos, files=files, res=_ress, frame=frame, force=force,
+        max_workers=max_workers)
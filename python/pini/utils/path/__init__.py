@@ -7,7 +7,11 @@ from .up_utils import (
 
 from .up_norm import abs_path, is_abs, norm_path
 from .up_find import find
+from .up_copy import (
+    copy_file, copy_files, move_files, files_match, find_unmatched_files)
 from .up_file import File, ReadDataError
 from .up_metadata_file import MetadataFile
 from .up_dir import Dir, TMP, HOME, DESKTOP, PINI_TMP, PROPERTIES
 from .up_path import Path, DATA_PATH
+from .up_blob_store import BlobStore
+from .up_sync import sync_dirs
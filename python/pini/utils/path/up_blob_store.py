@@ -0,0 +1,214 @@
+"""Tools for managing a content-addressed store of compressed blobs.
+
+Files are split into chunks, and each chunk is compressed and stored
+once, named by its hash. A file can then be stored as a list of chunk
+hashes, so successive versions of a file which share most of their
+content (eg. backups of a scene file) only cost the chunks which have
+changed.
+
+Chunk boundaries are content-defined rather than at fixed offsets, so
+that an insertion near the start of a file doesn't shift the chunks
+which follow it. Boundaries are placed at line ends, where the hash of
+the line selects it as a boundary - the probability of this is
+proportional to the line length, giving an average chunk size of
+_AVG_CHUNK bytes.
+
+    >>> _store = BlobStore('/tmp/blobs')
+    >>> _entry = _store.write_file('/tmp/test.ma')
+    >>> _store.restore(_entry, '/tmp/restored.ma')
+"""
+
+import hashlib
+import logging
+import os
+import uuid
+import zlib
+
+from . import up_utils
+from .up_dir import Dir
+from .up_file import File
+
+_LOGGER = logging.getLogger(__name__)
+
+_AVG_CHUNK = 64 * 1024
+_MIN_CHUNK = 16 * 1024
+_MAX_CHUNK = 4 * 1024 * 1024
+_ZLIB_LEVEL = 1
+
+
+class BlobStore(Dir):
+    """Represents a dir containing content-addressed compressed blobs."""
+
+    def to_blob(self, hash_):
+        """Obtain blob file for the given chunk hash.
+
+        Args:
+            hash_ (str): chunk hash
+
+        Returns:
+            (File): blob file
+        """
+        return self.to_file(f'{hash_[:2]}/{hash_}.zlib')
+
+    def find_blobs(self):
+        """Find blobs in this store.
+
+        Returns:
+            (File list): blob files
+        """
+        return self.find(
+            depth=2, type_='f', extn='zlib', class_=File, catch_missing=True)
+
+    def write_file(self, file_):
+        """Write the given file to this store.
+
+        The file is streamed, and only chunks which aren't already in
+        the store are written.
+
+        Args:
+            file_ (str): path to file to store
+
+        Returns:
+            (dict): store entry (chunk hashes, size, hash and number of
+                compressed bytes written)
+        """
+        up_utils.error_on_file_system_disabled()
+        _file = File(file_)
+        _hashes = []
+        _written = 0
+        _hash = hashlib.sha1()
+        with open(_file.path, 'rb') as _hook:
+            for _chunk in iter_chunks(_hook):
+                _hash.update(_chunk)
+                _chunk_hash = hashlib.sha1(_chunk).hexdigest()
+                _hashes.append(_chunk_hash)
+                _written += self._write_blob(_chunk_hash, _chunk)
+        _entry = {
+            'chunks': _hashes,
+            'size': os.path.getsize(_file.path),
+            'hash': _hash.hexdigest(),
+            'written': _written}
+        _LOGGER.debug(
+            ' - STORED %s chunks=%d size=%d written=%d', _file.path,
+            len(_hashes), _entry['size'], _written)
+        return _entry
+
+    def _write_blob(self, hash_, chunk):
+        """Write a chunk to this store (if it isn't already stored).
+
+        The blob is written to a temporary file which is then renamed
+        into place, so that a partially written blob is never used.
+
+        Args:
+            hash_ (str): chunk hash
+            chunk (bytes): chunk data
+
+        Returns:
+            (int): number of bytes written
+        """
+        _blob = self.to_blob(hash_)
+        if _blob.exists():
+            return 0
+        _blob.test_dir()
+        _data = zlib.compress(chunk, _ZLIB_LEVEL)
+        _tmp = f'{_blob.path}.{uuid.uuid4().hex}.tmp'
+        with open(_tmp, 'wb') as _hook:
+            _hook.write(_data)
+        os.replace(_tmp, _blob.path)
+        return len(_data)
+
+    def restore(self, entry, file_, force=False):
+        """Restore a stored file.
+
+        Chunks are decompressed and streamed to a temporary file, which
+        is checked against the stored hash and then moved into place.
+
+        Args:
+            entry (dict): store entry
+            file_ (str): path to restore to
+            force (bool): replace existing file without confirmation
+
+        Returns:
+            (File): restored file
+        """
+        up_utils.error_on_file_system_disabled()
+        _file = File(file_)
+        _file.delete(force=force, wording='replace')
+        _file.test_dir()
+        _tmp = f'{_file.to_dir().path}/.{_file.filename}.tmp'
+        _hash = hashlib.sha1()
+        with open(_tmp, 'wb') as _hook:
+            for _chunk_hash in entry['chunks']:
+                _chunk = self.read_chunk(_chunk_hash)
+                _hash.update(_chunk)
+                _hook.write(_chunk)
+        if _hash.hexdigest() != entry['hash']:
+            os.remove(_tmp)
+            raise RuntimeError(f'Restored file hash mismatch {_file.path}')
+        os.replace(_tmp, _file.path)
+        return _file
+
+    def read_chunk(self, hash_):
+        """Read a chunk from this store.
+
+        Args:
+            hash_ (str): chunk hash
+
+        Returns:
+            (bytes): chunk data
+        """
+        _blob = self.to_blob(hash_)
+        if not _blob.exists():
+            raise OSError(f'Missing blob {_blob.path}')
+        with open(_blob.path, 'rb') as _hook:
+            return zlib.decompress(_hook.read())
+
+    def flush(self, keep):
+        """Remove blobs which aren't used by any of the given entries.
+
+        Args:
+            keep (dict list): entries to keep
+
+        Returns:
+            (int): number of bytes freed
+        """
+        _keep = set()
+        for _entry in keep:
+            _keep.update(_entry['chunks'])
+        _freed = 0
+        for _blob in self.find_blobs():
+            if _blob.base in _keep:
+                continue
+            _freed += _blob.size()
+            _blob.delete(force=True)
+        _LOGGER.debug(' - FLUSHED %d BYTES FROM %s', _freed, self.path)
+        return _freed
+
+
+def iter_chunks(hook):
+    """Split a file into content-defined chunks.
+
+    Args:
+        hook (file): file handle (opened in binary mode)
+
+    Returns:
+        (bytes iterator): chunks
+    """
+    _chunk = []
+    _size = 0
+    for _line in hook:
+        while len(_line) > _MAX_CHUNK:  # Split very long lines
+            if _chunk:
+                yield b''.join(_chunk)
+                _chunk, _size = [], 0
+            yield _line[:_MAX_CHUNK]
+            _line = _line[_MAX_CHUNK:]
+        _chunk.append(_line)
+        _size += len(_line)
+        if _size >= _MAX_CHUNK or (
+                _size >= _MIN_CHUNK and
+                zlib.crc32(_line) % _AVG_CHUNK < len(_line)):
+            yield b''.join(_chunk)
+            _chunk, _size = [], 0
+    if _chunk:
+        yield b''.join(_chunk)
@@ -0,0 +1,330 @@
+"""Tools for copying/moving large numbers of files in parallel.
+
+Copying sequences across a network is latency bound, so files are
+copied using a pool of worker threads. Each copy is written to a
+partial file which is renamed into place on completion, which means
+an interrupted copy can be resumed. The source mtime is applied to each
+copied file so that later copies can skip identical files using a quick
+size+mtime check.
+
+The number of workers can be set using $PINI_COPY_WORKERS.
+"""
+
+import concurrent.futures
+import errno
+import filecmp
+import hashlib
+import logging
+import os
+import shutil
+import time
+
+from ..u_trace import trace_span
+from . import up_utils
+
+_LOGGER = logging.getLogger(__name__)
+
+COPY_WORKERS = int(os.environ.get('PINI_COPY_WORKERS', 8))
+
+_BUF_SIZE = 8 * 1024 * 1024
+_PART_EXTN = 'pinipart'
+
+
+def files_match(src, trg, check='size_mtime'):
+    """Test whether the given files match.
+
+    Checks:
+        size - file sizes match
+        size_mtime - file sizes and mtimes match (quick check)
+        hash - file sizes and hashes match
+        cmp - sizes and mtimes match, otherwise contents match (this
+            is the check applied by File.matches)
+        content - file contents match
+
+    Args:
+        src (str): path to source file
+        trg (str): path to target file
+        check (str): type of check to apply
+
+    Returns:
+        (bool): whether files match
+    """
+    from pini.utils import File
+    _src = File(src)
+    _trg = File(trg)
+    try:
+        _src_stat = os.stat(_src.path)
+        _trg_stat = os.stat(_trg.path)
+    except FileNotFoundError:
+        return False
+    if _src_stat.st_size != _trg_stat.st_size:
+        return False
+
+    if check == 'size':
+        return True
+    if check == 'size_mtime':
+        return abs(_src_stat.st_mtime - _trg_stat.st_mtime) < 1
+    if check == 'hash':
+        return _to_hash(_src.path) == _to_hash(_trg.path)
+    if check == 'cmp':
+        return filecmp.cmp(_src.path, _trg.path)
+    if check == 'content':
+        return filecmp.cmp(_src.path, _trg.path, shallow=False)
+    raise ValueError(check)
+
+
+def _to_hash(path):
+    """Obtain hash of the given file's contents.
+
+    Args:
+        path (str): path to file
+
+    Returns:
+        (str): file hash
+    """
+    _hash = hashlib.blake2b()
+    with open(path, 'rb') as _hook:
+        for _chunk in iter(lambda: _hook.read(_BUF_SIZE), b''):
+            _hash.update(_chunk)
+    return _hash.hexdigest()
+
+
+def copy_file(src, trg, resume=True, preserve_mtime=True):
+    """Copy a single file.
+
+    The data is written to a partial file alongside the target and then
+    renamed into place once the copy is complete. If resume is enabled
+    and a partial file from a previous interrupted copy exists, the copy
+    continues from the end of that partial file.
+
+    Args:
+        src (str): path to source file
+        trg (str): path to target file
+        resume (bool): resume partial copy if possible
+        preserve_mtime (bool): apply source mtime to target
+
+    Returns:
+        (int): number of bytes written
+    """
+    from pini.utils import File
+    up_utils.error_on_file_system_disabled()
+
+    _src = File(src)
+    _trg = File(trg)
+    _trg.test_dir()
+    _part = f'{_trg.path}.{_PART_EXTN}'
+    _size = os.path.getsize(_src.path)
+
+    # Check for partial copy to resume (ignored if source is newer)
+    _offset = 0
+    if (
+            resume and
+            os.path.exists(_part) and
+            os.path.getmtime(_part) >= os.path.getmtime(_src.path)):
+        _offset = os.path.getsize(_part)
+        if _offset > _size:
+            _offset = 0
+        _LOGGER.debug(' - RESUME %s FROM %d', _trg.path, _offset)
+
+    # Apply copy
+    with open(_src.path, 'rb') as _src_hook, \
+            open(_part, 'r+b' if _offset else 'wb') as _trg_hook:
+        _copied = _copy_data(
+            _src_hook, _trg_hook, offset=_offset, size=_size - _offset)
+        _trg_hook.truncate()
+
+    os.replace(_part, _trg.path)
+    if preserve_mtime:
+        shutil.copystat(_src.path, _trg.path)
+
+    return _copied
+
+
+def _copy_data(src_hook, trg_hook, offset, size):
+    """Copy data between open files.
+
+    This uses os.copy_file_range where available (linux), which avoids
+    copying the data via userspace and allows the file system to apply
+    server-side copies. Otherwise the data is copied in large chunks.
+
+    Args:
+        src_hook (file): source file handle
+        trg_hook (file): target file handle
+        offset (int): offset to copy from (in both files)
+        size (int): number of bytes to copy
+
+    Returns:
+        (int): number of bytes copied
+    """
+    _copied = 0
+
+    if hasattr(os, 'copy_file_range'):
+        _src_fd = src_hook.fileno()
+        _trg_fd = trg_hook.fileno()
+        try:
+            while _copied < size:
+                _n_bytes = os.copy_file_range(
+                    _src_fd, _trg_fd, min(size - _copied, 128 * _BUF_SIZE),
+                    offset + _copied, offset + _copied)
+                if not _n_bytes:
+                    break
+                _copied += _n_bytes
+        except OSError as _exc:
+            if _exc.errno not in (
+                    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                    errno.EBADF):
+                raise _exc
+            _LOGGER.debug(' - COPY FILE RANGE FAILED %s', _exc)
+        if _copied == size:
+            trg_hook.seek(offset + _copied)
+            return _copied
+
+    # Copy remaining data in chunks
+    src_hook.seek(offset + _copied)
+    trg_hook.seek(offset + _copied)
+    while True:
+        _chunk = src_hook.read(_BUF_SIZE)
+        if not _chunk:
+            break
+        trg_hook.write(_chunk)
+        _copied += len(_chunk)
+
+    return _copied
+
+
+def find_unmatched_files(files, check='size_mtime', workers=None):
+    """Find files which don't match their targets.
+
+    The checks are run in parallel.
+
+    Args:
+        files (tuple list): list of source/target path pairs
+        check (str): type of check to apply (see files_match)
+        workers (int): override number of worker threads
+
+    Returns:
+        (tuple list): source/target pairs which do not match
+    """
+    _files = list(files)
+    with trace_span('fs.match_files', count=len(_files)), \
+            concurrent.futures.ThreadPoolExecutor(
+                workers or COPY_WORKERS) as _pool:
+        _matches = list(_pool.map(
+            lambda _item: files_match(*_item, check=check), _files))
+    return [
+        _item for _item, _match in zip(_files, _matches) if not _match]
+
+
+def _copy_task(src, trg, check, resume):
+    """Copy a file unless it matches the target.
+
+    Args:
+        src (str): path to source file
+        trg (str): path to target file
+        check (str|None): match check to apply to skip identical files
+        resume (bool): resume partial copies
+
+    Returns:
+        (int|None): bytes copied (None if file was skipped)
+    """
+    if check and files_match(src, trg, check=check):
+        return None
+    return copy_file(src, trg, resume=resume)
+
+
+def copy_files(
+        files, check='size_mtime', resume=True, workers=None,
+        callback=None, progress=False, title='Copying {:d} file{}'):
+    """Copy a list of files in parallel.
+
+    Args:
+        files (tuple list): list of source/target path pairs
+        check (str|None): match check used to skip identical files
+            (see files_match) - if None all files are copied
+        resume (bool): resume partial copies
+        workers (int): override number of worker threads
+        callback (fn): function to call on completion of each file - this
+            is passed the source, target and bytes copied (None if the
+            file was skipped)
+        progress (bool): show progress bar
+        title (str): progress bar title
+
+    Returns:
+        (dict): copy stats (copied, skipped, bytes, dur)
+    """
+    _start = time.time()
+    _files = list(files)
+    _stats = {'copied': 0, 'skipped': 0, 'bytes': 0}
+    _workers = workers or COPY_WORKERS
+    _LOGGER.debug('COPY %d FILES workers=%d', len(_files), _workers)
+
+    with trace_span('fs.copy_files', count=len(_files)), \
+            concurrent.futures.ThreadPoolExecutor(_workers) as _pool:
+        _futures = [
+            (_src, _trg, _pool.submit(
+                _copy_task, _src, _trg, check=check, resume=resume))
+            for _src, _trg in _files]
+        _items = _futures
+        if progress:
+            from pini import qt
+            _items = qt.progress_bar(
+                _futures, title, stack_key='CopyFiles')
+        for _src, _trg, _future in _items:
+            _bytes = _future.result()
+            if _bytes is None:
+                _stats['skipped'] += 1
+            else:
+                _stats['copied'] += 1
+                _stats['bytes'] += _bytes
+            if callback:
+                callback(_src, _trg, _bytes)
+
+    _stats['dur'] = time.time() - _start
+    _LOGGER.debug(' - COPIED %s', _stats)
+    return _stats
+
+
+def _move_task(src, trg):
+    """Move a file, falling back on copy/delete across file systems.
+
+    Args:
+        src (str): path to source file
+        trg (str): path to target file
+    """
+    from pini.utils import File
+    _trg = File(trg)
+    _trg.test_dir()
+    try:
+        os.replace(src, _trg.path)
+    except OSError as _exc:
+        if _exc.errno != errno.EXDEV:
+            raise _exc
+        copy_file(src, _trg.path)
+        os.remove(src)
+
+
+def move_files(
+        files, workers=None, progress=False, title='Moving {:d} file{}'):
+    """Move a list of files in parallel.
+
+    Existing targets are replaced.
+
+    Args:
+        files (tuple list): list of source/target path pairs
+        workers (int): override number of worker threads
+        progress (bool): show progress bar
+        title (str): progress bar title
+    """
+    up_utils.error_on_file_system_disabled()
+    _files = list(files)
+    with trace_span('fs.move_files', count=len(_files)), \
+            concurrent.futures.ThreadPoolExecutor(
+                workers or COPY_WORKERS) as _pool:
+        _futures = [
+            _pool.submit(_move_task, _src, _trg) for _src, _trg in _files]
+        if progress:
+            from pini import qt
+            _futures = qt.progress_bar(
+                _futures, title, stack_key='MoveFiles')
+        for _future in _futures:
+            _future.result()
@@ -266,79 +266,39 @@ class Dir(up_path.Path):
         _new_path = self.to_dir().to_subdir(name)
         shutil.move(self.path, _new_path.path)
 
-    def sync_to(self, target, filter_=None, force=False):
+    def sync_to(self, target, filter_=None, force=False, dry_run=False):
         """Sync this directory to a different location.
 
         This will check for files which need to be added, removed or
         overwritten, and then show a summary in a confirmation dialog.
+        File size/mtime/hash data is cached in a manifest for each side,
+        so re-syncing a large tree only checks files which have changed.
 
         Args:
             target (Dir): where to sync to
             filter_ (str): apply path filter
             force (bool): force sync without confirmation
+            dry_run (bool): only report what would be synced
+
+        Returns:
+            (dict): sync report (see sync_dirs)
         """
         from pini import qt
+        from . import up_sync
 
-        _trg_dir = Dir(target)
-        if not _trg_dir.exists():
-            self.copy_to(_trg_dir)
-            return
-
-        _src_paths = self.find(
-            full_path=False, type_='f', class_=True, filter_=filter_)
-        _trg_paths = _trg_dir.find(
-            full_path=False, type_='f', class_=True, filter_=filter_)
-        _rel_paths = sorted(set(_src_paths + _trg_paths))
-
-        _to_delete = []
-        _to_sync = []
-
-        for _file in _rel_paths:
-            _LOGGER.debug('FILE %s', _file)
-            _src = self.to_file(_file.path)
-            _trg = _trg_dir.to_file(_file.path)
-            _LOGGER.debug(' - SRC %s', _src)
-            _LOGGER.debug(' - TRG %s', _trg)
-
-            if _file not in _src_paths:
-                _LOGGER.info(' - TO REMOVE %s', _trg.path)
-                _to_delete.append(_trg)
-                continue
-            if _file not in _trg_paths:
-                _LOGGER.debug(' - TO ADD')
-                _to_sync.append((_src, _trg))
-                continue
-
-            assert _file in _src_paths and _file in _trg_paths
-
-            if _src.matches(_trg):
-                _LOGGER.debug(' - IGNORE MATCHING FILE')
-                continue
-
-            _LOGGER.info(' - TO SYNC %s', _trg.path)
-            _to_sync.append((_src, _trg))
-
-        if not (_to_delete or _to_sync):
-            _LOGGER.debug('NOTHING TO SYNC')
-            return
-
-        # Confirm
-        if not force:
+        def _confirm(report):
             _msg = 'Confirm execute sync?\n'
-            if _to_sync:
-                _msg += f'\n - {len(_to_sync):d} files to sync'
-            if _to_delete:
-                _msg += f'\n - {len(_to_delete):d} files to remove'
+            _n_sync = len(report['copy']) + len(report['update'])
+            if _n_sync:
+                _msg += f'\n - {_n_sync:d} files to sync'
+            if report['delete']:
+                _msg += f'\n - {len(report["delete"]):d} files to remove'
             qt.ok_cancel(_msg, title='Execute sync')
 
-        # Execute sync
-        for _src, _trg in qt.progress_bar(_to_sync, 'Syncing {:d} file{}'):
-            _src.copy_to(_trg, force=True)
-        for _trg in qt.progress_bar(_to_delete, 'Removing {:d} file'):
-            _LOGGER.debug('REMOVE %s', _trg)
-            assert _trg_dir.contains(_trg)
-            assert not self.contains(_trg)
-            _trg.delete(force=True)
+        return up_sync.sync_dirs(
+            self.path, Dir(target).path, filter_=filter_, delete=True,
+            dry_run=dry_run, progress=True,
+            confirm=None if force else _confirm)
 
     def to_file(
             self, rel_path=None, base=None, extn=None, filename=None,
@@ -13,6 +13,7 @@ import yaml
 
 from . import up_path, up_utils
 from ..u_system import system
+from ..u_trace import trace_span
 
 _LOGGER = logging.getLogger(__name__)
 _DIFF_TOOL = None
@@ -371,7 +372,7 @@ class File(up_path.Path):  # pylint: disable=too-many-public-methods
             raise OSError('Missing file ' + self.path)
 
         try:
-            with open(self.path, "rb") as _handle:
+            with trace_span('pkl.read'), open(self.path, "rb") as _handle:
                 _obj = pickle.load(_handle)
         except Exception as _exc:
             if catch:
@@ -424,7 +425,8 @@ class File(up_path.Path):  # pylint: disable=too-many-public-methods
 
         # Parse contents
         try:
-            return yaml.unsafe_load(_body)
+            with trace_span('yaml.read'):
+                return yaml.unsafe_load(_body)
         except Exception as _exc:
             _LOGGER.info('SCANNER ERROR: %s', _exc)
             _LOGGER.info(' - FILE: %s', self.path)
@@ -585,7 +587,7 @@ class File(up_path.Path):  # pylint: disable=too-many-public-methods
 
         try:
             self.delete(force=force, wording='replace')
-            with open(self.path, "wb") as _handle:
+            with trace_span('pkl.write'), open(self.path, "wb") as _handle:
                 pickle.dump(data, _handle, protocol=0)
         except OSError as _exc:
             if catch:
@@ -610,7 +612,8 @@ class File(up_path.Path):  # pylint: disable=too-many-public-methods
         if mode != 'a':
             self.delete(force=force, wording=wording)
         self.to_dir().mkdir()
-        with open(self.path, mode=mode, encoding='utf-8') as _hook:
+        with trace_span('yaml.write'), open(
+                self.path, mode=mode, encoding='utf-8') as _hook:
             if not fix_unicode:
                 yaml.dump(data, _hook, default_flow_style=False)
             else:
@@ -7,11 +7,11 @@ import os
 
 from ..u_error import DebuggingError
 from ..u_misc import EMPTY
+from ..u_trace import trace_span
 
 from . import up_norm
 
 _LOGGER = logging.getLogger(__name__)
-_N_FINDS = 0
 
 
 def find(
@@ -45,7 +45,6 @@ def find(
     Returns:
         (str list): list of file paths
     """
-    global _N_FINDS
     from pini.utils import File, Dir
 
     _LOGGER.debug('FIND %s', path)
@@ -55,10 +54,10 @@ def find(
             "Read yaml disabled using PINI_DISABLE_FILE_SYSTEM")
 
     _dir = Dir(up_norm.abs_path(path))
-    _data = _read_find_data(
-        dir_=_dir, depth=depth, catch_missing=catch_missing,
-        hidden=hidden, catch_access_error=catch_access_error)
-    _N_FINDS += 1
+    with trace_span('fs.find'):
+        _data = _read_find_data(
+            dir_=_dir, depth=depth, catch_missing=catch_missing,
+            hidden=hidden, catch_access_error=catch_access_error)
 
     # Setup extns filter
     _extns = set(extns or [])
@@ -8,6 +8,7 @@ import time
 from . import up_utils, up_norm
 from ..u_misc import nice_size, nice_id
 from ..u_time import strftime
+from ..u_trace import trace_count
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -56,6 +57,7 @@ class Path:
             (float): mtime in secs
         """
         up_utils.error_on_file_system_disabled(self.path)
+        trace_count('fs.stat')
         return os.path.getctime(self.path)
 
     def exists(self, catch=False, root=None):
@@ -71,6 +73,7 @@ class Path:
         up_utils.error_on_file_system_disabled(self.path)
         if root:
             return self.to_abs(root=root).exists()
+        trace_count('fs.stat')
 
         try:
             return self._pathlib.exists()
@@ -94,6 +97,7 @@ class Path:
             (bool): whether directory
         """
         up_utils.error_on_file_system_disabled(self.path)
+        trace_count('fs.stat')
         return self._pathlib.is_dir()
 
     def is_file(self):
@@ -103,6 +107,7 @@ class Path:
             (bool): whether file
         """
         up_utils.error_on_file_system_disabled(self.path)
+        trace_count('fs.stat')
         return self._pathlib.is_file()
 
     def mkdir(self):
@@ -111,7 +116,7 @@ class Path:
         if self.exists():
             assert self.is_dir()
             return
-        os.makedirs(self.path)
+        os.makedirs(self.path, exist_ok=True)
 
     def mtime(self):
         """Get last modified time for this path.
@@ -120,6 +125,7 @@ class Path:
             (float): mtime in secs
         """
         up_utils.error_on_file_system_disabled(self.path)
+        trace_count('fs.stat')
         return os.path.getmtime(self.path)
 
     def nice_age(self):
@@ -185,6 +191,7 @@ class Path:
             (int): size in bytes
         """
         up_utils.error_on_file_system_disabled(self.path)
+        trace_count('fs.stat')
         return self._read_size(catch=catch)
 
     def _read_size(self, catch=False):
@@ -0,0 +1,332 @@
+"""Tools for incrementally syncing a directory to another location.
+
+Each side of a sync has a manifest which stores the size, mtime and
+content hash of each file. The manifests are cached locally (in
+$PINI_TMP/sync), so that hashes only need to be recalculated for files
+which have changed since the last sync.
+
+The delta is computed in a single pass over both trees:
+
+ - files which are only in the source are copied
+ - files with different sizes are copied
+ - files with matching size and mtime are skipped
+ - otherwise the content hashes are compared
+
+Files are copied in parallel using copy_files, which writes each file
+to a partial file which is renamed into place on completion. Extraneous
+files in the target can also be removed.
+
+    >>> _report = sync_dirs('/tmp/src', '/tmp/trg', dry_run=True)
+    >>> print(_report['copy'], _report['update'], _report['delete'])
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+
+from ..u_trace import trace_span
+from . import up_copy, up_utils, up_norm
+
+_LOGGER = logging.getLogger(__name__)
+
+_MANIFEST_VERSION = 1
+
+
+class SyncManifest:
+    """Manifest of file size/mtime/hash data for a directory."""
+
+    def __init__(self, root):
+        """Constructor.
+
+        Args:
+            root (str): path to directory
+        """
+        from .up_dir import PINI_TMP
+
+        self.root = up_norm.abs_path(root)
+        _uid = hashlib.md5(self.root.encode()).hexdigest()
+        self.file = PINI_TMP.to_file(f'sync/{_uid}.json')
+        self.n_hashed = 0
+
+        self._cache = {}
+        self.stats = {}
+        if self.file.exists():
+            try:
+                _data = self.file.read_json()
+            except ValueError:
+                _LOGGER.warning(' - FAILED TO READ MANIFEST %s', self.file)
+                _data = {}
+            if (
+                    _data.get('version') == _MANIFEST_VERSION and
+                    _data.get('root') == self.root):
+                self._cache = _data['files']
+
+    def read(self, filter_=None, workers=None):
+        """Read current file data (size/mtime) from disk.
+
+        Args:
+            filter_ (str): apply path filter
+            workers (int): override number of worker threads
+        """
+        with trace_span('fs.sync_manifest'):
+            self.stats = _read_tree_stats(
+                self.root, filter_=filter_, workers=workers)
+        _LOGGER.debug(' - READ %d FILES %s', len(self.stats), self.root)
+
+    def to_hash(self, rel_path):
+        """Obtain content hash of the given file.
+
+        The cached hash is used if the file's size/mtime haven't changed.
+
+        Args:
+            rel_path (str): path relative to root
+
+        Returns:
+            (str): content hash
+        """
+        _size, _mtime = self.stats[rel_path]
+        _cached = self._cache.get(rel_path)
+        if _cached and _cached[:2] == [_size, _mtime] and _cached[2]:
+            return _cached[2]
+        _hash = up_copy._to_hash(  # pylint: disable=protected-access
+            f'{self.root}/{rel_path}')
+        self._cache[rel_path] = [_size, _mtime, _hash]
+        self.n_hashed += 1
+        return _hash
+
+    def to_cached(self, rel_path):
+        """Obtain cached data for the given file.
+
+        Args:
+            rel_path (str): path relative to root
+
+        Returns:
+            (list|None): size/mtime/hash data (if any)
+        """
+        return self._cache.get(rel_path)
+
+    def update(self, rel_path, src):
+        """Update a file's entry after it has been copied.
+
+        The file's mtime is read from disk, and the hash is taken from
+        the source manifest (if it is known and up to date).
+
+        Args:
+            rel_path (str): path relative to root
+            src (SyncManifest): source manifest
+        """
+        _stat = os.stat(f'{self.root}/{rel_path}')
+        _data = [_stat.st_size, _stat.st_mtime_ns]
+        self.stats[rel_path] = tuple(_data)
+        _src_cached = src.to_cached(rel_path)
+        _hash = None
+        if (
+                _src_cached and
+                _src_cached[:2] == list(src.stats[rel_path]) and
+                _src_cached[0] == _stat.st_size):
+            _hash = _src_cached[2]
+        self._cache[rel_path] = _data + [_hash]
+
+    def remove(self, rel_path):
+        """Remove a file's entry.
+
+        Args:
+            rel_path (str): path relative to root
+        """
+        self.stats.pop(rel_path, None)
+        self._cache.pop(rel_path, None)
+
+    def write(self):
+        """Write manifest to disk.
+
+        Only files which exist in the last read are stored.
+        """
+        _files = {
+            _path: self._cache.get(_path, list(_stat) + [None])
+            for _path, _stat in self.stats.items()}
+        _data = {
+            'version': _MANIFEST_VERSION,
+            'root': self.root,
+            'files': _files}
+        self.file.test_dir()
+        _tmp = f'{self.file.path}.{uuid.uuid4().hex}.tmp'
+        with open(_tmp, 'w', encoding='utf-8') as _hook:
+            json.dump(_data, _hook)
+        os.replace(_tmp, self.file.path)
+
+
+def _read_tree_stats(root, filter_=None, workers=None):
+    """Read size/mtime of all files in the given directory.
+
+    Hidden files/dirs are ignored (as in find). Top level dirs are read
+    in parallel, as stat calls are latency bound on network drives.
+
+    Args:
+        root (str): path to directory
+        filter_ (str): apply path filter
+        workers (int): override number of worker threads
+
+    Returns:
+        (dict): rel path/(size, mtime) data
+    """
+    from pini.utils import passes_filter
+
+    _stats = {}
+    if not os.path.isdir(root):
+        return _stats
+
+    _dirs = []
+    for _entry in os.scandir(root):
+        if _entry.name.startswith('.'):
+            continue
+        if _entry.is_dir():
+            _dirs.append(_entry.name)
+        elif _entry.is_file():
+            _stat = _entry.stat()
+            _stats[_entry.name] = _stat.st_size, _stat.st_mtime_ns
+
+    with concurrent.futures.ThreadPoolExecutor(
+            workers or up_copy.COPY_WORKERS) as _pool:
+        for _dir_stats in _pool.map(
+                lambda _dir: _walk_dir_stats(root, _dir), _dirs):
+            _stats.update(_dir_stats)
+
+    if filter_:
+        _stats = {
+            _path: _stat for _path, _stat in _stats.items()
+            if passes_filter(f'{root}/{_path}', filter_)}
+
+    return _stats
+
+
+def _walk_dir_stats(root, rel_dir):
+    """Read size/mtime of all files in a subdirectory.
+
+    Args:
+        root (str): path to root directory
+        rel_dir (str): subdirectory (relative to root)
+
+    Returns:
+        (dict): rel path/(size, mtime) data
+    """
+    _stats = {}
+    _todo = [rel_dir]
+    while _todo:
+        _rel_dir = _todo.pop()
+        for _entry in os.scandir(f'{root}/{_rel_dir}'):
+            if _entry.name.startswith('.'):
+                continue
+            _rel_path = f'{_rel_dir}/{_entry.name}'
+            if _entry.is_dir():
+                _todo.append(_rel_path)
+            elif _entry.is_file():
+                _stat = _entry.stat()
+                _stats[_rel_path] = _stat.st_size, _stat.st_mtime_ns
+    return _stats
+
+
+def sync_dirs(
+        src, trg, filter_=None, delete=False, dry_run=False, workers=None,
+        progress=False, confirm=None):
+    """Incrementally sync a directory to another location.
+
+    Args:
+        src (str): path to source directory
+        trg (str): path to target directory
+        filter_ (str): apply path filter
+        delete (bool): remove files from the target which aren't in
+            the source
+        dry_run (bool): only calculate what would be synced
+        workers (int): override number of worker threads
+        progress (bool): show progress bar
+        confirm (fn): function which is passed the report before the
+            sync is executed (eg. to raise a confirmation dialog)
+
+    Returns:
+        (dict): sync report - files to copy (new files), update (changed
+            files), delete (extraneous files) and stats
+    """
+    _start = time.time()
+    _src = SyncManifest(src)
+    _trg = SyncManifest(trg)
+    if _src.root == _trg.root:
+        raise ValueError(f'Cannot sync dir to itself {_src.root}')
+    for _manifest in (_src, _trg):
+        _manifest.read(filter_=filter_, workers=workers)
+
+    # Find delta
+    _report = {'copy': [], 'update': [], 'delete': [], 'skipped': 0}
+    _to_hash = []
+    for _path, _src_stat in _src.stats.items():
+        _trg_stat = _trg.stats.get(_path)
+        if not _trg_stat:
+            _report['copy'].append(_path)
+        elif _src_stat[0] != _trg_stat[0]:
+            _report['update'].append(_path)
+        elif _src_stat[1] == _trg_stat[1]:
+            _report['skipped'] += 1
+        else:
+            _to_hash.append(_path)
+    if delete:
+        _report['delete'] = sorted(set(_trg.stats) - set(_src.stats))
+
+    # Compare hashes of files with matching size but different mtime
+    with concurrent.futures.ThreadPoolExecutor(
+            workers or up_copy.COPY_WORKERS) as _pool:
+        _matches = list(_pool.map(
+            lambda _path: _src.to_hash(_path) == _trg.to_hash(_path),
+            _to_hash))
+    for _path, _match in zip(_to_hash, _matches):
+        if _match:
+            _report['skipped'] += 1
+        else:
+            _report['update'].append(_path)
+    _report['copy'].sort()
+    _report['update'].sort()
+    _report['hashed'] = _src.n_hashed + _trg.n_hashed
+    _LOGGER.info(
+        'SYNC %s -> %s copy=%d update=%d delete=%d skipped=%d hashed=%d',
+        _src.root, _trg.root, len(_report['copy']), len(_report['update']),
+        len(_report['delete']), _report['skipped'], _report['hashed'])
+
+    # Execute sync
+    if not dry_run and (
+            _report['copy'] or _report['update'] or _report['delete']):
+        if confirm:
+            confirm(_report)
+        _apply_sync(
+            _report, src=_src, trg=_trg, workers=workers, progress=progress)
+    _src.write()
+    _trg.write()
+
+    _report['dry_run'] = dry_run
+    _report['dur'] = time.time() - _start
+    return _report
+
+
+def _apply_sync(report, src, trg, workers, progress):
+    """Apply sync, copying and removing files.
+
+    Args:
+        report (dict): sync report
+        src (SyncManifest): source manifest
+        trg (SyncManifest): target manifest
+        workers (int): override number of worker threads
+        progress (bool): show progress bar
+    """
+    up_utils.error_on_file_system_disabled()
+    _paths = report['copy'] + report['update']
+    up_copy.copy_files(
+        [(f'{src.root}/{_path}', f'{trg.root}/{_path}') for _path in _paths],
+        check=None, resume=False, workers=workers, progress=progress,
+        title='Syncing {:d} file{}')
+    for _path in _paths:
+        trg.update(_path, src=src)
+    for _path in report['delete']:
+        _LOGGER.debug(' - REMOVE %s', _path)
+        os.remove(f'{trg.root}/{_path}')
+        trg.remove(_path)
@@ -7,7 +7,7 @@ from .path import File
 from .u_exe import find_exe
 from .u_misc import single
 from .u_system import system
-from . import u_res
+from . import u_res, u_image_header
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -74,11 +74,15 @@ class Image(File):
         """
         return self.to_res().aspect
 
-    def to_res(self, catch=True):
-        """Read resolution of this image using ffprobe.
+    def to_res(self, catch=True, force=False):
+        """Read resolution of this image.
+
+        The resolution is read from the file header if possible (png,
+        jpg, exr, tiff and dpx), otherwise ffprobe is used.
 
         Args:
             catch (bool): no error if fail to read res
+            force (bool): ignore cached header result
 
         Returns:
             (tuple): width/height
@@ -92,8 +96,10 @@ class Image(File):
                 return None
             raise RuntimeError('Bad image extension ' + self.path)
 
-        if self.extn.lower() in ['png', 'jpg', 'jpeg']:
-            return self._read_res_qt()
+        _res = u_image_header.read_image_res(self.path, force=force)
+        if _res:
+            return _res
+        _LOGGER.debug(' - FALLING BACK ON FFPROBE %s', self.path)
         return self._read_res_ffprobe(catch=catch)
 
     def _read_ffprobe(self):
@@ -151,16 +157,6 @@ class Image(File):
 
         return u_res.Res(*_res)
 
-    def _read_res_qt(self):
-        """Read this image's resolution using qt.
-
-        Returns:
-            (tuple): width/height
-        """
-        from pini import qt
-        _pix = qt.CPixmap(self.path)
-        return u_res.Res(_pix.width(), _pix.height())
-
 
 def _convert_file_ffmpeg(
         src, trg, colspace=None, size=None, catch=False, force=False):
@@ -0,0 +1,270 @@
+"""Tools for reading image resolution from file headers.
+
+This avoids decoding images (eg. via qt) or launching ffprobe just to
+read their resolution. Only the start of the file is read - png, tiff
+and dpx store their resolution at a fixed offset, exr stores it in the
+attribute list at the start of the file, and for jpeg the markers are
+walked (seeking past segment data) until the start of frame is found.
+
+Results are cached by path, mtime and size.
+"""
+
+import logging
+import os
+import struct
+
+from . import u_res
+
+_LOGGER = logging.getLogger(__name__)
+
+_CACHE = {}
+_READ_SIZE = 4096
+_MAX_EXR_HEADER = 64 * 1024
+_MAX_JPG_MARKERS = 256
+_MAX_TIFF_TAGS = 4096
+
+_PNG_MAGIC = b'\x89PNG\r\n\x1a\n'
+_EXR_MAGIC = b'\x76\x2f\x31\x01'
+_JPG_MAGIC = b'\xff\xd8'
+_JPG_SOF_MARKERS = {
+    0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB,
+    0xCD, 0xCE, 0xCF}
+_JPG_STANDALONE_MARKERS = {0x01} | set(range(0xD0, 0xD9))
+_TIFF_TYPES = {3: 'H', 4: 'I', 16: 'Q'}
+
+
+def flush_image_res_cache():
+    """Flush cache of image resolutions."""
+    _CACHE.clear()
+
+
+def read_image_res(path, force=False):
+    """Read resolution of an image from its header.
+
+    Args:
+        path (str): path to image
+        force (bool): ignore cached result
+
+    Returns:
+        (Res|None): resolution (None if the format isn't supported or
+            the header could not be parsed)
+    """
+    _stat = os.stat(path)
+    _key = _stat.st_mtime, _stat.st_size
+    _cached = _CACHE.get(path)
+    if not force and _cached and _cached[0] == _key:
+        return _cached[1]
+
+    with open(path, 'rb') as _hook:
+        try:
+            _res = _read_header_res(_hook)
+        except (struct.error, ValueError) as _exc:
+            _LOGGER.debug(' - FAILED TO PARSE HEADER %s %s', path, _exc)
+            _res = None
+    _LOGGER.debug(' - READ HEADER RES %s %s', _res, path)
+    _CACHE[path] = _key, _res
+
+    return _res
+
+
+def _read_header_res(hook):
+    """Read resolution from an image file header.
+
+    The format is identified by its magic number rather than its
+    extension.
+
+    Args:
+        hook (file): file handle (opened in binary mode)
+
+    Returns:
+        (Res|None): resolution
+    """
+    _data = hook.read(_READ_SIZE)
+    if _data.startswith(_PNG_MAGIC):
+        _res = _read_png_res(_data)
+    elif _data.startswith(_EXR_MAGIC):
+        _res = _read_exr_res(hook, _data)
+    elif _data.startswith(_JPG_MAGIC):
+        _res = _read_jpg_res(hook, _data)
+    elif _data[:4] in (b'II*\x00', b'MM\x00*', b'II+\x00', b'MM\x00+'):
+        _res = _read_tiff_res(hook, _data)
+    elif _data[:4] in (b'SDPX', b'XPDS'):
+        _res = _read_dpx_res(_data)
+    else:
+        return None
+    if not _res or min(_res) <= 0:
+        return None
+    return u_res.Res(*_res)
+
+
+def _read_dpx_res(data):
+    """Read resolution from dpx header.
+
+    The magic number gives the byte order, and the pixels per line and
+    lines per element are stored in the image information header.
+
+    Args:
+        data (bytes): start of file
+
+    Returns:
+        (tuple): width/height
+    """
+    _order = '>' if data[:4] == b'SDPX' else '<'
+    return struct.unpack_from(_order + 'II', data, 772)
+
+
+def _read_exr_res(hook, data):
+    """Read resolution from exr header.
+
+    The header is a list of attributes, each stored as a null terminated
+    name and type, followed by the value size and value. The display
+    window is used if present, otherwise the data window.
+
+    Args:
+        hook (file): file handle
+        data (bytes): start of file
+
+    Returns:
+        (tuple): width/height
+    """
+    _windows = {}
+    _pos = 8
+    while b'displayWindow' not in _windows:
+        _name_end = data.find(b'\x00', _pos)
+        if _name_end == _pos:  # End of header
+            break
+        _type_end = data.find(b'\x00', _name_end + 1)
+        if -1 in (_name_end, _type_end) or _type_end + 21 > len(data):
+            if len(data) > _MAX_EXR_HEADER:
+                raise ValueError('Exr header too large')
+            _more = hook.read(_READ_SIZE)
+            if not _more:
+                raise ValueError('Exr header truncated')
+            data += _more
+            continue
+        _name = data[_pos:_name_end]
+        _size = struct.unpack_from('<i', data, _type_end + 1)[0]
+        if _name in (b'displayWindow', b'dataWindow'):
+            _windows[_name] = struct.unpack_from(
+                '<iiii', data, _type_end + 5)
+        _pos = _type_end + 5 + _size
+
+    _window = _windows.get(b'displayWindow') or _windows.get(b'dataWindow')
+    if not _window:
+        return None
+    _x_min, _y_min, _x_max, _y_max = _window
+    return _x_max - _x_min + 1, _y_max - _y_min + 1
+
+
+def _read_jpg_res(hook, data):
+    """Read resolution from jpeg header.
+
+    Markers are read until a start of frame marker is found, seeking past
+    the data of any other segments (eg. exif data and thumbnails).
+
+    Args:
+        hook (file): file handle
+        data (bytes): start of file
+
+    Returns:
+        (tuple): width/height
+    """
+    _base, _pos = 0, 2
+    for _ in range(_MAX_JPG_MARKERS):
+
+        # Make sure marker is loaded
+        if _pos + 9 > len(data):
+            _base += _pos
+            hook.seek(_base)
+            data = hook.read(_READ_SIZE)
+            _pos = 0
+            if len(data) < 9:
+                return None
+        if data[_pos] != 0xFF:
+            raise ValueError('Bad jpg marker')
+
+        # Read marker
+        _marker = data[_pos + 1]
+        if _marker == 0xFF:  # Fill byte
+            _pos += 1
+            continue
+        if _marker in _JPG_STANDALONE_MARKERS:
+            _pos += 2
+            continue
+        if _marker in _JPG_SOF_MARKERS:
+            _height, _width = struct.unpack_from('>HH', data, _pos + 5)
+            return _width, _height
+        if _marker == 0xDA:  # Start of scan before start of frame
+            return None
+        _pos += 2 + struct.unpack_from('>H', data, _pos + 2)[0]
+
+    return None
+
+
+def _read_png_res(data):
+    """Read resolution from png header.
+
+    The IHDR chunk is always the first chunk.
+
+    Args:
+        data (bytes): start of file
+
+    Returns:
+        (tuple): width/height
+    """
+    if data[12:16] != b'IHDR':
+        raise ValueError('Missing IHDR chunk')
+    return struct.unpack_from('>II', data, 16)
+
+
+def _read_tiff_res(hook, data):
+    """Read resolution from tiff header.
+
+    This reads the image width and length tags from the first image file
+    directory. BigTIFF is also supported.
+
+    Args:
+        hook (file): file handle
+        data (bytes): start of file
+
+    Returns:
+        (tuple): width/height
+    """
+    _order = '<' if data[:2] == b'II' else '>'
+    _big = struct.unpack_from(_order + 'H', data, 2)[0] == 43
+    if _big:
+        _ifd = struct.unpack_from(_order + 'Q', data, 8)[0]
+        _count_fmt, _entry_fmt, _entry_size = 'Q', 'HHQ', 20
+    else:
+        _ifd = struct.unpack_from(_order + 'I', data, 4)[0]
+        _count_fmt, _entry_fmt, _entry_size = 'H', 'HHI', 12
+
+    # Make sure directory is loaded
+    _count_size = struct.calcsize(_order + _count_fmt)
+    if _ifd + _count_size > len(data):
+        hook.seek(_ifd)
+        data = hook.read(_READ_SIZE)
+        _ifd = 0
+    _count = struct.unpack_from(_order + _count_fmt, data, _ifd)[0]
+    if _count > _MAX_TIFF_TAGS:
+        raise ValueError(f'Bad tiff tag count {_count:d}')
+    _end = _ifd + _count_size + _count * _entry_size
+    if _end > len(data):
+        hook.seek(hook.tell() - len(data) + _ifd)
+        data = hook.read(_end - _ifd)
+        _ifd = 0
+
+    # Read tags
+    _tags = {}
+    _val_offs = struct.calcsize(_order + _entry_fmt)
+    for _idx in range(_count):
+        _pos = _ifd + _count_size + _idx * _entry_size
+        _tag, _type, _ = struct.unpack_from(_order + _entry_fmt, data, _pos)
+        if _tag not in (256, 257) or _type not in _TIFF_TYPES:
+            continue
+        _tags[_tag] = struct.unpack_from(
+            _order + _TIFF_TYPES[_type], data, _pos + _val_offs)[0]
+        if len(_tags) == 2:
+            return _tags[256], _tags[257]
+
+    return None
@@ -0,0 +1,99 @@
+"""Tools for managing lazy loading of package attributes.
+
+This allows a package __init__ to declare its public api without
+importing all of its submodules - each attribute is imported the first
+time it is accessed, and is then stored on the package so that
+subsequent access is just a regular attribute lookup. Submodules are
+also available as attributes, as they would be after an eager import.
+
+Lazy loading can be disabled by setting $PINI_LAZY_IMPORT to 0, in
+which case all attributes are imported immediately.
+"""
+
+import importlib.util
+import logging
+import os
+import sys
+
+_LOGGER = logging.getLogger(__name__)
+
+LAZY_IMPORT = os.environ.get('PINI_LAZY_IMPORT', '1') != '0'
+
+
+def _import_mod(name):
+    """Import a module using its name.
+
+    NOTE: __import__ is used rather than importlib.import_module so
+    that lazy imports are included in -X importtime reports.
+
+    Args:
+        name (str): module name (eg. pini.utils.u_misc)
+
+    Returns:
+        (mod): imported module
+    """
+    __import__(name)
+    return sys.modules[name]
+
+
+def lazy_import(name, globals_, attrs=None, mods=None, builders=None):
+    """Set up lazy loading of attributes for the given package.
+
+    Attributes are declared by module, eg:
+
+        __getattr__, __dir__ = lazy_import(
+            __name__, globals(),
+            attrs={'.u_misc': ['single', 'lprint']},
+            mods={'email': '.u_email'})
+
+    Args:
+        name (str): name of package being set up (ie. __name__)
+        globals_ (dict): package globals (ie. globals())
+        attrs (dict): module name/attribute names list of attributes
+            to load lazily
+        mods (dict): attribute name/module name of modules to load lazily
+        builders (dict): attribute name/function of attributes which
+            are built on first access (eg. a package level cache object)
+
+    Returns:
+        (tuple): package __getattr__ and __dir__ functions
+    """
+    _sources = {}
+    for _mod_name, _attr_names in (attrs or {}).items():
+        for _attr_name in _attr_names:
+            _sources[_attr_name] = (_mod_name, _attr_name)
+    for _attr_name, _mod_name in (mods or {}).items():
+        _sources[_attr_name] = (_mod_name, None)
+    _builders = dict(builders or {})
+
+    # Clear any values cached in a previous import (ie. on reload)
+    for _attr_name in list(_sources) + list(_builders):
+        globals_.pop(_attr_name, None)
+
+    def _getattr(attr):
+        if attr in _sources:
+            _mod_name, _src_name = _sources[attr]
+            _LOGGER.debug('LAZY IMPORT %s.%s FROM %s', name, attr, _mod_name)
+            _mod = _import_mod(importlib.util.resolve_name(_mod_name, name))
+            _val = getattr(_mod, _src_name) if _src_name else _mod
+        elif attr in _builders:
+            _LOGGER.debug('LAZY BUILD %s.%s', name, attr)
+            _val = _builders[attr]()
+        elif (
+                not attr.startswith('__') and
+                importlib.util.find_spec(f'{name}.{attr}')):
+            _val = _import_mod(f'{name}.{attr}')
+        else:
+            raise AttributeError(
+                f"module '{name}' has no attribute '{attr}'")
+        globals_[attr] = _val
+        return _val
+
+    def _dir():
+        return sorted(set(globals_) | set(_sources) | set(_builders))
+
+    if not LAZY_IMPORT:
+        for _attr_name in list(_sources) + list(_builders):
+            _getattr(_attr_name)
+
+    return _getattr, _dir
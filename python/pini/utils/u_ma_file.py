@@ -1,9 +1,20 @@
 """Tools for managing and updating ma files.
 
 This is achieved via text parsing (ie. outside maya).
+
+Production scenes can be hundreds of MB, so the file is not read into
+memory. Instead, a compact index of the expressions (offset, command
+and, for createNode, node type/name) is built by scanning the
+memory-mapped file in a single pass. Expression objects are only
+built when they are requested, and on save the file is streamed to disk
+with just the updated/removed expressions rewritten.
 """
 
+import array
 import logging
+import mmap
+import os
+import re
 
 from .u_misc import basic_repr, single
 from .u_filter import passes_filter
@@ -12,11 +23,19 @@ from .path import MetadataFile, File
 _LOGGER = logging.getLogger(__name__)
 _COL = 'PowderBlue'
 
+_SEP = b';\n'
+_EXPR_RE = re.compile(
+    rb'(\s?)\s*(//)?([^\s;]*)[^;]*(?:;(?!\n)[^;]*)*(?:;\n)?')
+_NODE_RE = re.compile(rb'createNode\s+(\S+)\s(?:[^\n]*?\s)?-n\s+"([^"]*)"')
+_COPY_CHUNK = 1024 * 1024
+
 
 class _MaExpr:  # pylint: disable=too-many-instance-attributes
     """Represents an expression in an ma file."""
 
-    def __init__(self, body, line_n, tokens=None, cmd=None):
+    def __init__(
+            self, body, line_n, tokens=None, cmd=None, idx=None,
+            ma_file=None):
         """Constructor.
 
         Args:
@@ -24,18 +43,46 @@ class _MaExpr:  # pylint: disable=too-many-instance-attributes
             line_n (int): line number of expression
             tokens (str list): override tokens (words in line)
             cmd (str): override command (first token in line)
+            idx (int): index of expression in ma file
+            ma_file (MaFile): parent ma file
         """
         self.body = body
         self.new_body = body
         self.updated = False
 
         self.line_n = line_n
-        self.tokens = tokens or body.split()
+        self.idx = idx
+        self.ma_file = ma_file
+        self._tokens = tokens
         self.cmd = cmd or self.tokens[0]
 
         self.indented = body[0].isspace()
-        self.comment = body.startswith('\\')
-        self.children = []
+        self.comment = body.startswith('//')
+        self._children = None
+
+    @property
+    def children(self):
+        """Obtain child expressions (ie. following indented expressions).
+
+        Returns:
+            (MaExpr list): children
+        """
+        if self._children is None:
+            self._children = []
+            if self.ma_file:
+                self._children = self.ma_file.find_children(self)
+        return self._children
+
+    @property
+    def tokens(self):
+        """Obtain tokens (words) in this expression.
+
+        Returns:
+            (str list): tokens
+        """
+        if self._tokens is None:
+            self._tokens = self.body.split()
+        return self._tokens
 
     def replace(self, find, replace):
         """Replace text in this expression.
@@ -96,10 +143,139 @@ class _MaCreateNode(_MaExpr):
         return f'<{_type}[{self.type_}]:{self.name}>'
 
 
+class _MaIndex:
+    """Compact index of the expressions in an ma file.
+
+    Each expression runs from its start offset up to the start of the
+    next expression, including its terminating ";\\n".
+    """
+
+    def __init__(self, path):
+        """Constructor.
+
+        Args:
+            path (str): path to ma file
+        """
+        self.path = path
+        _stat = os.stat(path)
+        self.mtime = _stat.st_mtime
+        self.size = _stat.st_size
+
+        self.starts = array.array('q')
+        self.cmd_ids = array.array('H')
+        self.indented = bytearray()
+        self.cmds = []
+        self.nodes = []  # idx/type/name of createNode expressions
+        self._line_ns = {}
+
+        if self.size:
+            self._build()
+
+    def _build(self):
+        """Build index in a single pass of the memory-mapped file.
+
+        Expressions are separated by ";\\n" (ie. the same as splitting
+        the file text on this).
+        """
+        _cmd_ids = {}
+        with open(self.path, 'rb') as _hook, \
+                mmap.mmap(_hook.fileno(), 0, access=mmap.ACCESS_READ) as _mm:
+            for _match in _EXPR_RE.finditer(_mm):
+
+                _start, _end = _match.span()
+                if _start == _end:
+                    break
+                _indent, _comment, _cmd = _match.groups()
+                if _comment:
+                    _cmd = None
+
+                _cmd_id = _cmd_ids.get(_cmd)
+                if _cmd_id is None:
+                    _cmd_id = _cmd_ids[_cmd] = len(self.cmds)
+                    self.cmds.append(_cmd.decode() if _cmd else None)
+                if _cmd == b'createNode':
+                    _node = _NODE_RE.match(_mm, _start, _end)
+                    if _node:
+                        self.nodes.append((
+                            len(self.starts), _node.group(1).decode(),
+                            _node.group(2).decode()))
+
+                self.starts.append(_start)
+                self.cmd_ids.append(_cmd_id)
+                self.indented.append(bool(_indent))
+
+    def is_stale(self):
+        """Test whether the file has changed since this index was built.
+
+        Returns:
+            (bool): whether stale
+        """
+        _stat = os.stat(self.path)
+        return (_stat.st_mtime, _stat.st_size) != (self.mtime, self.size)
+
+    def find(self, cmd):
+        """Find indices of expressions with the given command.
+
+        Args:
+            cmd (str): command to match (eg. createNode)
+
+        Returns:
+            (int list): indices
+        """
+        if cmd not in self.cmds:
+            return []
+        _cmd_id = self.cmds.index(cmd)
+        return [_idx for _idx, _id in enumerate(self.cmd_ids)
+                if _id == _cmd_id]
+
+    def to_line_ns(self, idxs):
+        """Obtain line numbers of the given expressions.
+
+        Line numbers are calculated on request by counting newlines in
+        a single pass of the file, and are then cached.
+
+        Args:
+            idxs (int list): expression indices
+
+        Returns:
+            (int list): line numbers
+        """
+        _to_read = sorted({
+            _idx for _idx in idxs if _idx not in self._line_ns})
+        if _to_read:
+            with open(self.path, 'rb') as _hook:
+                _pos, _line_n = 0, 1
+                for _idx in _to_read:
+                    _start = self.starts[_idx]
+                    while _pos < _start:
+                        _data = _hook.read(min(_COPY_CHUNK, _start - _pos))
+                        _line_n += _data.count(b'\n')
+                        _pos += len(_data)
+                    self._line_ns[_idx] = _line_n
+        return [self._line_ns[_idx] for _idx in idxs]
+
+    def to_span(self, idx):
+        """Obtain byte span of the given expression.
+
+        Args:
+            idx (int): expression index
+
+        Returns:
+            (tuple): start/next start offsets
+        """
+        _start = self.starts[idx]
+        if idx + 1 < len(self.starts):
+            return _start, self.starts[idx + 1]
+        return _start, self.size
+
+    def __len__(self):
+        return len(self.starts)
+
+
 class MaFile(MetadataFile):
     """Represents a maya ascii file."""
 
-    _exprs = None
+    _index = None
 
     def __init__(self, file_):
         """Constructor.
@@ -108,9 +284,43 @@ class MaFile(MetadataFile):
             file_ (str): path to ma file
         """
         super().__init__(file_)
-        self.body = self.read()
         if self.extn != 'ma':
             raise ValueError(file_)
+        self._exprs = {}
+        self._removed = set()
+
+    @property
+    def body(self):
+        """Obtain full text of this file.
+
+        NOTE: this reads the whole file into memory.
+
+        Returns:
+            (str): file text
+        """
+        return self.read()
+
+    def find_children(self, expr):
+        """Find children of the given expression.
+
+        These are the indented expressions which follow it - indented
+        expressions have no children.
+
+        Args:
+            expr (MaExpr): expression to read children of
+
+        Returns:
+            (MaExpr list): children
+        """
+        _index = self.read_index()
+        if _index.indented[expr.idx]:
+            return []
+        _idxs = []
+        _idx = expr.idx + 1
+        while _idx < len(_index) and _index.indented[_idx]:
+            _idxs.append(_idx)
+            _idx += 1
+        return self._to_exprs(_idxs)
 
     def find_exprs(self, cmd=None, progress=False):
         """Find expressions in this ma file.
@@ -122,12 +332,12 @@ class MaFile(MetadataFile):
         Returns:
             (MaExpr list): matching expressions
         """
-        _exprs = []
-        for _expr in self._read_exprs(progress=progress):
-            if cmd and _expr.cmd != cmd:
-                continue
-            _exprs.append(_expr)
-        return _exprs
+        _index = self.read_index()
+        if cmd:
+            _idxs = _index.find(cmd)
+        else:
+            _idxs = range(len(_index))
+        return self._to_exprs(_idxs, progress=progress)
 
     def find_node(self, catch=True, **kwargs):
         """Find a matching createNode expression in this ma file.
@@ -144,6 +354,9 @@ class MaFile(MetadataFile):
     def find_nodes(self, type_=None, filter_=None, name=None, progress=False):
         """Find createNode expressions in this ma file.
 
+        Nodes are filtered using the index, so only matching nodes are
+        read from disk.
+
         Args:
             type_ (str): filter by node type
             filter_ (str): apply filter to name
@@ -153,24 +366,41 @@ class MaFile(MetadataFile):
         Returns:
             (MaCreateNode list): matching createNode expressions
         """
-        _nodes = []
-        for _node in self.find_exprs(cmd='createNode', progress=progress):
-
-            if type_ and _node.type_ != type_:
+        _idxs = []
+        for _idx, _type, _name in self.read_index().nodes:
+            if type_ and _type != type_:
                 continue
-
-            # Name filters last - expensive
-            if filter_ and not passes_filter(_node.name, filter_):
+            if filter_ and not passes_filter(_name, filter_):
                 continue
-            if name and _node.name != name:
+            if name and _name != name:
                 continue
+            _idxs.append(_idx)
+        return self._to_exprs(_idxs, progress=progress)
 
-            _nodes.append(_node)
-        return _nodes
+    def read_index(self, force=False):
+        """Read index of the expressions in this file.
+
+        The index is rebuilt if the file has changed on disk.
+
+        Args:
+            force (bool): force rebuild index
+
+        Returns:
+            (_MaIndex): index
+        """
+        if force or not self._index or self._index.is_stale():
+            _LOGGER.debug('INDEXING %s', self.path)
+            self._index = _MaIndex(self.path)
+            self._exprs = {}
+            self._removed = set()
+            _LOGGER.debug(' - FOUND %d EXPRS', len(self._index))
+        return self._index
 
     def _read_exprs(self, progress=False, force=False):
         """Read expressions in this ma file.
 
+        NOTE: this builds every expression.
+
         Args:
             progress (bool): show progress on read expressions
             force (bool): force re-read expressions from disk
@@ -178,45 +408,59 @@ class MaFile(MetadataFile):
         Returns:
             (MaExpr list): all expressions
         """
-        from pini import qt
-        if force or self._exprs is None:
-
-            # Read lines from file
-            _lines = self.body.split(';\n')
-            if progress:
-                _lines = qt.progress_bar(
-                    _lines, f'Reading MaFile {self.nice_size()}',
-                    col=_COL)
+        self.read_index(force=force)
+        return self.find_exprs(progress=progress)
 
-            # Convert to expressions
-            self._exprs = []
-            _line_n = 1
-            _parent = None
-            for _text in _lines:
+    def _to_exprs(self, idxs, progress=False):
+        """Obtain expression objects for the given indices.
 
-                _n_lines = _text.count('\n') + 1
+        Expressions which haven't been built yet are read from disk.
+        Removed expressions are ignored.
 
-                _class = _MaExpr
-                _tokens = _text.split()
-                if _text.startswith('//'):
-                    _cmd = None
-                else:
-                    _cmd = _tokens[0]
-                    if _cmd == 'createNode':
-                        _class = _MaCreateNode
-                _expr = _class(
-                    _text, line_n=_line_n, tokens=_tokens, cmd=_cmd)
-                self._exprs.append(_expr)
+        Args:
+            idxs (int list): expression indices
+            progress (bool): show progress on read expressions
 
-                # Keep track of parenting
-                if not _expr.indented:
-                    _parent = _expr
-                else:
-                    _parent.children.append(_expr)
+        Returns:
+            (MaExpr list): expressions
+        """
+        _index = self.read_index()
+        _idxs = [_idx for _idx in idxs if _idx not in self._removed]
+        _to_read = [_idx for _idx in _idxs if _idx not in self._exprs]
+        if _to_read:
+            if progress:
+                from pini import qt
+                _to_read = qt.progress_bar(
+                    _to_read, f'Reading MaFile {self.nice_size()}', col=_COL)
+            _line_ns = _index.to_line_ns(_to_read)
+            with open(self.path, 'rb') as _hook:
+                for _idx, _line_n in zip(_to_read, _line_ns):
+                    self._exprs[_idx] = self._read_expr(
+                        _idx, index=_index, hook=_hook, line_n=_line_n)
+        return [self._exprs[_idx] for _idx in _idxs]
+
+    def _read_expr(self, idx, index, hook, line_n):
+        """Read an expression from disk.
 
-                _line_n += _n_lines
+        Args:
+            idx (int): expression index
+            index (_MaIndex): expression index
+            hook (file): open file handle
+            line_n (int): line number of expression
 
-        return self._exprs
+        Returns:
+            (MaExpr): expression
+        """
+        _start, _next = index.to_span(idx)
+        hook.seek(_start)
+        _text = hook.read(_next - _start).decode('utf-8', errors='replace')
+        if _text.endswith(';\n'):
+            _text = _text[:-2]
+        _cmd = index.cmds[index.cmd_ids[idx]]
+        _class = _MaCreateNode if _cmd == 'createNode' else _MaExpr
+        return _class(
+            _text, line_n=line_n, cmd=_cmd, idx=idx,
+            ma_file=self)
 
     def read_contents(self, progress=True, force=False):
         """Read contents of this ma file.
@@ -230,43 +474,79 @@ class MaFile(MetadataFile):
     def remove(self, expr):
         """Remove the given expression from this file.
 
+        Removals are only applied when the ma file is saved.
+
         Args:
             expr (MaExpr): expression to remove
         """
         _LOGGER.debug('REMOVING %s', expr)
         for _expr in [expr] + expr.children:
             _LOGGER.debug(' - REMOVE %s', _expr)
-            self._exprs.remove(_expr)
+            self._removed.add(_expr.idx)
 
     def save(self, file_=None, force=False):
         """Save this ma file with any expression updates applied.
 
+        The file is streamed to disk, with unchanged expressions copied
+        directly and just the updated/removed expressions rewritten.
+
         Args:
             file_ (str): path to save to
             force (bool): overwrite existing without confirmation
+
+        Returns:
+            (File): saved file
         """
         _file = File(file_ or self)
+        if _file.exists() and not force:
+            from pini import qt
+            qt.ok_cancel(f'Overwrite existing file?\n\n{_file.path}')
+
+        # Find edits
+        _index = self.read_index()
+        _edits = {_idx: None for _idx in self._removed}
+        for _idx, _expr in self._exprs.items():
+            if _expr.updated and _idx not in self._removed:
+                _edits[_idx] = _expr.new_body.encode('utf-8')
+        _LOGGER.debug('SAVING %s edits=%d', _file.path, len(_edits))
+
+        # Stream to tmp file
+        _tmp = File(f'{_file.dir}/.{_file.filename}.tmp')
+        _tmp.test_dir()
+        with open(self.path, 'rb') as _src, open(_tmp.path, 'wb') as _dst:
+            _pos = 0
+            for _idx in sorted(_edits):
+                _start, _next = _index.to_span(_idx)
+                _copy_range(_src, _dst, _pos, _start)
+                if _edits[_idx] is not None:
+                    _src.seek(_start)
+                    _tail = _SEP if _src.read(_next - _start).endswith(
+                        _SEP) else b''
+                    _dst.write(_edits[_idx] + _tail)
+                _pos = _next
+            _copy_range(_src, _dst, _pos, _index.size)
+        os.replace(_tmp.path, _file.path)
+
+        if _file == self:
+            self.read_index(force=True)
 
-        _new_body = ''
-        for _expr in self._exprs:
-            _new_body += _expr.body
-            if not _expr.comment:
-                _new_body += ';'
-            _new_body += '\n'
-
-        # _new_body = ''
-        # _updated = False
-        # for _expr in self._exprs:
-        #     if not _expr.updated:
-        #         continue
-        #     assert _new_body.count(_expr.body) == 1
-        #     _new_body = _new_body.replace(_expr.body, _expr.new_body)
-        #     _updated = True
-
-        # if not _updated:
-        #     _title = 'Confirm {}'.format('Save' if file_ else 'Update')
-        #     qt.ok_cancel('Nothing was updated', title=_title)
+        return _file
 
-        _file.write(_new_body, force=force)
 
-        return _file
+def _copy_range(src, dst, start, end):
+    """Copy a byte range from one file to another.
+
+    Args:
+        src (file): file to read from
+        dst (file): file to write to
+        start (int): start offset
+        end (int): end offset
+    """
+    src.seek(start)
+    _remaining = end - start
+    while _remaining > 0:
+        _data = src.read(min(_COPY_CHUNK, _remaining))
+        if not _data:
+            break
+        dst.write(_data)
+        _remaining -= len(_data)
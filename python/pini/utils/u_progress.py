@@ -0,0 +1,178 @@
+"""Tools for reporting progress without qt (eg. in batch/farm jobs).
+
+The console progress iterator has the same api as qt.progress_bar, so it
+can be used in its place where qt is not available. Progress is printed
+at most once every interval, so loops which complete within the interval
+print nothing:
+
+    >>> for _item in ConsoleProgress(_items, 'Processing {:d} item{}'):
+    ...     _process(_item)
+    [12:00:05] Processing 1000 items: 45% (450/1000) etr=6s
+    [12:00:10] Processing 1000 items: 91% (910/1000) etr=1s
+    [12:00:11] Processing 1000 items: complete in 11.0s
+"""
+
+import collections
+import logging
+import time
+
+from .u_heart import check_heart
+from .u_misc import dprint, basic_repr
+from .u_text import plural
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ConsoleProgress:
+    """Iterator which prints progress to the console."""
+
+    def __init__(
+            self, items, title='Processing {:d} item{}', plural_=None,
+            raise_stop=True, stack_key='DefaultProgress', interval=5.0,
+            verbose=True, **kwargs):
+        """Constructor.
+
+        Args:
+            items (list): items to iterate
+            title (str): progress title
+            plural_ (str): override plural string in title
+                (eg. 'es' for 'fixes')
+            raise_stop (bool): raise StopIteration on complete
+            stack_key (str): progress uid
+            interval (float): minimum time between progress updates
+                (in secs)
+            verbose (bool): print progress
+        """
+        _LOGGER.log(9, 'IGNORING QT OPTS %s', sorted(kwargs))
+
+        _items = items
+        if isinstance(_items, (enumerate, collections.abc.Iterable)):
+            _items = list(_items)
+        self.items = _items
+
+        self.title = title.format(
+            len(self.items), plural(self.items, plural_=plural_))
+        self.stack_key = stack_key
+        self.raise_stop = raise_stop
+        self.interval = interval
+        self.verbose = verbose
+
+        self.counter = 0
+        self.start = time.time()
+        self.last_redraw = self.start
+        self.info = ''
+        self._finished = False
+        self._printed = False
+
+    @property
+    def cur_pc(self):
+        """Calculate current percent complete.
+
+        Returns:
+            (float): percent complete
+        """
+        return round(100.0 * self.counter / max(len(self.items), 1))
+
+    def close(self):
+        """Close this progress iterator.
+
+        If any progress has been printed, the total duration is printed.
+        """
+        if self._finished:
+            return
+        self._finished = True
+        if self._printed:
+            _dur = time.time() - self.start
+            dprint(f'{self.title}: complete in {_dur:.01f}s',
+                   verbose=self.verbose)
+
+    def is_finished(self):
+        """Test whether this iterator is finished.
+
+        Returns:
+            (bool): whether finished
+        """
+        return self._finished
+
+    def print_eta(self):
+        """Print expected time remaining."""
+        dprint(self._to_status(), verbose=self.verbose)
+        self._printed = True
+
+    def set_pc(self, percent):
+        """Set percent complete.
+
+        Args:
+            percent (float): percent complete
+        """
+        while self.cur_pc <= percent:
+            check_heart()
+            self.__next__(update_ui=False)  # pylint: disable=unnecessary-dunder-call
+        self.update_ui()
+
+    def update_ui(self):
+        """Print current progress."""
+        self.print_eta()
+        self.last_redraw = time.time()
+
+    def _to_status(self):
+        """Build status line describing current progress.
+
+        Returns:
+            (str): status
+        """
+        _status = (
+            f'{self.title}: {self.cur_pc:.0f}% '
+            f'({self.counter}/{len(self.items)})')
+        if self.counter:
+            _avg_dur = (time.time() - self.start) / self.counter
+            _etr = _avg_dur * (len(self.items) - self.counter)
+            _status += f' etr={_etr:.0f}s'
+        return _status + self.info
+
+    def __iter__(self):
+        return self
+
+    def __len__(self):
+        return len(self.items)
+
+    def __next__(self, update_ui=True):
+
+        # Apply update - this is rate limited to avoid flooding the console
+        if time.time() - self.last_redraw >= self.interval:
+            check_heart()
+            if update_ui:
+                self.update_ui()
+            else:
+                self.last_redraw = time.time()
+
+        # Increment item
+        self.counter += 1
+        try:
+            _result = self.items[self.counter - 1]
+        except IndexError as _exc:
+            self.close()
+            if self.raise_stop:
+                raise StopIteration from _exc
+            return None
+
+        return _result
+
+    def __repr__(self):
+        return basic_repr(self, self.stack_key)
+
+
+def console_progress(items, *args, **kwargs):
+    """Print progress to the console while iterating the given item list.
+
+    Args:
+        items (list): items to iterate
+
+    Returns:
+        (ConsoleProgress): iterator which prints progress
+    """
+    if not kwargs.get('show', True):
+        return items
+    if not items:
+        return items
+    return ConsoleProgress(items, *args, **kwargs)
@@ -1,13 +1,28 @@
-"""Tools for managing the system command."""
+"""Tools for managing the system command.
 
+As well as the blocking system command, commands can be executed
+concurrently using system_many (threads) or asystem/asystem_many
+(asyncio), eg.
+
+    >>> _results = system_many([['ffprobe', _video] for _video in _videos])
+
+The number of concurrent commands can be set using $PINI_SYSTEM_WORKERS.
+"""
+
+import asyncio
+import concurrent.futures
 import logging
+import os
 import platform
 import subprocess
+import threading
 
 from . import u_text
 
 _LOGGER = logging.getLogger(__name__)
 
+SYSTEM_WORKERS = int(os.environ.get('PINI_SYSTEM_WORKERS', 8))
+
 
 def _build_cmds(cmd, verbose):
     """Build cmds list.
@@ -65,10 +80,6 @@ def system(
     _cmds = _build_cmds(cmd, verbose=verbose)
 
     # Submit command
-    _si = None
-    if block_shell_window and platform.system() == 'Windows':
-        _si = subprocess.STARTUPINFO()
-        _si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
     _kwargs = {}
     if env is not None:
         _kwargs['shell'] = True
@@ -78,7 +89,7 @@ def system(
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        startupinfo=_si,
+        startupinfo=_to_startupinfo(block_shell_window),
         **_kwargs)
     if not result:
         return None
@@ -88,12 +99,44 @@ def system(
     if timeout:
         _kwargs['timeout'] = timeout
     _out, _err = _pipe.communicate(**_kwargs)
+    return _to_result(_out, _err, result=result, decode=decode)
+
+
+def _to_startupinfo(block_shell_window):
+    """Build startupinfo for the given shell window setting.
+
+    Args:
+        block_shell_window (bool): prevent shell window from appearing
+            (windows only)
+
+    Returns:
+        (STARTUPINFO|None): startupinfo (if any)
+    """
+    if not block_shell_window or platform.system() != 'Windows':
+        return None
+    _si = subprocess.STARTUPINFO()
+    _si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    return _si
+
+
+def _to_result(out, err, result, decode):
+    """Build system result from command output.
+
+    Args:
+        out (bytes): stdout
+        err (bytes): stderr
+        result (bool|str): result to return (see system)
+        decode (str): encoding to decode bytes result with
+
+    Returns:
+        (str|tuple): result
+    """
+    _out, _err = out, err
     if decode and isinstance(_out, bytes):
         _out = _out.decode(decode)
     if decode and isinstance(_err, bytes):
         _err = _err.decode(decode)
 
-    # Handle result
     if result in [True, 'out']:
         return _out
     if result == 'out/err':
@@ -101,3 +144,250 @@ def system(
     if result == 'err':
         return _err
     raise ValueError(result)
+
+
+def _run_streamed(pipe, idx, callback, decode, timeout):
+    """Read the output of a running process line by line.
+
+    Args:
+        pipe (Popen): process to read
+        idx (int): command index (passed to callback)
+        callback (fn): callback for each line of output
+        decode (str): encoding to decode lines with
+        timeout (float): timeout in seconds
+
+    Returns:
+        (tuple): stdout/stderr bytes
+    """
+    _lines = {'out': [], 'err': []}
+
+    def _read_stream(stream, name):
+        for _line in iter(stream.readline, b''):
+            _lines[name].append(_line)
+            callback(
+                idx, name,
+                _line.decode(decode, errors='replace') if decode else _line)
+        stream.close()
+
+    _threads = [
+        threading.Thread(
+            target=_read_stream, args=(pipe.stdout, 'out'), daemon=True),
+        threading.Thread(
+            target=_read_stream, args=(pipe.stderr, 'err'), daemon=True)]
+    for _thread in _threads:
+        _thread.start()
+    try:
+        pipe.wait(timeout=timeout)
+    finally:
+        if pipe.poll() is None:
+            pipe.kill()
+        for _thread in _threads:
+            _thread.join()
+
+    return b''.join(_lines['out']), b''.join(_lines['err'])
+
+
+def _run_cmds(
+        cmds, idx, result, decode, block_shell_window, env, timeout,
+        callback):
+    """Run a single command as part of a system_many call.
+
+    Args:
+        cmds (str list): command to execute
+        idx (int): command index
+        result (bool|str): result to return (see system)
+        decode (str): encoding to decode bytes result with
+        block_shell_window (bool): prevent shell window from appearing
+        env (dict): override environment
+        timeout (float): apply timeout in seconds
+        callback (fn): callback for each line of output
+
+    Returns:
+        (str|tuple): result
+    """
+    _pipe = subprocess.Popen(
+        cmds,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        startupinfo=_to_startupinfo(block_shell_window),
+        env=env)
+    if callback:
+        _out, _err = _run_streamed(
+            _pipe, idx=idx, callback=callback, decode=decode, timeout=timeout)
+    else:
+        try:
+            _out, _err = _pipe.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired as _exc:
+            _pipe.kill()
+            _pipe.communicate()
+            raise _exc
+    return _to_result(_out, _err, result=result, decode=decode)
+
+
+def system_many(
+        cmds, max_workers=None, result=True, decode='utf-8',
+        block_shell_window=True, env=None, timeout=None, callback=None,
+        catch=False, verbose=0):
+    """Execute a list of system commands concurrently.
+
+    Results are returned in the same order as the commands.
+
+    Args:
+        cmds (list): list of commands to execute (see system)
+        max_workers (int): maximum number of concurrent commands
+        result (bool|str): result to return for each command
+            True|out - return stdout
+            out/err - return stout/stderr as tuple
+        decode (str): encoding to decode bytes result with
+            (default is utf-8)
+        block_shell_window (bool): prevent shell window from appearing
+            (windows only)
+        env (dict): override environment
+        timeout (float): apply timeout to each command in seconds
+        callback (fn): function to call on each line of output - this
+            is passed the command index, the stream name (out/err) and
+            the line, and is called from a worker thread
+        catch (bool): return None for commands which time out or fail
+            to execute rather than raising an error
+        verbose (int): print process data
+
+    Returns:
+        (list): command results
+    """
+    _cmds_list = [_build_cmds(_cmd, verbose=verbose) for _cmd in cmds]
+    _workers = max_workers or SYSTEM_WORKERS
+    _LOGGER.debug('SYSTEM MANY %d workers=%d', len(_cmds_list), _workers)
+
+    _results = []
+    with concurrent.futures.ThreadPoolExecutor(_workers) as _pool:
+        _futures = [
+            _pool.submit(
+                _run_cmds, _cmds, idx=_idx, result=result, decode=decode,
+                block_shell_window=block_shell_window, env=env,
+                timeout=timeout, callback=callback)
+            for _idx, _cmds in enumerate(_cmds_list)]
+        for _cmds, _future in zip(_cmds_list, _futures):
+            try:
+                _result = _future.result()
+            except (subprocess.TimeoutExpired, OSError) as _exc:
+                if not catch:
+                    raise _exc
+                _LOGGER.warning(
+                    'SYSTEM FAILED %s - %s', u_text.nice_cmds(_cmds), _exc)
+                _result = None
+            _results.append(_result)
+
+    return _results
+
+
+async def _aread_stream(stream, idx, name, callback, decode):
+    """Read a process stream line by line.
+
+    Args:
+        stream (StreamReader): stream to read
+        idx (int): command index (passed to callback)
+        name (str): stream name (out/err)
+        callback (fn): callback for each line of output
+        decode (str): encoding to decode lines with
+
+    Returns:
+        (bytes): stream contents
+    """
+    _lines = []
+    while True:
+        _line = await stream.readline()
+        if not _line:
+            break
+        _lines.append(_line)
+        if callback:
+            callback(
+                idx, name,
+                _line.decode(decode, errors='replace') if decode else _line)
+    return b''.join(_lines)
+
+
+async def asystem(
+        cmd, result=True, decode='utf-8', env=None, timeout=None,
+        callback=None, idx=0, verbose=0):
+    """Execute a system command using asyncio.
+
+    Args:
+        cmd (str): command to execute
+        result (bool|str): result to return (see system)
+        decode (str): encoding to decode bytes result with
+        env (dict): override environment
+        timeout (float): apply timeout in seconds
+        callback (fn): function to call on each line of output - this
+            is passed the command index, the stream name (out/err) and
+            the line
+        idx (int): command index (passed to callback)
+        verbose (int): print process data
+
+    Returns:
+        (str|tuple): result
+    """
+    _cmds = _build_cmds(cmd, verbose=verbose)
+    _proc = await asyncio.create_subprocess_exec(
+        *_cmds,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env)
+    _read = asyncio.gather(
+        _aread_stream(
+            _proc.stdout, idx=idx, name='out', callback=callback,
+            decode=decode),
+        _aread_stream(
+            _proc.stderr, idx=idx, name='err', callback=callback,
+            decode=decode),
+        _proc.wait())
+    try:
+        _out, _err, _ = await asyncio.wait_for(_read, timeout=timeout)
+    except asyncio.TimeoutError as _exc:
+        _proc.kill()
+        await _proc.wait()
+        raise subprocess.TimeoutExpired(_cmds, timeout) from _exc
+    return _to_result(_out, _err, result=result, decode=decode)
+
+
+async def asystem_many(
+        cmds, max_workers=None, result=True, decode='utf-8', env=None,
+        timeout=None, callback=None, catch=False, verbose=0):
+    """Execute a list of system commands concurrently using asyncio.
+
+    Results are returned in the same order as the commands.
+
+    Args:
+        cmds (list): list of commands to execute (see system)
+        max_workers (int): maximum number of concurrent commands
+        result (bool|str): result to return for each command
+        decode (str): encoding to decode bytes result with
+        env (dict): override environment
+        timeout (float): apply timeout to each command in seconds
+        callback (fn): function to call on each line of output (see
+            asystem)
+        catch (bool): return None for commands which time out or fail
+            to execute rather than raising an error
+        verbose (int): print process data
+
+    Returns:
+        (list): command results
+    """
+    _sem = asyncio.Semaphore(max_workers or SYSTEM_WORKERS)
+
+    async def _run(idx, cmd):
+        async with _sem:
+            try:
+                return await asystem(
+                    cmd, result=result, decode=decode, env=env,
+                    timeout=timeout, callback=callback, idx=idx,
+                    verbose=verbose)
+            except (subprocess.TimeoutExpired, OSError) as _exc:
+                if not catch:
+                    raise _exc
+                _LOGGER.warning('SYSTEM FAILED %s - %s', cmd, _exc)
+                return None
+
+    return await asyncio.gather(
+        *[_run(_idx, _cmd) for _idx, _cmd in enumerate(cmds)])
@@ -0,0 +1,351 @@
+"""Tools for instrumenting pini with counters, timers and nested spans.
+
+Tracing is disabled by default, in which case each call is a single
+flag check. It can be enabled by setting $PINI_TRACE to 1, or by
+using the TRACER object:
+
+    >>> from pini.utils import TRACER, trace_span, trace_count
+    >>> TRACER.enable()
+    >>> with trace_span('my_op'):
+    ...     trace_count('my_counter')
+    >>> TRACER.print_report()
+
+Spans are aggregated into timers by name, and are also stored as
+events so that they can be written to a chrome trace json file (open
+in chrome://tracing or https://ui.perfetto.dev).
+
+Names are dot-separated with the category first, eg:
+
+    fs.find/fs.stat - file system searches/stats
+    yaml.read/yaml.write/pkl.read/pkl.write - data file io
+    cache.{namespace}.hit/miss/disk - result cache access
+    template.parse - pipeline template parses
+    sg.find/sg.find_one/sg.create/sg.update/sg.batch/sg.upload - shotgrid
+        requests
+    farm.read_jobs - farm job queries
+"""
+
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAX_EVENTS = int(os.environ.get('PINI_TRACE_MAX_EVENTS', 200000))
+
+
+class _Span:
+    """Represents a timed span of execution."""
+
+    __slots__ = ('name', 'args', 'start', 'child_t')
+
+    def __init__(self, name, args):
+        """Constructor.
+
+        Args:
+            name (str): span name
+            args (dict): span args (added to chrome trace)
+        """
+        self.name = name
+        self.args = args
+        self.start = None
+        self.child_t = 0.0
+
+    def __enter__(self):
+        TRACER.push_span(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        _dur = time.perf_counter() - self.start
+        TRACER.pop_span(self, dur=_dur)
+
+
+class _NullSpan:
+    """Span used when tracing is disabled - this has no effect."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Tracer:
+    """Stores instrumentation data for this session.
+
+    The span stack is thread local, while counters, timers and events
+    are shared between all threads.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self.enabled = os.environ.get('PINI_TRACE') == '1'
+        self.recording = False
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counters = {}
+        self._timers = {}
+        self._events = []
+        self._start = time.perf_counter()
+
+    @property
+    def stack(self):
+        """Obtain span stack for the current thread.
+
+        Returns:
+            (_Span list): current spans
+        """
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def enable(self, enabled=True):
+        """Enable/disable tracing.
+
+        Args:
+            enabled (bool): tracing state
+        """
+        self.enabled = enabled
+
+    def reset(self):
+        """Clear all counters, timers and events."""
+        with self._lock:
+            self._counters = {}
+            self._timers = {}
+            self._events = []
+            self._start = time.perf_counter()
+
+    def count(self, name, val=1):
+        """Increment a counter.
+
+        Args:
+            name (str): counter name
+            val (int): increment value
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + val
+
+    def push_span(self, span):
+        """Add a span to the current thread's stack.
+
+        Args:
+            span (_Span): span being entered
+        """
+        self.stack.append(span)
+
+    def pop_span(self, span, dur):
+        """Remove a span from the current thread's stack and store it.
+
+        Args:
+            span (_Span): span being exited
+            dur (float): span duration (in seconds)
+        """
+        _stack = self.stack
+        _stack.pop()
+        if _stack:
+            _stack[-1].child_t += dur
+        with self._lock:
+            _timer = self._timers.get(span.name)
+            if not _timer:
+                _timer = self._timers[span.name] = [0, 0.0, 0.0, 0.0]
+            _timer[0] += 1
+            _timer[1] += dur
+            _timer[2] += dur - span.child_t
+            _timer[3] = max(_timer[3], dur)
+            if len(self._events) < _MAX_EVENTS:
+                self._events.append((
+                    span.name, span.start, dur, threading.get_ident(),
+                    span.args))
+
+    def read_counters(self):
+        """Read current counter values.
+
+        Returns:
+            (dict): counter name/value
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    def read_timers(self):
+        """Read current timer values.
+
+        Returns:
+            (dict): timer name/data dict (count, total, self, max)
+        """
+        with self._lock:
+            return {
+                _name: {'count': _count, 'total': _total, 'self': _self,
+                        'max': _max}
+                for _name, (_count, _total, _self, _max)
+                in self._timers.items()}
+
+    def to_report(self):
+        """Build per-operation report of the current data.
+
+        Returns:
+            (str): report text
+        """
+        _lines = []
+        _timers = self.read_timers()
+        if _timers:
+            _lines.append(
+                f'{"TIMER":<40} {"COUNT":>8} {"TOTAL":>9} {"SELF":>9} '
+                f'{"MEAN":>9} {"MAX":>9}')
+            for _name, _data in sorted(
+                    _timers.items(), key=lambda _item: -_item[1]['total']):
+                _mean = _data['total'] / _data['count']
+                _lines.append(
+                    f'{_name:<40} {_data["count"]:>8d} '
+                    f'{_data["total"]:>8.03f}s {_data["self"]:>8.03f}s '
+                    f'{_mean:>8.04f}s {_data["max"]:>8.03f}s')
+        _counters = self.read_counters()
+        if _counters:
+            if _lines:
+                _lines.append('')
+            _lines.append(f'{"COUNTER":<40} {"COUNT":>8}')
+            for _name, _count in sorted(_counters.items()):
+                _lines.append(f'{_name:<40} {_count:>8d}')
+        return '\n'.join(_lines)
+
+    def print_report(self):
+        """Print per-operation report of the current data."""
+        print(self.to_report())
+
+    def to_chrome_trace(self):
+        """Build chrome trace data.
+
+        Returns:
+            (dict): chrome trace data
+        """
+        _pid = os.getpid()
+        _events = []
+        with self._lock:
+            for _name, _start, _dur, _tid, _args in self._events:
+                _event = {
+                    'name': _name, 'cat': _name.split('.')[0], 'ph': 'X',
+                    'ts': (_start - self._start) * 1000000,
+                    'dur': _dur * 1000000, 'pid': _pid, 'tid': _tid}
+                if _args:
+                    _event['args'] = {
+                        _key: str(_val) for _key, _val in _args.items()}
+                _events.append(_event)
+            _end = (time.perf_counter() - self._start) * 1000000
+            for _name, _count in sorted(self._counters.items()):
+                _events.append({
+                    'name': _name, 'ph': 'C', 'ts': _end, 'pid': _pid,
+                    'args': {'count': _count}})
+        return {'traceEvents': _events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, file_):
+        """Write chrome trace json file.
+
+        Args:
+            file_ (File): file to write to
+        """
+        from pini.utils import File
+        _file = File(file_)
+        _file.write(json.dumps(self.to_chrome_trace()), force=True)
+        _LOGGER.info('WROTE CHROME TRACE %s', _file.path)
+
+
+TRACER = _Tracer()
+
+
+def trace_count(name, val=1):
+    """Increment the given counter.
+
+    Args:
+        name (str): counter name
+        val (int): increment value
+    """
+    if TRACER.enabled:
+        TRACER.count(name, val)
+
+
+def trace_span(name, **args):
+    """Build a context which times the code it contains.
+
+    Args:
+        name (str): span name (eg. fs.find)
+        args (dict): span args (added to chrome trace)
+
+    Returns:
+        (_Span): span context
+    """
+    if not TRACER.enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def traced(name=None):
+    """Build a decorator which times each call of a function.
+
+    Args:
+        name (str): override span name (default is function name)
+
+    Returns:
+        (fn): span decorator
+    """
+
+    def _traced_dec(func):
+
+        _name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def _traced_func(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            with _Span(_name, None):
+                return func(*args, **kwargs)
+
+        return _traced_func
+
+    return _traced_dec
+
+
+@contextlib.contextmanager
+def record_trace(name, report=True, chrome_trace=True):
+    """Record a trace of the given operation (eg. a helper refresh).
+
+    If tracing is enabled, the existing data is cleared and then on
+    completion a report is printed and a chrome trace json is written to
+    $TMP/.pini/trace/{name}.json. Nested recordings are treated as
+    regular spans.
+
+    Args:
+        name (str): operation name
+        report (bool): print per-operation report
+        chrome_trace (bool): write chrome trace json
+    """
+    if not TRACER.enabled or TRACER.recording:
+        with trace_span(name):
+            yield
+        return
+
+    from pini.utils import TMP
+    TRACER.recording = True
+    TRACER.reset()
+    try:
+        with _Span(name, None):
+            yield
+    finally:
+        TRACER.recording = False
+        if report:
+            print(f'TRACE {name}')
+            TRACER.print_report()
+        if chrome_trace:
+            TRACER.write_chrome_trace(
+                TMP.to_file(f'.pini/trace/{name}.json'))